@@ -4,7 +4,7 @@
 Run:  .venv/bin/python bench/ecommerce_demo.py
 
 This is the study-group demo. It exercises the *real* V1 code paths
-(``ContextConcierge`` + KV-backed federation + the canned Postgres explorer +
+(``ContextConcierge`` + KV-backed federation + the canned stub explorer +
 the offline ``FakeLLM``) to show three things end-to-end without a token or a
 live database:
 
@@ -167,7 +167,7 @@ def section_3_safety(pipeline: SafetyPipeline) -> None:
 
 
 async def main() -> None:
-    print("Lang2SQL v4.1 — e-commerce demo (offline: FakeLLM, canned PG, in-memory)")
+    print("Lang2SQL v4.1 — e-commerce demo (offline: FakeLLM, canned DB, in-memory)")
 
     store = SqliteStore()
     pipeline = SafetyPipeline()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Safety-gate latency — how long ``SafetyPipeline.evaluate`` takes per query.
+
+Run:  .venv/bin/python bench/safety_gate.py [--repeat N]
+
+Generates chained-CTE queries of growing size (the shape an agent writes when
+it builds a metric step by step: string literals with ``;`` in them, line
+comments, nested parentheses) and times the default pipeline on each:
+
+  cold — a query seen for the first time: lexing plus every layer, with the
+         decision cache disabled and the lexer's memo cleared per call.
+  warm — the same query again: one hash and a decision-cache hit.
+
+Numbers are microseconds per ``evaluate`` call, best of three runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from lang2sql.core.ports.safety import SafetyContext, Verdict
+from lang2sql.safety.lexer import tokenize
+from lang2sql.safety.pipeline import SafetyPipeline
+
+STEPS = (5, 20, 80, 200)
+
+
+def generate_cte_query(steps: int) -> str:
+    """A WITH chain of ``steps`` CTEs, each filtering and deriving from the last."""
+    ctes = []
+    for i in range(steps):
+        source = "orders" if i == 0 else f"step_{i - 1}"
+        ctes.append(
+            f"step_{i} AS (\n"
+            f"  SELECT o.id, o.user_id, o.amount * {i + 1} AS amount,\n"
+            f"         'note; step {i}' AS note, COALESCE(o.region, 'n/a') AS region\n"
+            f"  FROM {source} o  -- carried from {source}\n"
+            f"  WHERE (o.amount > {i} AND o.created_at >= DATE '2024-01-01')\n"
+            f")"
+        )
+    return "WITH " + ",\n".join(ctes) + f"\nSELECT region, SUM(amount) FROM step_{steps - 1} GROUP BY region"
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1e6
+
+
+def measure(sql: str, repeat: int) -> tuple[float, float]:
+    """(cold µs, warm µs) per evaluate call for ``sql``."""
+    uncached = SafetyPipeline(decision_cache_size=0)
+    cached = SafetyPipeline()
+
+    def cold() -> None:
+        tokenize.cache_clear()
+        uncached.evaluate(sql, SafetyContext())
+
+    def warm() -> None:
+        cached.evaluate(sql, SafetyContext())
+
+    decision = cached.evaluate(sql, SafetyContext())
+    assert decision.verdict is Verdict.PASS, decision.reason
+    return _best_of(cold, repeat), _best_of(warm, repeat * 20)
+
+
+def main(repeat: int = 50) -> None:
+    print(f"{'CTEs':>5} {'bytes':>8} {'tokens':>7} {'cold µs':>10} {'warm µs':>9}")
+    for steps in STEPS:
+        sql = generate_cte_query(steps)
+        cold, warm = measure(sql, repeat)
+        print(f"{steps:>5} {len(sql):>8} {len(tokenize(sql)):>7} {cold:>10.1f} {warm:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="evaluate calls per timing")
+    main(parser.parse_args().repeat)
@@ -1,14 +1,16 @@
 """Outbound adapters — concrete impls of the ``core.ports`` Protocols (v4.1 §2.1).
 
-stdlib only in V1: OpenAI via ``urllib``, storage via ``sqlite3``, the Postgres
-explorer a canned stub until psycopg lands in v1.5.
+OpenAI and Cloudflare D1 share the pooled ``http`` client (aiohttp), storage is
+``sqlite3``, Postgres is read over psycopg 3, and :class:`StubExplorer` stands in
+with canned data when no database is configured.
 """
 
 from __future__ import annotations
 
 from .db.postgres_explorer import PostgresExplorer
+from .db.stub_explorer import StubExplorer
 from .llm.fake import FakeLLM
 from .llm.openai_ import OpenAILLM
 from .storage.sqlite_store import SqliteStore
 
-__all__ = ["FakeLLM", "OpenAILLM", "PostgresExplorer", "SqliteStore"]
+__all__ = ["FakeLLM", "OpenAILLM", "PostgresExplorer", "SqliteStore", "StubExplorer"]
@@ -1,20 +1,26 @@
 """DB adapters — :class:`ExplorerPort` impls + the connection factory.
 
 ``build_explorer`` routes a connection string to the right adapter:
-Cloudflare D1 over its HTTP API, everything else over generic SQLAlchemy.
+Cloudflare D1 over its HTTP API, PostgreSQL over psycopg, everything else over
+generic SQLAlchemy (natively async for drivers that support it).
+:class:`StubExplorer` serves canned data when nothing is configured.
 """
 
 from __future__ import annotations
 
+from .async_sqlalchemy_explorer import AsyncSqlAlchemyExplorer
 from .d1_explorer import D1Explorer
 from .factory import build_explorer, explorer_from_env
 from .postgres_explorer import PostgresExplorer
 from .sqlalchemy_explorer import SqlAlchemyExplorer
+from .stub_explorer import StubExplorer
 
 __all__ = [
     "build_explorer",
     "explorer_from_env",
     "D1Explorer",
     "SqlAlchemyExplorer",
+    "AsyncSqlAlchemyExplorer",
     "PostgresExplorer",
+    "StubExplorer",
 ]
@@ -0,0 +1,135 @@
+"""Native-async SQLAlchemy explorer for drivers with an asyncio flavour.
+
+:class:`SqlAlchemyExplorer` pushes every blocking call onto a worker thread,
+which caps concurrency at the default executor's size and pays a thread hop
+per query. Drivers that speak asyncio natively (``psycopg`` 3, ``asyncpg``,
+``aiosqlite``, ``asyncmy``/``aiomysql``) don't need that: this variant builds
+an :class:`~sqlalchemy.ext.asyncio.AsyncEngine` and awaits the connection on
+the event loop itself.
+
+Introspection and execution reuse the sync explorer's workers unchanged —
+``AsyncConnection.run_sync`` hands them a regular ``Connection`` — so catalog
+caching, ``describe_all`` and staleness probes behave identically. Streaming
+uses ``AsyncConnection.stream``, which awaits each batch on the loop.
+Timeouts reuse the sync explorer's statement guard too; past the deadline the
+driver is interrupted (``aiosqlite``, ``psycopg``) or the awaiting task is
+cancelled, which makes ``asyncpg`` cancel on the server.
+
+The pool is sized independently of the sync explorer (``pool_size``,
+``max_overflow``, ``pool_timeout``): one async engine is shared by every
+concurrent request on the loop, so it is the pool, not a thread count, that
+bounds how many queries reach the database at once.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from ...core.ports.explorer import DEFAULT_STREAM_BATCH
+from ...core.result import ResultSet
+from .catalog import DEFAULT_CATALOG_TTL_SECONDS
+from .sqlalchemy_explorer import SqlAlchemyExplorer, _StatementGuard
+
+T = TypeVar("T")
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT_SECONDS = 30.0
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+
+# SQLAlchemy driver names (the part after ``+``) that have an asyncio dialect.
+ASYNC_DRIVERS = frozenset({"psycopg", "psycopg_async", "asyncpg", "aiosqlite", "asyncmy", "aiomysql"})
+
+
+def is_async_url(url: str) -> bool:
+    """True when ``url`` names a driver :class:`AsyncSqlAlchemyExplorer` can use."""
+    scheme = url.split("://", 1)[0].lower()
+    _, _, driver = scheme.partition("+")
+    return driver in ASYNC_DRIVERS
+
+
+class AsyncSqlAlchemyExplorer(SqlAlchemyExplorer):
+    """ExplorerPort over a SQLAlchemy AsyncEngine, built from a connection URL."""
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        schema: str | None = None,
+        catalog_ttl: float = DEFAULT_CATALOG_TTL_SECONDS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_overflow: int = DEFAULT_MAX_OVERFLOW,
+        pool_timeout: float = DEFAULT_POOL_TIMEOUT_SECONDS,
+        pool_recycle: int = DEFAULT_POOL_RECYCLE_SECONDS,
+    ) -> None:
+        super().__init__(url, schema=schema, catalog_ttl=catalog_ttl)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+
+    def _get_engine(self) -> Any:
+        if self._engine is None:
+            from sqlalchemy.engine import make_url
+            from sqlalchemy.ext.asyncio import create_async_engine
+
+            self._engine = create_async_engine(self.url, **self._pool_options(make_url(self.url)))
+        return self._engine
+
+    def _pool_options(self, url: Any) -> dict[str, Any]:
+        # In-memory SQLite gets a StaticPool (one shared connection), which
+        # rejects queue sizing arguments.
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            return {}
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": True,
+        }
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        async with self._get_engine().connect() as conn:
+            return await conn.run_sync(fn, *args)
+
+    async def execute_stream(
+        self,
+        sql: str,
+        limit: int = 1000,
+        *,
+        batch_size: int = DEFAULT_STREAM_BATCH,
+        timeout: float | None = None,
+    ) -> AsyncIterator[ResultSet]:
+        from sqlalchemy import text
+
+        guard = _StatementGuard(timeout) if timeout is not None else None
+        async with self._get_engine().connect() as conn:
+            if guard is not None:
+                await conn.run_sync(guard.begin)
+            try:
+                result = await self._bounded(
+                    guard,
+                    conn.stream(text(sql), execution_options={"max_row_buffer": batch_size}),
+                )
+                try:
+                    remaining = int(limit)
+                    while remaining > 0:
+                        rows = await self._bounded(
+                            guard, result.fetchmany(min(batch_size, remaining))
+                        )
+                        if not rows:
+                            break
+                        remaining -= len(rows)
+                        yield ResultSet(list(result.keys()), rows)
+                finally:
+                    await result.close()
+            finally:
+                if guard is not None:
+                    await conn.run_sync(guard.end)
+
+    async def close(self) -> None:
+        """Dispose of the pool; the next call opens a fresh one."""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
@@ -0,0 +1,132 @@
+"""SchemaCatalog — a per-explorer, versioned snapshot of tables and columns.
+
+Reading the catalog is the expensive part of introspection on a warehouse
+(Snowflake/BigQuery spend seconds per ``get_table_names``), yet the schema
+changes rarely compared with how often the agent asks for it — the system
+prompt alone lists tables every turn. The catalog keeps the last answer in
+memory so warm ``list_tables``/``describe_table`` calls are dict lookups.
+
+Freshness is bounded three ways:
+
+* a TTL — after ``ttl_seconds`` the snapshot is treated as cold;
+* a cheap staleness *token* — an explorer may record a dialect-specific marker
+  (e.g. SQLite's ``PRAGMA schema_version``) and compare it on read, catching
+  DDL before the TTL runs out;
+* explicit :meth:`invalidate` — called after ``/setup`` or ``/enrich``.
+
+``version`` increases every time the snapshot is dropped or reloaded, so
+downstream caches (the system prompt) can key on it instead of re-reading.
+Versions come from one process-wide counter, so an explorer rebuilt for the
+same DSN never reuses a version its predecessor's snapshot had.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from typing import Any, Callable
+
+from ...core.ports.explorer import Table
+
+# How long a loaded catalog is trusted when no staleness token is available.
+DEFAULT_CATALOG_TTL_SECONDS = 300.0
+
+_versions = itertools.count(1)
+
+
+class SchemaCatalog:
+    """TTL-bounded table/column cache with a monotonically increasing version."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_CATALOG_TTL_SECONDS,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._tables: list[Table] | None = None
+        self._described: dict[str, Table] = {}
+        self._loaded_at: float | None = None
+        self._token: Any = None
+        self.version = 0
+
+    # --- freshness -------------------------------------------------------
+
+    @property
+    def token(self) -> Any:
+        """Staleness marker recorded with the current snapshot (or ``None``)."""
+        return self._token
+
+    def is_stale(self) -> bool:
+        """True when there is nothing cached or the TTL has run out."""
+        if self._loaded_at is None:
+            return True
+        return self._ttl >= 0 and (self._clock() - self._loaded_at) > self._ttl
+
+    def check_token(self, token: Any) -> None:
+        """Drop the snapshot if ``token`` differs from the one it was built at."""
+        if token is not None and self._loaded_at is not None and token != self._token:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget everything; the next read goes back to the database."""
+        if self._loaded_at is None and self._tables is None and not self._described:
+            return
+        self._tables = None
+        self._described.clear()
+        self._loaded_at = None
+        self._token = None
+        self.version = next(_versions)
+
+    # --- reads -----------------------------------------------------------
+
+    def tables(self) -> list[Table] | None:
+        """Cached table list, or ``None`` when cold/expired."""
+        if self._tables is None or self.is_stale():
+            return None
+        return list(self._tables)
+
+    def table(self, name: str) -> Table | None:
+        """Cached column detail for one table, or ``None`` on a miss."""
+        if self.is_stale():
+            return None
+        return self._described.get(name)
+
+    def described(self) -> list[Table] | None:
+        """Every table with column detail, when the whole catalog is warm.
+
+        Only complete when each listed table has been described (e.g. after a
+        bulk load); otherwise ``None`` so callers fall back to the explorer.
+        """
+        tables = self.tables()
+        if tables is None:
+            return None
+        out: list[Table] = []
+        for t in tables:
+            detail = self._described.get(t.name)
+            if detail is None:
+                return None
+            out.append(detail)
+        return out
+
+    # --- writes ----------------------------------------------------------
+
+    def store_tables(self, tables: list[Table], *, token: Any = None) -> None:
+        """Record a fresh table listing (starts a new snapshot if cold)."""
+        self._begin(token)
+        self._tables = list(tables)
+
+    def store_table(self, table: Table, *, token: Any = None) -> None:
+        """Record column detail for one table."""
+        self._begin(token)
+        self._described[table.name] = table
+
+    def _begin(self, token: Any) -> None:
+        if self.is_stale():
+            if self._loaded_at is not None or self._tables is not None or self._described:
+                self._tables = None
+                self._described.clear()
+            self._loaded_at = self._clock()
+            self._token = token
+            self.version = next(_versions)
@@ -10,28 +10,58 @@ or over the REST query endpoint. A Python process (our Discord bot) uses the
 
 Since D1 *is* SQLite, schema introspection uses ``sqlite_master`` / ``PRAGMA``.
 The HTTP call is injectable (``transport``) so the adapter is unit-testable with
-no network.
+no network. The default transport posts through the shared pooled
+:class:`HttpClient`, so consecutive queries reuse one TLS connection to the
+Cloudflare API. An injected transport may be sync (run in a worker thread) or
+async (awaited directly).
+
+Every byte comes back over HTTP from the edge, so the adapter keeps requests
+few and small:
+
+* ``execute`` pushes the row limit into the SQL it sends
+  (``SELECT * FROM (<query>) LIMIT n``) instead of slicing a full result;
+* :meth:`execute_batch` sends several statements in one request — the query
+  endpoint runs ``;``-separated statements and returns one result each — so
+  :func:`~lang2sql.tools.sampling.sample_tables` samples a batch of tables per
+  round-trip, and ``describe_all`` reads the whole catalog in one.
+
+Introspection lives in a :class:`SchemaCatalog` filled by that one
+``describe_all`` request, so a cold ``list_tables`` also warms every
+``describe_table`` and concurrent cold reads share the request. There is no
+per-read staleness probe (``PRAGMA schema_version`` would cost a round-trip
+of its own): the TTL and explicit :meth:`invalidate` bound freshness.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
+import inspect
 import os
-import urllib.request
-from typing import Any, Callable
+import re
+from typing import Any, Awaitable, Callable, Sequence, Union
 
 from ...core.ports.explorer import Column, Table
+from ...core.result import ResultSet
+from ...core.singleflight import SingleFlight
+from ..http import HttpClient, HttpError, shared_client
+from .catalog import DEFAULT_CATALOG_TTL_SECONDS, SchemaCatalog
+from .introspection import SQLITE_CATALOG_SQL, schema_matches, tables_from_rows
 
 _API_ROOT = "https://api.cloudflare.com/client/v4"
 
-# A transport takes (sql, params) and returns the parsed D1 JSON response.
-Transport = Callable[[str, list], dict]
+# A transport takes (sql, params) and returns the parsed D1 JSON response,
+# either directly or as an awaitable.
+Transport = Callable[[str, list], Union[dict, Awaitable[dict]]]
+
+# Row-returning statements the LIMIT wrapper applies to (leading comments allowed).
+_ROW_QUERY = re.compile(r"^(?:\s+|--[^\n]*\n|/\*.*?\*/)*(?:select|with|values)\b", re.I | re.S)
 
 
 class D1Explorer:
     """ExplorerPort backed by Cloudflare D1's HTTP query API."""
 
+    dialect = "sqlite"
+
     def __init__(
         self,
         account_id: str,
@@ -40,69 +70,170 @@ class D1Explorer:
         *,
         transport: Transport | None = None,
         timeout: float = 30.0,
+        http: HttpClient | None = None,
+        catalog_ttl: float = DEFAULT_CATALOG_TTL_SECONDS,
     ) -> None:
         self.account_id = account_id
         self.database_id = database_id
         self._token = token if token is not None else os.environ.get("CLOUDFLARE_API_TOKEN")
         self._timeout = timeout
+        self._http = http or shared_client()
         self._transport = transport or self._http_transport
+        self._catalog = SchemaCatalog(catalog_ttl)
+        # Concurrent cold-catalog reads share one HTTP request.
+        self._flights: SingleFlight[Any] = SingleFlight()
+
+    # --- catalog ---------------------------------------------------------
+
+    @property
+    def catalog_version(self) -> int:
+        """Bumps whenever the cached catalog is reloaded or invalidated."""
+        return self._catalog.version
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog (call after /setup or /enrich)."""
+        self._catalog.invalidate()
 
     # --- ExplorerPort ----------------------------------------------------
 
     async def list_tables(self) -> list[Table]:
-        rows = await self._query(
-            "SELECT name FROM sqlite_master WHERE type='table' "
-            "AND name NOT LIKE 'sqlite_%' AND name NOT LIKE '_cf_%' ORDER BY name"
-        )
-        return [Table(name=r["name"], schema="") for r in rows]
+        cached = self._catalog.tables()
+        if cached is not None:
+            return cached
+        tables = await self._flights.do(("describe_all",), self._load_all)
+        return [Table(name=t.name, schema=t.schema) for t in tables]
 
     async def describe_table(self, name: str) -> Table:
+        cached = self._catalog.table(name)
+        if cached is not None:
+            return cached
+        if self._catalog.tables() is None:  # cold: one request describes every table
+            for table in await self._flights.do(("describe_all",), self._load_all):
+                if table.name == name:
+                    return table
+        # Not a catalogued table (a view, or created since the load).
+        return await self._flights.do(("describe_table", name), lambda: self._load_table(name))
+
+    async def _load_table(self, name: str) -> Table:
         rows = await self._query(f"PRAGMA table_info({_ident(name)})")
         cols = [
             Column(name=r["name"], type=r["type"] or "", nullable=not bool(r["notnull"]))
             for r in rows
         ]
-        return Table(name=name, schema="", columns=cols)
+        table = Table(name=name, schema="", columns=cols)
+        self._catalog.store_table(table)
+        return table
+
+    async def describe_all(
+        self,
+        *,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+    ) -> list[Table]:
+        """Every table and column in one HTTP round-trip (D1's only schema is ``main``)."""
+        if not schema_matches("main", include, exclude):
+            return []
+        cached = self._catalog.described()
+        if cached is not None:
+            return cached
+        return list(await self._flights.do(("describe_all",), self._load_all))
+
+    async def _load_all(self) -> list[Table]:
+        rows = await self._query(SQLITE_CATALOG_SQL)
+        tables = tables_from_rows(rows, display_schema=lambda _: "")
+        self._catalog.store_tables([Table(name=t.name, schema=t.schema) for t in tables])
+        for t in tables:
+            self._catalog.store_table(t)
+        return tables
+
+    async def sample_rows(self, name: str, limit: int = 5) -> ResultSet:
+        return ResultSet.from_dicts(
+            await self._query(f"SELECT * FROM {_ident(name)} LIMIT {int(limit)}")
+        )
+
+    async def execute(self, sql: str, limit: int = 1000) -> ResultSet:
+        rows = await self._query(limit_sql(sql, limit))
+        return ResultSet.from_dicts(rows[: int(limit)])
 
-    async def sample_rows(self, name: str, limit: int = 5) -> list[dict]:
-        return await self._query(f"SELECT * FROM {_ident(name)} LIMIT {int(limit)}")
+    async def execute_batch(
+        self, statements: Sequence[str], limit: int = 1000
+    ) -> list[ResultSet | Exception]:
+        """Run read-only statements in one request; one result (or error) each.
 
-    async def execute(self, sql: str, limit: int = 1000) -> list[dict]:
-        rows = await self._query(sql)
-        return rows[: int(limit)]
+        D1 rejects the whole request when any statement fails, so on error the
+        statements are retried one per request to pin it down.
+        """
+        if not statements:
+            return []
+        bounded = [limit_sql(sql, limit) for sql in statements]
+        try:
+            results = await self._query_all(";\n".join(bounded))
+        except RuntimeError:
+            results = []
+        if len(results) == len(bounded):
+            return [ResultSet.from_dicts(rows[: int(limit)]) for rows in results]
+        out: list[ResultSet | Exception] = []
+        for sql in bounded:
+            try:
+                out.append(ResultSet.from_dicts((await self._query(sql))[: int(limit)]))
+            except Exception as exc:
+                out.append(exc)
+        return out
 
     # --- internals -------------------------------------------------------
 
     async def _query(self, sql: str, params: list | None = None) -> list[dict]:
-        resp = await asyncio.to_thread(self._transport, sql, params or [])
+        results = await self._query_all(sql, params)
+        return results[0] if results else []
+
+    async def _query_all(self, sql: str, params: list | None = None) -> list[list[dict]]:
+        """Rows of every statement in ``sql`` (the endpoint returns one result each)."""
+        if inspect.iscoroutinefunction(self._transport):
+            resp = await self._transport(sql, params or [])
+        else:
+            resp = await asyncio.to_thread(self._transport, sql, params or [])
+            if inspect.isawaitable(resp):
+                resp = await resp
         if not resp.get("success", False):
             errors = resp.get("errors") or resp.get("messages") or "unknown D1 error"
             raise RuntimeError(f"D1 query failed: {errors}")
-        result = resp.get("result") or []
-        if not result:
-            return []
         # The query endpoint returns one result object per statement.
-        return result[0].get("results", []) or []
+        return [r.get("results", []) or [] for r in resp.get("result") or []]
 
-    def _http_transport(self, sql: str, params: list) -> dict:
+    async def _http_transport(self, sql: str, params: list) -> dict:
         if not self._token:
             raise RuntimeError("CLOUDFLARE_API_TOKEN not set (D1 requires an API token)")
         url = (
             f"{_API_ROOT}/accounts/{self.account_id}"
             f"/d1/database/{self.database_id}/query"
         )
-        body = json.dumps({"sql": sql, "params": params}).encode("utf-8")
-        req = urllib.request.Request(
-            url,
-            data=body,
-            method="POST",
-            headers={
-                "Authorization": f"Bearer {self._token}",
-                "Content-Type": "application/json",
-            },
-        )
-        with urllib.request.urlopen(req, timeout=self._timeout) as resp:
-            return json.loads(resp.read().decode("utf-8"))
+        try:
+            resp = await self._http.request(
+                "POST",
+                url,
+                json_body={"sql": sql, "params": params},
+                headers={"Authorization": f"Bearer {self._token}"},
+                timeout=self._timeout,
+            )
+            # Cloudflare reports SQL errors as JSON with success=false (often
+            # with a 4xx status); _query turns those into a RuntimeError.
+            return resp.json()
+        except HttpError as exc:
+            raise RuntimeError(f"D1 request failed: {exc}") from exc
+        except ValueError as exc:
+            raise RuntimeError(f"D1 returned non-JSON response (HTTP {resp.status})") from exc
+
+
+def limit_sql(sql: str, limit: int) -> str:
+    """Cap a row-returning query at ``limit`` rows on the D1 side.
+
+    Other statements (``PRAGMA`` …) pass through with only a trailing ``;``
+    removed. The newline before ``)`` keeps a trailing ``--`` comment closed.
+    """
+    body = sql.strip().rstrip(";").rstrip()
+    if not _ROW_QUERY.match(body):
+        return body
+    return f"SELECT * FROM (\n{body}\n) LIMIT {max(0, int(limit))}"
 
 
 def _ident(name: str) -> str:
@@ -1,11 +1,17 @@
 """build_explorer — turn a connection string into the right ExplorerPort.
 
 This is what makes ``/connect`` trivial: the user (or env) gives one URL and the
-factory routes it. Cloudflare D1 has its own HTTP adapter; everything else with
-a normal SQLAlchemy URL goes through the generic SQLAlchemy explorer.
+factory routes it. Cloudflare D1 has its own HTTP adapter and PostgreSQL its
+own psycopg adapter; everything else with a normal SQLAlchemy URL goes through
+the generic SQLAlchemy explorer — the native-async variant when the driver has
+an asyncio dialect.
 
     d1://<account_id>/<database_id>      → D1Explorer        (token from env)
-    postgresql+psycopg://user:…/db       → SqlAlchemyExplorer
+    postgresql://user:…/db               → PostgresExplorer  (psycopg pipeline)
+    postgresql+psycopg://user:…/db       → PostgresExplorer
+    postgresql+asyncpg://user:…/db       → AsyncSqlAlchemyExplorer
+    sqlite+aiosqlite:///…                → AsyncSqlAlchemyExplorer
+    mysql+asyncmy://…                    → AsyncSqlAlchemyExplorer
     bigquery://project/dataset           → SqlAlchemyExplorer
     snowflake://user:…@account/db        → SqlAlchemyExplorer
     mysql+pymysql://…  /  duckdb:///…    → SqlAlchemyExplorer
@@ -17,22 +23,31 @@ import os
 from urllib.parse import urlsplit
 
 from ...core.ports.explorer import ExplorerPort
+from .async_sqlalchemy_explorer import AsyncSqlAlchemyExplorer, is_async_url
 from .d1_explorer import D1Explorer
+from .postgres_explorer import PostgresExplorer
 from .sqlalchemy_explorer import SqlAlchemyExplorer
 
+# Schemes served by the native psycopg explorer rather than SQLAlchemy.
+_POSTGRES_SCHEMES = frozenset({"postgresql", "postgres", "postgresql+psycopg"})
+
 
 def build_explorer(
     connection: str,
     *,
     schema: str | None = None,
     extras: dict | None = None,
+    prefer_async: bool = True,
 ) -> ExplorerPort:
     """Route a connection string to the matching explorer adapter.
 
     ``schema`` is forwarded to the SQLAlchemy explorer (ignored by D1, which is
-    schema-less SQLite). ``extras`` carries per-adapter secrets that don't
-    belong in the URL — currently ``d1_token`` for the D1 HTTP API. Raises
-    ``ValueError`` on an empty/unparseable string.
+    schema-less SQLite). ``extras`` carries per-adapter settings that don't
+    belong in the URL — ``d1_token`` for the D1 HTTP API, ``pool_size`` /
+    ``max_overflow`` / ``pool_timeout`` for the async explorers' pools, and
+    ``statement_timeout_ms`` for Postgres sessions. ``prefer_async=False``
+    keeps async-capable drivers (Postgres included) on the thread-backed
+    SQLAlchemy explorer. Raises ``ValueError`` on an empty/unparseable string.
     """
     if not connection or not connection.strip():
         raise ValueError("empty connection string")
@@ -55,24 +70,41 @@ def build_explorer(
             token=extras.get("d1_token"),
         )
 
-    # Normalize bare postgresql:// → postgresql+psycopg:// (psycopg3 is installed).
-    if scheme == "postgresql":
-        connection = "postgresql+psycopg" + connection[len("postgresql"):]
+    if scheme in _POSTGRES_SCHEMES:
+        if prefer_async:
+            pg = {k: extras[k] for k in _POSTGRES_EXTRAS if extras.get(k) is not None}
+            return PostgresExplorer(connection, schema=schema, **pg)
+        # SQLAlchemy needs the driver spelled out for psycopg 3.
+        connection = "postgresql+psycopg" + connection[len(scheme):]
 
     # Anything else is assumed to be a SQLAlchemy URL (driver loaded lazily).
+    if prefer_async and is_async_url(connection):
+        pool = {k: extras[k] for k in _POOL_EXTRAS if extras.get(k) is not None}
+        return AsyncSqlAlchemyExplorer(connection, schema=schema, **pool)
     return SqlAlchemyExplorer(connection, schema=schema)
 
 
+_POOL_EXTRAS = ("pool_size", "max_overflow", "pool_timeout")
+_POSTGRES_EXTRAS = ("pool_size", "pool_timeout", "statement_timeout_ms")
+
+
 def explorer_from_env() -> ExplorerPort | None:
     """Build an explorer from environment, or ``None`` if nothing is configured.
 
     Precedence: an explicit ``LANG2SQL_DB_URL`` wins; otherwise a pair of
     ``CLOUDFLARE_D1_ACCOUNT_ID`` + ``CLOUDFLARE_D1_DATABASE_ID`` selects D1.
+    ``LANG2SQL_DB_POOL_SIZE`` / ``LANG2SQL_DB_MAX_OVERFLOW`` size the async pool;
+    ``LANG2SQL_DB_STATEMENT_TIMEOUT_MS`` caps Postgres statements.
     """
     url = os.environ.get("LANG2SQL_DB_URL")
     if url:
         schema = os.environ.get("LANG2SQL_DB_SCHEMA") or None
-        return build_explorer(url, schema=schema)
+        extras = {
+            "pool_size": _env_int("LANG2SQL_DB_POOL_SIZE"),
+            "max_overflow": _env_int("LANG2SQL_DB_MAX_OVERFLOW"),
+            "statement_timeout_ms": _env_int("LANG2SQL_DB_STATEMENT_TIMEOUT_MS"),
+        }
+        return build_explorer(url, schema=schema, extras=extras)
 
     account = os.environ.get("CLOUDFLARE_D1_ACCOUNT_ID")
     database = os.environ.get("CLOUDFLARE_D1_DATABASE_ID")
@@ -80,3 +112,11 @@ def explorer_from_env() -> ExplorerPort | None:
         return build_explorer(f"d1://{account}/{database}")
 
     return None
+
+
+def _env_int(name: str) -> int | None:
+    value = os.environ.get(name)
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,288 @@
+"""Bulk schema introspection — every table and column in one query per dialect.
+
+SQLAlchemy's inspector answers ``get_columns`` one table at a time, so
+describing a 200-table warehouse meant 200 catalog round-trips (each one a
+multi-second metadata query on Snowflake/BigQuery). The statements here read
+tables, columns, types, nullability, comments and foreign keys from the
+dialect's catalog views in a single statement:
+
+* PostgreSQL — ``pg_catalog`` (comments via ``col_description``, FKs from
+  ``pg_constraint``);
+* MySQL/MariaDB — ``information_schema.COLUMNS`` + ``KEY_COLUMN_USAGE``;
+* Snowflake — ``information_schema.columns`` (FK column pairs are only
+  exposed by ``SHOW IMPORTED KEYS``, so none are reported);
+* BigQuery — one ``INFORMATION_SCHEMA`` read per dataset, ``UNION ALL``-ed;
+* DuckDB — ``duckdb_columns()`` + ``duckdb_constraints()``;
+* SQLite / Cloudflare D1 — ``sqlite_master`` joined with the
+  ``pragma_table_info`` / ``pragma_foreign_key_list`` table functions.
+
+Schema include/exclude patterns are shell globs (``analytics_*``) translated to
+``LIKE`` so filtering happens in the database, not after the transfer. Every
+query yields rows with the same keys, folded into :class:`Table` objects by
+:func:`tables_from_rows`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from fnmatch import fnmatchcase
+from typing import Any
+
+from ...core.ports.explorer import Column, Table
+
+SQLITE_CATALOG_SQL = """
+SELECT 'main' AS table_schema, m.name AS table_name, p.name AS column_name,
+       p.type AS data_type, NOT p."notnull" AS is_nullable,
+       NULL AS column_comment, NULL AS table_comment,
+       (SELECT f."table" || COALESCE('.' || f."to", '')
+          FROM pragma_foreign_key_list(m.name) f
+         WHERE f."from" = p.name LIMIT 1) AS foreign_key
+  FROM sqlite_master m
+  JOIN pragma_table_info(m.name) p
+ WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite!_%' ESCAPE '!'
+   AND m.name NOT LIKE '!_cf!_%' ESCAPE '!'
+ ORDER BY m.name, p.cid
+"""
+
+_POSTGRES_SQL = """
+SELECT n.nspname AS table_schema, c.relname AS table_name, a.attname AS column_name,
+       pg_catalog.format_type(a.atttypid, a.atttypmod) AS data_type,
+       NOT a.attnotnull AS is_nullable,
+       pg_catalog.col_description(c.oid, a.attnum) AS column_comment,
+       pg_catalog.obj_description(c.oid, 'pg_class') AS table_comment,
+       fk.target AS foreign_key
+  FROM pg_catalog.pg_class c
+  JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+  JOIN pg_catalog.pg_attribute a
+    ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+  LEFT JOIN LATERAL (
+        SELECT rc.relname || '.' || ra.attname AS target
+          FROM pg_catalog.pg_constraint con
+          JOIN pg_catalog.pg_class rc ON rc.oid = con.confrelid
+          JOIN pg_catalog.pg_attribute ra
+            ON ra.attrelid = con.confrelid
+           AND ra.attnum = con.confkey[array_position(con.conkey, a.attnum)]
+         WHERE con.contype = 'f' AND con.conrelid = c.oid AND a.attnum = ANY (con.conkey)
+         LIMIT 1
+       ) fk ON TRUE
+ WHERE c.relkind IN ('r', 'p', 'f') AND {where}
+ ORDER BY n.nspname, c.relname, a.attnum
+"""
+
+_MYSQL_SQL = """
+SELECT c.TABLE_SCHEMA AS table_schema, c.TABLE_NAME AS table_name,
+       c.COLUMN_NAME AS column_name, c.COLUMN_TYPE AS data_type,
+       c.IS_NULLABLE = 'YES' AS is_nullable, c.COLUMN_COMMENT AS column_comment,
+       t.TABLE_COMMENT AS table_comment,
+       (SELECT MIN(CONCAT(k.REFERENCED_TABLE_NAME, '.', k.REFERENCED_COLUMN_NAME))
+          FROM information_schema.KEY_COLUMN_USAGE k
+         WHERE k.TABLE_SCHEMA = c.TABLE_SCHEMA AND k.TABLE_NAME = c.TABLE_NAME
+           AND k.COLUMN_NAME = c.COLUMN_NAME
+           AND k.REFERENCED_TABLE_NAME IS NOT NULL) AS foreign_key
+  FROM information_schema.COLUMNS c
+  JOIN information_schema.TABLES t
+    ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+ WHERE t.TABLE_TYPE = 'BASE TABLE' AND {where}
+ ORDER BY c.TABLE_SCHEMA, c.TABLE_NAME, c.ORDINAL_POSITION
+"""
+
+_SNOWFLAKE_SQL = """
+SELECT c.table_schema, c.table_name, c.column_name, c.data_type,
+       c.is_nullable = 'YES' AS is_nullable, c.comment AS column_comment,
+       t.comment AS table_comment, NULL AS foreign_key
+  FROM information_schema.columns c
+  JOIN information_schema.tables t
+    ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+ WHERE t.table_type = 'BASE TABLE' AND {where}
+ ORDER BY c.table_schema, c.table_name, c.ordinal_position
+"""
+
+_DUCKDB_SQL = """
+SELECT c.schema_name AS table_schema, c.table_name, c.column_name, c.data_type,
+       c.is_nullable, c.comment AS column_comment, t.comment AS table_comment,
+       (SELECT k.referenced_table || '.'
+               || k.referenced_column_names[list_position(k.constraint_column_names, c.column_name)]
+          FROM duckdb_constraints() k
+         WHERE k.constraint_type = 'FOREIGN KEY' AND k.schema_name = c.schema_name
+           AND k.table_name = c.table_name
+           AND list_contains(k.constraint_column_names, c.column_name)
+         LIMIT 1) AS foreign_key
+  FROM duckdb_columns() c
+  JOIN duckdb_tables() t ON t.schema_name = c.schema_name AND t.table_name = c.table_name
+ WHERE c.database_name = current_database() AND {where}
+ ORDER BY c.schema_name, c.table_name, c.column_index
+"""
+
+# BigQuery's INFORMATION_SCHEMA is per dataset unless region-qualified, so the
+# matching datasets are resolved first and read in one UNION ALL.
+_BIGQUERY_PART = """
+SELECT c.table_schema, c.table_name, c.column_name, c.data_type,
+       c.is_nullable = 'YES' AS is_nullable, p.description AS column_comment,
+       NULL AS table_comment, fk.foreign_key
+  FROM `{ds}`.INFORMATION_SCHEMA.COLUMNS c
+  LEFT JOIN `{ds}`.INFORMATION_SCHEMA.COLUMN_FIELD_PATHS p
+    ON p.table_name = c.table_name AND p.column_name = c.column_name
+   AND p.field_path = c.column_name
+  LEFT JOIN (
+        SELECT k.table_name, k.column_name,
+               ANY_VALUE(u.table_name || '.' || u.column_name) AS foreign_key
+          FROM `{ds}`.INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+          JOIN `{ds}`.INFORMATION_SCHEMA.KEY_COLUMN_USAGE k
+            ON k.constraint_name = tc.constraint_name
+          JOIN `{ds}`.INFORMATION_SCHEMA.CONSTRAINT_COLUMN_USAGE u
+            ON u.constraint_name = tc.constraint_name
+         WHERE tc.constraint_type = 'FOREIGN KEY'
+         GROUP BY k.table_name, k.column_name
+       ) fk ON fk.table_name = c.table_name AND fk.column_name = c.column_name
+"""
+
+_SCHEMA_COLUMN = {
+    "postgresql": "n.nspname",
+    "mysql": "c.TABLE_SCHEMA",
+    "mariadb": "c.TABLE_SCHEMA",
+    "snowflake": "c.table_schema",
+    "duckdb": "c.schema_name",
+}
+
+_TABLE_COLUMN = {
+    "postgresql": "c.relname",
+    "mysql": "c.TABLE_NAME",
+    "mariadb": "c.TABLE_NAME",
+    "snowflake": "c.table_name",
+    "duckdb": "c.table_name",
+}
+
+_TEMPLATES = {
+    "postgresql": _POSTGRES_SQL,
+    "mysql": _MYSQL_SQL,
+    "mariadb": _MYSQL_SQL,
+    "snowflake": _SNOWFLAKE_SQL,
+    "duckdb": _DUCKDB_SQL,
+}
+
+
+def glob_to_like(pattern: str) -> str:
+    """Shell glob → SQL ``LIKE`` pattern (escape character ``!``)."""
+    out = []
+    for ch in pattern:
+        if ch in "!%_":
+            out.append("!" + ch)
+        elif ch == "*":
+            out.append("%")
+        elif ch == "?":
+            out.append("_")
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def schema_matches(schema: str, include: Sequence[str], exclude: Sequence[str]) -> bool:
+    """Client-side equivalent of :func:`schema_filter` (case-insensitive)."""
+    s = schema.lower()
+    if include and not any(fnmatchcase(s, p.lower()) for p in include):
+        return False
+    return not any(fnmatchcase(s, p.lower()) for p in exclude)
+
+
+def schema_filter(
+    column: str, schemas: Sequence[str], include: Sequence[str], exclude: Sequence[str]
+) -> tuple[str, dict[str, Any]]:
+    """``WHERE`` fragment + bind params restricting ``column``.
+
+    ``schemas`` (exact names) applies when no include patterns are given —
+    the explorer's own schema by default.
+    """
+    clauses: list[str] = []
+    params: dict[str, Any] = {}
+    if include:
+        ors = []
+        for i, pat in enumerate(include):
+            params[f"inc{i}"] = glob_to_like(pat.lower())
+            ors.append(f"LOWER({column}) LIKE :inc{i} ESCAPE '!'")
+        clauses.append("(" + " OR ".join(ors) + ")")
+    elif schemas:
+        names = []
+        for i, name in enumerate(schemas):
+            params[f"sch{i}"] = name
+            names.append(f":sch{i}")
+        clauses.append(f"{column} IN ({', '.join(names)})")
+    for i, pat in enumerate(exclude):
+        params[f"exc{i}"] = glob_to_like(pat.lower())
+        clauses.append(f"LOWER({column}) NOT LIKE :exc{i} ESCAPE '!'")
+    return (" AND ".join(clauses) or "1 = 1"), params
+
+
+def bulk_query(
+    dialect: str,
+    schemas: Sequence[str],
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    tables: Sequence[str] = (),
+) -> tuple[str, dict[str, Any]] | None:
+    """The single catalog statement for ``dialect``, or ``None`` if unsupported.
+
+    For BigQuery ``schemas`` must already be the resolved dataset list.
+    ``tables`` narrows the result to those table names; SQLite and BigQuery
+    ignore it (callers filter their rows).
+    """
+    if dialect == "sqlite":
+        return SQLITE_CATALOG_SQL, {}
+    if dialect == "bigquery":
+        datasets = [d for d in schemas if d.replace("_", "").replace("-", "").isalnum()]
+        if not datasets:
+            return None
+        return "\nUNION ALL\n".join(_BIGQUERY_PART.format(ds=d) for d in datasets), {}
+    template = _TEMPLATES.get(dialect)
+    if template is None:
+        return None
+    where, params = schema_filter(_SCHEMA_COLUMN[dialect], schemas, include, exclude)
+    if tables:
+        names = []
+        for i, name in enumerate(tables):
+            params[f"tbl{i}"] = name
+            names.append(f":tbl{i}")
+        where += f" AND {_TABLE_COLUMN[dialect]} IN ({', '.join(names)})"
+    return template.format(where=where), params
+
+
+def tables_from_rows(
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    display_schema: Any = None,
+) -> list[Table]:
+    """Fold per-column rows (in table order) into :class:`Table` objects.
+
+    ``display_schema(schema) -> str`` decides the ``Table.schema`` shown; by
+    default the raw schema name is kept. A column repeated (one row per
+    foreign key it takes part in) keeps its first row.
+    """
+    tables: dict[tuple[str, str], Table] = {}
+    seen: set[tuple[str, str, str]] = set()
+    for r in rows:
+        schema = str(r.get("table_schema") or "")
+        name = str(r["table_name"])
+        column = str(r["column_name"])
+        if (schema, name, column) in seen:
+            continue
+        seen.add((schema, name, column))
+        table = tables.get((schema, name))
+        if table is None:
+            shown = display_schema(schema) if display_schema else schema
+            table = Table(name=name, schema=shown, description=r.get("table_comment") or "")
+            tables[(schema, name)] = table
+        table.columns.append(
+            Column(
+                name=column,
+                type=str(r.get("data_type") or ""),
+                nullable=_truthy(r.get("is_nullable", True)),
+                description=r.get("column_comment") or "",
+                foreign_key=r.get("foreign_key") or "",
+            )
+        )
+    return list(tables.values())
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().upper() in ("YES", "TRUE", "1", "T", "Y")
+    return bool(value)
@@ -1,84 +1,437 @@
-"""PostgresExplorer — V1 stub; real psycopg-backed explorer lands in v1.5.
+"""PostgresExplorer — native psycopg 3 explorer for PostgreSQL.
 
-psycopg is not stdlib, so V1 does not connect to anything. The ctor stores the
-DSN for the future real impl, and the read methods return small canned schema
-data so the agent loop and schema-aware tools can be exercised end-to-end.
+Postgres is the main warehouse, and against a managed instance the cost of
+introspection and enrichment is round-trips, not query time. This adapter talks
+to psycopg's async API directly (no SQLAlchemy layer) to cut them:
+
+* **Pipeline mode** — :meth:`execute_batch` sends a batch of statements and
+  reads every result after a single sync, so sampling twenty tables costs one
+  round-trip instead of twenty. :func:`~lang2sql.tools.sampling.sample_tables`
+  uses it when the explorer offers it.
+* **Server-side prepared statements** — the ``pg_catalog`` queries behind
+  ``list_tables``/``describe_table``/``describe_all`` are executed with
+  ``prepare=True``, so repeat metadata reads skip parse/plan. Pass
+  ``prepare=False`` behind a transaction-mode PgBouncer, which can't keep them.
+* **Session guards** — every pooled connection is configured once with
+  ``statement_timeout`` and ``default_transaction_read_only = on``, so even a
+  query the safety pipeline misjudged cannot write or run away.
+* **Named cursors** — :meth:`execute_stream` declares a server-side cursor and
+  fetches ``batch_size`` rows per round-trip, so large results stream.
+* **Per-query deadlines** — a ``timeout`` on :meth:`execute`/:meth:`execute_stream`
+  tightens ``statement_timeout`` for that statement. If the asyncio deadline
+  passes first, the query is cancelled on the server as well.
+
+The pool (``psycopg_pool``) is opened lazily on first use, so constructing the
+explorer — and routing to it in the factory — never imports psycopg. Catalog
+results are cached in a :class:`SchemaCatalog` bounded by TTL and explicit
+invalidation.
 """
 
 from __future__ import annotations
 
-from ...core.ports.explorer import Column, Table
-
-# Canned catalog — two tables a demo guild would plausibly have.
-_TABLES: dict[str, Table] = {
-    "public.orders": Table(
-        name="orders",
-        schema="public",
-        description="One row per customer order.",
-        columns=[
-            Column("id", "integer", nullable=False, description="Primary key."),
-            Column("amount", "numeric", nullable=False, description="Order total."),
-            Column("status", "text", description="pending | paid | shipped | cancelled."),
-            Column("created_at", "timestamptz", nullable=False),
-        ],
-    ),
-    "public.users": Table(
-        name="users",
-        schema="public",
-        description="Registered users.",
-        columns=[
-            Column("id", "integer", nullable=False, description="Primary key."),
-            Column("email", "text", nullable=False),
-            Column("created_at", "timestamptz", nullable=False),
-        ],
-    ),
-}
-
-_SAMPLES: dict[str, list[dict]] = {
-    "public.orders": [
-        {"id": 1, "amount": 49.90, "status": "paid", "created_at": "2026-05-01T10:00:00Z"},
-        {"id": 2, "amount": 12.00, "status": "pending", "created_at": "2026-05-02T14:30:00Z"},
-    ],
-    "public.users": [
-        {"id": 1, "email": "alice@example.com", "created_at": "2026-04-20T08:00:00Z"},
-        {"id": 2, "email": "bob@example.com", "created_at": "2026-04-21T09:15:00Z"},
-    ],
-}
-
-
-def _resolve_key(name: str) -> str:
-    """Map a bare or qualified table name onto a canned-catalog key."""
-    if name in _TABLES:
-        return name
-    return f"public.{name}"
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Sequence, TypeVar
+
+from ...core.ports.explorer import DEFAULT_STREAM_BATCH, QueryTimeout, Table
+from ...core.result import ResultSet
+from ...core.singleflight import SingleFlight
+from .catalog import DEFAULT_CATALOG_TTL_SECONDS, SchemaCatalog
+from .introspection import bulk_query, tables_from_rows
+
+DEFAULT_STATEMENT_TIMEOUT_MS = 30_000
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT_SECONDS = 30.0
+
+_LIST_SQL = """
+SELECT c.relname AS table_name, c.reltuples::bigint AS row_estimate
+  FROM pg_catalog.pg_class c
+  JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+ WHERE n.nspname = %(schema)s AND c.relkind IN ('r', 'p', 'f')
+ ORDER BY c.relname
+"""
+
+# Runs once per new pooled connection; current_schema() rides along so the
+# default schema is known without a separate round-trip.
+_CONFIGURE_SQL = (
+    "SELECT set_config('statement_timeout', %s, false),"
+    " set_config('default_transaction_read_only', 'on', false),"
+    " current_schema()"
+)
+
+# Per-query override of the session guard; the flag makes it transaction-local.
+_SET_TIMEOUT_SQL = "SELECT set_config('statement_timeout', %s, %s)"
+
+T = TypeVar("T")
+
+_NAMED_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+
+
+def libpq_dsn(url: str) -> str:
+    """SQLAlchemy-style ``postgresql+psycopg://`` → a libpq URI psycopg accepts."""
+    scheme, sep, rest = url.partition("://")
+    if sep and scheme.lower().startswith(("postgresql+", "postgres+")):
+        return "postgresql://" + rest
+    return url
+
+
+def pyformat(sql: str) -> str:
+    """Rewrite ``:name`` binds (as built by :mod:`.introspection`) to ``%(name)s``."""
+    return _NAMED_PARAM.sub(r"%(\1)s", sql.replace("%", "%%"))
+
+
+def quote_ident(name: str) -> str:
+    """Quote a possibly schema-qualified identifier (``a.b`` → ``"a"."b"``)."""
+    return ".".join('"' + part.replace('"', '""') + '"' for part in name.split("."))
 
 
 class PostgresExplorer:
-    """Read-only schema introspection — canned data in V1."""
+    """ExplorerPort over a psycopg 3 async connection pool."""
+
+    dialect = "postgresql"
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        schema: str | None = None,
+        statement_timeout_ms: int = DEFAULT_STATEMENT_TIMEOUT_MS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_timeout: float = DEFAULT_POOL_TIMEOUT_SECONDS,
+        prepare: bool = True,
+        catalog_ttl: float = DEFAULT_CATALOG_TTL_SECONDS,
+    ) -> None:
+        self.dsn = libpq_dsn(dsn)
+        self._schema = schema
+        self.statement_timeout_ms = statement_timeout_ms
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self._prepare = prepare
+        self._catalog = SchemaCatalog(catalog_ttl)
+        # Concurrent cold-catalog reads share one round trip.
+        self._flights: SingleFlight[Any] = SingleFlight()
+        self._pool: Any = None  # psycopg_pool.AsyncConnectionPool, opened lazily
+        self._pool_lock = asyncio.Lock()
+        self._default_schema = "public"
+
+    # --- catalog ---------------------------------------------------------
 
-    def __init__(self, dsn: str) -> None:
-        self.dsn = dsn  # stored for the v1.5 psycopg impl; no connection in V1.
+    @property
+    def catalog_version(self) -> int:
+        """Bumps whenever the cached catalog is reloaded or invalidated."""
+        return self._catalog.version
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog (call after /setup or /enrich)."""
+        self._catalog.invalidate()
+
+    # --- ExplorerPort ----------------------------------------------------
 
     async def list_tables(self) -> list[Table]:
-        return list(_TABLES.values())
+        cached = self._catalog.tables()
+        if cached is not None:
+            return cached
+        return list(await self._flights.do(("list_tables",), self._load_tables))
+
+    async def _load_tables(self) -> list[Table]:
+        pool = await self._get_pool()  # opening it resolves the default schema
+        async with pool.connection() as conn:
+            rows = await self._fetch(conn, _LIST_SQL, {"schema": self._own_schema()}, prepare=True)
+        shown = self._display_schema()
+        # reltuples is -1 (PG 14+) or 0 for a table never vacuumed or analysed.
+        tables = [
+            Table(name=name, schema=shown, row_estimate=int(n) if n and n > 0 else None)
+            for name, n in zip(rows.column("table_name"), rows.column("row_estimate"))
+        ]
+        self._catalog.store_tables(tables)
+        return tables
 
     async def describe_table(self, name: str) -> Table:
-        key = _resolve_key(name)
-        table = _TABLES.get(key)
-        if table is None:
+        cached = self._catalog.table(name)
+        if cached is not None:
+            return cached
+        return await self._flights.do(("describe_table", name), lambda: self._load_table(name))
+
+    async def _load_table(self, name: str) -> Table:
+        schema, _, bare = name.rpartition(".")
+        pool = await self._get_pool()
+        sql, params = _catalog_query([schema or self._own_schema()], tables=[bare])
+        async with pool.connection() as conn:
+            rows = await self._fetch(conn, sql, params, prepare=True)
+        shown = schema or self._display_schema()
+        found = tables_from_rows(rows, display_schema=lambda _: shown)
+        if not found:
             raise KeyError(f"unknown table: {name}")
+        table = found[0]
+        self._catalog.store_table(table)
         return table
 
-    async def sample_rows(self, name: str, limit: int = 5) -> list[dict]:
-        key = _resolve_key(name)
-        return list(_SAMPLES.get(key, []))[:limit]
-
-    async def execute(self, sql: str, limit: int = 1000) -> list[dict]:
-        # V1 stub: no real query engine. Echo canned rows that match whichever
-        # known table the SQL mentions, else a generic single-row result.
-        lowered = sql.lower()
-        for key, rows in _SAMPLES.items():
-            table = key.split(".", 1)[-1]
-            if table in lowered:
-                return list(rows)[:limit]
-        return [{"result": 1}][:limit]
+    async def describe_all(
+        self,
+        *,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+    ) -> list[Table]:
+        """Every table with columns, comments and foreign keys in one query.
+
+        Same contract as :meth:`SqlAlchemyExplorer.describe_all`: schema globs,
+        own schema by default, and unfiltered results fill the catalog.
+        """
+        filtered = bool(include or exclude)
+        if not filtered:
+            cached = self._catalog.described()
+            if cached is not None:
+                return cached
+            return list(await self._flights.do(("describe_all",), lambda: self._load_all((), ())))
+        return await self._load_all(include, exclude)
+
+    async def _load_all(self, include: Sequence[str], exclude: Sequence[str]) -> list[Table]:
+        filtered = bool(include or exclude)
+        pool = await self._get_pool()
+        default = self._default_schema
+        sql, params = _catalog_query([self._own_schema()], include, exclude)
+        async with pool.connection() as conn:
+            rows = await self._fetch(conn, sql, params, prepare=True)
+
+        def display(schema: str) -> str:
+            if filtered:
+                return "" if schema == default else schema
+            return self._display_schema()
+
+        tables = tables_from_rows(rows, display_schema=display)
+        if not filtered:
+            self._catalog.store_tables([Table(name=t.name, schema=t.schema) for t in tables])
+            for t in tables:
+                self._catalog.store_table(t)
+        return tables
+
+    async def sample_rows(self, name: str, limit: int = 5) -> ResultSet:
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
+            return await self._fetch(
+                conn, f"SELECT * FROM {quote_ident(name)} LIMIT %s", (int(limit),)
+            )
+
+    async def execute(
+        self, sql: str, limit: int = 1000, *, timeout: float | None = None
+    ) -> ResultSet:
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
+            # No params: psycopg leaves '%' in the gated SQL alone.
+            if timeout is None:
+                return await self._fetch(conn, sql, None, limit=int(limit))
+            deadline = _deadline(timeout)
+            async with self._statement_timeout(conn, timeout):
+                return await _within(
+                    conn, deadline, timeout, self._fetch(conn, sql, None, limit=int(limit))
+                )
+
+    async def execute_stream(
+        self,
+        sql: str,
+        limit: int = 1000,
+        *,
+        batch_size: int = DEFAULT_STREAM_BATCH,
+        timeout: float | None = None,
+    ) -> AsyncIterator[ResultSet]:
+        """Up to ``limit`` rows in batches from a named (server-side) cursor."""
+        pool = await self._get_pool()
+        deadline = _deadline(timeout) if timeout is not None else None
+        async with pool.connection() as conn:
+            # Named cursors live inside a transaction (read-only by session default).
+            async with conn.transaction():
+                if timeout is not None:
+                    await conn.execute(_SET_TIMEOUT_SQL, (self._timeout_ms(timeout), True))
+                async with conn.cursor(name="lang2sql_stream") as cur:
+                    cur.itersize = batch_size
+                    await _within(conn, deadline, timeout, cur.execute(sql))
+                    remaining = int(limit)
+                    while remaining > 0:
+                        rows = await _within(
+                            conn, deadline, timeout, cur.fetchmany(min(batch_size, remaining))
+                        )
+                        if not rows:
+                            break
+                        remaining -= len(rows)
+                        yield ResultSet(_column_names(cur), rows)
+
+    async def execute_batch(
+        self, statements: Sequence[str], limit: int = 1000
+    ) -> list[ResultSet | Exception]:
+        """Run read-only statements in one pipeline; one result (or error) each.
+
+        A failing statement aborts the rest of its pipeline, so on a statement
+        error the batch is replayed one statement at a time to pin it down.
+        Connection and pool failures are not per-statement results; they raise.
+        """
+        if not statements:
+            return []
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
+            cursors: list[Any] = []
+            try:
+                async with conn.pipeline():
+                    for sql in statements:
+                        cur = conn.cursor()
+                        cursors.append(cur)
+                        await cur.execute(sql)
+                return [await _rows(cur, int(limit)) for cur in cursors]
+            except _driver_error():
+                if _broken(conn):
+                    raise
+            finally:
+                for cur in cursors:
+                    await cur.close()
+            out: list[ResultSet | Exception] = []
+            for sql in statements:
+                try:
+                    out.append(await self._fetch(conn, sql, None, limit=int(limit)))
+                except _driver_error() as exc:
+                    if _broken(conn):
+                        raise
+                    out.append(exc)
+            return out
+
+    async def close(self) -> None:
+        """Close the pool; the next call opens a fresh one."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+
+    def pool_stats(self) -> dict[str, int]:
+        """psycopg_pool counters (empty before the pool opens)."""
+        if self._pool is None:
+            return {}
+        stats = self._pool.get_stats()
+        return {
+            "size": stats.get("pool_size", 0),
+            "available": stats.get("pool_available", 0),
+            "waiting": stats.get("requests_waiting", 0),
+        }
+
+    # --- connection handling ---------------------------------------------
+
+    async def _get_pool(self) -> Any:
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    from psycopg_pool import AsyncConnectionPool
+
+                    pool = AsyncConnectionPool(
+                        self.dsn,
+                        min_size=1,
+                        max_size=self.pool_size,
+                        timeout=self.pool_timeout,
+                        kwargs={"autocommit": True},
+                        configure=self._configure,
+                        open=False,
+                    )
+                    await pool.open(wait=True, timeout=self.pool_timeout)
+                    self._pool = pool
+        return self._pool
+
+    async def _configure(self, conn: Any) -> None:
+        """Per-session guards, applied once when the pool opens a connection."""
+        cur = await conn.execute(_CONFIGURE_SQL, (f"{int(self.statement_timeout_ms)}ms",))
+        row = await cur.fetchone()
+        if row and row[2]:
+            self._default_schema = row[2]
+
+    async def _fetch(
+        self,
+        conn: Any,
+        sql: str,
+        params: Any,
+        *,
+        limit: int | None = None,
+        prepare: bool = False,
+    ) -> ResultSet:
+        async with conn.cursor() as cur:
+            # prepare=None leaves psycopg's automatic threshold in charge.
+            await cur.execute(sql, params, prepare=True if (prepare and self._prepare) else None)
+            return await _rows(cur, limit)
+
+    def _timeout_ms(self, timeout: float) -> str:
+        # Never looser than the session guard.
+        return f"{max(1, min(int(timeout * 1000), int(self.statement_timeout_ms)))}ms"
+
+    @asynccontextmanager
+    async def _statement_timeout(self, conn: Any, timeout: float) -> AsyncIterator[None]:
+        """Tighten ``statement_timeout`` for one autocommit statement, then restore it."""
+        await conn.execute(_SET_TIMEOUT_SQL, (self._timeout_ms(timeout), False))
+        try:
+            yield
+        finally:
+            await conn.execute(
+                _SET_TIMEOUT_SQL, (f"{int(self.statement_timeout_ms)}ms", False)
+            )
+
+    def _own_schema(self) -> str:
+        return self._schema or self._default_schema
+
+    def _display_schema(self) -> str:
+        # As in SqlAlchemyExplorer, the connection's default schema stays unqualified.
+        if not self._schema or self._schema == self._default_schema:
+            return ""
+        return self._schema
+
+
+def _catalog_query(
+    schemas: Sequence[str],
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    tables: Sequence[str] = (),
+) -> tuple[str, dict[str, Any]]:
+    query = bulk_query("postgresql", schemas, include, exclude, tables)
+    assert query is not None  # postgresql always has a catalog template
+    sql, params = query
+    return pyformat(sql), params
+
+
+def _driver_error() -> type[Exception]:
+    """psycopg's base error, imported only once a statement has failed."""
+    import psycopg
+
+    return psycopg.Error
+
+
+def _broken(conn: Any) -> bool:
+    # A lost connection fails every statement; that is not a per-statement result.
+    return bool(getattr(conn, "broken", False) or getattr(conn, "closed", False))
+
+
+def _deadline(timeout: float) -> float:
+    return asyncio.get_running_loop().time() + timeout
+
+
+async def _within(
+    conn: Any, deadline: float | None, timeout: float | None, step: Awaitable[T]
+) -> T:
+    """Await ``step`` until ``deadline``; past it, cancel the query on the server."""
+    if deadline is None or timeout is None:
+        return await step
+    remaining = deadline - asyncio.get_running_loop().time()
+    try:
+        return await asyncio.wait_for(step, max(remaining, 0))
+    except asyncio.TimeoutError:
+        try:
+            cancel = getattr(conn, "cancel_safe", None)
+            if cancel is not None:
+                await cancel()  # psycopg >= 3.2
+            else:
+                await asyncio.to_thread(conn.cancel)
+        except Exception:
+            pass  # statement_timeout still stops it server-side
+        raise QueryTimeout(timeout) from None
+
+
+async def _rows(cur: Any, limit: int | None) -> ResultSet:
+    if cur.description is None:
+        return ResultSet(())
+    rows = await (cur.fetchall() if limit is None else cur.fetchmany(limit))
+    return ResultSet(_column_names(cur), rows)
+
+
+def _column_names(cur: Any) -> list[str]:
+    return [d.name for d in cur.description or ()]
@@ -8,23 +8,82 @@ purely from a connection URL. This is the "사용성" win: adding a new warehous
 The engine is created lazily on first use so constructing the explorer (and
 routing to it in the factory) never imports a driver that isn't installed.
 Blocking DB calls run in a worker thread to keep the async event loop free.
+Every worker takes an open connection, so :class:`AsyncSqlAlchemyExplorer`
+runs the same code through ``AsyncConnection.run_sync`` instead of a thread.
+
+Introspection results live in a :class:`SchemaCatalog`, so the connection pool
+is kept across calls and only a cold/expired/invalidated catalog goes back to
+the inspector. Dialects with a cheap schema-change marker (SQLite's
+``PRAGMA schema_version``) are probed on each read to catch DDL early.
+
+:meth:`describe_all` loads every table and column in one catalog query for
+the dialects in :mod:`.introspection` and fills the whole catalog at once;
+other dialects fall back to the inspector's multi-table reflection.
+
+:meth:`execute_stream` reads results through a server-side cursor
+(``stream_results=True``) one batch at a time, holding its connection only
+until the consumer finishes or stops early.
+
+A ``timeout`` on :meth:`execute`/:meth:`execute_stream` is enforced on both
+ends. Before the statement runs, the session gets the dialect's own limit
+(``statement_timeout``, ``MAX_EXECUTION_TIME``/``max_statement_time``,
+``STATEMENT_TIMEOUT_IN_SECONDS``), so the server aborts it even if this
+process is gone. When the asyncio deadline passes first, the driver
+connection is interrupted: ``interrupt()`` on SQLite and DuckDB, ``cancel()``
+on psycopg. A worker thread is never left running an abandoned query.
 """
 
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import inspect
+import math
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence, TypeVar
 
-from ...core.ports.explorer import Column, Table
+from ...core.ports.explorer import DEFAULT_STREAM_BATCH, Column, QueryTimeout, Table
+from ...core.singleflight import SingleFlight
+from ...core.result import ResultSet
+from .catalog import DEFAULT_CATALOG_TTL_SECONDS, SchemaCatalog
+from .introspection import bulk_query, schema_matches, tables_from_rows
+
+T = TypeVar("T")
+
+# Session settings that make the server abort a statement on its own, as
+# (set, reset); {ms}/{s} are the time left in milliseconds / whole seconds.
+# Postgres uses SET LOCAL, undone by the rollback when the connection returns.
+_SERVER_TIMEOUT_SQL: dict[str, tuple[str, str | None]] = {
+    "postgresql": ("SET LOCAL statement_timeout = {ms}", None),
+    "mysql": ("SET SESSION MAX_EXECUTION_TIME = {ms}", "SET SESSION MAX_EXECUTION_TIME = DEFAULT"),
+    "mariadb": ("SET SESSION max_statement_time = {s}", "SET SESSION max_statement_time = DEFAULT"),
+    "snowflake": (
+        "ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = {s}",
+        "ALTER SESSION UNSET STATEMENT_TIMEOUT_IN_SECONDS",
+    ),
+}
+
+# After interrupting, how long to wait for the statement to hand back its
+# connection before giving up on it.
+CANCEL_GRACE_SECONDS = 5.0
 
 
 class SqlAlchemyExplorer:
     """ExplorerPort over a SQLAlchemy Engine, built from a connection URL."""
 
-    def __init__(self, url: str, *, schema: str | None = None) -> None:
+    def __init__(
+        self,
+        url: str,
+        *,
+        schema: str | None = None,
+        catalog_ttl: float = DEFAULT_CATALOG_TTL_SECONDS,
+    ) -> None:
         self.url = url
         self._schema = schema
         self._engine: Any = None  # created lazily
+        self._catalog = SchemaCatalog(catalog_ttl)
+        # Concurrent reads of a cold catalog share one inspector call.
+        self._flights: SingleFlight[Any] = SingleFlight()
 
     def _get_engine(self) -> Any:
         if self._engine is None:
@@ -33,44 +92,196 @@ class SqlAlchemyExplorer:
             self._engine = create_engine(self.url)
         return self._engine
 
+    @property
+    def dialect(self) -> str:
+        """Backend name from the URL (``postgresql``, ``duckdb`` …), without connecting."""
+        from sqlalchemy.engine import make_url
+
+        return make_url(self.url).get_backend_name()
+
+    # --- catalog ---------------------------------------------------------
+
+    @property
+    def catalog_version(self) -> int:
+        """Bumps whenever the cached catalog is reloaded or invalidated."""
+        return self._catalog.version
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog (call after /setup or /enrich)."""
+        self._catalog.invalidate()
+
     # --- ExplorerPort ----------------------------------------------------
 
     async def list_tables(self) -> list[Table]:
-        return await asyncio.to_thread(self._list_tables_sync)
+        await self._check_staleness()
+        cached = self._catalog.tables()
+        if cached is not None:
+            return cached
+        tables = await self._flights.do(("list_tables",), lambda: self._run(self._list_tables_sync))
+        return list(tables)
 
     async def describe_table(self, name: str) -> Table:
-        return await asyncio.to_thread(self._describe_table_sync, name)
+        await self._check_staleness()
+        cached = self._catalog.table(name)
+        if cached is not None:
+            return cached
+        return await self._flights.do(
+            ("describe_table", name), lambda: self._run(self._describe_table_sync, name)
+        )
 
-    async def sample_rows(self, name: str, limit: int = 5) -> list[dict]:
+    async def describe_all(
+        self,
+        *,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+    ) -> list[Table]:
+        """Every table with columns, comments and foreign keys in one query.
+
+        ``include``/``exclude`` are schema globs; without ``include`` only
+        the explorer's own schema is read. Unfiltered results fill the
+        catalog, so later ``describe_table`` calls are memory hits.
+        """
+        filtered = bool(include or exclude)
+        if not filtered:
+            await self._check_staleness()
+            cached = self._catalog.described()
+            if cached is not None:
+                return cached
+            tables = await self._flights.do(
+                ("describe_all",), lambda: self._run(self._describe_all_sync, (), ())
+            )
+            return list(tables)
+        return await self._run(self._describe_all_sync, tuple(include), tuple(exclude))
+
+    async def sample_rows(self, name: str, limit: int = 5) -> ResultSet:
         # Bind the limit; quote the identifier via the dialect's preparer.
         eng = self._get_engine()
         qname = eng.dialect.identifier_preparer.quote(name)
         return await self.execute(f"SELECT * FROM {qname}", limit=limit)
 
-    async def execute(self, sql: str, limit: int = 1000) -> list[dict]:
-        return await asyncio.to_thread(self._execute_sync, sql, int(limit))
+    async def execute(
+        self, sql: str, limit: int = 1000, *, timeout: float | None = None
+    ) -> ResultSet:
+        if timeout is None:
+            return await self._run(self._execute_sync, sql, int(limit))
+        guard = _StatementGuard(timeout)
+        return await self._bounded(guard, self._run(guard.wrap(self._execute_sync), sql, int(limit)))
+
+    async def execute_stream(
+        self,
+        sql: str,
+        limit: int = 1000,
+        *,
+        batch_size: int = DEFAULT_STREAM_BATCH,
+        timeout: float | None = None,
+    ) -> AsyncIterator[ResultSet]:
+        """Up to ``limit`` rows in batches, fetched lazily from a server-side cursor."""
+        guard = _StatementGuard(timeout) if timeout is not None else None
+        cursor = await self._bounded(
+            guard,
+            asyncio.to_thread(_StreamCursor.open, self._get_engine(), sql, batch_size, guard),
+            discard=_StreamCursor.close,
+        )
+        try:
+            remaining = int(limit)
+            while remaining > 0:
+                batch = await self._bounded(
+                    guard, asyncio.to_thread(cursor.fetch, min(batch_size, remaining))
+                )
+                if not batch:
+                    break
+                remaining -= len(batch)
+                yield batch
+        finally:
+            await asyncio.to_thread(cursor.close)
 
-    # --- sync workers ----------------------------------------------------
+    async def _bounded(
+        self,
+        guard: "_StatementGuard | None",
+        step: Awaitable[T],
+        *,
+        discard: Callable[[Any], None] | None = None,
+    ) -> T:
+        """Await ``step`` within ``guard``'s deadline, interrupting the statement past it.
 
-    def _list_tables_sync(self) -> list[Table]:
+        ``discard`` cleans up a result that only arrives after the deadline.
+        """
+        if guard is None:
+            return await step
+        task = asyncio.ensure_future(step)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(guard.remaining(), 0))
+        except asyncio.TimeoutError:
+            await guard.stop(task, discard)
+            raise QueryTimeout(guard.seconds) from None
+        except asyncio.CancelledError:
+            await guard.stop(task, discard)
+            raise
+
+    async def close(self) -> None:
+        """Dispose of the pool; the next call opens a fresh one."""
+        if self._engine is not None:
+            engine, self._engine = self._engine, None
+            await asyncio.to_thread(engine.dispose)
+
+    def pool_stats(self) -> dict[str, int]:
+        """Counters of the engine's connection pool (empty before first use)."""
+        if self._engine is None:
+            return {}
+        pool = self._engine.pool
+        stats = {}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            counter = getattr(pool, name, None)
+            if counter is not None:
+                stats[name] = int(counter())
+        return stats
+
+    async def _check_staleness(self) -> None:
+        """Cheap per-dialect probe; drops the catalog if the schema moved."""
+        if self._catalog.is_stale():
+            return  # nothing cached yet — the load itself records a token
+        if self._get_engine().dialect.name != "sqlite":
+            return  # TTL + explicit invalidation only
+        self._catalog.check_token(await self._run(self._schema_token_sync))
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call a sync worker with a pooled connection, off the event loop."""
+        return await asyncio.to_thread(self._run_sync, fn, *args)
+
+    def _run_sync(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._get_engine().connect() as conn:
+            return fn(conn, *args)
+
+    # --- sync workers (each gets an open Connection) ---------------------
+
+    def _schema_token_sync(self, conn: Any) -> Any:
+        """Dialect marker that changes on DDL, or ``None`` when unsupported."""
+        if conn.dialect.name != "sqlite":
+            return None
+        from sqlalchemy import text
+
+        return conn.execute(text("PRAGMA schema_version")).scalar()
+
+    def _list_tables_sync(self, conn: Any) -> list[Table]:
         from sqlalchemy import inspect
 
-        engine = self._get_engine()
-        engine.dispose()  # flush stale pool connections so schema changes are visible
-        insp = inspect(engine)
+        token = self._schema_token_sync(conn)
+        insp = inspect(conn)
         default = insp.default_schema_name
         effective = self._schema or default
         # Omit schema when it's the connection default so SQL stays unqualified.
         display_schema = "" if (not self._schema or self._schema == default) else effective
-        return [
+        tables = [
             Table(name=t, schema=display_schema)
             for t in insp.get_table_names(schema=self._schema)
         ]
+        self._catalog.store_tables(tables, token=token)
+        return list(tables)
 
-    def _describe_table_sync(self, name: str) -> Table:
+    def _describe_table_sync(self, conn: Any, name: str) -> Table:
         from sqlalchemy import inspect
 
-        insp = inspect(self._get_engine())
+        insp = inspect(conn)
         cols = [
             Column(
                 name=c["name"],
@@ -80,14 +291,251 @@ class SqlAlchemyExplorer:
             )
             for c in insp.get_columns(name, schema=self._schema)
         ]
-        return Table(name=name, schema=self._schema or "", columns=cols)
+        table = Table(name=name, schema=self._schema or "", columns=cols)
+        token = self._schema_token_sync(conn) if self._catalog.is_stale() else self._catalog.token
+        self._catalog.store_table(table, token=token)
+        return table
+
+    def _describe_all_sync(
+        self, conn: Any, include: tuple[str, ...], exclude: tuple[str, ...]
+    ) -> list[Table]:
+        from sqlalchemy import inspect, text
+
+        dialect = conn.dialect.name
+        token = self._schema_token_sync(conn)
+        insp = inspect(conn)
+        default = insp.default_schema_name
+        own = self._schema or default
+        filtered = bool(include or exclude)
 
-    def _execute_sync(self, sql: str, limit: int) -> list[dict]:
+        def display(schema: str) -> str:
+            # As in list_tables, the connection's default schema stays unqualified.
+            if filtered:
+                return "" if schema == default else schema
+            return "" if (not self._schema or self._schema == default) else self._schema
+
+        schemas: list[str] = [own] if own else []
+        if dialect == "bigquery":
+            if include or not schemas:
+                schemas = [
+                    s for s in insp.get_schema_names() if schema_matches(s, include, exclude)
+                ]
+            else:
+                schemas = [s for s in schemas if schema_matches(s, (), exclude)]
+        # Dialects that fold names (Snowflake) report the default schema as
+        # "public" while information_schema stores "PUBLIC"; bind the stored form.
+        folds = bool(getattr(conn.dialect, "requires_name_normalize", False))
+        bound = [conn.dialect.denormalize_name(s) for s in schemas] if folds else schemas
+        query = bulk_query(dialect, bound, include, exclude)
+
+        if query is None:
+            tables = self._reflect_all_sync(insp, schemas, include, exclude, display)
+        else:
+            sql, params = query
+            rows = conn.execute(text(sql), params).mappings().all()
+            if dialect == "sqlite" and filtered:
+                rows = [r for r in rows if schema_matches(r["table_schema"], include, exclude)]
+            if folds:
+                # Match the inspector's case folding (ORDERS → orders).
+                normalize = conn.dialect.normalize_name
+                rows = [
+                    {
+                        **r,
+                        "table_schema": normalize(r["table_schema"]),
+                        "table_name": normalize(r["table_name"]),
+                        "column_name": normalize(r["column_name"]),
+                    }
+                    for r in rows
+                ]
+            tables = tables_from_rows(rows, display_schema=display)
+
+        if not filtered:
+            self._catalog.store_tables(
+                [Table(name=t.name, schema=t.schema) for t in tables], token=token
+            )
+            for t in tables:
+                self._catalog.store_table(t, token=token)
+        return tables
+
+    def _reflect_all_sync(
+        self,
+        insp: Any,
+        schemas: list[str],
+        include: tuple[str, ...],
+        exclude: tuple[str, ...],
+        display: Any,
+    ) -> list[Table]:
+        """Inspector fallback: one multi-table reflection call per schema."""
+        if include:
+            schemas = [s for s in insp.get_schema_names() if schema_matches(s, include, exclude)]
+        elif exclude:
+            schemas = [s for s in schemas if schema_matches(s, (), exclude)]
+        tables: list[Table] = []
+        candidates: list[str | None] = list(schemas) or [None]
+        for schema in candidates:
+            bind_schema = None if schema == insp.default_schema_name else schema
+            columns = insp.get_multi_columns(schema=bind_schema)
+            fks = insp.get_multi_foreign_keys(schema=bind_schema)
+            for (_, name), cols in sorted(columns.items(), key=lambda kv: kv[0][1]):
+                refs: dict[str, str] = {}
+                for fk in fks.get((bind_schema, name), []):
+                    for src, dst in zip(fk["constrained_columns"], fk["referred_columns"]):
+                        refs.setdefault(src, f"{fk['referred_table']}.{dst}")
+                tables.append(
+                    Table(
+                        name=name,
+                        schema=display(schema or ""),
+                        columns=[
+                            Column(
+                                name=c["name"],
+                                type=str(c["type"]),
+                                nullable=bool(c.get("nullable", True)),
+                                description=c.get("comment") or "",
+                                foreign_key=refs.get(c["name"], ""),
+                            )
+                            for c in cols
+                        ],
+                    )
+                )
+        return tables
+
+    def _execute_sync(self, conn: Any, sql: str, limit: int) -> ResultSet:
         from sqlalchemy import text
 
-        with self._get_engine().connect() as conn:
-            result = conn.execute(text(sql))
-            if not result.returns_rows:
-                return []
-            rows = result.mappings().fetchmany(limit)
-            return [dict(r) for r in rows]
+        result = conn.execute(text(sql))
+        if not result.returns_rows:
+            return ResultSet(())
+        return ResultSet(list(result.keys()), result.fetchmany(limit))
+
+
+class _StatementGuard:
+    """One query's deadline: the server-side limit plus a driver interrupt.
+
+    :meth:`begin`/:meth:`end` run next to the statement (worker thread or
+    ``run_sync``); :meth:`stop` runs on the event loop once time is up.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._at = time.monotonic() + seconds
+        self._lock = threading.Lock()
+        self._driver: Any = None
+        self._reset: str | None = None
+        self._stopped = False
+
+    def remaining(self) -> float:
+        return self._at - time.monotonic()
+
+    def wrap(self, fn: Callable[..., T]) -> Callable[..., T]:
+        """``fn(conn, *args)`` with :meth:`begin`/:meth:`end` around it."""
+
+        def guarded(conn: Any, *args: Any) -> T:
+            self.begin(conn)
+            try:
+                return fn(conn, *args)
+            finally:
+                self.end(conn)
+
+        return guarded
+
+    def begin(self, conn: Any) -> None:
+        with self._lock:
+            if self._stopped:
+                raise QueryTimeout(self.seconds)
+            self._driver = conn.connection.driver_connection
+        dialect = conn.dialect
+        key = "mariadb" if getattr(dialect, "is_mariadb", False) else dialect.name
+        statements = _SERVER_TIMEOUT_SQL.get(key)
+        if statements is not None:
+            set_sql, self._reset = statements
+            left = max(self.remaining(), 0.001)
+            conn.exec_driver_sql(set_sql.format(ms=max(1, int(left * 1000)), s=math.ceil(left)))
+
+    def end(self, conn: Any) -> None:
+        with self._lock:
+            self._driver = None
+        if self._reset is not None:
+            try:
+                conn.exec_driver_sql(self._reset)
+            except Exception:
+                conn.invalidate()  # never pool a connection that kept the limit
+
+    async def stop(self, task: "asyncio.Future[Any]", discard: Callable[[Any], None] | None) -> None:
+        """Interrupt the running statement and wait (briefly) for it to unwind."""
+        with self._lock:
+            self._stopped = True
+            driver = self._driver
+        if driver is not None:
+            await _interrupt(driver)
+        done, _ = await asyncio.wait({task}, timeout=CANCEL_GRACE_SECONDS)
+        if not done:
+            task.cancel()  # native-async drivers cancel on the server themselves
+
+        def settle(t: "asyncio.Future[Any]") -> None:
+            if t.cancelled() or t.exception() is not None:
+                return
+            if discard is not None:
+                discard(t.result())
+
+        if task.done():
+            settle(task)
+        else:
+            task.add_done_callback(settle)
+
+
+async def _interrupt(driver: Any) -> None:
+    """Abort whatever ``driver`` (a DB-API/driver connection) is executing."""
+    for name in ("cancel_safe", "interrupt", "cancel"):
+        fn = getattr(driver, name, None)
+        if callable(fn):
+            break
+    else:
+        return  # no client-side cancel; the server-side limit still applies
+    try:
+        if inspect.iscoroutinefunction(fn):
+            await fn()
+        else:
+            await asyncio.to_thread(fn)
+    except Exception:
+        pass
+
+
+class _StreamCursor:
+    """An open connection + streaming result, advanced from worker threads."""
+
+    def __init__(self, conn: Any, result: Any, guard: _StatementGuard | None = None) -> None:
+        self._conn = conn
+        self._result = result
+        self._guard = guard
+
+    @classmethod
+    def open(
+        cls, engine: Any, sql: str, batch_size: int, guard: _StatementGuard | None = None
+    ) -> "_StreamCursor":
+        from sqlalchemy import text
+
+        conn = engine.connect().execution_options(
+            stream_results=True, max_row_buffer=batch_size
+        )
+        try:
+            if guard is not None:
+                guard.begin(conn)
+            return cls(conn, conn.execute(text(sql)), guard)
+        except BaseException:
+            if guard is not None:
+                guard.end(conn)
+            conn.close()
+            raise
+
+    def fetch(self, n: int) -> ResultSet:
+        if not self._result.returns_rows:
+            return ResultSet(())
+        return ResultSet(list(self._result.keys()), self._result.fetchmany(n))
+
+    def close(self) -> None:
+        try:
+            self._result.close()
+            if self._guard is not None:
+                self._guard.end(self._conn)
+        finally:
+            self._conn.close()
@@ -0,0 +1,95 @@
+"""StubExplorer — canned two-table catalog for offline runs and tests.
+
+Used when no database is configured (no ``LANG2SQL_DB_URL``, no D1): it
+connects to nothing, and the read methods return small canned schema data so
+the agent loop and schema-aware tools can be exercised end-to-end.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from ...core.ports.explorer import Column, Table
+from ...core.result import ResultSet
+from .introspection import schema_matches
+
+# Canned catalog — two tables a demo guild would plausibly have.
+_TABLES: dict[str, Table] = {
+    "public.orders": Table(
+        name="orders",
+        schema="public",
+        description="One row per customer order.",
+        columns=[
+            Column("id", "integer", nullable=False, description="Primary key."),
+            Column("amount", "numeric", nullable=False, description="Order total."),
+            Column("status", "text", description="pending | paid | shipped | cancelled."),
+            Column("created_at", "timestamptz", nullable=False),
+        ],
+    ),
+    "public.users": Table(
+        name="users",
+        schema="public",
+        description="Registered users.",
+        columns=[
+            Column("id", "integer", nullable=False, description="Primary key."),
+            Column("email", "text", nullable=False),
+            Column("created_at", "timestamptz", nullable=False),
+        ],
+    ),
+}
+
+_SAMPLES: dict[str, list[dict]] = {
+    "public.orders": [
+        {"id": 1, "amount": 49.90, "status": "paid", "created_at": "2026-05-01T10:00:00Z"},
+        {"id": 2, "amount": 12.00, "status": "pending", "created_at": "2026-05-02T14:30:00Z"},
+    ],
+    "public.users": [
+        {"id": 1, "email": "alice@example.com", "created_at": "2026-04-20T08:00:00Z"},
+        {"id": 2, "email": "bob@example.com", "created_at": "2026-04-21T09:15:00Z"},
+    ],
+}
+
+
+def _resolve_key(name: str) -> str:
+    """Map a bare or qualified table name onto a canned-catalog key."""
+    if name in _TABLES:
+        return name
+    return f"public.{name}"
+
+
+class StubExplorer:
+    """Read-only schema introspection over canned data."""
+
+    async def list_tables(self) -> list[Table]:
+        return list(_TABLES.values())
+
+    async def describe_table(self, name: str) -> Table:
+        key = _resolve_key(name)
+        table = _TABLES.get(key)
+        if table is None:
+            raise KeyError(f"unknown table: {name}")
+        return table
+
+    async def describe_all(
+        self,
+        *,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+    ) -> list[Table]:
+        if not schema_matches("public", include, exclude):
+            return []
+        return list(_TABLES.values())
+
+    async def sample_rows(self, name: str, limit: int = 5) -> ResultSet:
+        key = _resolve_key(name)
+        return ResultSet.from_dicts(_SAMPLES.get(key, [])[:limit])
+
+    async def execute(self, sql: str, limit: int = 1000) -> ResultSet:
+        # No real query engine. Echo canned rows that match whichever
+        # known table the SQL mentions, else a generic single-row result.
+        lowered = sql.lower()
+        for key, rows in _SAMPLES.items():
+            table = key.split(".", 1)[-1]
+            if table in lowered:
+                return ResultSet.from_dicts(rows[:limit])
+        return ResultSet(["result"], [(1,)][:limit])
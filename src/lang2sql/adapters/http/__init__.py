@@ -0,0 +1,7 @@
+"""HTTP transport shared by network-backed adapters (OpenAI, Cloudflare D1)."""
+
+from __future__ import annotations
+
+from .client import HttpClient, HttpError, HttpResponse, shared_client
+
+__all__ = ["HttpClient", "HttpError", "HttpResponse", "shared_client"]
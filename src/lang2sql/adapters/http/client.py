@@ -0,0 +1,185 @@
+"""HttpClient — one pooled, keep-alive async HTTP transport for the adapters.
+
+The OpenAI and D1 adapters used to open a fresh ``urllib`` connection (DNS +
+TCP + TLS handshake) per request inside ``asyncio.to_thread``. Under load that
+ties up the default thread pool and adds a handshake to every LLM turn and
+every D1 query. This client keeps an :mod:`aiohttp` session whose connector
+reuses connections across requests, caps concurrent connections overall and
+per host, and applies connect/total timeouts.
+
+aiohttp sessions are bound to the event loop they were created on, so the
+client lazily opens one session per running loop (the bot has one; the CLI and
+tests call ``asyncio.run`` repeatedly). :func:`shared_client` is the
+process-wide default the adapters use when none is injected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Callable, Mapping
+
+import aiohttp
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+
+
+class HttpError(RuntimeError):
+    """A request that failed in transport (``status`` None) or with an HTTP error."""
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status: int | None = None,
+        headers: Mapping[str, str] | None = None,
+        body: str = "",
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = dict(headers or {})
+        self.body = body
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", "replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class HttpClient:
+    """Connection-pooling HTTP client shared by the network-backed adapters."""
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 16,
+        keepalive_timeout: float = 30.0,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        json_body: Any = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> HttpResponse:
+        """Send one request and read the whole body (any status is returned)."""
+        session = self._session()
+        try:
+            async with session.request(
+                method,
+                url,
+                json=json_body,
+                headers=headers,
+                timeout=self._timeout(timeout),
+            ) as resp:
+                body = await resp.read()
+                return HttpResponse(resp.status, body, dict(resp.headers))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise HttpError(f"{method} {url} failed: {exc!r}") from exc
+
+    async def stream_lines(
+        self,
+        method: str,
+        url: str,
+        *,
+        json_body: Any = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+        on_headers: Callable[[dict[str, str]], None] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Send one request and yield the response body line by line.
+
+        Non-2xx responses raise :class:`HttpError` carrying status and body.
+        A successful response's headers go to ``on_headers`` before the first
+        line. ``timeout`` bounds the whole stream, not each line.
+        """
+        session = self._session()
+        try:
+            async with session.request(
+                method,
+                url,
+                json=json_body,
+                headers=headers,
+                timeout=self._timeout(timeout),
+            ) as resp:
+                if resp.status >= 400:
+                    body = (await resp.read()).decode("utf-8", "replace")
+                    raise HttpError(
+                        f"HTTP {resp.status}", status=resp.status, headers=resp.headers, body=body
+                    )
+                if on_headers is not None:
+                    on_headers(dict(resp.headers))
+                async for raw in resp.content:
+                    yield raw.decode("utf-8", "replace")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise HttpError(f"{method} {url} failed: {exc!r}") from exc
+
+    async def close(self) -> None:
+        """Close the session bound to the running loop (idle connections drop)."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            self._forget_closed_loops()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+
+    def _forget_closed_loops(self) -> None:
+        # A session whose loop has finished can no longer be closed cleanly;
+        # detaching just drops it (the OS reclaims its sockets).
+        for loop in [lp for lp in self._sessions if lp.is_closed()]:
+            self._sessions.pop(loop).detach()
+
+    def _timeout(self, total: float | None) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(
+            total=self.timeout if total is None else total,
+            sock_connect=self.connect_timeout,
+        )
+
+
+_shared: HttpClient | None = None
+
+
+def shared_client() -> HttpClient:
+    """The process-wide client, so every adapter draws from one pool."""
+    global _shared
+    if _shared is None:
+        _shared = HttpClient()
+    return _shared
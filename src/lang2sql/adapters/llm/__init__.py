@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
+from .cache import CachingLLM
 from .fake import FakeLLM
 from .openai_ import OpenAILLM
 
-__all__ = ["FakeLLM", "OpenAILLM"]
+__all__ = ["CachingLLM", "FakeLLM", "OpenAILLM"]
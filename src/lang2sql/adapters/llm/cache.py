@@ -0,0 +1,136 @@
+"""CachingLLM — an :class:`LLMPort` wrapper that replays identical requests.
+
+``/enrich`` on an unchanged schema, ``/org_setup`` re-runs and re-ingesting the
+same document send byte-identical prompts; each used to pay full LLM latency
+and cost. This wrapper hashes the canonical request — model, messages and tool
+specs, serialised with sorted keys — and serves repeats from the ``llm_cache``
+table of :class:`SqliteStore`, which survives restarts.
+
+Caching is opt-in per call site: the concierge hands the wrapped LLM to the
+batch-style tools and the document extractor (``HarnessContext.cached_llm``),
+while the interactive agent loop keeps calling the raw LLM — a conversational
+turn should never be answered from a stale transcript hash.
+
+A cached answer is only as good as the first one, so callers :meth:`forget`
+a completion they could not use (the next identical request asks the model
+again), and a ``--fresh`` run forgets the entry before asking. Completions cut
+off at the token limit (``finish_reason == "length"``) are never stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Sequence
+
+from ...core.ports.llm import LLMPort
+from ...core.types import Completion, Message, ToolCall, ToolSpec
+
+if TYPE_CHECKING:
+    from ..storage.sqlite_store import SqliteStore
+
+DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 3600.0
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump when the key derivation or stored shape changes to orphan old rows.
+_KEY_VERSION = 1
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachingLLM:
+    """Read-through completion cache in front of another :class:`LLMPort`."""
+
+    def __init__(
+        self,
+        inner: LLMPort,
+        store: SqliteStore,
+        *,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.inner = inner
+        self._store = store
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self.stats = CacheStats()
+
+    @property
+    def model(self) -> str:
+        return getattr(self.inner, "model", type(self.inner).__name__)
+
+    async def complete(
+        self,
+        messages: Sequence[Message],
+        tools: Sequence[ToolSpec] = (),
+    ) -> Completion:
+        key = request_key(self.model, messages, tools)
+        cached = self._store.llm_cache_get(key, self._ttl)
+        if cached is not None:
+            self.stats.hits += 1
+            return _decode(cached)
+
+        self.stats.misses += 1
+        completion = await self.inner.complete(messages, tools)
+        if completion.finish_reason == "length":
+            return completion  # truncated; a retry may well finish
+        self.stats.evictions += self._store.llm_cache_put(
+            key,
+            _encode(completion),
+            max_entries=self._max_entries,
+            max_bytes=self._max_bytes,
+        )
+        return completion
+
+    def forget(self, messages: Sequence[Message], tools: Sequence[ToolSpec] = ()) -> None:
+        """Drop the cached completion for this request, if any."""
+        self._store.llm_cache_delete(request_key(self.model, messages, tools))
+
+
+def request_key(model: str, messages: Sequence[Message], tools: Sequence[ToolSpec]) -> str:
+    """SHA-256 over the canonical JSON of one completion request."""
+    canonical = json.dumps(
+        {
+            "v": _KEY_VERSION,
+            "model": model,
+            "messages": [_canonical_message(m) for m in messages],
+            "tools": [asdict(t) for t in tools],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _canonical_message(m: Message) -> dict[str, Any]:
+    out = asdict(m)
+    out["role"] = m.role.value
+    return out
+
+
+def _encode(completion: Completion) -> str:
+    return json.dumps(asdict(completion), ensure_ascii=False)
+
+
+def _decode(raw: str) -> Completion:
+    data = json.loads(raw)
+    return Completion(
+        content=data.get("content", ""),
+        tool_calls=[ToolCall(**tc) for tc in data.get("tool_calls", [])],
+        finish_reason=data.get("finish_reason"),
+    )
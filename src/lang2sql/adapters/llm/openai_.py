@@ -1,25 +1,38 @@
 """OpenAILLM — the V1 :class:`LLMPort`, talking OpenAI chat/completions.
 
-stdlib only: HTTP via :mod:`urllib.request`, JSON via :mod:`json`. No openai
-SDK. The adapter's whole job is translation — core :class:`Message`/:class:`ToolSpec`
+No openai SDK: requests go through the pooled :class:`HttpClient` (keep-alive
+connections shared with the other network adapters), JSON via :mod:`json`.
+The adapter's whole job is translation — core :class:`Message`/:class:`ToolSpec`
 in, OpenAI wire dict out, OpenAI response back into a core :class:`Completion`.
 The loop never sees an OpenAI shape.
 
+Every request passes a :class:`RateLimiter` (RPM/TPM token buckets, synced
+from ``x-ratelimit-*`` headers) and 429/5xx/transport failures are retried
+with jittered exponential backoff honouring ``Retry-After``; time spent
+waiting is in :attr:`OpenAILLM.throttle_stats`. A stream is only retried
+before its first event arrives.
+
 Construction is offline-safe: a missing key only bites when :meth:`complete` is
 actually called, so importing/wiring this in a no-key environment is fine.
+
+:meth:`stream` is the :class:`StreamingLLMPort` side: the same request with
+``stream: true``, read as server-sent events. Text deltas are surfaced as they
+arrive (``<think>`` blocks held back); tool-call arguments arrive as JSON
+fragments per call ``index`` and are assembled into the final
+:class:`Completion`.
 """
 
 from __future__ import annotations
 
-import asyncio
 import json
 import os
 import re
-import urllib.error
-import urllib.request
-from typing import Any, Sequence
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Sequence
 
-from ...core.types import Completion, Message, Role, ToolCall, ToolSpec
+from ...core.types import Completion, CompletionDelta, Message, Role, ToolCall, ToolSpec
+from ..http import HttpClient, HttpError, shared_client
+from .ratelimit import RETRYABLE_STATUSES, RateLimiter, RetryPolicy, ThrottleStats, retry_after
 
 _DEFAULT_URL = "https://api.openai.com/v1/chat/completions"
 
@@ -34,6 +47,11 @@ class OpenAILLM:
         *,
         base_url: str = _DEFAULT_URL,
         timeout: float = 60.0,
+        http: HttpClient | None = None,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        retry: RetryPolicy | None = None,
+        limiter: RateLimiter | None = None,
     ) -> None:
         self.model = model
         # Resolve lazily-ish: read env now, but tolerate absence until complete().
@@ -41,55 +59,247 @@ class OpenAILLM:
         self._api_key = raw_key.strip() if raw_key else raw_key
         self._base_url = base_url
         self._timeout = timeout
+        self._http = http or shared_client()
+        # Limits default to env (OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT), else they
+        # are learned from the provider's x-ratelimit-limit-* headers.
+        self._limiter = limiter or RateLimiter(
+            rpm if rpm is not None else _env_number("OPENAI_RPM_LIMIT"),
+            tpm if tpm is not None else _env_number("OPENAI_TPM_LIMIT"),
+        )
+        self._retry = retry or RetryPolicy()
+
+    @property
+    def throttle_stats(self) -> ThrottleStats:
+        return self._limiter.stats
 
     async def complete(
         self,
         messages: Sequence[Message],
         tools: Sequence[ToolSpec] = (),
     ) -> Completion:
+        payload = self._payload(messages, tools)
+        return _decode_completion(await self._post(payload))
+
+    async def stream(
+        self,
+        messages: Sequence[Message],
+        tools: Sequence[ToolSpec] = (),
+    ) -> AsyncIterator[CompletionDelta]:
+        payload = self._payload(messages, tools)
+        payload["stream"] = True
+
+        assembler = _StreamAssembler()
+        async for event in self._post_stream(payload):
+            text = assembler.feed(event)
+            if text:
+                yield CompletionDelta(content=text)
+        yield CompletionDelta(content=assembler.flush(), completion=assembler.result())
+
+    def _payload(self, messages: Sequence[Message], tools: Sequence[ToolSpec]) -> dict[str, Any]:
         if not self._api_key:
             raise RuntimeError("OPENAI_API_KEY not set")
-
         payload: dict[str, Any] = {
             "model": self.model,
             "messages": [_encode_message(m) for m in messages],
         }
         if tools:
             payload["tools"] = [_encode_tool(t) for t in tools]
+        return payload
 
-        raw = await asyncio.to_thread(self._post, payload)
-        return _decode_completion(raw)
-
-    def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
-        body = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            self._base_url,
-            data=body,
-            method="POST",
-            headers={
-                "Authorization": f"Bearer {self._api_key}",
-                "Content-Type": "application/json",
-            },
-        )
-        try:
-            with urllib.request.urlopen(req, timeout=self._timeout) as resp:
-                text = resp.read().decode("utf-8")
-        except urllib.error.HTTPError as exc:
-            detail = exc.read().decode("utf-8", "replace") if exc.fp else ""
-            raise RuntimeError(f"OpenAI HTTP {exc.code}: {detail}") from exc
-        except urllib.error.URLError as exc:
-            raise RuntimeError(f"OpenAI request failed: {exc.reason}") from exc
+    def _headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+
+    async def _post_stream(self, payload: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        attempt = 0
+        while True:
+            await self._limiter.acquire(_estimate_tokens(payload))
+            lines = self._http.stream_lines(
+                "POST",
+                self._base_url,
+                json_body=payload,
+                headers=self._headers(),
+                timeout=self._timeout,
+                on_headers=self._limiter.observe,
+            )
+            started = False
+            try:
+                # aclosing releases the pooled connection as soon as [DONE] arrives.
+                async with aclosing(lines):
+                    async for line in lines:
+                        event = _parse_sse_line(line)
+                        if event is _SSE_DONE:
+                            return
+                        if event is not None:
+                            started = True
+                            yield event
+                return
+            except HttpError as exc:
+                # Once events were yielded the caller has shown them; no replay.
+                if started or not await self._backoff(attempt, exc.status, exc.headers):
+                    raise _openai_error(exc) from exc
+                attempt += 1
 
+    async def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
+        attempt = 0
+        while True:
+            await self._limiter.acquire(_estimate_tokens(payload))
+            try:
+                resp = await self._http.request(
+                    "POST",
+                    self._base_url,
+                    json_body=payload,
+                    headers=self._headers(),
+                    timeout=self._timeout,
+                )
+            except HttpError as exc:
+                if not await self._backoff(attempt, None, {}):
+                    raise _openai_error(exc) from exc
+                attempt += 1
+                continue
+            self._limiter.observe(resp.headers)
+            text = resp.text()
+            if resp.ok:
+                break
+            if not await self._backoff(attempt, resp.status, resp.headers):
+                raise RuntimeError(f"OpenAI HTTP {resp.status}: {text}")
+            attempt += 1
         try:
             return json.loads(text)
         except (ValueError, TypeError) as exc:
             raise RuntimeError(f"OpenAI returned non-JSON response: {text[:200]!r}") from exc
 
+    async def _backoff(self, attempt: int, status: int | None, headers: dict[str, str]) -> bool:
+        """Sleep before retry ``attempt`` if the failure is retryable; else False.
+
+        ``status`` None means the request never got a response (connect error,
+        timeout), which is retried like a 503.
+        """
+        if attempt >= self._retry.max_retries:
+            return False
+        if status is not None and status not in RETRYABLE_STATUSES:
+            return False
+        if headers:
+            self._limiter.observe(headers)
+        delay = self._retry.delay(attempt, retry_after(headers))
+        await self._limiter.backoff(delay, rate_limited=status == 429)
+        return True
+
+
+def _estimate_tokens(payload: dict[str, Any]) -> int:
+    # Rough prompt size for the TPM bucket (~4 chars per token); the
+    # x-ratelimit-remaining-tokens header corrects drift after each response.
+    return max(1, len(json.dumps(payload.get("messages", []), ensure_ascii=False)) // 4)
+
+
+def _env_number(name: str) -> float | None:
+    raw = os.environ.get(name)
+    try:
+        return float(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def _openai_error(exc: HttpError) -> RuntimeError:
+    if exc.status is not None:
+        return RuntimeError(f"OpenAI HTTP {exc.status}: {exc.body}")
+    return RuntimeError(f"OpenAI request failed: {exc}")
+
 
 def _strip_thinking(text: str) -> str:
     return re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL).strip()
 
 
+_THINK_OPEN = "<think>"
+
+
+def _visible_prefix(raw: str, *, final: bool) -> str:
+    """The part of a partial response that is safe to show right now.
+
+    Closed ``<think>`` blocks are removed, text after an unclosed one is held
+    back, and (mid-stream) so is a trailing fragment that could be the start of
+    ``<think>``.
+    """
+    text = re.sub(r"<think>.*?</think>", "", raw, flags=re.DOTALL)
+    cut = text.find(_THINK_OPEN)
+    if cut != -1:
+        return text[:cut]
+    if not final:
+        for n in range(len(_THINK_OPEN) - 1, 0, -1):
+            if text.endswith(_THINK_OPEN[:n]):
+                return text[:-n]
+    return text
+
+
+_SSE_DONE: dict[str, Any] = {}  # sentinel: the ``data: [DONE]`` terminator
+
+
+def _parse_sse_line(line: str) -> dict[str, Any] | None:
+    """One SSE body line → its JSON event, ``_SSE_DONE``, or None to skip."""
+    line = line.strip()
+    if not line.startswith("data:"):
+        return None  # blank separators, ``:`` keep-alive comments, event names
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return _SSE_DONE
+    try:
+        return json.loads(data)
+    except ValueError as exc:
+        raise RuntimeError(f"OpenAI stream sent non-JSON event: {data[:200]!r}") from exc
+
+
+class _StreamAssembler:
+    """Fold ``chat.completion.chunk`` events into text deltas + a Completion."""
+
+    def __init__(self) -> None:
+        self._raw = ""
+        self._emitted = 0
+        self._calls: dict[int, dict[str, str]] = {}
+        self._finish_reason: str | None = None
+
+    def feed(self, event: dict[str, Any]) -> str:
+        """Absorb one event; return newly visible text (may be empty)."""
+        choices = event.get("choices") or []
+        if not choices:
+            return ""  # e.g. a trailing usage-only chunk
+        choice = choices[0]
+        delta = choice.get("delta") or {}
+        if choice.get("finish_reason"):
+            self._finish_reason = choice["finish_reason"]
+        for tc in delta.get("tool_calls") or []:
+            slot = self._calls.setdefault(int(tc.get("index", 0)), {"id": "", "name": "", "arguments": ""})
+            if tc.get("id"):
+                slot["id"] = tc["id"]
+            fn = tc.get("function") or {}
+            slot["name"] += fn.get("name") or ""
+            slot["arguments"] += fn.get("arguments") or ""
+        if delta.get("content"):
+            self._raw += delta["content"]
+        return self._take(final=False)
+
+    def flush(self) -> str:
+        """Any visible text held back waiting for a possible ``<think>``."""
+        return self._take(final=True)
+
+    def result(self) -> Completion:
+        return Completion(
+            content=_strip_thinking(self._raw),
+            tool_calls=[
+                _decode_tool_call(c["id"], c["name"], c["arguments"])
+                for _, c in sorted(self._calls.items())
+            ],
+            finish_reason=self._finish_reason,
+        )
+
+    def _take(self, *, final: bool) -> str:
+        visible = _visible_prefix(self._raw, final=final)
+        text = visible[self._emitted:]
+        self._emitted = max(self._emitted, len(visible))
+        return text
+
+
 def _encode_message(m: Message) -> dict[str, Any]:
     """Core :class:`Message` → an OpenAI chat message dict."""
     out: dict[str, Any] = {"role": m.role.value}
@@ -141,14 +351,8 @@ def _decode_completion(raw: dict[str, Any]) -> Completion:
     tool_calls: list[ToolCall] = []
     for tc in msg.get("tool_calls") or []:
         fn = tc.get("function", {})
-        raw_args = fn.get("arguments", "") or "{}"
-        try:
-            args = json.loads(raw_args)
-        except (ValueError, TypeError):
-            # Model emitted malformed JSON args; surface raw so the tool can complain.
-            args = {"__raw__": raw_args}
         tool_calls.append(
-            ToolCall(id=tc.get("id", ""), name=fn.get("name", ""), arguments=args)
+            _decode_tool_call(tc.get("id", ""), fn.get("name", ""), fn.get("arguments", ""))
         )
 
     return Completion(
@@ -156,3 +360,13 @@ def _decode_completion(raw: dict[str, Any]) -> Completion:
         tool_calls=tool_calls,
         finish_reason=choice.get("finish_reason"),
     )
+
+
+def _decode_tool_call(call_id: str, name: str, raw_args: str | None) -> ToolCall:
+    raw_args = raw_args or "{}"
+    try:
+        args = json.loads(raw_args)
+    except (ValueError, TypeError):
+        # Model emitted malformed JSON args; surface raw so the tool can complain.
+        args = {"__raw__": raw_args}
+    return ToolCall(id=call_id, name=name, arguments=args)
@@ -0,0 +1,224 @@
+"""Client-side rate limiting and retry policy for HTTP LLM adapters.
+
+Providers enforce requests-per-minute and tokens-per-minute limits and answer
+429 once they are exceeded. When a whole guild onboards at once, a burst of
+``/org_setup`` calls used to hit those limits, and every 429 or 5xx failed a
+user turn outright. Three pieces fix that:
+
+* :class:`TokenBucket` — continuous-refill bucket; the request waits locally
+  instead of being rejected remotely. :class:`RateLimiter` pairs an RPM and a
+  TPM bucket and re-syncs them from the provider's ``x-ratelimit-*`` headers,
+  so several processes sharing a key still back off.
+* :class:`RetryPolicy` — exponential backoff with full jitter, overridden by
+  ``Retry-After`` when the provider sends one.
+* :class:`ThrottleStats` — how long requests spent waiting, for dashboards.
+
+``clock`` and ``sleep`` are injectable so tests run without real time passing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Mapping
+
+Clock = Callable[[], float]
+Sleep = Callable[[float], Awaitable[None]]
+
+# Statuses worth retrying: rate limited, or the provider is having a moment.
+RETRYABLE_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class ThrottleStats:
+    throttled_seconds: float = 0.0  # bucket waits + retry backoff
+    waits: int = 0  # requests that had to wait for the bucket
+    retries: int = 0
+    rate_limited: int = 0  # 429 responses received
+
+
+class TokenBucket:
+    """``rate_per_minute`` units refill continuously up to ``capacity``."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        *,
+        capacity: float | None = None,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._clock = clock
+        self._level = self.capacity
+        self._stamp = clock()
+        self._blocked_until = 0.0
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 when they are now)."""
+        self._refill()
+        now = self._clock()
+        wait = max(0.0, self._blocked_until - now)
+        # A request larger than the bucket can never fit; let it through at full.
+        need = min(amount, self.capacity) - self._level
+        if need > 0:
+            wait = max(wait, need / self.rate)
+        return wait
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._level -= min(amount, self.capacity)
+
+    def sync(self, remaining: float | None, reset_in: float | None) -> None:
+        """Align with the provider's view: never hold more than it says is left."""
+        self._refill()
+        if remaining is not None:
+            self._level = min(self._level, remaining)
+        if remaining is not None and remaining <= 0 and reset_in:
+            self._blocked_until = max(self._blocked_until, self._clock() + reset_in)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+
+class RateLimiter:
+    """RPM + TPM buckets shared by every request of one adapter instance."""
+
+    def __init__(
+        self,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        *,
+        clock: Clock = time.monotonic,
+        sleep: Sleep = asyncio.sleep,
+    ) -> None:
+        self._clock = clock
+        self._requests = TokenBucket(rpm, clock=clock) if rpm else None
+        self._tokens = TokenBucket(tpm, clock=clock) if tpm else None
+        self._sleep = sleep
+        self._lock = asyncio.Lock()
+        self.stats = ThrottleStats()
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until one request of ~``tokens`` fits both buckets; return the wait."""
+        waited = 0.0
+        # The lock keeps waiters in FIFO order instead of racing for refills.
+        async with self._lock:
+            while True:
+                delay = max(
+                    self._requests.delay_for(1) if self._requests else 0.0,
+                    self._tokens.delay_for(tokens) if self._tokens else 0.0,
+                )
+                if delay <= 0:
+                    break
+                waited += delay
+                await self._sleep(delay)
+            if self._requests:
+                self._requests.take(1)
+            if self._tokens:
+                self._tokens.take(tokens)
+        if waited:
+            self.stats.waits += 1
+            self.stats.throttled_seconds += waited
+        return waited
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Fold ``x-ratelimit-*`` response headers into the buckets.
+
+        Without configured limits, buckets are sized from the provider's own
+        ``x-ratelimit-limit-*`` the first time they appear.
+        """
+        h = {k.lower(): v for k, v in headers.items()}
+        if self._requests is None:
+            rpm = _number(h.get("x-ratelimit-limit-requests"))
+            if rpm:
+                self._requests = TokenBucket(rpm, clock=self._clock)
+        if self._tokens is None:
+            tpm = _number(h.get("x-ratelimit-limit-tokens"))
+            if tpm:
+                self._tokens = TokenBucket(tpm, clock=self._clock)
+        if self._requests:
+            self._requests.sync(
+                _number(h.get("x-ratelimit-remaining-requests")),
+                parse_duration(h.get("x-ratelimit-reset-requests")),
+            )
+        if self._tokens:
+            self._tokens.sync(
+                _number(h.get("x-ratelimit-remaining-tokens")),
+                parse_duration(h.get("x-ratelimit-reset-tokens")),
+            )
+
+    async def backoff(self, delay: float, *, rate_limited: bool) -> None:
+        self.stats.retries += 1
+        if rate_limited:
+            self.stats.rate_limited += 1
+        self.stats.throttled_seconds += delay
+        await self._sleep(delay)
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Backoff before retry number ``attempt`` (0-based).
+
+        ``Retry-After`` wins when present; otherwise full jitter over an
+        exponentially growing window, so a burst of clients spreads out.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        window = min(self.max_delay, self.base_delay * (2**attempt))
+        return random.uniform(0, window)
+
+
+def retry_after(headers: Mapping[str, str]) -> float | None:
+    """Seconds to wait per ``Retry-After`` / ``retry-after-ms``, if given."""
+    h = {k.lower(): v for k, v in headers.items()}
+    ms = _number(h.get("retry-after-ms"))
+    if ms is not None:
+        return ms / 1000.0
+    value = h.get("retry-after")
+    if not value:
+        return None
+    seconds = _number(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:  # HTTP-date form
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: str | None) -> float | None:
+    """OpenAI reset durations (``"1s"``, ``"6m0s"``, ``"20ms"``) → seconds."""
+    if not value:
+        return None
+    plain = _number(value)
+    if plain is not None:
+        return plain
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(n) * _UNIT_SECONDS[unit] for n, unit in parts)
+
+
+def _number(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -1,15 +1,26 @@
 """SqliteStore — the real V1 persistence backend (stdlib :mod:`sqlite3`).
 
-One store, three roles:
+One store, five roles:
 
 * :class:`AuditPort` — append-only ``audit`` table behind ``/audit me``.
 * :class:`SessionStorePort` — serialize/restore a :class:`Session` as JSON.
 * a generic key-value table the secrets adapter (tenancy) wraps.
+* the ``llm_cache`` table behind :class:`~lang2sql.adapters.llm.cache.CachingLLM`
+  — completions by request hash, with TTL and LRU eviction by count/bytes.
+* the ``result_cache`` table, the optional disk tier of
+  :class:`~lang2sql.harness.result_cache.ResultCache` — pickled query results
+  by key, with an absolute expiry and LRU eviction by bytes.
 
 sqlite is synchronous; V1 just runs the calls inline inside the async methods,
 which is fine for the expected load. The connection uses
 ``check_same_thread=False`` so it tolerates being touched from the event-loop
 thread pool.
+
+Every kv write bumps an in-process generation counter per ``(scope,
+namespace)`` — the namespace being the key's first ``:``-separated segment
+(``cterm``, ``enriched_desc``, ``schema_relationships`` …). Readers that derive
+expensive views from the kv table (the system prompt) compare generations
+instead of re-reading. Writes made by another process are not observed.
 """
 
 from __future__ import annotations
@@ -32,6 +43,7 @@ class SqliteStore:
         self.path = path
         self._conn = sqlite3.connect(path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._kv_generations: dict[tuple[str, str], int] = {}
         self._create_tables()
 
     def _create_tables(self) -> None:
@@ -55,6 +67,25 @@ class SqliteStore:
                 value TEXT NOT NULL,
                 PRIMARY KEY (scope, key)
             );
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key      TEXT PRIMARY KEY,
+                value    TEXT NOT NULL,
+                size     INTEGER NOT NULL,
+                created  REAL NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed);
+            CREATE TABLE IF NOT EXISTS result_cache (
+                key      TEXT PRIMARY KEY,
+                scope    TEXT NOT NULL,
+                value    BLOB NOT NULL,
+                size     INTEGER NOT NULL,
+                elapsed  REAL NOT NULL,
+                created  REAL NOT NULL,
+                expires  REAL NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS result_cache_accessed ON result_cache (accessed);
             """
         )
         self._conn.commit()
@@ -123,12 +154,22 @@ class SqliteStore:
             (scope, key, value),
         )
         self._conn.commit()
+        self._bump(scope, key)
 
     def kv_delete(self, scope: str, key: str) -> None:
         self._conn.execute(
             "DELETE FROM kv WHERE scope = ? AND key = ?", (scope, key)
         )
         self._conn.commit()
+        self._bump(scope, key)
+
+    def kv_generation(self, scope: str, namespace: str) -> int:
+        """Write counter for ``namespace`` keys under ``scope`` (0 if untouched)."""
+        return self._kv_generations.get((scope, namespace), 0)
+
+    def _bump(self, scope: str, key: str) -> None:
+        ns = (scope, key.split(":", 1)[0])
+        self._kv_generations[ns] = self._kv_generations.get(ns, 0) + 1
 
     @staticmethod
     def _escape_like(s: str) -> str:
@@ -141,6 +182,7 @@ class SqliteStore:
             (scope, self._escape_like(prefix) + "%"),
         )
         self._conn.commit()
+        self._bump(scope, prefix)
         return cur.rowcount
 
     def kv_list_prefix(self, scope: str, prefix: str) -> list[tuple[str, str]]:
@@ -152,6 +194,138 @@ class SqliteStore:
         return [(r["key"], r["value"]) for r in rows]
 
 
+    # -- LLM completion cache ------------------------------------------------
+
+    def llm_cache_get(self, key: str, ttl_seconds: float) -> str | None:
+        """Cached completion JSON for ``key``; expired rows are dropped on read."""
+        row = self._conn.execute(
+            "SELECT value, created FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if ttl_seconds >= 0 and now - row["created"] > ttl_seconds:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return row["value"]
+
+    def llm_cache_delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def llm_cache_put(self, key: str, value: str, *, max_entries: int, max_bytes: int) -> int:
+        """Store a completion, then evict least-recently-used rows over the caps.
+
+        Returns the number of rows evicted.
+        """
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO llm_cache (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+            "created = excluded.created, accessed = excluded.accessed",
+            (key, value, len(value.encode("utf-8")), now, now),
+        )
+        entries, total = self.llm_cache_usage()
+        evicted = 0
+        if entries > max_entries or total > max_bytes:
+            over_bytes = total - max_bytes
+            for row in self._conn.execute(
+                "SELECT key, size FROM llm_cache WHERE key != ? ORDER BY accessed", (key,)
+            ).fetchall():
+                if entries - evicted <= max_entries and over_bytes <= 0:
+                    break
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (row["key"],))
+                over_bytes -= row["size"]
+                evicted += 1
+        self._conn.commit()
+        return evicted
+
+    def llm_cache_usage(self) -> tuple[int, int]:
+        """``(entries, bytes)`` currently held in the completion cache."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) AS n, COALESCE(SUM(size), 0) AS b FROM llm_cache"
+        ).fetchone()
+        return row["n"], row["b"]
+
+    def llm_cache_clear(self) -> None:
+        self._conn.execute("DELETE FROM llm_cache")
+        self._conn.commit()
+
+    # -- query result cache --------------------------------------------------
+
+    def result_cache_get(
+        self, key: str, now: float
+    ) -> tuple[str, bytes, float, float, float] | None:
+        """``(scope, value, elapsed, expires, created)`` for a live ``key``.
+
+        Expired rows are dropped on read.
+        """
+        row = self._conn.execute(
+            "SELECT scope, value, elapsed, expires, created FROM result_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        if row["expires"] <= now:
+            self._conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE result_cache SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return row["scope"], bytes(row["value"]), row["elapsed"], row["expires"], row["created"]
+
+    def result_cache_put(
+        self,
+        key: str,
+        scope: str,
+        value: bytes,
+        *,
+        elapsed: float,
+        expires: float,
+        max_bytes: int,
+    ) -> int:
+        """Store a result, then evict least-recently-used rows over ``max_bytes``.
+
+        Returns the number of rows evicted.
+        """
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO result_cache (key, scope, value, size, elapsed, created, expires, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET scope = excluded.scope, value = excluded.value, "
+            "size = excluded.size, elapsed = excluded.elapsed, created = excluded.created, "
+            "expires = excluded.expires, accessed = excluded.accessed",
+            (key, scope, sqlite3.Binary(value), len(value), elapsed, now, expires, now),
+        )
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) AS b FROM result_cache"
+        ).fetchone()["b"]
+        evicted = 0
+        if total > max_bytes:
+            over_bytes = total - max_bytes
+            for row in self._conn.execute(
+                "SELECT key, size FROM result_cache WHERE key != ? ORDER BY accessed", (key,)
+            ).fetchall():
+                if over_bytes <= 0:
+                    break
+                self._conn.execute("DELETE FROM result_cache WHERE key = ?", (row["key"],))
+                over_bytes -= row["size"]
+                evicted += 1
+        self._conn.commit()
+        return evicted
+
+    def result_cache_clear(self, scope: str | None = None) -> None:
+        """Drop cached results of ``scope`` (every scope when ``None``)."""
+        if scope is None:
+            self._conn.execute("DELETE FROM result_cache")
+        else:
+            self._conn.execute("DELETE FROM result_cache WHERE scope = ?", (scope,))
+        self._conn.commit()
+
+
 # -- Session (de)serialization ------------------------------------------
 
 
@@ -166,6 +340,7 @@ def _serialize_session(session: Session) -> dict[str, Any]:
             "is_admin": ident.is_admin,
         },
         "transcript": [_serialize_message(m) for m in session.transcript],
+        "summary": session.summary,
     }
 
 
@@ -179,7 +354,7 @@ def _deserialize_session(data: dict[str, Any]) -> Session:
         is_admin=ident_data.get("is_admin", False),
     )
     transcript = [_deserialize_message(m) for m in data.get("transcript", [])]
-    return Session(identity=identity, transcript=transcript)
+    return Session(identity=identity, transcript=transcript, summary=data.get("summary", ""))
 
 
 def _serialize_message(m: Message) -> dict[str, Any]:
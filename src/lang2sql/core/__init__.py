@@ -1,8 +1,10 @@
 """Pure core — types, identity, and ports. No I/O, sits at the import root."""
 
 from .identity import Identity, Scope, ScopeLevel
+from .result import ResultSet
 from .types import (
     Completion,
+    CompletionDelta,
     Message,
     Role,
     ToolCall,
@@ -12,5 +14,6 @@ from .types import (
 
 __all__ = [
     "Identity", "Scope", "ScopeLevel",
-    "Completion", "Message", "Role", "ToolCall", "ToolResult", "ToolSpec",
+    "ResultSet",
+    "Completion", "CompletionDelta", "Message", "Role", "ToolCall", "ToolResult", "ToolSpec",
 ]
@@ -6,7 +6,7 @@ without the harness or tools changing.
 """
 
 from .audit import AuditEvent, AuditPort
-from .explorer import Column, ExplorerPort, Table
+from .explorer import Column, ExplorerPort, QueryTimeout, Table, describe_all, execute_stream
 from .frontend import FrontendPort, InboundMessage, OutboundMessage
 from .ingestion import (
     CandidateKind,
@@ -15,7 +15,7 @@ from .ingestion import (
     SemanticCandidate,
     SourcePort,
 )
-from .llm import LLMPort
+from .llm import LLMPort, StreamingLLMPort
 from .memory import ExtractorPort, Fact, RecallPort, StorePort
 from .safety import (
     SafetyContext,
@@ -31,10 +31,10 @@ from .tool import ToolPort
 
 __all__ = [
     "AuditEvent", "AuditPort",
-    "Column", "ExplorerPort", "Table",
+    "Column", "ExplorerPort", "QueryTimeout", "Table", "describe_all", "execute_stream",
     "FrontendPort", "InboundMessage", "OutboundMessage",
     "CandidateKind", "DocExtractorPort", "Document", "SemanticCandidate", "SourcePort",
-    "LLMPort",
+    "LLMPort", "StreamingLLMPort",
     "ExtractorPort", "Fact", "RecallPort", "StorePort",
     "SafetyContext", "SafetyDecision", "SafetyLayerPort", "SafetyPipelinePort", "Verdict",
     "SecretsPort",
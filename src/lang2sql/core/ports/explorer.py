@@ -3,12 +3,60 @@
 The agent uses this to discover tables/columns before writing SQL. V1 backs it
 with a PostgreSQL adapter; the contract is dialect-neutral so BigQuery et al.
 slot in later.
+
+Adapters may also offer ``describe_all(include=(), exclude=())`` — every table
+with columns in one catalog query, optionally filtered by schema glob
+patterns. It is not part of the Protocol so minimal explorers stay valid;
+callers go through :func:`describe_all`, which falls back to per-table
+``describe_table``.
+
+Likewise ``execute_stream(sql, limit, *, batch_size)`` — an async iterator of
+:class:`ResultSet` batches read from a server-side cursor, so a large result
+never sits in memory whole. Callers use :func:`execute_stream`, which chunks a
+plain ``execute`` for adapters without one.
+
+Both ``execute`` and ``execute_stream`` may take a keyword-only ``timeout``
+(seconds). An adapter that declares it enforces the deadline itself and must
+abort the statement on the server when it passes; for the rest,
+:func:`execute_stream` enforces it client-side. Either way the caller sees
+:class:`QueryTimeout`.
+
+Query results are :class:`ResultSet` objects (column names + tuple rows).
+Explorers that still return ``list[dict]`` keep working: :func:`as_result_set`
+wraps them at the call site.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import inspect
+from contextlib import aclosing
 from dataclasses import dataclass, field
-from typing import Protocol, runtime_checkable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Protocol,
+    Sequence,
+    TypeVar,
+    runtime_checkable,
+)
+
+from ..result import ResultSet, as_result_set
+
+DEFAULT_STREAM_BATCH = 500
+
+T = TypeVar("T")
+
+
+class QueryTimeout(TimeoutError):
+    """A query ran past its deadline and was cancelled."""
+
+    def __init__(self, seconds: float) -> None:
+        super().__init__(f"query exceeded {seconds:g}s and was cancelled")
+        self.seconds = seconds
 
 
 @dataclass
@@ -17,6 +65,7 @@ class Column:
     type: str
     nullable: bool = True
     description: str = ""  # may be auto-enriched (v1.5 metadata layer)
+    foreign_key: str = ""  # "table.column" this column references, if declared
 
 
 @dataclass
@@ -25,6 +74,7 @@ class Table:
     schema: str = "public"
     columns: list[Column] = field(default_factory=list)
     description: str = ""
+    row_estimate: int | None = None  # from planner statistics, where the catalog keeps them
 
     @property
     def qualified(self) -> str:
@@ -43,12 +93,130 @@ class ExplorerPort(Protocol):
         """Full column detail for one table."""
         ...
 
-    async def sample_rows(self, name: str, limit: int = 5) -> list[dict]:
+    async def sample_rows(self, name: str, limit: int = 5) -> ResultSet:
         """A few rows to give the model a feel for the data."""
         ...
 
-    async def execute(self, sql: str, limit: int = 1000) -> list[dict]:
+    async def execute(self, sql: str, limit: int = 1000) -> ResultSet:
         """Run a read-only query (already cleared by the safety pipeline) and
         return up to ``limit`` rows. The ``run_sql`` tool calls this only after
         a PASS verdict; the adapter must never see un-gated SQL."""
         ...
+
+
+def explorer_dialect(explorer: Any) -> str:
+    """The SQL dialect an explorer speaks (``"postgresql"``, ``"duckdb"`` …), or ``""``.
+
+    Adapters advertise it through an optional ``dialect`` attribute.
+    """
+    return str(getattr(explorer, "dialect", "") or "")
+
+
+def explorer_fingerprint(explorer: Any) -> str:
+    """Short hash of the connection an explorer talks to.
+
+    Uses the DSN/URL the adapters keep (``url``, ``dsn``, or the D1 account
+    and database ids); an explorer without one is fingerprinted by identity.
+    """
+    for attrs in (("url",), ("dsn",), ("account_id", "database_id")):
+        values = [getattr(explorer, a, None) for a in attrs]
+        if all(isinstance(v, str) and v for v in values):
+            source = "\0".join(str(v) for v in values)
+            break
+    else:
+        source = f"{type(explorer).__qualname__}@{id(explorer):x}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+async def describe_all(
+    explorer: ExplorerPort,
+    *,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> list[Table]:
+    """Every table with column detail, in bulk when the adapter supports it.
+
+    The fallback lists tables and describes each one; tables that fail to
+    describe are returned without columns. ``include``/``exclude`` only apply
+    on the bulk path.
+    """
+    bulk = getattr(explorer, "describe_all", None)
+    if bulk is not None:
+        return await bulk(include=include, exclude=exclude)
+    out: list[Table] = []
+    for table in await explorer.list_tables():
+        try:
+            out.append(await explorer.describe_table(table.name))
+        except Exception:
+            out.append(table)
+    return out
+
+
+async def execute_stream(
+    explorer: ExplorerPort,
+    sql: str,
+    *,
+    limit: int = 1000,
+    batch_size: int = DEFAULT_STREAM_BATCH,
+    timeout: float | None = None,
+) -> AsyncIterator[ResultSet]:
+    """Up to ``limit`` rows of ``sql`` in batches of at most ``batch_size``.
+
+    Streams when the adapter supports it; otherwise runs ``execute`` once and
+    slices the result, so memory is bounded only on the streaming path.
+
+    ``timeout`` bounds the whole query. It is handed to adapters that accept
+    it (which also cancel server-side); otherwise each step is awaited under
+    the remaining time. Raises :class:`QueryTimeout` once it is spent.
+    """
+    batch_size = max(1, int(batch_size))
+    stream = getattr(explorer, "execute_stream", None)
+    call = stream if stream is not None else explorer.execute
+    deadline: _Deadline | None = None
+    kwargs: dict[str, Any] = {}
+    if timeout is not None:
+        if _accepts_timeout(call):
+            kwargs["timeout"] = timeout
+        else:
+            deadline = _Deadline(timeout)
+    if stream is not None:
+        async with aclosing(stream(sql, limit, batch_size=batch_size, **kwargs)) as batches:
+            while True:
+                try:
+                    batch = await _bounded(deadline, batches.__anext__)
+                except StopAsyncIteration:
+                    break
+                yield as_result_set(batch)
+        return
+    rows = as_result_set(await _bounded(deadline, lambda: explorer.execute(sql, limit, **kwargs)))
+    for i in range(0, len(rows), batch_size):
+        yield rows[i : i + batch_size]
+
+
+class _Deadline:
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._at = asyncio.get_running_loop().time() + seconds
+
+    def remaining(self) -> float:
+        return self._at - asyncio.get_running_loop().time()
+
+
+async def _bounded(deadline: _Deadline | None, step: Callable[[], Awaitable[T]]) -> T:
+    if deadline is None:
+        return await step()
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise QueryTimeout(deadline.seconds)
+    try:
+        return await asyncio.wait_for(step(), remaining)
+    except asyncio.TimeoutError:
+        raise QueryTimeout(deadline.seconds) from None
+
+
+def _accepts_timeout(fn: Callable[..., Any]) -> bool:
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return "timeout" in params
@@ -8,7 +8,7 @@ Slack later is "implement this Protocol" with zero core changes.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Protocol, runtime_checkable
+from typing import IO, Protocol, runtime_checkable
 
 from ..identity import Identity
 
@@ -29,6 +29,7 @@ class OutboundMessage:
 
     text: str
     file_bytes: bytes | None = None   # e.g. CSV when result > 50 rows
+    file: IO[bytes] | None = None     # same, as an open (possibly disk-backed) file
     file_name: str | None = None
 
 
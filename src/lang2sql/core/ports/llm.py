@@ -3,13 +3,17 @@
 V1 wires a single OpenAI ``gpt-4.1-mini`` adapter behind this. Because the loop
 depends only on this Protocol, swapping in Anthropic/NIM later (v1.5+) is an
 adapter add with zero loop changes.
+
+Adapters that can stream also implement :class:`StreamingLLMPort`; the loop
+prefers it when present and falls back to :meth:`LLMPort.complete` otherwise
+(e.g. ``FakeLLM``).
 """
 
 from __future__ import annotations
 
-from typing import Protocol, Sequence, runtime_checkable
+from typing import AsyncIterator, Protocol, Sequence, runtime_checkable
 
-from ..types import Completion, Message, ToolSpec
+from ..types import Completion, CompletionDelta, Message, ToolSpec
 
 
 @runtime_checkable
@@ -23,3 +27,16 @@ class LLMPort(Protocol):
     ) -> Completion:
         """Run one completion. May return tool calls, a final answer, or both."""
         ...
+
+
+@runtime_checkable
+class StreamingLLMPort(Protocol):
+    """Tool-calling chat completion delivered incrementally."""
+
+    def stream(
+        self,
+        messages: Sequence[Message],
+        tools: Sequence[ToolSpec] = (),
+    ) -> AsyncIterator[CompletionDelta]:
+        """Yield text deltas; the last delta carries the assembled Completion."""
+        ...
@@ -4,13 +4,18 @@ Airport-security model: SQL passes a *line* of layers; each returns pass /
 block / needs-confirmation / rewrite. New checks (v1.5 AST validation, function
 blocklist, metadata enrichment) are "one class + slot it in the line" with zero
 ``run_sql`` changes.
+
+Layers that must ask the database (``EXPLAIN``-based cost estimates) also offer
+an async ``acheck(sql, ctx)``. ``evaluate`` is synchronous and uses ``check``
+only; ``aevaluate`` awaits ``acheck`` where a layer has one. ``run_sql`` calls
+``aevaluate`` and fills :attr:`SafetyContext.explorer`/``scope`` for it.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Protocol, Sequence, runtime_checkable
+from typing import Any, Protocol, Sequence, runtime_checkable
 
 
 class Verdict(str, Enum):
@@ -36,6 +41,10 @@ class SafetyContext:
     timeout_seconds: int = 30
     row_limit: int = 1000
     extras: dict = field(default_factory=dict)
+    # The explorer the SQL will run on and the guild scope asking, for layers
+    # that consult the database or per-guild settings (cost gate).
+    explorer: Any = None
+    scope: str = ""
 
 
 @runtime_checkable
@@ -56,5 +65,9 @@ class SafetyPipelinePort(Protocol):
     def evaluate(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
         ...
 
+    async def aevaluate(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        """As :meth:`evaluate`, awaiting layers' ``acheck`` where they have one."""
+        ...
+
     @property
     def layers(self) -> Sequence[SafetyLayerPort]: ...
@@ -0,0 +1,148 @@
+"""ResultSet — query rows as one header plus tuple rows.
+
+Results used to travel as ``list[dict]``: every row carried its own copy of the
+column-name → value mapping, so a 1,000 × 50 result meant 1,000 dicts just to
+render a 50-row preview. A :class:`ResultSet` stores the column names once and
+each row as a plain tuple (duplicate column names survive, too).
+
+For callers written against the old shape it is still a ``Sequence`` of dicts:
+indexing and iteration build a row dict on the fly, and it compares equal to a
+list of dicts with the same content. New code should prefer :attr:`rows`,
+:meth:`column` and the renderers (:meth:`to_markdown`, :meth:`to_csv`).
+
+:meth:`array` hands out a NumPy array for a numeric column when NumPy is
+installed (``pip install lang2sql[numpy]``); without it the method returns
+``None`` and nothing else changes.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from decimal import Decimal
+from typing import Any, overload
+
+
+class ResultSet(Sequence[dict]):
+    """Column names plus tuple rows, with dict-row compatibility."""
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns: Sequence[str], rows: Iterable[Sequence[Any]] = ()) -> None:
+        self.columns: tuple[str, ...] = tuple(columns)
+        self.rows: list[tuple] = [tuple(r) for r in rows]
+
+    @classmethod
+    def from_dicts(
+        cls, rows: Iterable[Mapping[str, Any]], columns: Sequence[str] | None = None
+    ) -> "ResultSet":
+        """Build from dict rows; columns default to the first row's keys."""
+        dicts = list(rows)
+        if columns is None:
+            columns = list(dicts[0].keys()) if dicts else []
+        return cls(columns, (tuple(r.get(c) for c in columns) for r in dicts))
+
+    # --- Sequence[dict] compatibility ------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @overload
+    def __getitem__(self, index: int) -> dict: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ResultSet": ...
+
+    def __getitem__(self, index: int | slice) -> "dict | ResultSet":
+        if isinstance(index, slice):
+            return ResultSet(self.columns, self.rows[index])
+        return dict(zip(self.columns, self.rows[index]))
+
+    def __iter__(self) -> Iterator[dict]:
+        columns = self.columns
+        for row in self.rows:
+            yield dict(zip(columns, row))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResultSet):
+            return self.columns == other.columns and self.rows == other.rows
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(other) == len(self.rows) and all(
+                isinstance(o, Mapping) and dict(o) == d for o, d in zip(other, self)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ResultSet(columns={list(self.columns)!r}, rows={len(self.rows)})"
+
+    # --- access ----------------------------------------------------------
+
+    def head(self, n: int = 5) -> "ResultSet":
+        """The first ``n`` rows."""
+        return ResultSet(self.columns, self.rows[: max(0, n)])
+
+    def column(self, name: str) -> list[Any]:
+        """All values of one column, in row order."""
+        idx = self.columns.index(name)
+        return [r[idx] for r in self.rows]
+
+    def array(self, name: str) -> Any:
+        """A numeric column as a NumPy array, or ``None``.
+
+        ``None`` when NumPy isn't installed or the column holds non-numbers.
+        NULLs become ``NaN`` (so the array is float64).
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+        values = self.column(name)
+        if not all(_is_number(v) or v is None for v in values):
+            return None
+        if any(v is None or isinstance(v, (float, Decimal)) for v in values):
+            return np.array(
+                [np.nan if v is None else float(v) for v in values], dtype=np.float64
+            )
+        return np.array(values, dtype=np.int64)
+
+    def to_dicts(self) -> list[dict]:
+        return list(self)
+
+    def extend(self, other: "ResultSet") -> None:
+        """Append ``other``'s rows (same columns expected)."""
+        self.rows.extend(other.rows)
+
+    # --- rendering -------------------------------------------------------
+
+    def to_markdown(self, max_rows: int | None = None) -> str:
+        """Pipe table (header, ``---`` rule, one line per row)."""
+        rows = self.rows if max_rows is None else self.rows[:max_rows]
+        lines = [" | ".join(self.columns), " | ".join("---" for _ in self.columns)]
+        lines.extend(" | ".join("NULL" if v is None else str(v) for v in r) for r in rows)
+        return "\n".join(lines)
+
+    def to_csv(self, *, header: bool = True) -> str:
+        buf = io.StringIO()
+        self.write_csv(buf, header=header)
+        return buf.getvalue()
+
+    def write_csv(self, fp: Any, *, header: bool = True) -> None:
+        """Write CSV to a text file object (no intermediate string)."""
+        writer = csv.writer(fp)
+        if header:
+            writer.writerow(self.columns)
+        writer.writerows(self.rows)
+
+
+def as_result_set(rows: "ResultSet | Iterable[Mapping[str, Any]]") -> ResultSet:
+    """Pass a ResultSet through; wrap dict rows from explorers that return them."""
+    if isinstance(rows, ResultSet):
+        return rows
+    return ResultSet.from_dicts(rows)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
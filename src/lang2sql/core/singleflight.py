@@ -0,0 +1,55 @@
+"""SingleFlight — concurrent callers with the same key share one call.
+
+When several users ask the same question at once, each ``run_sql`` (and, on
+a cold catalog, each ``list_tables``/``describe_table``) would start its own
+scan of the warehouse. :meth:`SingleFlight.do` runs the first caller's
+coroutine as a task and hands every caller that arrives with the same key
+while it is running the same result — or the same exception. The key is
+forgotten as soon as the call settles, so nothing is cached beyond it.
+
+A caller that is cancelled stops waiting without cancelling the shared call;
+the others still get their answer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0   # underlying calls actually made
+    shared: int = 0  # callers that joined a call already in flight
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicates concurrent calls by key (one event loop)."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Future[T]] = {}
+        self.stats = SingleFlightStats()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()``, or the call already running under ``key``."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._settle(key, done))
+            self.stats.calls += 1
+        else:
+            self.stats.shared += 1
+        return await asyncio.shield(flight)
+
+    def _settle(self, key: Hashable, done: asyncio.Future[T]) -> None:
+        if self._flights.get(key) is done:
+            del self._flights[key]
+        if not done.cancelled():
+            done.exception()  # mark retrieved when every caller had gone
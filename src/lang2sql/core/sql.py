@@ -0,0 +1,27 @@
+"""SQL text helpers shared by the caches and safety layers (no parsing, no I/O)."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+# Quoted literals/identifiers are kept verbatim; any run of comments and
+# whitespace outside them collapses to one space.
+_SQL_TOKEN = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`)|(?:\s|--[^\n]*|/\*.*?\*/)+""",
+    re.DOTALL,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Canonical text for cache keys: no comments, single spaces, no trailing ``;``.
+
+    Case is left alone — identifiers are case-sensitive on some warehouses.
+    """
+    text = _SQL_TOKEN.sub(lambda m: m.group(1) or " ", sql).strip()
+    return text.rstrip(";").rstrip()
+
+
+def sql_fingerprint(sql: str) -> str:
+    """SHA-256 of :func:`normalize_sql` — equal for formatting-only differences."""
+    return hashlib.sha256(normalize_sql(sql).encode("utf-8")).hexdigest()
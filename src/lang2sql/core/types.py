@@ -9,7 +9,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import IO, Any
 
 
 class Role(str, Enum):
@@ -43,6 +43,19 @@ class ToolResult:
     is_error: bool = False
 
 
+@dataclass
+class Attachment:
+    """A file produced during a turn for the frontend to deliver (e.g. a CSV).
+
+    ``file`` is an open binary file positioned at the start; it may be backed
+    by disk, so a large result never has to exist as one ``bytes`` object.
+    """
+
+    name: str
+    file: IO[bytes]
+    rows: int = 0
+
+
 @dataclass
 class Message:
     """One entry in a conversation transcript.
@@ -83,3 +96,16 @@ class Completion:
     content: str = ""
     tool_calls: list[ToolCall] = field(default_factory=list)
     finish_reason: str | None = None
+
+
+@dataclass
+class CompletionDelta:
+    """One increment of a streamed completion.
+
+    ``content`` is newly generated visible text (possibly empty). The final
+    delta of a stream carries the fully assembled ``completion`` — including
+    tool calls, whose JSON arguments only parse once complete.
+    """
+
+    content: str = ""
+    completion: Completion | None = None
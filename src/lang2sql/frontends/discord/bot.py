@@ -6,6 +6,10 @@ mention, translate it to an :class:`InteractionContext` →
 deliver the resulting :class:`OutboundMessage` natively (plain reply, or a
 ``discord.File`` upload when render attached a CSV).
 
+Free-form questions stream: the bot posts a placeholder and edits it as the
+answer arrives (throttled to stay inside Discord's edit rate limit), then
+replaces it with the final render.
+
 Import-safety contract (tested): importing this module must not require a token
 or any network access — only :func:`run` connects to the gateway. So discord.py
 is imported at module load (it's a pure library import), but the client is
@@ -17,6 +21,8 @@ from __future__ import annotations
 import io
 import logging
 import os
+import time
+from typing import cast
 
 import discord
 from discord import app_commands
@@ -30,6 +36,7 @@ logger = logging.getLogger(__name__)
 
 TOKEN_ENV = "DISCORD_BOT_TOKEN"
 _DISCORD_CONTENT_LIMIT = 1900  # Discord hard limit is 2000; 100-char safety margin
+_EDIT_INTERVAL_SECONDS = 1.0  # Discord allows ~5 edits per 5 s on one message
 
 
 def _interaction_context(interaction: discord.Interaction) -> InteractionContext:
@@ -85,6 +92,10 @@ def _message_context(message: discord.Message) -> InteractionContext:
 
 def _to_sendable(message: OutboundMessage) -> tuple[str, discord.File | None]:
     """Turn an :class:`OutboundMessage` into (content, optional file) for send."""
+    if message.file is not None:
+        # A spooled temp file is an io.IOBase at runtime, which discord.File accepts.
+        fp = cast(io.BufferedIOBase, message.file)
+        return message.text, discord.File(fp, filename=message.file_name or "result.csv")
     if message.file_bytes is not None:
         file = discord.File(
             io.BytesIO(message.file_bytes),
@@ -110,6 +121,37 @@ def _build_send_kwargs(out: OutboundMessage) -> dict:
     return kwargs
 
 
+class _StreamingReply:
+    """A placeholder reply edited in place while the agent streams."""
+
+    def __init__(self, message: discord.Message, *, interval: float = _EDIT_INTERVAL_SECONDS) -> None:
+        self._message = message
+        self._interval = interval
+        self._last_edit = 0.0
+        self._shown = ""
+
+    async def update(self, text: str) -> None:
+        now = time.monotonic()
+        if now - self._last_edit < self._interval:
+            return  # the final edit always lands, so skipped frames are fine
+        preview = text if len(text) <= _DISCORD_CONTENT_LIMIT else text[:_DISCORD_CONTENT_LIMIT] + "…"
+        if not preview.strip() or preview == self._shown:
+            return
+        self._last_edit = now
+        self._shown = preview
+        try:
+            await self._message.edit(content=preview)
+        except discord.HTTPException:
+            logger.debug("progress edit dropped", exc_info=True)
+
+    async def finish(self, out: OutboundMessage) -> None:
+        kwargs = _build_send_kwargs(out)
+        file = kwargs.pop("file", None)
+        if file is not None:
+            kwargs["attachments"] = [file]
+        await self._message.edit(**kwargs)
+
+
 class Lang2SQLBot(discord.Client):
     """Discord client wiring slash commands + @mentions to the harness."""
 
@@ -149,11 +191,18 @@ class Lang2SQLBot(discord.Client):
         async def remember(interaction: discord.Interaction, text: str) -> None:
             await self._run(interaction, handlers.remember(to_identity(_interaction_context(interaction)), text))
 
-        @tree.command(name="enrich", description="LLM으로 DB 컬럼 메타데이터 자동 보강 (clear=True로 초기화)")
-        async def enrich(interaction: discord.Interaction, table: str = "", clear: bool = False) -> None:
+        @tree.command(
+            name="enrich",
+            description="LLM으로 DB 컬럼 메타데이터 자동 보강 (clear=True로 초기화, fresh=True로 캐시 무시)",
+        )
+        async def enrich(
+            interaction: discord.Interaction, table: str = "", clear: bool = False, fresh: bool = False
+        ) -> None:
             await self._run(
                 interaction,
-                handlers.enrich(to_identity(_interaction_context(interaction)), table=table, clear=clear),
+                handlers.enrich(
+                    to_identity(_interaction_context(interaction)), table=table, clear=clear, fresh=fresh
+                ),
             )
 
         @tree.command(name="term_custom", description="비즈니스 용어 등록·조회·삭제 (action: show / remove, term: 용어명)")
@@ -178,16 +227,24 @@ class Lang2SQLBot(discord.Client):
             org: str = "",
             team: str = "",
             clear: bool = False,
+            fresh: bool = False,
         ) -> None:
             await self._run(
                 interaction,
-                handlers.org_setup(to_identity(_interaction_context(interaction)), org=org, team=team, clear=clear),
+                handlers.org_setup(
+                    to_identity(_interaction_context(interaction)),
+                    org=org, team=team, clear=clear, fresh=fresh,
+                ),
             )
 
         @tree.command(name="audit_me", description="Show your recent activity")
         async def audit_me(interaction: discord.Interaction) -> None:
             await self._run(interaction, handlers.audit_me(to_identity(_interaction_context(interaction))))
 
+        @tree.command(name="quota", description="Show this server's run_sql usage and limits (admins)")
+        async def quota(interaction: discord.Interaction) -> None:
+            await self._run(interaction, handlers.quota(to_identity(_interaction_context(interaction))))
+
     async def _run(self, interaction: discord.Interaction, coro) -> None:
         """Await a handler coroutine and reply with its OutboundMessage."""
         await interaction.response.defer(thinking=True)
@@ -219,14 +276,15 @@ class Lang2SQLBot(discord.Client):
             return
 
         identity = to_identity(_message_context(message))
+        reply = await message.channel.send(content="⏳ thinking…")
+        stream = _StreamingReply(reply)
         try:
-            out = await self._handlers.query(identity, text)
-            kwargs = _build_send_kwargs(out)
-            await message.channel.send(**kwargs)
+            out = await self._handlers.query(identity, text, on_progress=stream.update)
+            await stream.finish(out)
         except Exception as exc:
             import traceback
             traceback.print_exc()
-            await message.channel.send(content=f"❌ Error: {type(exc).__name__}: {exc}")
+            await reply.edit(content=f"❌ Error: {type(exc).__name__}: {exc}", attachments=[])
 
 
 def run() -> None:
@@ -17,64 +17,115 @@ memory writes identical to what the agent itself does.
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Awaitable, Callable
 
 from ...adapters.db import build_explorer
 from ...adapters.db.dsn_builder import assemble
 from ...core.identity import Identity
 from ...core.ports.frontend import OutboundMessage
 from ...core.types import Role
-from ...harness.loop import agent_loop
+from ...harness.loop import agent_events
 from ...tenancy.concierge import ContextConcierge
 from .render import render_answer
 
 
+# Receives the reply-so-far while the agent is still working (streaming edits).
+ProgressCallback = Callable[[str], Awaitable[None]]
+
+# Leading token on a question that skips the query result cache for that turn.
+FRESH_FLAG = "--fresh"
+
+
 class CommandHandlers:
     """Async command methods returning :class:`OutboundMessage` (discord-free)."""
 
     def __init__(self, concierge: ContextConcierge) -> None:
         self._concierge = concierge
 
-    async def query(self, identity: Identity, text: str) -> OutboundMessage:
+    async def query(
+        self,
+        identity: Identity,
+        text: str,
+        *,
+        on_progress: ProgressCallback | None = None,
+    ) -> OutboundMessage:
         """Run a natural-language question through the agent loop, then render.
 
         The loop mutates the in-context :class:`Session`; we persist it back
         through the concierge store afterwards so the next message in the same
         thread/DM continues the conversation (tiebreaker #4).
+
+        ``on_progress`` is awaited with the partial reply as tokens stream in
+        (and a short status while tools run), so a frontend can edit its
+        placeholder message; the returned message is still the final render.
+
+        A question starting with :data:`FRESH_FLAG` runs with the result cache
+        bypassed, so every ``run_sql`` in the turn hits the database.
         """
+        words = text.split(maxsplit=1)
+        fresh = bool(words) and words[0] == FRESH_FLAG
+        if fresh:
+            text = words[1] if len(words) > 1 else ""
         ctx = await self._concierge.build_context(identity, user_text=text)
+        ctx.bypass_result_cache = fresh
         pre_loop_len = len(ctx.session.history())
-        answer = await agent_loop(ctx, text)
-
-        history = ctx.session.history()
-        current_turn = history[pre_loop_len:]
-
-        call_id_to_sql: dict[str, str] = {
-            tc.id: tc.arguments["sql"]
-            for msg in current_turn
-            if msg.role == Role.ASSISTANT and msg.tool_calls
-            for tc in msg.tool_calls
-            if tc.name == "run_sql" and "sql" in tc.arguments
-        }
-
-        sql_queries: list[str] = []
-        sql_results: list[str] = []
-        for msg in current_turn:
-            if msg.role != Role.TOOL or msg.name != "run_sql" or not msg.content:
-                continue
-            sql = call_id_to_sql.get(msg.tool_call_id or "")
-            if sql and ("row(s):" in msg.content or "(0 rows)" in msg.content):
-                sql_queries.append(sql)
-                sql_results.append(msg.content)
-
-        ctx.session.compress()
-        await self._concierge.store.save(identity.session_key(), ctx.session)
-
-        suffix = ""
-        if sql_queries:
-            suffix += "\n\n**SQL:**\n```sql\n" + "\n\n".join(sql_queries) + "\n```"
-        if sql_results:
-            suffix += "\n\n**결과:**\n```\n" + "\n\n".join(sql_results) + "\n```"
-        return render_answer(answer + suffix)
+        kept = None
+        try:
+            answer = ""
+            partial = ""
+            async for event in agent_events(ctx, text):
+                if event.kind == "answer":
+                    answer = event.text
+                elif on_progress is None:
+                    continue
+                elif event.kind == "delta":
+                    partial += event.text
+                    await on_progress(partial)
+                elif event.kind == "tools":
+                    partial = ""  # text so far was an intermediate step
+                    await on_progress(f"_(running {event.text}…)_")
+
+            history = ctx.session.history()
+            current_turn = history[pre_loop_len:]
+
+            call_id_to_sql: dict[str, str] = {
+                tc.id: tc.arguments["sql"]
+                for msg in current_turn
+                if msg.role == Role.ASSISTANT and msg.tool_calls
+                for tc in msg.tool_calls
+                if tc.name == "run_sql" and "sql" in tc.arguments
+            }
+
+            sql_queries: list[str] = []
+            sql_results: list[str] = []
+            for msg in current_turn:
+                if msg.role != Role.TOOL or msg.name != "run_sql" or not msg.content:
+                    continue
+                sql = call_id_to_sql.get(msg.tool_call_id or "")
+                if sql and ("row(s):" in msg.content or "(0 rows)" in msg.content):
+                    sql_queries.append(sql)
+                    sql_results.append(msg.content)
+
+            ctx.session.compress()
+            await self._concierge.store.save(identity.session_key(), ctx.session)
+            self._concierge.schedule_compaction(ctx.session)
+
+            suffix = ""
+            if sql_queries:
+                suffix += "\n\n**SQL:**\n```sql\n" + "\n\n".join(sql_queries) + "\n```"
+            if sql_results:
+                suffix += "\n\n**결과:**\n```\n" + "\n\n".join(sql_results) + "\n```"
+            # Several run_sql calls may have spooled a CSV; the last one answers.
+            attachment = ctx.attachments[-1] if ctx.attachments else None
+            out = render_answer(answer + suffix, attachment=attachment)
+            kept = attachment
+            return out
+        finally:
+            # Close every spooled CSV not handed to the frontend, including
+            # all of them when the turn raised or was cancelled.
+            for spooled in ctx.attachments:
+                if spooled is not kept:
+                    spooled.file.close()
 
     async def remember(self, identity: Identity, text: str) -> OutboundMessage:
         """Persist a user fact via the memory service (manual ``/remember``)."""
@@ -95,6 +146,13 @@ class CommandHandlers:
             lines.append(f"- {_fmt_ts(event.ts)} {event.action} @ {event.scope}")
         return OutboundMessage(text="\n".join(lines))
 
+    async def quota(self, identity: Identity) -> OutboundMessage:
+        """Admins: this guild's run_sql usage against its quota."""
+        if not identity.is_admin:
+            return OutboundMessage(text="Only server admins can view query quotas.")
+        usage = self._concierge.quotas.usage(identity.kv_scope)
+        return OutboundMessage(text=usage.render())
+
     async def register_db_for_guild(
         self,
         identity: Identity,
@@ -149,19 +207,35 @@ class CommandHandlers:
             )
         )
 
-    async def enrich(self, identity: Identity, table: str = "", clear: bool = False) -> OutboundMessage:
-        """Run EnrichSchema tool: sample DB columns and LLM-infer descriptions."""
+    async def enrich(
+        self, identity: Identity, table: str = "", clear: bool = False, fresh: bool = False
+    ) -> OutboundMessage:
+        """Run EnrichSchema tool: sample DB columns and LLM-infer descriptions.
+
+        ``fresh`` asks the LLM again instead of replaying a cached completion.
+        """
+        await self._concierge.invalidate_schema(identity)  # enrich what's there now
         ctx = await self._concierge.build_context(identity)
+        ctx.bypass_llm_cache = fresh
         result = await ctx.tools.dispatch(
             "enrich_schema", {"table": table, "clear": clear}, ctx, "cmd:enrich"
         )
         return OutboundMessage(text=result.content)
 
     async def org_setup(
-        self, identity: Identity, org: str = "", team: str = "", clear: bool = False
+        self,
+        identity: Identity,
+        org: str = "",
+        team: str = "",
+        clear: bool = False,
+        fresh: bool = False,
     ) -> OutboundMessage:
-        """조직(전사) 또는 팀(채널) 등록 + DB 스캔으로 비즈니스 용어 자동 추출."""
+        """조직(전사) 또는 팀(채널) 등록 + DB 스캔으로 비즈니스 용어 자동 추출.
+
+        ``fresh`` asks the LLM again instead of replaying a cached completion.
+        """
         ctx = await self._concierge.build_context(identity)
+        ctx.bypass_llm_cache = fresh
         result = await ctx.tools.dispatch(
             "org_setup", {"org": org, "team": team, "clear": clear}, ctx, "cmd:org_setup"
         )
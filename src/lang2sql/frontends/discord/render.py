@@ -15,6 +15,8 @@ from collections.abc import Sequence
 from typing import Any
 
 from ...core.ports.frontend import OutboundMessage
+from ...core.result import ResultSet
+from ...core.types import Attachment
 
 # Above this many rows (or text lines) we attach a CSV instead of inlining.
 MAX_INLINE_ROWS = 50
@@ -22,22 +24,38 @@ MAX_INLINE_ROWS = 50
 
 def render_answer(
     text: str,
-    rows: Sequence[Sequence[Any]] | None = None,
+    rows: ResultSet | Sequence[Sequence[Any]] | None = None,
     *,
     header: Sequence[str] | None = None,
     file_name: str = "result.csv",
+    attachment: Attachment | None = None,
 ) -> OutboundMessage:
     """Render an agent answer, attaching a CSV when it's too big to inline.
 
-    Two oversized shapes trigger an attachment:
+    An ``attachment`` (``run_sql``'s spooled full-result CSV) is passed
+    through as-is, with its row count appended to ``text``. Otherwise two
+    oversized shapes trigger an attachment:
 
     * structured ``rows`` longer than :data:`MAX_INLINE_ROWS` — serialised to
-      CSV (with ``header`` if given) and replaced by a one-line summary; or
+      CSV (with ``header`` if given, a :class:`ResultSet`'s own columns
+      otherwise) and replaced by a one-line summary; or
     * a plain ``text`` answer with more than :data:`MAX_INLINE_ROWS` lines —
       written verbatim into a ``.csv``/text attachment.
 
     Anything smaller is returned as plain ``text``.
     """
+    if attachment is not None:
+        summary = f"{attachment.rows} rows — attached as {attachment.name}."
+        body = text.strip()
+        return OutboundMessage(
+            text=f"{body}\n{summary}" if body else summary,
+            file=attachment.file,
+            file_name=attachment.name,
+        )
+
+    if isinstance(rows, ResultSet):
+        header = header if header is not None else rows.columns
+        rows = rows.rows
     if rows is not None and len(rows) > MAX_INLINE_ROWS:
         payload = _rows_to_csv(rows, header)
         summary = f"{len(rows)} rows — attached as {file_name}."
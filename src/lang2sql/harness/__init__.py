@@ -1,8 +1,8 @@
 """Harness — the assembled agent unit (context, session, loop, tools)."""
 
 from .context import HarnessContext
-from .loop import agent_loop
+from .loop import LoopEvent, agent_events, agent_loop
 from .session import Session
 from .tool_registry import ToolRegistry
 
-__all__ = ["HarnessContext", "agent_loop", "Session", "ToolRegistry"]
+__all__ = ["HarnessContext", "agent_loop", "agent_events", "LoopEvent", "Session", "ToolRegistry"]
@@ -8,18 +8,23 @@ read from it. Optional fields are the pieces a bare CLI smoke-test can omit.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 from ..core.identity import Identity
+from ..core.types import Attachment
 
 if TYPE_CHECKING:
     from ..adapters.storage.sqlite_store import SqliteStore
+    from ..core.singleflight import SingleFlight
+    from .quota import QuotaManager
+    from .result_cache import ResultCache
+    from .system_prompt import PromptCache
 from ..core.ports.audit import AuditPort
 from ..core.ports.explorer import ExplorerPort
 from ..core.ports.llm import LLMPort
 from ..core.ports.safety import SafetyPipelinePort
-from .session import Session
+from .session import Session, Tokenizer, estimate_tokens
 from .tool_registry import ToolRegistry
 
 
@@ -33,4 +38,24 @@ class HarnessContext:
     safety: SafetyPipelinePort | None = None
     audit: AuditPort | None = None
     store: SqliteStore | None = None
+    # Same model behind a persistent completion cache, for call sites whose
+    # prompts repeat verbatim (/enrich, /org_setup). The loop never uses it.
+    cached_llm: LLMPort | None = None
+    prompt_cache: PromptCache | None = None
+    # run_sql results by (normalised SQL, scope, DSN); shared across requests.
+    result_cache: ResultCache | None = None
+    # Identical run_sql executions in flight at once share one warehouse call.
+    flights: SingleFlight | None = None
+    # Per-scope/user run_sql concurrency, rate and warehouse-time limits.
+    quotas: QuotaManager | None = None
+    # Set by the frontend when the user asked for fresh data this turn.
+    bypass_result_cache: bool = False
+    # Set by /enrich and /org_setup --fresh: re-ask instead of replaying cached_llm.
+    bypass_llm_cache: bool = False
     max_turns: int = 8
+    max_tool_concurrency: int = 4
+    # Transcript token budget per LLM call; None sends the whole transcript.
+    history_budget_tokens: int | None = None
+    tokenizer: Tokenizer = estimate_tokens
+    # Files tools produced this turn (run_sql's full-result CSV), for the frontend.
+    attachments: list[Attachment] = field(default_factory=list)
@@ -4,25 +4,84 @@ One call per user message: build the system prompt, then iterate
 LLM → tool calls → LLM until the model returns a final answer (no tool calls)
 or ``max_turns`` is hit. Tool failures come back as tool messages so the model
 can recover rather than crashing the loop.
+
+When one completion requests several tools, independent calls run concurrently
+(bounded by ``ctx.max_tool_concurrency``); tools marked
+``concurrent_safe = False`` run alone. Tool messages are always appended in the
+original call order so the transcript stays deterministic.
+
+With ``ctx.history_budget_tokens`` set, each call sends
+:meth:`Session.window` (rolling summary + newest turns that fit) instead of
+the full transcript; the session itself still records every message.
+
+:func:`agent_events` is the streaming form: an async generator of
+:class:`LoopEvent` (text deltas as the model writes, tool batches as they
+start, then the final answer). It streams through a
+:class:`StreamingLLMPort` when the LLM implements one and falls back to
+``complete`` otherwise. :func:`agent_loop` simply drains it.
 """
 
 from __future__ import annotations
 
-from ..core.types import Message, Role
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Literal
+
+from ..core.ports.llm import StreamingLLMPort
+from ..core.types import Completion, Message, Role, ToolCall, ToolResult
 from .context import HarnessContext
 from .system_prompt import build_system_prompt
 
+_MAX_TURNS_TEXT = "(reached max turns without a final answer)"
+
+
+@dataclass
+class LoopEvent:
+    """Progress from :func:`agent_events`.
+
+    ``delta`` — newly generated assistant text for the current LLM call;
+    ``tools`` — the model requested tools (``text`` lists their names), so any
+    partial text shown so far belonged to an intermediate step;
+    ``answer`` — the final assistant text, always the last event.
+    """
+
+    kind: Literal["delta", "tools", "answer"]
+    text: str = ""
+
 
 async def agent_loop(ctx: HarnessContext, user_text: str) -> str:
     """Run one user turn to completion; return the final assistant text."""
+    answer = _MAX_TURNS_TEXT
+    async for event in agent_events(ctx, user_text):
+        if event.kind == "answer":
+            answer = event.text
+    return answer
+
+
+async def agent_events(ctx: HarnessContext, user_text: str) -> AsyncIterator[LoopEvent]:
+    """Run one user turn, yielding :class:`LoopEvent` as it progresses."""
     ctx.session.add(Message(role=Role.USER, content=user_text))
 
     system = await build_system_prompt(ctx)
     specs = ctx.tools.specs()
 
     for _ in range(ctx.max_turns):
-        messages = [Message(role=Role.SYSTEM, content=system), *ctx.session.history()]
-        completion = await ctx.llm.complete(messages, specs)
+        if ctx.history_budget_tokens is None:
+            history = ctx.session.history()
+        else:
+            history = ctx.session.window(ctx.history_budget_tokens, ctx.tokenizer)
+        messages = [Message(role=Role.SYSTEM, content=system), *history]
+        completion: Completion | None = None
+        if isinstance(ctx.llm, StreamingLLMPort):
+            async for delta in ctx.llm.stream(messages, specs):
+                if delta.content:
+                    yield LoopEvent("delta", delta.content)
+                if delta.completion is not None:
+                    completion = delta.completion
+            if completion is None:
+                raise RuntimeError("LLM stream ended without a completion")
+        else:
+            completion = await ctx.llm.complete(messages, specs)
 
         assistant = Message(
             role=Role.ASSISTANT,
@@ -32,10 +91,12 @@ async def agent_loop(ctx: HarnessContext, user_text: str) -> str:
         ctx.session.add(assistant)
 
         if not completion.tool_calls:
-            return completion.content
+            yield LoopEvent("answer", completion.content)
+            return
 
-        for call in completion.tool_calls:
-            result = await ctx.tools.dispatch(call.name, call.arguments, ctx, call.id)
+        yield LoopEvent("tools", ", ".join(c.name for c in completion.tool_calls))
+        results = await _dispatch_all(ctx, completion.tool_calls)
+        for call, result in zip(completion.tool_calls, results):
             ctx.session.add(
                 Message(
                     role=Role.TOOL,
@@ -45,4 +106,33 @@ async def agent_loop(ctx: HarnessContext, user_text: str) -> str:
                 )
             )
 
-    return "(reached max turns without a final answer)"
+    yield LoopEvent("answer", _MAX_TURNS_TEXT)
+
+
+async def _dispatch_all(ctx: HarnessContext, calls: list[ToolCall]) -> list[ToolResult]:
+    """Run ``calls``, overlapping runs of concurrent-safe tools.
+
+    Consecutive concurrent-safe calls form one batch gathered under a
+    semaphore; an opted-out tool is a barrier that runs by itself. Results
+    come back in call order regardless of completion order.
+    """
+    limit = max(1, ctx.max_tool_concurrency)
+    sem = asyncio.Semaphore(limit)
+
+    async def run(call: ToolCall) -> ToolResult:
+        async with sem:
+            return await ctx.tools.dispatch(call.name, call.arguments, ctx, call.id)
+
+    results: list[ToolResult] = []
+    batch: list[ToolCall] = []
+    for call in calls:
+        if ctx.tools.is_concurrent(call.name):
+            batch.append(call)
+            continue
+        if batch:
+            results.extend(await asyncio.gather(*(run(c) for c in batch)))
+            batch = []
+        results.append(await run(call))
+    if batch:
+        results.extend(await asyncio.gather(*(run(c) for c in batch)))
+    return results
@@ -0,0 +1,288 @@
+"""QuotaManager — per-guild and per-user limits on ``run_sql`` executions.
+
+Every guild shares the warehouse (and often one connection pool), so one user
+looping over exploratory questions could starve everybody else. ``run_sql``
+asks the manager for a :class:`QuotaLease` before a query reaches the
+explorer. Result-cache hits never reach it. Limits are per kv scope
+(``Identity.kv_scope``), with :meth:`QuotaManager.set_limits` overriding the
+default for one scope:
+
+* **Concurrency** — at most ``max_concurrent`` queries in flight per scope and
+  ``max_concurrent_per_user`` per user in it. A request over either cap waits
+  for a slot to free up for at most ``queue_timeout`` seconds, then is
+  rejected.
+* **Rate** — token buckets of ``queries_per_minute`` per scope and
+  ``user_queries_per_minute`` per user. An empty bucket delays the request
+  when the next token arrives within ``queue_timeout``, and rejects it with
+  a retry hint otherwise.
+* **Warehouse time** — leases report the seconds their query spent executing,
+  and a scope that has spent ``warehouse_seconds`` in the current
+  ``budget_window`` is rejected until the window rolls over.
+
+Rejections raise :class:`QuotaExceeded`; ``run_sql`` turns the message into
+its tool result. :meth:`QuotaManager.usage` is the admin view of one scope.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Mapping
+
+DEFAULT_QUEUE_TIMEOUT_SECONDS = 10.0
+DEFAULT_BUDGET_WINDOW_SECONDS = 3600.0
+
+
+class QuotaExceeded(Exception):
+    """A ``run_sql`` request was over its scope's or user's quota."""
+
+
+@dataclass(frozen=True)
+class QuotaLimits:
+    """Per-scope quota; ``None`` disables a limit."""
+
+    max_concurrent: int | None = 4
+    max_concurrent_per_user: int | None = 2
+    queries_per_minute: int | None = 60
+    user_queries_per_minute: int | None = 20
+    warehouse_seconds: float | None = 1800.0  # per budget_window
+    budget_window: float = DEFAULT_BUDGET_WINDOW_SECONDS
+    queue_timeout: float = DEFAULT_QUEUE_TIMEOUT_SECONDS
+
+
+@dataclass
+class QuotaUsage:
+    """Snapshot of one scope, for admins."""
+
+    scope: str
+    running: int
+    queued: int
+    running_by_user: dict[str, int]
+    warehouse_seconds: float          # spent in the current window
+    warehouse_budget: float | None
+    window_resets_in: float
+    rejected: int                     # since the manager started
+    limits: QuotaLimits
+
+    def render(self) -> str:
+        limits = self.limits
+        budget = (
+            f"{self.warehouse_seconds:.1f}s of {self.warehouse_budget:g}s"
+            if self.warehouse_budget is not None
+            else f"{self.warehouse_seconds:.1f}s (no budget)"
+        )
+        lines = [
+            f"run_sql quota for {self.scope}:",
+            f"- in flight: {self.running}/{_cap(limits.max_concurrent)}, queued: {self.queued}",
+            f"- per user: {_cap(limits.max_concurrent_per_user)} concurrent, "
+            f"{_cap(limits.user_queries_per_minute)}/min; scope: "
+            f"{_cap(limits.queries_per_minute)}/min",
+            f"- warehouse time: {budget}, window resets in {self.window_resets_in:.0f}s",
+            f"- rejected so far: {self.rejected}",
+        ]
+        lines += [f"  - {user}: {n} running" for user, n in sorted(self.running_by_user.items())]
+        return "\n".join(lines)
+
+
+def _queries(n: int) -> str:
+    return f"{n} query" if n == 1 else f"{n} queries"
+
+
+def _cap(value: float | None) -> str:
+    return "∞" if value is None else f"{value:g}"
+
+
+class _Bucket:
+    """Token bucket refilled continuously at ``per_minute`` tokens per minute."""
+
+    def __init__(self, per_minute: int, now: float) -> None:
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.stamp = now
+
+    def wait(self, now: float) -> float:
+        """Seconds until a token is available (0 when one is)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+@dataclass
+class _ScopeState:
+    window_start: float
+    running: int = 0
+    by_user: dict[str, int] = field(default_factory=dict)
+    spent: float = 0.0
+    rejected: int = 0
+    buckets: dict[str, _Bucket] = field(default_factory=dict)  # by user; "" for the scope
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+class QuotaLease:
+    """A held execution slot; :meth:`charge` records warehouse time against it."""
+
+    def __init__(self, state: _ScopeState, user: str) -> None:
+        self._state = state
+        self.user = user
+        self.charged = 0.0
+
+    def charge(self, seconds: float) -> None:
+        self.charged += max(0.0, seconds)
+        self._state.spent += max(0.0, seconds)
+
+
+class QuotaManager:
+    """Concurrency caps, rate buckets and warehouse-time budgets per kv scope."""
+
+    def __init__(
+        self,
+        limits: QuotaLimits | None = None,
+        *,
+        scope_limits: Mapping[str, QuotaLimits] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._limits = limits or QuotaLimits()
+        self._scope_limits: dict[str, QuotaLimits] = dict(scope_limits or {})
+        self._clock = clock
+        self._states: dict[str, _ScopeState] = {}
+
+    def limits_for(self, scope: str) -> QuotaLimits:
+        return self._scope_limits.get(scope, self._limits)
+
+    def set_limits(self, scope: str, limits: QuotaLimits | None) -> None:
+        """Override the limits for one scope (``None`` restores the default)."""
+        if limits is None:
+            self._scope_limits.pop(scope, None)
+        else:
+            self._scope_limits[scope] = limits
+        state = self._states.get(scope)
+        if state is not None:
+            state.buckets.clear()  # resized on the next request
+            self._wake(state)
+
+    def usage(self, scope: str) -> QuotaUsage:
+        limits = self.limits_for(scope)
+        state = self._state(scope, limits)
+        return QuotaUsage(
+            scope=scope,
+            running=state.running,
+            queued=len(state.waiters),
+            running_by_user={u: n for u, n in state.by_user.items() if n},
+            warehouse_seconds=state.spent,
+            warehouse_budget=limits.warehouse_seconds,
+            window_resets_in=max(0.0, state.window_start + limits.budget_window - self._clock()),
+            rejected=state.rejected,
+            limits=limits,
+        )
+
+    @asynccontextmanager
+    async def lease(self, scope: str, user: str) -> AsyncIterator[QuotaLease]:
+        """Hold one execution slot of ``scope`` for ``user``.
+
+        Waits (within ``queue_timeout``) for rate tokens and a free slot;
+        raises :class:`QuotaExceeded` when the request can't be admitted.
+        """
+        limits = self.limits_for(scope)
+        state = self._state(scope, limits)
+        try:
+            await self._admit(state, user, limits)
+        except QuotaExceeded:
+            state.rejected += 1
+            raise
+        state.running += 1
+        state.by_user[user] = state.by_user.get(user, 0) + 1
+        try:
+            yield QuotaLease(state, user)
+        finally:
+            state.running -= 1
+            state.by_user[user] -= 1
+            if not state.by_user[user]:
+                del state.by_user[user]
+            self._wake(state)
+
+    def _state(self, scope: str, limits: QuotaLimits) -> _ScopeState:
+        now = self._clock()
+        state = self._states.get(scope)
+        if state is None:
+            state = self._states[scope] = _ScopeState(window_start=now)
+        elif now - state.window_start >= limits.budget_window:
+            state.window_start, state.spent = now, 0.0
+        return state
+
+    async def _admit(self, state: _ScopeState, user: str, limits: QuotaLimits) -> None:
+        if limits.warehouse_seconds is not None and state.spent >= limits.warehouse_seconds:
+            resets = state.window_start + limits.budget_window - self._clock()
+            raise QuotaExceeded(
+                f"this server has used its {limits.warehouse_seconds:g}s of warehouse time "
+                f"for the current {limits.budget_window:g}s window; it resets in {resets:.0f}s"
+            )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + limits.queue_timeout
+        buckets = self._buckets(state, user, limits)
+        now = self._clock()
+        waits = [(key, bucket.wait(now)) for key, bucket in buckets]
+        key, wait = max(waits, key=lambda kw: kw[1], default=("", 0.0))
+        if wait > limits.queue_timeout:
+            who = "you have" if key else "this server has"
+            raise QuotaExceeded(f"{who} hit the query rate limit; retry in {wait:.0f}s")
+        # Take the tokens before sleeping, so concurrent requests queue behind
+        # this one's reservation instead of all waking for the same token.
+        for _, bucket in buckets:
+            bucket.take()
+        if wait:
+            await asyncio.sleep(wait)
+
+        while True:
+            busy = self._busy(state, user, limits)
+            if busy is None:
+                return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise QuotaExceeded(
+                    f"{busy}; waited {limits.queue_timeout:g}s for a slot. Try again shortly."
+                )
+            waiter: asyncio.Future[None] = loop.create_future()
+            state.waiters.append(waiter)
+            try:
+                await asyncio.wait({waiter}, timeout=remaining)
+            finally:
+                state.waiters.remove(waiter)
+
+    def _buckets(
+        self, state: _ScopeState, user: str, limits: QuotaLimits
+    ) -> list[tuple[str, _Bucket]]:
+        # Keyed "" for the scope's bucket and the user id for theirs.
+        out = []
+        for key, per_minute in (
+            ("", limits.queries_per_minute),
+            (user, limits.user_queries_per_minute),
+        ):
+            if per_minute is None:
+                continue
+            bucket = state.buckets.get(key)
+            if bucket is None:
+                bucket = state.buckets[key] = _Bucket(per_minute, self._clock())
+            out.append((key, bucket))
+        return out
+
+    @staticmethod
+    def _busy(state: _ScopeState, user: str, limits: QuotaLimits) -> str | None:
+        if limits.max_concurrent is not None and state.running >= limits.max_concurrent:
+            return f"this server already has {_queries(state.running)} running"
+        cap = limits.max_concurrent_per_user
+        if cap is not None and state.by_user.get(user, 0) >= cap:
+            return f"you already have {_queries(state.by_user[user])} running"
+        return None
+
+    @staticmethod
+    def _wake(state: _ScopeState) -> None:
+        for waiter in state.waiters:
+            if not waiter.done():
+                waiter.set_result(None)
@@ -0,0 +1,195 @@
+"""ResultCache — replay identical ``run_sql`` queries without the warehouse.
+
+Teams in one guild ask the same dashboard-style questions over and over, and
+each ``run_sql`` used to go straight to the database. The cache sits between
+the safety decision and the explorer: the key is the gated SQL with comments
+and whitespace normalised away, the row limit, the guild scope
+(``Identity.kv_scope``) and a fingerprint of the connection the explorer
+talks to, so two guilds — or one guild before and after ``/setup`` points it
+at another database — never share an entry.
+
+* **Per-scope TTL** — :meth:`ResultCache.set_ttl` overrides the default for
+  one scope; a TTL of ``0`` turns caching off there.
+* **Memory budget** — entries are charged their serialised size and evicted
+  least recently used once the total passes ``max_bytes``; a result bigger
+  than ``max_entry_bytes`` is never cached.
+* **Disk tier** (optional) — given a :class:`SqliteStore`, entries are also
+  written to its ``result_cache`` table and survive restarts; a memory miss
+  falls through to it.
+* **Bypass** — callers skip the lookup (the model via ``run_sql``'s
+  ``bypass_cache`` argument, a user via ``HarnessContext.bypass_result_cache``)
+  and the fresh result replaces the cached one.
+
+:class:`ResultCacheStats` counts hits and misses and adds up the warehouse time
+each hit saved (the elapsed time of the query that filled the entry).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+from ..core.ports.explorer import explorer_fingerprint
+from ..core.result import ResultSet
+from ..core.sql import normalize_sql
+
+if TYPE_CHECKING:
+    from ..adapters.storage.sqlite_store import SqliteStore
+
+DEFAULT_RESULT_TTL_SECONDS = 300.0
+DEFAULT_RESULT_CACHE_BYTES = 32 * 1024 * 1024
+DEFAULT_RESULT_ENTRY_BYTES = 4 * 1024 * 1024
+DEFAULT_DISK_CACHE_BYTES = 256 * 1024 * 1024
+
+# Bump when the key derivation or stored shape changes to orphan old rows.
+_KEY_VERSION = 1
+
+
+@dataclass
+class ResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class CachedResult:
+    result: ResultSet
+    # Warehouse time of the query that produced it, and when it was stored.
+    elapsed: float
+    stored_at: float
+
+
+@dataclass
+class _Entry:
+    scope: str
+    cached: CachedResult
+    size: int
+    expires: float
+
+
+class ResultCache:
+    """Two-tier (memory LRU, optional sqlite) cache of query results."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_RESULT_TTL_SECONDS,
+        scope_ttls: Mapping[str, float] | None = None,
+        max_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+        max_entry_bytes: int = DEFAULT_RESULT_ENTRY_BYTES,
+        store: SqliteStore | None = None,
+        disk_max_bytes: int = DEFAULT_DISK_CACHE_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._scope_ttls: dict[str, float] = dict(scope_ttls or {})
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._store = store
+        self._disk_max_bytes = disk_max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self.stats = ResultCacheStats()
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes currently charged to the memory tier."""
+        return self._bytes
+
+    def ttl_for(self, scope: str) -> float:
+        return self._scope_ttls.get(scope, self._ttl)
+
+    def set_ttl(self, scope: str, seconds: float | None) -> None:
+        """Override the TTL for ``scope`` (``0`` disables, ``None`` restores the default)."""
+        if seconds is None:
+            self._scope_ttls.pop(scope, None)
+        else:
+            self._scope_ttls[scope] = seconds
+
+    def key(self, sql: str, *, scope: str, explorer: Any, limit: int) -> str:
+        """SHA-256 over normalised SQL, limit, scope and the explorer's DSN fingerprint."""
+        canonical = "\0".join(
+            (str(_KEY_VERSION), scope, explorer_fingerprint(explorer), str(limit), normalize_sql(sql))
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> CachedResult | None:
+        """The live entry for ``key`` (memory, then disk), counting the hit or miss."""
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= now:
+            self._drop(key)
+            entry = None
+        if entry is None and self._store is not None:
+            entry = self._load(key, now)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self.stats.hits += 1
+        self.stats.saved_seconds += entry.cached.elapsed
+        return entry.cached
+
+    def put(self, key: str, scope: str, result: ResultSet, *, elapsed: float, size: int) -> bool:
+        """Store ``result`` (``size`` bytes, ``elapsed`` s to compute); False if not cached."""
+        ttl = self.ttl_for(scope)
+        if ttl <= 0 or size > self.max_entry_bytes:
+            return False
+        now = self._clock()
+        entry = _Entry(scope, CachedResult(result, elapsed, now), size, now + ttl)
+        self._insert(key, entry)
+        if self._store is not None:
+            blob = pickle.dumps((result.columns, result.rows), protocol=pickle.HIGHEST_PROTOCOL)
+            self.stats.evictions += self._store.result_cache_put(
+                key, scope, blob, elapsed=elapsed, expires=entry.expires,
+                max_bytes=self._disk_max_bytes,
+            )
+        return True
+
+    def invalidate(self, scope: str | None = None) -> None:
+        """Forget every entry of ``scope`` (all scopes when ``None``), on both tiers."""
+        for key in [k for k, e in self._entries.items() if scope is None or e.scope == scope]:
+            self._drop(key)
+        if self._store is not None:
+            self._store.result_cache_clear(scope)
+
+    def _insert(self, key: str, entry: _Entry) -> None:
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.stats.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _load(self, key: str, now: float) -> _Entry | None:
+        assert self._store is not None
+        row = self._store.result_cache_get(key, now)
+        if row is None:
+            return None
+        scope, blob, elapsed, expires, stored_at = row
+        columns, rows = pickle.loads(blob)
+        result = ResultSet(columns, rows)
+        entry = _Entry(scope, CachedResult(result, elapsed, stored_at), len(blob), expires)
+        if entry.size <= self.max_entry_bytes:
+            self._insert(key, entry)
+        return entry
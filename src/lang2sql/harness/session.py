@@ -3,20 +3,82 @@
 Holds the transcript plus a scratch of facts recalled for the current turn.
 Persisted via :class:`SessionStorePort` keyed by ``Identity.session_key`` so a
 thread picks up where it left off (tiebreaker #4).
+
+A long-lived channel session would grow without bound, so the loop reads a
+token-budgeted :meth:`Session.window` rather than the whole transcript: the
+newest turns that fit, preceded by a rolling ``summary`` of everything older.
+Folding old turns into that summary happens off the hot path (see
+:mod:`lang2sql.harness.summarizer`); ``summary`` persists with the session.
 """
 
 from __future__ import annotations
 
+import json
+import os
 from dataclasses import dataclass, field
+from typing import Callable
 
 from ..core.identity import Identity
-from ..core.types import Message
+from ..core.types import Message, Role
+
+# Estimates a text's token count. Swap in a real tokenizer (tiktoken, …) if
+# exact budgets matter; the default heuristic needs no dependency.
+Tokenizer = Callable[[str], int]
+
+# Per-message framing overhead in chat-completion APIs (role, separators).
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+# History budgets by model-name prefix (longest prefix wins). Deliberately a
+# fraction of each context window: the system prompt, tool specs and the
+# completion itself need room too.
+_HISTORY_BUDGETS: dict[str, int] = {
+    "gpt-4.1": 32_000,
+    "gpt-4o": 16_000,
+    "o3": 32_000,
+    "o4-mini": 32_000,
+}
+_DEFAULT_HISTORY_BUDGET = 8_000
+_ENV_HISTORY_BUDGET = "LANG2SQL_HISTORY_TOKENS"
+
+_SUMMARY_HEADER = "Summary of the earlier conversation (older turns were condensed):\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~4 ASCII chars per token, ~1 per other char.
+
+    Non-ASCII text (Korean in particular) tokenizes far denser than English,
+    so counting those characters individually keeps budgets conservative.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def message_tokens(message: Message, tokenizer: Tokenizer = estimate_tokens) -> int:
+    total = _MESSAGE_OVERHEAD_TOKENS + tokenizer(message.content or "")
+    for tc in message.tool_calls:
+        total += tokenizer(tc.name) + tokenizer(json.dumps(tc.arguments, ensure_ascii=False))
+    return total
+
+
+def history_budget_for(model: str) -> int:
+    """Transcript token budget for ``model`` (``LANG2SQL_HISTORY_TOKENS`` overrides)."""
+    env = os.environ.get(_ENV_HISTORY_BUDGET)
+    if env and env.isdigit():
+        return int(env)
+    best = ""
+    for prefix in _HISTORY_BUDGETS:
+        if model.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return _HISTORY_BUDGETS[best] if best else _DEFAULT_HISTORY_BUDGET
 
 
 @dataclass
 class Session:
     identity: Identity
     transcript: list[Message] = field(default_factory=list)
+    summary: str = ""
 
     def add(self, message: Message) -> None:
         self.transcript.append(message)
@@ -24,12 +86,49 @@ class Session:
     def history(self) -> list[Message]:
         return list(self.transcript)
 
+    def window(self, budget_tokens: int, tokenizer: Tokenizer = estimate_tokens) -> list[Message]:
+        """The rolling summary (if any) plus the newest turns that fit the budget.
+
+        Cuts only at user-message boundaries so a tool call is never separated
+        from its result, and always keeps the latest user turn even if it alone
+        exceeds the budget.
+        """
+        start = self.overflow(budget_tokens, tokenizer)
+        kept = self.transcript[start:]
+        if self.summary:
+            return [Message(role=Role.SYSTEM, content=_SUMMARY_HEADER + self.summary), *kept]
+        return list(kept)
+
+    def overflow(self, budget_tokens: int, tokenizer: Tokenizer = estimate_tokens) -> int:
+        """How many leading messages fall outside a ``budget_tokens`` window."""
+        used = tokenizer(self.summary) + _MESSAGE_OVERHEAD_TOKENS if self.summary else 0
+        total = used + sum(message_tokens(m, tokenizer) for m in self.transcript)
+        if total <= budget_tokens:
+            return 0
+        starts = [i for i, m in enumerate(self.transcript) if m.role == Role.USER]
+        if not starts:
+            return 0
+        running = total
+        consumed = 0
+        for start in starts:
+            while consumed < start:
+                running -= message_tokens(self.transcript[consumed], tokenizer)
+                consumed += 1
+            if running <= budget_tokens:
+                return start
+        return starts[-1]
+
+    def fold(self, count: int, summary: str) -> None:
+        """Replace the first ``count`` messages with an updated rolling summary."""
+        del self.transcript[:count]
+        self.summary = summary
+
     def reset(self) -> None:
         self.transcript.clear()
+        self.summary = ""
 
     def compress(self) -> None:
         """Remove tool call/result messages to prevent context pollution across turns."""
-        from ..core.types import Role
         cleaned: list[Message] = []
         for msg in self.transcript:
             if msg.role == Role.TOOL:
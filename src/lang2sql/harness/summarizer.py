@@ -0,0 +1,84 @@
+"""TranscriptSummarizer — folds old turns into the session's rolling summary.
+
+:meth:`Session.window` already keeps each request inside the history budget,
+but the dropped turns would be lost entirely without a summary. Generating one
+costs an LLM call, so it runs after the reply has been sent (the concierge
+schedules it as a background task) rather than inside the turn.
+
+Compaction folds down to ``target_ratio`` of the budget instead of exactly to
+it, so one summarisation buys several turns before the next is needed.
+"""
+
+from __future__ import annotations
+
+from ..core.ports.llm import LLMPort
+from ..core.types import Message, Role
+from .session import Session, Tokenizer, estimate_tokens
+
+_INSTRUCTIONS = (
+    "You maintain a running summary of a data-analysis chat between users and "
+    "a SQL assistant. Merge the previous summary with the new excerpt. Keep "
+    "facts that later questions may depend on: tables and columns discussed, "
+    "filters and definitions agreed on, notable query results, open questions. "
+    "Drop pleasantries and raw result rows. Write at most 200 words, in the "
+    "conversation's language. Respond with only the summary."
+)
+
+# Tool output can be a whole result table; the summary only needs its gist.
+_TOOL_EXCERPT_CHARS = 400
+
+
+class TranscriptSummarizer:
+    """Decides when a session overflows its budget and produces the fold."""
+
+    def __init__(
+        self,
+        llm: LLMPort,
+        *,
+        budget_tokens: int,
+        tokenizer: Tokenizer = estimate_tokens,
+        target_ratio: float = 0.5,
+    ) -> None:
+        self._llm = llm
+        self.budget_tokens = budget_tokens
+        self.tokenizer = tokenizer
+        self._target = max(1, int(budget_tokens * target_ratio))
+
+    def needs_compaction(self, session: Session) -> bool:
+        return session.overflow(self.budget_tokens, self.tokenizer) > 0
+
+    def fold_count(self, session: Session) -> int:
+        """Leading messages to fold so the rest fits the target budget."""
+        if not self.needs_compaction(session):
+            return 0
+        return session.overflow(self._target, self.tokenizer)
+
+    async def summarize(self, previous: str, messages: list[Message]) -> str:
+        excerpt = "\n".join(_render(m) for m in messages)
+        prompt = (
+            f"{_INSTRUCTIONS}\n\nPrevious summary:\n{previous or '(none)'}"
+            f"\n\nNew excerpt:\n{excerpt}"
+        )
+        completion = await self._llm.complete([Message(role=Role.USER, content=prompt)])
+        return completion.content.strip() or previous
+
+    async def compact(self, session: Session) -> bool:
+        """Fold ``session`` in place; False when it already fits."""
+        count = self.fold_count(session)
+        if count == 0:
+            return False
+        summary = await self.summarize(session.summary, session.transcript[:count])
+        session.fold(count, summary)
+        return True
+
+
+def _render(message: Message) -> str:
+    if message.role == Role.TOOL:
+        text = message.content
+        if len(text) > _TOOL_EXCERPT_CHARS:
+            text = text[:_TOOL_EXCERPT_CHARS] + "…"
+        return f"tool({message.name or '?'}): {text}"
+    line = f"{message.role.value}: {message.content}"
+    if message.tool_calls:
+        line += " [called " + ", ".join(tc.name for tc in message.tool_calls) + "]"
+    return line
@@ -4,14 +4,24 @@ Per v4.1 §2.1 the prompt injects: (1) the agent's role/rules, (2) the effective
 semantic layer for the current scope, (3) recalled facts, (4) DB schema. V1
 keeps each section simple; later versions enrich them without changing the
 loop. Sections are suppressed when empty.
+
+Assembly runs on every ``agent_loop`` call, so sections are memoised in a
+:class:`PromptCache` when the context carries one.
 """
 
 from __future__ import annotations
 
 import json
+from collections import OrderedDict
 
+from ..core.ports.explorer import Table, describe_all, explorer_fingerprint
 from .context import HarnessContext
 
+# kv namespaces the prompt reads (written by enrich_schema / term_custom).
+_KV_ENRICHED = "enriched_desc"
+_KV_RELATIONSHIPS = "schema_relationships"
+_KV_TERMS = "cterm"
+
 _BASE = """\
 You are Lang2SQL, a read-only data analytics agent.
 
@@ -24,53 +34,127 @@ Rules:
 """
 
 
+class PromptCache:
+    """Memoised prompt sections, each rebuilt only when its inputs change.
+
+    Sections are cached at the narrowest key their content depends on: the
+    schema and relationship blocks per kv scope, the federation terms per
+    ``(kv_scope, channel, user)``. An entry is reused while its *inputs* — the
+    explorer's catalog version and the store's kv write generations — are
+    unchanged, so a write through ``SqliteStore.kv_set``/``kv_delete`` is what
+    invalidates it. Bounded LRU; the concierge holds one across requests.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[tuple, str]] = OrderedDict()
+
+    def get(self, key: tuple, inputs: tuple) -> str | None:
+        hit = self._entries.get(key)
+        if hit is None or hit[0] != inputs:
+            return None
+        self._entries.move_to_end(key)
+        return hit[1]
+
+    def put(self, key: tuple, inputs: tuple, text: str) -> None:
+        self._entries[key] = (inputs, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
 async def build_system_prompt(ctx: HarnessContext) -> str:
     parts: list[str] = [_BASE]
+    cache = ctx.prompt_cache
+    store = ctx.store
+    scope = ctx.identity.kv_scope if store else None
+
+    def gen(namespace: str) -> int:
+        return store.kv_generation(scope, namespace) if store and scope else 0
 
     if ctx.explorer is not None:
+        # Always ask the explorer: a warm catalog answers from memory, and a
+        # cold one reloads and bumps catalog_version, which misses the cache.
         tables = await ctx.explorer.list_tables()
         if tables:
-            scope = ctx.identity.kv_scope if ctx.store else None
-            has_enrichment = bool(
-                scope and ctx.store and
-                ctx.store.kv_get(scope, "schema_relationships")
+            version = getattr(ctx.explorer, "catalog_version", None)
+            # Each section reuses ``key``/``inputs`` with its own tuple shape.
+            key: tuple[object, ...] = ("schema", scope)
+            inputs: tuple[object, ...] = (
+                explorer_fingerprint(ctx.explorer),
+                version,
+                gen(_KV_RELATIONSHIPS),
+                gen(_KV_ENRICHED),
             )
+            section = cache.get(key, inputs) if cache and version is not None else None
+            if section is None:
+                section = await _schema_section(ctx, tables, scope)
+                if cache and version is not None:
+                    cache.put(key, inputs, section)
+            parts.append(section)
 
-            if has_enrichment and scope and ctx.store:
-                schema_lines: list[str] = []
-                for tbl in tables:
-                    try:
-                        described = await ctx.explorer.describe_table(tbl.name)
-                    except Exception:
-                        schema_lines.append(f"- {tbl.qualified}")
-                        continue
-                    col_lines = []
-                    for col in described.columns:
-                        desc = col.description or ctx.store.kv_get(scope, f"enriched_desc:{tbl.name}:{col.name}") or ""
-                        col_lines.append(f"  - {col.name}{': ' + desc if desc else ''}")
-                    schema_lines.append(f"- {tbl.qualified}\n" + "\n".join(col_lines))
-                parts.append("## Known tables (with column descriptions)\n" + "\n".join(schema_lines))
-            else:
-                names = ", ".join(t.qualified for t in tables)
-                parts.append("## Known tables\n" + names)
-
-    if ctx.store is not None:
-        scope = ctx.identity.kv_scope
-        raw = ctx.store.kv_get(scope, "schema_relationships")
-        if raw:
-            try:
-                rels = json.loads(raw)
-                if rels:
-                    rel_text = "\n".join(f"- {r}" for r in rels)
-                    parts.append("## Table relationships (use these for JOINs)\n" + rel_text)
-            except (ValueError, TypeError):
-                pass
+    if store is not None and scope is not None:
+        key = ("relationships", scope)
+        inputs = (gen(_KV_RELATIONSHIPS),)
+        section = cache.get(key, inputs) if cache else None
+        if section is None:
+            section = _relationships_section(store.kv_get(scope, _KV_RELATIONSHIPS))
+            if cache:
+                cache.put(key, inputs, section)
+        if section:
+            parts.append(section)
 
         from ..tools.semantic_federation import build_prompt_section
         user_id = ctx.identity.user_id or "unknown"
         channel_id = ctx.identity.effective_channel_id
-        semfed_section = build_prompt_section(ctx.store, scope, channel_id, user_id)
-        if semfed_section:
-            parts.append(semfed_section)
+        key = ("terms", scope, channel_id, user_id)
+        inputs = (gen(_KV_TERMS),)
+        section = cache.get(key, inputs) if cache else None
+        if section is None:
+            section = build_prompt_section(store, scope, channel_id, user_id)
+            if cache:
+                cache.put(key, inputs, section)
+        if section:
+            parts.append(section)
 
     return "\n\n".join(parts)
+
+
+async def _schema_section(ctx: HarnessContext, tables: list[Table], scope: str | None) -> str:
+    store = ctx.store
+    has_enrichment = bool(scope and store and store.kv_get(scope, _KV_RELATIONSHIPS))
+    if not (has_enrichment and scope and store):
+        names = ", ".join(t.qualified for t in tables)
+        return "## Known tables\n" + names
+
+    # One prefix scan instead of a kv_get per column.
+    enriched = dict(store.kv_list_prefix(scope, _KV_ENRICHED + ":"))
+    try:
+        described = await describe_all(ctx.explorer)  # type: ignore[arg-type]
+    except Exception:
+        described = tables
+    schema_lines: list[str] = []
+    for tbl in described:
+        if not tbl.columns:
+            schema_lines.append(f"- {tbl.qualified}")
+            continue
+        col_lines = []
+        for col in tbl.columns:
+            desc = col.description or enriched.get(f"{_KV_ENRICHED}:{tbl.name}:{col.name}") or ""
+            ref = f" → {col.foreign_key}" if col.foreign_key else ""
+            col_lines.append(f"  - {col.name}{ref}{': ' + desc if desc else ''}")
+        schema_lines.append(f"- {tbl.qualified}\n" + "\n".join(col_lines))
+    return "## Known tables (with column descriptions)\n" + "\n".join(schema_lines)
+
+
+def _relationships_section(raw: str | None) -> str:
+    if not raw:
+        return ""
+    try:
+        rels = json.loads(raw)
+    except (ValueError, TypeError):
+        return ""
+    if not rels:
+        return ""
+    rel_text = "\n".join(f"- {r}" for r in rels)
+    return "## Table relationships (use these for JOINs)\n" + rel_text
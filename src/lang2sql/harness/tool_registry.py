@@ -1,4 +1,10 @@
-"""Tool registry — name→tool dispatch and spec catalog for the loop."""
+"""Tool registry — name→tool dispatch and spec catalog for the loop.
+
+Tools are assumed safe to run concurrently with other calls from the same
+completion. A tool with side effects whose ordering matters (kv writes, audit
+records) opts out by setting a class attribute ``concurrent_safe = False``;
+the loop then runs it on its own, in call order.
+"""
 
 from __future__ import annotations
 
@@ -20,6 +26,11 @@ class ToolRegistry:
     def register(self, tool: ToolPort) -> None:
         self._tools[tool.spec.name] = tool
 
+    def is_concurrent(self, name: str) -> bool:
+        """Whether calls to ``name`` may overlap with other tool calls."""
+        tool = self._tools.get(name)
+        return tool is None or bool(getattr(tool, "concurrent_safe", True))
+
     def specs(self) -> list[ToolSpec]:
         return [t.spec for t in self._tools.values()]
 
@@ -3,6 +3,8 @@
 Asks an LLM to read a document and propose metric/dimension/rule definitions as
 a JSON array. Parsing is deliberately robust: ```json fences are stripped and
 any malformed response degrades to an empty candidate list rather than raising.
+When the LLM is a caching one, a response that yields no candidates is
+forgotten, so re-ingesting the document asks again instead of replaying it.
 v1.5 adds a DDL parser implementing the same :class:`DocExtractorPort`.
 """
 
@@ -33,13 +35,17 @@ class LLMExtractor:
 
     async def extract(self, doc: Document) -> list[SemanticCandidate]:
         prompt = f"{_INSTRUCTIONS}\n\nDocument: {doc.name}\n\n{doc.text}"
-        completion = await self._llm.complete([Message(role=Role.USER, content=prompt)])
+        messages = [Message(role=Role.USER, content=prompt)]
+        completion = await self._llm.complete(messages)
         rows = _parse(completion.content)
         candidates: list[SemanticCandidate] = []
         for row in rows:
             candidate = _to_candidate(row, doc.source_id)
             if candidate is not None:
                 candidates.append(candidate)
+        forget = getattr(self._llm, "forget", None)  # a CachingLLM
+        if not candidates and forget is not None:
+            forget(messages)
         return candidates
 
 
@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from .layers import RowLimitLayer, TimeoutLayer, WhitelistLayer
+from .layers import (
+    ComplexityLayer,
+    CostGateLayer,
+    RowLimitLayer,
+    SchemaCheckLayer,
+    TimeoutLayer,
+    WhitelistLayer,
+)
 from .pipeline import SafetyPipeline
 
-__all__ = ["SafetyPipeline", "WhitelistLayer", "RowLimitLayer", "TimeoutLayer"]
+__all__ = [
+    "SafetyPipeline", "WhitelistLayer", "SchemaCheckLayer", "ComplexityLayer", "RowLimitLayer",
+    "CostGateLayer", "TimeoutLayer",
+]
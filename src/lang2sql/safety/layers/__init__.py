@@ -2,8 +2,15 @@
 
 from __future__ import annotations
 
+from .complexity import ComplexityLayer, ComplexityReport, ComplexityThresholds
+from .cost_gate import CostEstimate, CostGateLayer, CostThresholds
 from .row_limit import RowLimitLayer
+from .schema_check import SchemaCheckLayer
 from .timeout import TimeoutLayer
 from .whitelist import WhitelistLayer
 
-__all__ = ["WhitelistLayer", "RowLimitLayer", "TimeoutLayer"]
+__all__ = [
+    "WhitelistLayer", "SchemaCheckLayer", "ComplexityLayer", "ComplexityReport",
+    "ComplexityThresholds", "RowLimitLayer", "CostGateLayer", "CostEstimate", "CostThresholds",
+    "TimeoutLayer",
+]
@@ -0,0 +1,467 @@
+"""ComplexityLayer — CONFIRM structurally expensive queries without asking the database.
+
+The cost gate needs an ``EXPLAIN`` round trip to see that a query is
+expensive. Many expensive shapes are visible in the text: this layer scores
+them from the lexer's token stream, plus the explorer's cached catalog, and
+asks for confirmation above per-guild :class:`ComplexityThresholds`:
+
+* **Join fan-out** — joined sources across all query scopes (``JOIN`` and
+  comma joins), above ``max_joins``.
+* **Cartesian products** — sources in one scope that no predicate connects:
+  ``CROSS JOIN``, comma joins without a linking ``WHERE`` comparison, ``JOIN``
+  without ``ON`` or with a constant one (``ON TRUE``). Subqueries, table
+  functions and ``LATERAL`` sources are taken as correlated, and a comparison
+  between unqualified columns is assumed to link its scope.
+* **``SELECT *`` over wide tables** — a star in the result (top-level) select
+  list over a catalogued table with more than ``wide_columns`` columns.
+* **Unbounded scans** — a large table read by a scope with no ``WHERE``
+  (a plain ``LIMIT`` without grouping, ordering or ``DISTINCT`` counts as
+  bounded; the default pipeline runs this layer after ``row_limit``, so the
+  injected one does too). Large means a catalog row estimate (:attr:`Table.row_estimate`) of
+  at least ``large_rows``, or a name listed in ``large_tables`` for catalogs
+  without statistics.
+
+Joins and cartesian products need only the text, so the sync ``check`` scores
+them; ``acheck`` adds the catalog checks and falls back to the text-only score
+when the catalog can't be read.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from ...core.ports.safety import SafetyContext, SafetyDecision, Verdict
+from ..lexer import IDENT, KEYWORDS, PUNCT, WORD, Token, split_statements, tokenize
+from .schema_check import collect_references, describe_name, index_tables
+
+_SET_OPERATORS = frozenset({"UNION", "INTERSECT", "EXCEPT", "MINUS"})
+_JOIN_WORDS = frozenset(
+    {"NATURAL", "LEFT", "RIGHT", "FULL", "INNER", "CROSS", "OUTER", "JOIN", "SEMI", "ANTI",
+     "ASOF", "POSITIONAL"}
+)
+# Clauses that end a FROM list (and a WHERE clause, bar WHERE itself).
+_CLAUSE_ENDS = frozenset(
+    {"WHERE", "GROUP", "HAVING", "ORDER", "LIMIT", "OFFSET", "FETCH", "QUALIFY", "WINDOW"}
+)
+_COMPARISONS = frozenset("=<>")
+
+
+@dataclass(frozen=True)
+class ComplexityThresholds:
+    """When a query's shape needs confirmation; ``None``/``False`` disables a check."""
+
+    max_joins: int | None = 8
+    cartesian: bool = True
+    wide_columns: int | None = 50
+    large_rows: int | None = 10_000_000
+    large_tables: frozenset[str] = frozenset()  # lower-case names, bare or schema-qualified
+
+
+@dataclass
+class ComplexityReport:
+    """What the scorer found in one statement."""
+
+    joins: int = 0
+    cartesian: list[str] = field(default_factory=list)  # "orders × users"
+    wide_star: list[str] = field(default_factory=list)  # "events (212 columns)"
+    unbounded: list[str] = field(default_factory=list)  # "events (~3,100,000,000 rows)"
+
+    def findings(self, limits: ComplexityThresholds) -> list[str]:
+        out = []
+        if limits.max_joins is not None and self.joins > limits.max_joins:
+            out.append(f"{self.joins} joins (limit {limits.max_joins})")
+        if limits.cartesian and self.cartesian:
+            out.append(f"cartesian product {', '.join(self.cartesian)}")
+        if self.wide_star:
+            out.append(f"SELECT * over {', '.join(self.wide_star)}")
+        if self.unbounded:
+            out.append(f"no WHERE on large table {', '.join(self.unbounded)}")
+        return out
+
+
+@dataclass
+class _Source:
+    name: str = ""    # lower-case table name; "" for subqueries and table functions
+    schema: str = ""
+    alias: str = ""
+    linked: bool = False  # joined by ON/USING/NATURAL, or correlated with the others
+
+    @property
+    def label(self) -> str:
+        return self.alias or self.name or "subquery"
+
+
+@dataclass
+class _Scope:
+    depth: int
+    top: bool  # produces the statement's result rows
+    tokens: list[Token] = field(default_factory=list)
+    sources: list[_Source] = field(default_factory=list)
+    cartesian: list[str] = field(default_factory=list)
+    stars: list[str] = field(default_factory=list)  # "" for ``*``, else the ``q`` of ``q.*``
+    bounded: bool = False
+
+
+def _lower(token: Token) -> str:
+    return (token.text[1:-1] if token.kind == IDENT else token.text).lower()
+
+
+def _is(token: Token | None, text: str) -> bool:
+    return token is not None and token.kind == PUNCT and token.text == text
+
+
+def _is_name(token: Token | None) -> bool:
+    return token is not None and (
+        token.kind == IDENT
+        or (token.kind == WORD and not (token.keyword in KEYWORDS or token.keyword in _JOIN_WORDS))
+    )
+
+
+def _is_comparison(token: Token | None) -> bool:
+    return token is not None and token.kind == PUNCT and token.text in _COMPARISONS
+
+
+def _joins_at(ts: list[Token], i: int, end: int) -> bool:
+    # A join keyword, not the ``LEFT(``/``RIGHT(`` string functions.
+    return ts[i].keyword in _JOIN_WORDS and not (i + 1 < end and _is(ts[i + 1], "("))
+
+
+def _clause_end(ts: list[Token], at_level: list[bool], start: int) -> int:
+    return next(
+        (i for i in range(start, len(ts)) if at_level[i] and ts[i].keyword in _CLAUSE_ENDS),
+        len(ts),
+    )
+
+
+def _split_scopes(tokens: tuple[Token, ...]) -> list[_Scope]:
+    """Each SELECT body — subqueries, CTE bodies, set-operation branches — on its own.
+
+    A nested query leaves only its brackets in the enclosing scope.
+    """
+    root = _Scope(0, top=True)
+    scopes, stack = [root], [root]
+    for i, token in enumerate(tokens):
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+        if _is(token, "("):
+            stack[-1].tokens.append(token)
+            if nxt is not None and nxt.keyword in ("SELECT", "WITH", "VALUES"):
+                # ``SELECT * FROM (...)`` returns the subquery's select list as
+                # is — the shape row_limit wraps set operations in.
+                tail = stack[-1].tokens[-4:-1]
+                top = (
+                    stack[-1].top
+                    and len(tail) == 3
+                    and tail[0].keyword == "SELECT"
+                    and _is(tail[1], "*")
+                    and tail[2].keyword == "FROM"
+                )
+                stack.append(_Scope(token.depth + 1, top=top))
+                scopes.append(stack[-1])
+            continue
+        if _is(token, ")") and len(stack) > 1 and token.depth < stack[-1].depth:
+            stack.pop()
+        elif (
+            token.depth == stack[-1].depth
+            and token.keyword in _SET_OPERATORS
+            and not _is(nxt, "(")  # BigQuery ``* EXCEPT (col)``
+        ):
+            stack[-1] = _Scope(token.depth, top=stack[-1].top)
+            scopes.append(stack[-1])
+            continue
+        stack[-1].tokens.append(token)
+    return scopes
+
+
+def _skip_brackets(ts: list[Token], i: int) -> int:
+    """Index just past the ``)`` matching the ``(`` at ``ts[i]``."""
+    depth = ts[i].depth
+    i += 1
+    while i < len(ts) and not (_is(ts[i], ")") and ts[i].depth == depth):
+        i += 1
+    return i + 1
+
+
+def _qualifier_before(ts: list[Token], k: int) -> str | None:
+    # ``q.c`` ending at ``ts[k]``: "q"; a bare column: ""; anything else: None.
+    if k < 0 or not _is_name(ts[k]):
+        return None
+    if k >= 2 and _is(ts[k - 1], ".") and ts[k - 2].kind in (WORD, IDENT):
+        return _lower(ts[k - 2])
+    return ""
+
+
+def _qualifier_after(ts: list[Token], k: int) -> str | None:
+    # ``q.c`` starting at ``ts[k]``: "q"; a bare column: ""; anything else: None.
+    if k >= len(ts) or not _is_name(ts[k]):
+        return None
+    nxt = ts[k + 1] if k + 1 < len(ts) else None
+    if _is(nxt, "."):
+        return _lower(ts[k])
+    return None if _is(nxt, "(") else ""
+
+
+def _analyse(scope: _Scope) -> None:
+    ts, level = scope.tokens, scope.depth
+    at_level = [t.depth == level and t.kind == WORD for t in ts]
+    start = next(
+        (i for i, t in enumerate(ts)
+         if at_level[i] and t.keyword == "FROM" and not (i and ts[i - 1].keyword == "DISTINCT")),
+        None,
+    )
+    words = {t.keyword for i, t in enumerate(ts) if at_level[i]}
+    scope.bounded = "WHERE" in words or (
+        not words.isdisjoint({"LIMIT", "FETCH", "TOP"})
+        and words.isdisjoint({"GROUP", "ORDER", "DISTINCT"})
+    )
+    select_end = start if start is not None else len(ts)
+    for k in range(select_end):
+        if ts[k].depth == level and _is(ts[k], "*"):
+            prev = ts[k - 1] if k else None
+            if prev is not None and (
+                prev.keyword in ("SELECT", "DISTINCT", "ALL") or _is(prev, ",")
+            ):
+                scope.stars.append("")
+            elif _is(prev, ".") and k >= 2:
+                scope.stars.append(_lower(ts[k - 2]))
+    if start is None:
+        return
+    end = _clause_end(ts, at_level, start + 1)
+
+    sources = scope.sources
+    groups: list[int] = []  # union-find parent per source
+    conditions: list[list[Token]] = []  # ON and WHERE predicates
+
+    def find(a: int) -> int:
+        while groups[a] != a:
+            groups[a] = groups[groups[a]]
+            a = groups[a]
+        return a
+
+    def union(a: int, b: int) -> None:
+        groups[find(a)] = find(b)
+
+    current: _Source | None = None
+    natural = False
+    i = start + 1
+    while i < end:
+        token = ts[i]
+        level_here = token.depth == level
+        if level_here and _is(token, ","):
+            current, natural = None, False
+            i += 1
+            continue
+        if level_here and _joins_at(ts, i, end):
+            mods: set[str] = set()
+            while i < end and ts[i].depth == level and _joins_at(ts, i, end):
+                mods.add(ts[i].keyword)
+                i += 1
+            current, natural = None, "NATURAL" in mods
+            continue
+        if current is None:
+            current = _Source(linked=natural)
+            sources.append(current)
+            groups.append(len(groups))
+            while i < end and ts[i].keyword in ("LATERAL", "ONLY"):
+                current.linked |= ts[i].keyword == "LATERAL"
+                i += 1
+            if i >= end:
+                break
+            if _is(ts[i], "("):
+                current.linked = True  # subquery or parenthesised join
+                i = _skip_brackets(ts, i)
+            elif ts[i].kind in (WORD, IDENT):
+                path = [_lower(ts[i])]
+                while i + 2 < end and _is(ts[i + 1], ".") and ts[i + 2].kind in (WORD, IDENT):
+                    i += 2
+                    path.append(_lower(ts[i]))
+                i += 1
+                if i < end and _is(ts[i], "("):
+                    current.linked = True  # table function (UNNEST, range, …)
+                    i = _skip_brackets(ts, i)
+                else:
+                    path = ".".join(path).split(".")  # a backquoted ``dataset.table``
+                    current.name = path[-1]
+                    current.schema = path[-2] if len(path) > 1 else ""
+            if i < end and ts[i].keyword == "AS":
+                i += 1
+            if i < end and _is_name(ts[i]) and ts[i].keyword not in ("ON", "USING"):
+                current.alias = _lower(ts[i])
+                i += 1
+                if i < end and _is(ts[i], "("):  # alias column list
+                    i = _skip_brackets(ts, i)
+            continue
+        if level_here and token.keyword == "USING":
+            current.linked = True  # ``current`` is set: USING follows a source
+        elif level_here and token.keyword == "ON":
+            j = i + 1
+            while j < end and not (
+                ts[j].depth == level and (_is(ts[j], ",") or _joins_at(ts, j, end))
+            ):
+                j += 1
+            condition = ts[i + 1 : j]
+            if any(_is_name(t) for t in condition):
+                current.linked = True
+                conditions.append(condition)
+            i = j
+            continue
+        i += 1
+
+    names: dict[str, int] = {}
+    for n, source in enumerate(sources):
+        for key in (source.name, source.alias):
+            if key:
+                names[key] = n
+        if source.linked and n:
+            union(n, n - 1)
+    where = next((i for i in range(end, len(ts)) if at_level[i] and ts[i].keyword == "WHERE"), None)
+    if where is not None:
+        conditions.append(ts[where + 1 : _clause_end(ts, at_level, where + 1)])
+    for condition in conditions:
+        for k, token in enumerate(condition):
+            if not _is_comparison(token) or (k and _is_comparison(condition[k - 1])):
+                continue  # not an operator, or the second half of ``<=``/``<>``/``>=``
+            right = k + 1
+            if right < len(condition) and _is_comparison(condition[right]):
+                right += 1
+            left_q = _qualifier_before(condition, k - 1)
+            right_q = _qualifier_after(condition, right)
+            if left_q is None or right_q is None:
+                continue
+            if left_q in names and right_q in names:
+                union(names[left_q], names[right_q])
+            elif not left_q or not right_q:
+                for n in range(1, len(sources)):  # unqualified: can't tell, assume linked
+                    union(n, 0)
+
+    components: dict[int, list[str]] = {}
+    for n, source in enumerate(sources):
+        components.setdefault(find(n), []).append(source.label)
+    if len(components) > 1:
+        scope.cartesian.append(" × ".join(labels[0] for labels in components.values()))
+
+
+def _structure(sql: str) -> tuple[list[_Scope], ComplexityReport] | None:
+    statements = split_statements(tokenize(sql))
+    if len(statements) != 1:
+        return None
+    scopes = _split_scopes(statements[0])
+    report = ComplexityReport()
+    for scope in scopes:
+        _analyse(scope)
+        report.joins += max(0, len(scope.sources) - 1)
+        report.cartesian.extend(scope.cartesian)
+    return scopes, report
+
+
+class ComplexityLayer:
+    """CONFIRM above structural thresholds. ``SafetyLayerPort`` with ``acheck``."""
+
+    def __init__(
+        self,
+        thresholds: ComplexityThresholds | None = None,
+        *,
+        scope_thresholds: Mapping[str, ComplexityThresholds] | None = None,
+    ) -> None:
+        self._thresholds = thresholds or ComplexityThresholds()
+        self._scope_thresholds: dict[str, ComplexityThresholds] = dict(scope_thresholds or {})
+        # Bumped on every threshold change so cached decisions aren't replayed.
+        self.config_version = 0
+
+    @property
+    def name(self) -> str:
+        return "complexity"
+
+    def thresholds_for(self, scope: str) -> ComplexityThresholds:
+        return self._scope_thresholds.get(scope, self._thresholds)
+
+    def set_thresholds(self, scope: str, thresholds: ComplexityThresholds | None) -> None:
+        """Override the thresholds for one guild (``None`` restores the default)."""
+        if thresholds is None:
+            self._scope_thresholds.pop(scope, None)
+        else:
+            self._scope_thresholds[scope] = thresholds
+        self.config_version += 1
+
+    def check(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        structure = _structure(sql)
+        report = structure[1] if structure is not None else ComplexityReport()
+        return self._judge(sql, report, self.thresholds_for(ctx.scope))
+
+    async def acheck(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        limits = self.thresholds_for(ctx.scope)
+        try:
+            report = await self.score(sql, ctx.explorer, limits)
+        except Exception:
+            structure = _structure(sql)  # catalog unreadable: text-only score
+            report = structure[1] if structure is not None else ComplexityReport()
+        return self._judge(sql, report, limits)
+
+    async def score(
+        self, sql: str, explorer: Any = None, limits: ComplexityThresholds | None = None
+    ) -> ComplexityReport:
+        """Structural score of ``sql``; catalog checks need ``explorer``."""
+        limits = limits or self._thresholds
+        structure = _structure(sql)
+        if structure is None:
+            return ComplexityReport()
+        scopes, report = structure
+        if explorer is None or not (
+            limits.wide_columns or limits.large_rows or limits.large_tables
+        ):
+            return report
+        index = index_tables(await explorer.list_tables())
+        schemas = {schema for schema, _ in index if schema}
+        ctes = collect_references(tokenize(sql)).ctes
+        widths: dict[str, int] = {}
+        for scope in scopes:
+            named = []
+            for source in scope.sources:
+                if not source.name or (not source.schema and source.name in ctes):
+                    continue
+                # A schema the catalog doesn't list may be its default one:
+                # fall back to the bare name when only one table has it.
+                schema = source.schema if source.schema in schemas else ""
+                table = index.get((schema, source.name))
+                if table is not None:
+                    named.append((source, table))
+            if not scope.bounded:
+                for source, table in named:
+                    rows = table.row_estimate
+                    marked = source.name in limits.large_tables or (
+                        table.qualified.lower() in limits.large_tables
+                    )
+                    if marked or (
+                        limits.large_rows and rows is not None and rows >= limits.large_rows
+                    ):
+                        size = f" (~{rows:,} rows)" if rows is not None else ""
+                        report.unbounded.append(f"{source.name}{size}")
+            if not (scope.top and scope.stars and limits.wide_columns):
+                continue
+            for source, table in named:
+                if "" not in scope.stars and not {source.name, source.alias} & set(scope.stars):
+                    continue
+                width_key = table.qualified.lower()
+                if width_key not in widths:
+                    described = await explorer.describe_table(describe_name(index, table))
+                    widths[width_key] = len(described.columns)
+                if widths[width_key] > limits.wide_columns:
+                    report.wide_star.append(f"{source.name} ({widths[width_key]} columns)")
+        report.unbounded = list(dict.fromkeys(report.unbounded))
+        report.wide_star = list(dict.fromkeys(report.wide_star))
+        return report
+
+    def _judge(
+        self, sql: str, report: ComplexityReport, limits: ComplexityThresholds
+    ) -> SafetyDecision:
+        findings = report.findings(limits)
+        if not findings:
+            return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
+        summary = "; ".join(findings)
+        return SafetyDecision(
+            verdict=Verdict.CONFIRM,
+            sql=sql,
+            reason=summary,
+            layer=self.name,
+            confirm_prompt=f"This query looks expensive ({summary}). Run it anyway?",
+        )
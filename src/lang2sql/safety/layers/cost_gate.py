@@ -0,0 +1,252 @@
+"""CostGateLayer — asks the database what a query will cost before it runs.
+
+The other layers only read the SQL text, so a ``SELECT *`` cross join of two
+huge tables passes the whitelist and lands on the warehouse. This layer runs
+the dialect's planner instead and compares its estimate with per-guild
+thresholds: above ``confirm_*`` it returns CONFIRM, above ``block_*`` BLOCK.
+
+* **PostgreSQL** — ``EXPLAIN (FORMAT JSON)``; the largest ``Plan Rows`` of any
+  node (so a ``LIMIT`` on top does not hide the join under it) and the root's
+  ``Total Cost``.
+* **DuckDB** — ``EXPLAIN (FORMAT JSON)``; ``Estimated Cardinality`` per node,
+  with cross products (which carry none) sized as the product of their inputs.
+* **BigQuery** — bytes processed from a dry run, through the injectable
+  ``bigquery_dry_run(sql) -> bytes`` hook (the adapter owns the client).
+
+Estimating needs the explorer, so the work happens in the async ``acheck``,
+called by :meth:`SafetyPipeline.aevaluate` with ``ctx.explorer`` and
+``ctx.scope`` set; the sync ``check`` always passes. So does any failure to
+estimate — an unknown dialect, a planner error, an ``EXPLAIN`` slower than
+``explain_timeout`` — since the runtime timeout still bounds the query. The
+built-in ``EXPLAIN`` estimators also pass ``explain_timeout`` to
+``explorer.execute``, so the server abandons a slow plan too.
+Estimates are cached by connection and query fingerprint for ``cache_ttl``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping
+
+from ...core.ports.explorer import explorer_dialect, explorer_fingerprint
+from ...core.ports.safety import SafetyContext, SafetyDecision, Verdict
+from ...core.sql import normalize_sql, sql_fingerprint
+
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_CACHE_TTL_SECONDS = 600.0
+DEFAULT_EXPLAIN_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class CostEstimate:
+    """What the planner expects; ``None`` where the dialect doesn't say."""
+
+    rows: float | None = None
+    cost: float | None = None
+    bytes: int | None = None
+
+
+@dataclass(frozen=True)
+class CostThresholds:
+    """Limits per measure; ``None`` disables that check."""
+
+    confirm_rows: float | None = 10_000_000
+    block_rows: float | None = 1_000_000_000
+    confirm_cost: float | None = None
+    block_cost: float | None = None
+    confirm_bytes: int | None = 10 * 1024**3
+    block_bytes: int | None = 1024**4
+
+
+Estimator = Callable[[Any, str], Awaitable[CostEstimate]]
+DryRun = Callable[[str], "int | Awaitable[int]"]
+
+
+class CostGateLayer:
+    """CONFIRM/BLOCK on planner estimates. ``SafetyLayerPort`` with an async ``acheck``."""
+
+    def __init__(
+        self,
+        thresholds: CostThresholds | None = None,
+        *,
+        scope_thresholds: Mapping[str, CostThresholds] | None = None,
+        estimators: Mapping[str, Estimator] | None = None,
+        bigquery_dry_run: DryRun | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+        explain_timeout: float = DEFAULT_EXPLAIN_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._thresholds = thresholds or CostThresholds()
+        self._scope_thresholds: dict[str, CostThresholds] = dict(scope_thresholds or {})
+        # Bumped on every threshold change so cached decisions aren't replayed.
+        self.config_version = 0
+        self._estimators: dict[str, Estimator] = {
+            "postgresql": functools.partial(explain_postgres, timeout=explain_timeout),
+            "duckdb": functools.partial(explain_duckdb, timeout=explain_timeout),
+        }
+        if bigquery_dry_run is not None:
+            self._estimators["bigquery"] = _dry_run_estimator(bigquery_dry_run)
+        self._estimators.update(estimators or {})
+        self._cache_size = max(0, cache_size)
+        self._cache_ttl = cache_ttl
+        self._explain_timeout = explain_timeout
+        self._clock = clock
+        self._cache: OrderedDict[str, tuple[CostEstimate, float]] = OrderedDict()
+
+    @property
+    def name(self) -> str:
+        return "cost_gate"
+
+    def thresholds_for(self, scope: str) -> CostThresholds:
+        return self._scope_thresholds.get(scope, self._thresholds)
+
+    def set_thresholds(self, scope: str, thresholds: CostThresholds | None) -> None:
+        """Override the thresholds for one guild (``None`` restores the default)."""
+        if thresholds is None:
+            self._scope_thresholds.pop(scope, None)
+        else:
+            self._scope_thresholds[scope] = thresholds
+        self.config_version += 1
+
+    def check(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        # No explorer on the sync path; the estimate is made in ``acheck``.
+        return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
+
+    async def acheck(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        estimate = await self.estimate(sql, ctx.explorer)
+        if estimate is not None:
+            return self._judge(sql, estimate, self.thresholds_for(ctx.scope))
+        return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
+
+    async def estimate(self, sql: str, explorer: Any) -> CostEstimate | None:
+        """The (cached) planner estimate for ``sql``, or ``None`` if unavailable."""
+        if explorer is None:
+            return None
+        estimator = self._estimators.get(explorer_dialect(explorer))
+        if estimator is None:
+            return None
+        key = f"{explorer_fingerprint(explorer)}:{sql_fingerprint(sql)}"
+        now = self._clock()
+        hit = self._cache.get(key)
+        if hit is not None and hit[1] > now:
+            self._cache.move_to_end(key)
+            return hit[0]
+        try:
+            estimate = await asyncio.wait_for(
+                estimator(explorer, normalize_sql(sql)), self._explain_timeout
+            )
+        except Exception:
+            return None  # fail open: the runtime timeout still bounds the query
+        if self._cache_size:
+            self._cache[key] = (estimate, now + self._cache_ttl)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return estimate
+
+    def _judge(self, sql: str, estimate: CostEstimate, limits: CostThresholds) -> SafetyDecision:
+        measures = (
+            ("rows", estimate.rows, limits.confirm_rows, limits.block_rows),
+            ("cost", estimate.cost, limits.confirm_cost, limits.block_cost),
+            ("bytes", estimate.bytes, limits.confirm_bytes, limits.block_bytes),
+        )
+        blocked, confirm = [], []
+        for label, value, confirm_at, block_at in measures:
+            if value is None:
+                continue
+            if block_at is not None and value > block_at:
+                blocked.append(f"{label} ~{_human(value)} > {_human(block_at)}")
+            elif confirm_at is not None and value > confirm_at:
+                confirm.append(f"{label} ~{_human(value)} > {_human(confirm_at)}")
+        if blocked:
+            return SafetyDecision(
+                verdict=Verdict.BLOCK,
+                sql=sql,
+                reason=f"estimated {', '.join(blocked)} (guild limit). "
+                "Add filters or aggregate before selecting rows.",
+                layer=self.name,
+            )
+        if confirm:
+            return SafetyDecision(
+                verdict=Verdict.CONFIRM,
+                sql=sql,
+                reason=f"estimated {', '.join(confirm)}",
+                layer=self.name,
+                confirm_prompt=f"This query is expensive (estimated {', '.join(confirm)}). "
+                "Run it anyway?",
+            )
+        return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
+
+
+async def explain_postgres(
+    explorer: Any, sql: str, *, timeout: float | None = None
+) -> CostEstimate:
+    """``EXPLAIN (FORMAT JSON)`` on PostgreSQL: widest node's rows, root's total cost."""
+    result = await explorer.execute(f"EXPLAIN (FORMAT JSON) {sql}", 1, timeout=timeout)
+    plan = _json_value(result.rows[0][0])
+    root = plan[0]["Plan"]
+    rows = max(float(node.get("Plan Rows", 0)) for node in _walk(root, "Plans"))
+    return CostEstimate(rows=rows, cost=float(root.get("Total Cost", 0)))
+
+
+async def explain_duckdb(
+    explorer: Any, sql: str, *, timeout: float | None = None
+) -> CostEstimate:
+    """``EXPLAIN (FORMAT JSON)`` on DuckDB: the largest cardinality any operator expects."""
+    result = await explorer.execute(f"EXPLAIN (FORMAT JSON) {sql}", 10, timeout=timeout)
+    widest = [0.0]
+    for _, value in result.rows:
+        for node in _json_value(value):
+            _duckdb_rows(node, widest)
+    return CostEstimate(rows=widest[0])
+
+
+def _duckdb_rows(node: dict, widest: list[float]) -> float:
+    # Rows this operator emits; ``widest`` collects the maximum over the tree.
+    children = [_duckdb_rows(child, widest) for child in node.get("children", [])]
+    estimated = (node.get("extra_info") or {}).get("Estimated Cardinality")
+    if estimated is not None:
+        rows = float(estimated)
+    elif node.get("name") in ("CROSS_PRODUCT", "NESTED_LOOP_JOIN", "BLOCKWISE_NL_JOIN"):
+        rows = 1.0
+        for child in children:
+            rows *= child
+    else:
+        rows = max(children, default=0.0)
+    widest[0] = max(widest[0], rows)
+    return rows
+
+
+def _dry_run_estimator(dry_run: DryRun) -> Estimator:
+    async def estimate(explorer: Any, sql: str) -> CostEstimate:
+        processed = dry_run(sql)
+        if inspect.isawaitable(processed):
+            processed = await processed
+        return CostEstimate(bytes=int(processed))
+
+    return estimate
+
+
+def _json_value(value: Any) -> Any:
+    # Drivers hand EXPLAIN JSON back either as text or already decoded.
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _walk(node: dict, key: str):
+    yield node
+    for child in node.get(key, []):
+        yield from _walk(child, key)
+
+
+def _human(value: float) -> str:
+    for unit, size in (("T", 1e12), ("G", 1e9), ("M", 1e6), ("k", 1e3)):
+        if value >= size:
+            return f"{value / size:.3g}{unit}"
+    return f"{value:.3g}"
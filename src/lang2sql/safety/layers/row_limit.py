@@ -1,41 +1,165 @@
-"""RowLimitLayer — automatically appends LIMIT to queries that lack one.
+"""RowLimitLayer — makes the database, not the client, stop at the row limit.
 
 Returns PASS (not REWRITE) so the rewritten SQL flows into the next layer
 (TimeoutLayer) and ctx.timeout_seconds still gets configured.
+
+Reads the shared token stream (:mod:`..lexer`), so a limit inside a string,
+comment, subquery or CTE doesn't count, and the rewrite goes after the last
+real token — past any trailing ``;`` or comment. The clause follows the
+connected explorer's dialect (``ctx.explorer``):
+
+* ``LIMIT n`` by default;
+* ``FETCH FIRST n ROWS ONLY`` on Oracle and DB2;
+* ``SELECT TOP n`` on SQL Server-style dialects, or ``OFFSET 0 ROWS FETCH
+  NEXT n ROWS ONLY`` after a top-level ``ORDER BY`` (where TOP can't reach a
+  whole ``UNION``).
+
+A top-level ``UNION``/``INTERSECT``/``EXCEPT`` without its own ``ORDER BY`` is
+wrapped in an outer ``SELECT * FROM (...) limited`` so the limit applies to the
+combined result; a ``WITH`` prefix stays outside the wrapper. An explicit
+top-level ``LIMIT``/``TOP``/``FETCH`` larger than ``ctx.row_limit`` is
+tightened to it; smaller ones are left alone.
 """
 
 from __future__ import annotations
 
-import re
-
+from ...core.ports.explorer import explorer_dialect
 from ...core.ports.safety import SafetyContext, SafetyDecision, Verdict
+from ..lexer import NUMBER, PUNCT, WORD, Token, tokenize
+
+DEFAULT_ROW_LIMIT = 1000
+
+_TOP_DIALECTS = frozenset({"mssql", "sybase", "teradata"})
+_FETCH_DIALECTS = frozenset({"oracle", "db2", "ibm_db_sa"})
+
+_SET_OPERATORS = frozenset({"UNION", "INTERSECT", "EXCEPT", "MINUS"})
+
+
+def _word(token: Token | None, *words: str) -> bool:
+    return token is not None and token.kind == WORD and token.text.upper() in words
+
+
+def _punct(token: Token | None, text: str) -> bool:
+    return token is not None and token.kind == PUNCT and token.text == text
+
 
-_LIMIT_RE = re.compile(r"\bLIMIT\s+\d+", re.IGNORECASE)
+def _statement_end(tokens: tuple[Token, ...]) -> int:
+    """Index just past the last token that isn't a ``;``."""
+    end = len(tokens)
+    while end and _punct(tokens[end - 1], ";"):
+        end -= 1
+    return end
 
 
-def _has_top_level_limit(sql: str) -> bool:
-    """True if a LIMIT clause exists at parenthesis depth 0."""
-    depth = 0
-    for part in re.split(r"(\(|\))", sql):
-        if part == "(":
-            depth += 1
-        elif part == ")":
-            depth -= 1
-        elif depth == 0 and _LIMIT_RE.search(part):
-            return True
-    return False
+def _main_start(tokens: tuple[Token, ...], end: int) -> int:
+    """Index of the first token after a leading ``WITH`` list (0 without one)."""
+    if not _word(tokens[0], "WITH"):
+        return 0
+    i = 1
+    while i < end:
+        # Each CTE: name [(columns)] AS [[NOT] MATERIALIZED] ( body ) — skip to
+        # the body's opening paren, then past its closing one.
+        while i < end and not (
+            _punct(tokens[i], "(") and tokens[i].depth == 0
+            and _word(tokens[i - 1], "AS", "MATERIALIZED")
+        ):
+            i += 1
+        i += 1
+        while i < end and not (_punct(tokens[i], ")") and tokens[i].depth == 0):
+            i += 1
+        i += 1
+        if not (i < end and _punct(tokens[i], ",")):
+            return i
+        i += 1
+    return end
+
+
+def _explicit_limit(tokens: tuple[Token, ...], start: int, end: int) -> Token | None:
+    """The row-count token of a top-level LIMIT / TOP / FETCH, if any.
+
+    ``LIMIT ALL`` yields the ``ALL`` word (to be replaced by a number).
+    """
+    for i in range(start, end):
+        token = tokens[i]
+        if token.depth or token.kind != WORD:
+            continue
+        keyword = token.text.upper()
+        after = tokens[i + 1] if i + 1 < end else None
+        if keyword == "LIMIT" and after is not None:
+            if after.kind == NUMBER and i + 3 < end and _punct(tokens[i + 2], ","):
+                return tokens[i + 3]  # MySQL ``LIMIT offset, count``
+            if after.kind == NUMBER or _word(after, "ALL"):
+                return after
+        elif keyword == "TOP" and after is not None:
+            if _punct(after, "(") and i + 2 < end:
+                after = tokens[i + 2]  # ``TOP (n)``
+            if after.kind == NUMBER:
+                return after
+        elif keyword == "FETCH" and _word(after, "FIRST", "NEXT"):
+            count = tokens[i + 2] if i + 2 < end else None
+            # ``FETCH FIRST ROW ONLY`` is one row; report the FETCH itself.
+            return count if count is not None and count.kind == NUMBER else token
+    return None
 
 
 class RowLimitLayer:
-    """Appends LIMIT when absent; leaves explicit LIMITs untouched."""
+    """Adds or tightens the dialect's row limit so the database stops early."""
 
     @property
     def name(self) -> str:
         return "row_limit"
 
     def check(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
-        if _has_top_level_limit(sql):
-            return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
-        limit = ctx.row_limit if ctx.row_limit and ctx.row_limit > 0 else 1000
-        rewritten = sql.rstrip().rstrip(";") + f"\nLIMIT {limit}"
+        limit = ctx.row_limit if ctx.row_limit and ctx.row_limit > 0 else DEFAULT_ROW_LIMIT
+        rewritten = limit_sql(sql, limit, explorer_dialect(ctx.explorer))
         return SafetyDecision(verdict=Verdict.PASS, sql=rewritten, layer=self.name)
+
+
+def limit_sql(sql: str, limit: int, dialect: str = "") -> str:
+    """``sql`` with at most ``limit`` rows, in ``dialect``'s syntax."""
+    tokens = tokenize(sql)
+    end = _statement_end(tokens)
+    if not end:
+        return sql
+    main = _main_start(tokens, end)
+    if main >= end:
+        return sql
+
+    explicit = _explicit_limit(tokens, main, end)
+    if explicit is not None:
+        if _word(explicit, "FETCH") or (explicit.kind == NUMBER and float(explicit.text) <= limit):
+            return sql
+        return sql[: explicit.start] + str(limit) + sql[explicit.end :]
+
+    body = sql[: tokens[end - 1].end]
+    top_level = [t.text.upper() for t in tokens[main:end] if t.depth == 0 and t.kind == WORD]
+    ordered = any(a == "ORDER" and b == "BY" for a, b in zip(top_level, top_level[1:]))
+    combined = not _SET_OPERATORS.isdisjoint(top_level)
+
+    if dialect in _TOP_DIALECTS:
+        if ordered:
+            return f"{body}\nOFFSET 0 ROWS FETCH NEXT {limit} ROWS ONLY"
+        if combined:
+            return _wrap(tokens, main, body, f"SELECT TOP {limit} * FROM", "")
+        select = next(
+            (i for i in range(main, end) if tokens[i].depth == 0 and _word(tokens[i], "SELECT")),
+            None,
+        )
+        if select is None:
+            return sql
+        after = select + 1
+        if _word(tokens[after] if after < end else None, "DISTINCT", "ALL"):
+            after += 1
+        at = tokens[after].start if after < end else len(body)
+        return f"{body[:at]}TOP {limit} {body[at:]}"
+
+    clause = f"FETCH FIRST {limit} ROWS ONLY" if dialect in _FETCH_DIALECTS else f"LIMIT {limit}"
+    if combined and not ordered:
+        return _wrap(tokens, main, body, "SELECT * FROM", f"\n{clause}")
+    return f"{body}\n{clause}"
+
+
+def _wrap(tokens: tuple[Token, ...], main: int, body: str, head: str, tail: str) -> str:
+    # Keep a WITH list outside: not every dialect allows it in a subquery.
+    cut = tokens[main].start
+    return f"{body[:cut]}{head} (\n{body[cut:]}\n) limited{tail}"
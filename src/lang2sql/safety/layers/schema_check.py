@@ -0,0 +1,306 @@
+"""SchemaCheckLayer — reject unknown tables and columns before the warehouse does.
+
+A hallucinated column costs a warehouse round trip to fail and an LLM turn to
+fix. This layer resolves the query's table and column references against the
+explorer's catalog (``list_tables``/``describe_table``, memory lookups once
+the catalog is warm) and BLOCKs with "did you mean" suggestions instead, so
+the model's retry starts from a local error.
+
+Resolution works on the lexer's token stream, not a parser, and leans towards
+passing whatever it cannot pin down:
+
+* Tables are the names after ``FROM``/``JOIN`` (and comma-joined sources) in a
+  query scope. CTE names, subqueries, table functions and names qualified with
+  a schema the catalog doesn't list are not checked.
+* ``alias.column`` is checked against the table the alias (or table name)
+  refers to; other qualifiers (struct fields, derived tables) are left alone.
+* Bare names are not checked: telling a column from a dialect keyword
+  (``SYSDATE``, ``CONVERT(x, CHAR)``, ``BETWEEN SYMMETRIC``) or an implicit
+  alias without a grammar is guesswork, so those misses are left for the
+  warehouse to report.
+
+Like the cost gate it needs the explorer, so it runs in ``acheck`` (through
+:meth:`SafetyPipeline.aevaluate`) and passes on the sync path, when there is
+no explorer, or when the catalog can't be read.
+"""
+
+from __future__ import annotations
+
+import difflib
+from dataclasses import dataclass, field
+from typing import Any
+
+from ...core.ports.explorer import Table
+from ...core.ports.safety import SafetyContext, SafetyDecision, Verdict
+from ..lexer import IDENT, KEYWORDS, PUNCT, WORD, Token, split_statements, tokenize
+
+# Words before "(" that open a plain parenthesised expression, not a call.
+_NOT_CALLS = frozenset({"IN", "EXISTS", "ANY", "ALL", "SOME", "AS", "ON", "USING", "OVER",
+                        "FILTER", "WITHIN", "AND", "OR", "NOT", "FROM", "JOIN", "LATERAL",
+                        "SELECT", "WHERE", "HAVING", "BY", "WHEN", "THEN", "ELSE", "VALUES"})
+
+_SOURCE_KEYWORDS = frozenset({"FROM", "JOIN"})
+# Words between FROM/JOIN and the source name, or a source and its alias.
+_SOURCE_MODIFIERS = frozenset({"LATERAL", "ONLY"})
+
+
+def _lower(token: Token) -> str:
+    text = token.text
+    if token.kind == IDENT:
+        text = text[1:-1]
+    return text.lower()
+
+
+def _is_name(token: Token) -> bool:
+    return token.kind == IDENT or (token.kind == WORD and token.text.upper() not in KEYWORDS)
+
+
+def _is(token: Token | None, text: str) -> bool:
+    return token is not None and token.kind == PUNCT and token.text == text
+
+
+@dataclass
+class _TableRef:
+    schema: str
+    name: str
+
+
+@dataclass
+class _References:
+    tables: list[_TableRef] = field(default_factory=list)
+    ctes: set[str] = field(default_factory=set)
+    # alias or table name (lower) → referenced table, None for derived sources
+    sources: dict[str, _TableRef | None] = field(default_factory=dict)
+    qualified: list[tuple[str, str]] = field(default_factory=list)  # (qualifier, column)
+
+
+def collect_references(tokens: tuple[Token, ...]) -> _References:
+    """Table sources, aliases and qualified column references of one statement."""
+    refs = _References()
+    n = len(tokens)
+
+    def at(i: int) -> Token | None:
+        return tokens[i] if 0 <= i < n else None
+
+    consumed: set[int] = set()
+    # Paren kinds by depth: "query" (subquery), "call" (function arguments) or
+    # "group"; FROM/JOIN only introduce sources in query scopes.
+    scopes = ["query"]
+    for i, token in enumerate(tokens):
+        if _is(token, "("):
+            prev, nxt = at(i - 1), at(i + 1)
+            if nxt is not None and nxt.text.upper() in ("SELECT", "WITH", "VALUES"):
+                scopes.append("query")
+            elif prev is not None and prev.kind in (WORD, IDENT) and prev.text.upper() not in _NOT_CALLS:
+                scopes.append("call")
+            else:
+                scopes.append("group")
+            if prev is not None and prev.kind == WORD and prev.text.upper() == "AS":
+                _note_cte(tokens, i - 2, refs, consumed)
+        elif _is(token, ")"):
+            if len(scopes) > 1:
+                scopes.pop()
+        elif (
+            token.kind == WORD
+            and scopes[-1] != "call"
+            and token.text.upper() in _SOURCE_KEYWORDS
+            and not (i and tokens[i - 1].text.upper() == "DISTINCT")  # IS DISTINCT FROM
+        ):
+            _read_sources(tokens, i + 1, refs, consumed)
+
+    for i, token in enumerate(tokens):
+        if i in consumed or token.kind not in (WORD, IDENT):
+            continue
+        if token.kind == WORD and token.text.upper() in KEYWORDS:
+            continue
+        prev, nxt = at(i - 1), at(i + 1)
+        if _is(nxt, "(") or _is(prev, ".") or _is(prev, ":"):
+            continue  # a function, the tail of a qualified name, a ``::type`` cast
+        if _is(nxt, "."):
+            _note_qualified(tokens, i, refs)
+    return refs
+
+
+def _note_cte(tokens: tuple[Token, ...], i: int, refs: _References, consumed: set[int]) -> None:
+    # ``name AS (`` or ``name (columns) AS (``: ``tokens[i]`` precedes the AS.
+    if i >= 0 and _is(tokens[i], ")"):
+        depth = tokens[i].depth
+        i -= 1
+        while i >= 0 and not (_is(tokens[i], "(") and tokens[i].depth == depth):
+            consumed.add(i)
+            i -= 1
+        i -= 1
+    if i >= 0 and tokens[i].kind in (WORD, IDENT):
+        refs.ctes.add(_lower(tokens[i]))
+        consumed.add(i)
+
+
+def _note_qualified(tokens: tuple[Token, ...], i: int, refs: _References) -> None:
+    # ``qualifier.column`` or ``schema.table.column`` starting at ``tokens[i]``.
+    parts = [tokens[i]]
+    j = i + 1
+    while j + 1 < len(tokens) and _is(tokens[j], ".") and tokens[j + 1].kind in (WORD, IDENT):
+        parts.append(tokens[j + 1])
+        j += 2
+    if len(parts) < 2 or (j < len(tokens) and (_is(tokens[j], "(") or _is(tokens[j], "."))):
+        return  # ``t.*``, a schema-qualified function, or something longer
+    refs.qualified.append((_lower(parts[-2]), _lower(parts[-1])))
+
+
+def _read_sources(tokens: tuple[Token, ...], i: int, refs: _References, consumed: set[int]) -> None:
+    """Read ``source [AS alias] [, source ...]`` starting at ``tokens[i]``."""
+    n = len(tokens)
+    while i < n:
+        while i < n and tokens[i].text.upper() in _SOURCE_MODIFIERS:
+            i += 1
+        if i >= n:
+            return
+        token = tokens[i]
+        if _is(token, "("):
+            depth = token.depth
+            i += 1
+            while i < n and not (_is(tokens[i], ")") and tokens[i].depth == depth):
+                i += 1
+            i += 1
+            ref = None
+        elif _is_name(token):
+            parts = [i]
+            while i + 2 < n and _is(tokens[i + 1], ".") and tokens[i + 2].kind in (WORD, IDENT):
+                i += 2
+                parts.append(i)
+            i += 1
+            consumed.update(parts)
+            if i < n and _is(tokens[i], "("):
+                return  # table function; its arguments are a call scope
+            # A backquoted ``dataset.table`` is one token; split it like the rest.
+            path = ".".join(_lower(tokens[p]) for p in parts).split(".")
+            name, schema = path[-1], path[-2] if len(path) > 1 else ""
+            if not schema and name in refs.ctes:
+                ref = None
+            else:
+                ref = _TableRef(schema, name)
+                refs.tables.append(ref)
+            refs.sources[name] = ref
+        else:
+            return
+        if i < n and tokens[i].kind == WORD and tokens[i].text.upper() == "AS":
+            i += 1
+        if i < n and _is_name(tokens[i]):
+            alias = _lower(tokens[i])
+            refs.sources[alias] = ref
+            consumed.add(i)
+            i += 1
+            if i < n and _is(tokens[i], "("):  # alias column list
+                depth = tokens[i].depth
+                while i < n and not (_is(tokens[i], ")") and tokens[i].depth == depth):
+                    consumed.add(i)
+                    i += 1
+                i += 1
+        if i < n and _is(tokens[i], ","):
+            i += 1
+            continue
+        return
+
+
+def index_tables(listed: list[Table]) -> dict[tuple[str, str], Table]:
+    """Catalog tables keyed by lower-case ``(schema, name)``.
+
+    A name only one table has is also keyed as ``("", name)``, so a bare
+    reference resolves without guessing between schemas.
+    """
+    index: dict[tuple[str, str], Table] = {}
+    owners: dict[str, int] = {}
+    for t in listed:
+        name = t.name.lower()
+        index[(t.schema.lower(), name)] = t
+        owners[name] = owners.get(name, 0) + 1
+    for t in listed:
+        if owners[t.name.lower()] == 1:
+            index.setdefault(("", t.name.lower()), t)
+    return index
+
+
+def describe_name(index: dict[tuple[str, str], Table], table: Table) -> str:
+    """Name to pass ``describe_table``: bare unless another schema shares it."""
+    return table.name if index.get(("", table.name.lower())) is table else table.qualified
+
+
+class SchemaCheckLayer:
+    """BLOCK unknown tables/columns with suggestions. ``SafetyLayerPort`` with ``acheck``."""
+
+    def __init__(self, *, max_suggestions: int = 3, cutoff: float = 0.6) -> None:
+        self._max_suggestions = max_suggestions
+        self._cutoff = cutoff
+
+    @property
+    def name(self) -> str:
+        return "schema_check"
+
+    def check(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        # The catalog lives behind the (async) explorer; see ``acheck``.
+        return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
+
+    async def acheck(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        problems: list[str] = []
+        if ctx.explorer is not None:
+            try:
+                problems = await self.unknown_references(sql, ctx.explorer)
+            except Exception:
+                problems = []  # an unreadable catalog is not the query's fault
+        if problems:
+            return SafetyDecision(
+                verdict=Verdict.BLOCK,
+                sql=sql,
+                reason="; ".join(problems),
+                layer=self.name,
+            )
+        return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
+
+    async def unknown_references(self, sql: str, explorer: Any) -> list[str]:
+        """One message per table or column the catalog doesn't know."""
+        statements = split_statements(tokenize(sql))
+        if len(statements) != 1:
+            return []
+        refs = collect_references(statements[0])
+        if not refs.tables:
+            return []
+        listed = await explorer.list_tables()
+        if not listed:
+            return []
+        index = index_tables(listed)
+        schemas = {schema for schema, _ in index if schema}
+        names = {name for _, name in index}
+
+        problems: list[str] = []
+        resolved: dict[tuple[str, str], Table] = {}
+        for ref in refs.tables:
+            if ref.schema and ref.schema not in schemas:
+                continue  # another schema: not in this catalog
+            key = (ref.schema, ref.name)
+            table = index.get(key)
+            if table is None:
+                if not ref.schema and ref.name in names:
+                    continue  # in several schemas; the search path picks one
+                problems.append(self._unknown("table", ref.name, names))
+                continue
+            if key not in resolved:
+                resolved[key] = await explorer.describe_table(describe_name(index, table))
+
+        columns = {
+            key: {c.name.lower() for c in table.columns} for key, table in resolved.items()
+        }
+        for qualifier, column in refs.qualified:
+            source = refs.sources.get(qualifier)
+            known = columns.get((source.schema, source.name)) if source is not None else None
+            if known is None:
+                continue  # struct field, derived source or unresolved table
+            if column not in known:
+                problems.append(self._unknown("column", column, known, f"{qualifier}."))
+        return problems
+
+    def _unknown(self, kind: str, name: str, candidates: Any, prefix: str = "") -> str:
+        close = difflib.get_close_matches(
+            name, list(candidates), n=self._max_suggestions, cutoff=self._cutoff
+        )
+        hint = f" (did you mean {', '.join(prefix + c for c in close)}?)" if close else ""
+        return f"unknown {kind} {prefix}{name}{hint}"
@@ -1,8 +1,10 @@
 """Timeout layer — execution-config layer, never blocks.
 
 This layer does not inspect the SQL for slow constructs (``pg_sleep`` etc.);
-that is enforced at *run time* by the executor honoring ``ctx.timeout_seconds``.
-Its only job is to guarantee a timeout is set on the context before execution.
+that is enforced at *run time*: ``run_sql`` hands ``ctx.timeout_seconds`` to
+:func:`~lang2sql.core.ports.explorer.execute_stream`, which bounds the query
+client-side and lets capable explorers cancel it on the server. Its only job
+is to guarantee a timeout is set on the context before execution.
 """
 
 from __future__ import annotations
@@ -1,20 +1,21 @@
 """Whitelist layer — V1 gate that only lets read-only statements through.
 
 Fail-closed by design: anything we can't confidently classify as a single
-read-only ``SELECT`` / ``WITH`` (or an ``EXPLAIN`` of one) is BLOCKED. This is
-deliberately blunt string parsing — the precise AST validation that catches
-schema-qualified bypasses and the like is V1.5 work (no sqlglot here).
+read-only ``SELECT`` / ``WITH`` (or an ``EXPLAIN`` of one) is BLOCKED. The
+check reads the token stream from :mod:`..lexer`, so quoted text never counts
+as a separator or a keyword, and an unterminated quote or comment is a parse
+error. Precise AST validation (schema-qualified bypasses and the like) is
+V1.5 work (no sqlglot here).
 """
 
 from __future__ import annotations
 
-import re
-
 from ...core.ports.safety import (
     SafetyContext,
     SafetyDecision,
     Verdict,
 )
+from ..lexer import ERROR, PUNCT, WORD, split_statements, tokenize
 
 # Statement keywords that mutate state. If any of these appears as a *statement*
 # keyword anywhere (including inside a CTE body), we block fail-closed.
@@ -35,31 +36,8 @@ _DML_DDL = frozenset(
 # Statements we allow to *start* a query.
 _ALLOWED_START = ("SELECT", "WITH")
 
-# A line comment runs to end-of-line; a block comment is /* ... */ (non-greedy,
-# spanning newlines).
-_LINE_COMMENT = re.compile(r"--[^\n]*")
-_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
-
-# Word-boundary keyword match, case-insensitive. Used to scan for mutating
-# keywords as standalone words (so "created_at" never matches "CREATE").
-_WORD = re.compile(r"[A-Za-z_][A-Za-z_0-9]*")
-
-
-def _strip_comments(sql: str) -> str:
-    """Remove line and block comments, then collapse surrounding whitespace."""
-    no_block = _BLOCK_COMMENT.sub(" ", sql)
-    no_line = _LINE_COMMENT.sub(" ", no_block)
-    return no_line.strip()
-
-
-def _split_statements(sql: str) -> list[str]:
-    """Split on ``;`` into non-empty trimmed statements.
-
-    String/identifier-quote awareness is V1.5 AST work; for V1 a bare ``;``
-    separator is enough to detect multi-statement payloads fail-closed.
-    """
-    parts = [p.strip() for p in sql.split(";")]
-    return [p for p in parts if p]
+# Bare option words that may sit between EXPLAIN and the statement.
+_EXPLAIN_OPTIONS = frozenset({"ANALYZE", "VERBOSE", "COSTS", "BUFFERS"})
 
 
 class WhitelistLayer:
@@ -69,79 +47,53 @@ class WhitelistLayer:
     def name(self) -> str:
         return "whitelist"
 
+    def _block(self, sql: str, reason: str) -> SafetyDecision:
+        return SafetyDecision(verdict=Verdict.BLOCK, sql=sql, reason=reason, layer=self.name)
+
     def check(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
-        cleaned = _strip_comments(sql)
+        tokens = tokenize(sql)
 
-        # Empty / blank (or comment-only) input → cannot parse anything.
-        if not cleaned:
-            return SafetyDecision(
-                verdict=Verdict.BLOCK,
-                sql=sql,
-                reason="parse_error",
-                layer=self.name,
-            )
+        # Empty / blank (or comment-only) input, or an unterminated quote or
+        # comment → cannot parse anything.
+        if not tokens or tokens[-1].kind == ERROR:
+            return self._block(sql, "parse_error")
 
-        statements = _split_statements(cleaned)
+        statements = split_statements(tokens)
 
         # Multi-statement payloads (e.g. ``; DELETE FROM t; --``) are blocked.
         if len(statements) != 1:
-            return SafetyDecision(
-                verdict=Verdict.BLOCK,
-                sql=sql,
-                reason="multi_statement",
-                layer=self.name,
-            )
-
-        statement = statements[0]
-
-        # An EXPLAIN wrapper is allowed only when it fronts a read-only query.
-        # Strip a leading EXPLAIN (and EXPLAIN ANALYZE / EXPLAIN VERBOSE etc.)
-        # then re-check the underlying statement's leading keyword.
-        body = statement
-        explain = re.match(r"(?is)^EXPLAIN\b(.*)$", body)
-        if explain is not None:
-            body = explain.group(1).strip()
-            # ``EXPLAIN`` may carry options like ANALYZE / VERBOSE / a paren
-            # option list before the real statement. Drop leading option words
-            # and any "( ... )" option block so we reach the real keyword.
-            paren = re.match(r"(?s)^\((?:[^()]|\([^()]*\))*\)\s*(.*)$", body)
-            if paren is not None:
-                body = paren.group(1).strip()
+            return self._block(sql, "multi_statement")
+
+        body = statements[0]
+
+        # An EXPLAIN wrapper is allowed only when it fronts a read-only query:
+        # skip EXPLAIN, then a "( ... )" option list or bare option words.
+        if body[0].keyword == "EXPLAIN":
+            i = 1
+            if i < len(body) and body[i].kind == PUNCT and body[i].text == "(":
+                outer = body[i].depth
+                i += 1
+                while i < len(body) and not (body[i].text == ")" and body[i].depth == outer):
+                    i += 1
+                i += 1
             else:
-                # Consume leading bare option words (ANALYZE, VERBOSE, ...).
-                while True:
-                    m = re.match(r"(?i)^(ANALYZE|VERBOSE|COSTS|BUFFERS)\b\s*(.*)$", body)
-                    if m is None:
-                        break
-                    body = m.group(2).strip()
+                while i < len(body) and body[i].keyword in _EXPLAIN_OPTIONS:
+                    i += 1
+            body = body[i:]
             if not body:
-                return SafetyDecision(
-                    verdict=Verdict.BLOCK,
-                    sql=sql,
-                    reason="parse_error",
-                    layer=self.name,
-                )
+                return self._block(sql, "parse_error")
 
         # The (possibly EXPLAIN-unwrapped) statement must start with an allowed
         # read-only keyword.
-        first_word_m = _WORD.match(body)
-        if first_word_m is None or first_word_m.group(0).upper() not in _ALLOWED_START:
-            return SafetyDecision(
-                verdict=Verdict.BLOCK,
-                sql=sql,
-                reason="not_select",
-                layer=self.name,
-            )
+        if body[0].keyword not in _ALLOWED_START:
+            return self._block(sql, "not_select")
 
         # Fail-closed keyword scan: a mutating keyword appearing anywhere as a
-        # standalone word blocks (catches ``WITH x AS (INSERT ...) SELECT``).
-        for token in _WORD.findall(body):
-            if token.upper() in _DML_DDL:
-                return SafetyDecision(
-                    verdict=Verdict.BLOCK,
-                    sql=sql,
-                    reason=f"dml_keyword:{token.upper()}",
-                    layer=self.name,
-                )
+        # bare word blocks (catches ``WITH x AS (INSERT ...) SELECT``).
+        for token in body:
+            if token.kind == WORD:
+                word = token.text.upper()
+                if word in _DML_DDL:
+                    return self._block(sql, f"dml_keyword:{word}")
 
         return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
@@ -0,0 +1,140 @@
+"""SQL lexer shared by the safety layers — one pass, quote- and comment-aware.
+
+The whitelist and row-limit layers used to re-scan the text with separate
+regexes (strip comments, split on ``;``, find words, split on parentheses),
+none of which knew about string literals: ``SELECT 'a;b'`` looked like two
+statements and ``SELECT 'drop'`` like DDL. :func:`tokenize` walks the text
+once and yields words, numbers, quoted strings and identifiers, and single-
+character punctuation, each tagged with its parenthesis depth. Whitespace and
+comments are dropped.
+
+Recognised quoting: ``'...'`` (``''`` escapes), ``E'...'`` (backslash
+escapes), ``$tag$...$tag$``, ``"..."`` and ```...```. An unterminated quote
+or block comment becomes an ``error`` token so callers can fail closed.
+
+MySQL, BigQuery and Databricks also treat ``\\'`` inside ``'...'`` (and
+``\\"`` inside ``"..."``) as an escaped quote, so the same text can end a
+literal in one dialect and not in another: ``'x\\'' ; DELETE ...`` is one
+string here and three statements on MySQL. A literal with an odd run of
+backslashes before a quote is therefore an ``error`` token too.
+
+Token streams are memoised per SQL string, so layers that run one after the
+other on the same text share one lexing pass.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+WORD = "word"
+NUMBER = "number"
+STRING = "string"
+IDENT = "ident"  # quoted identifier
+PUNCT = "punct"
+ERROR = "error"
+
+# Reserved and structural words — clauses, operators, literals, window/frame
+# terms, date parts and common type names — that the layers never read as a
+# table, column or alias name.
+KEYWORDS = frozenset(
+    """
+    ALL AND ANY ARRAY AS ASC AT BETWEEN BOTH BY CASE CAST COLLATE CROSS CUBE
+    CURRENT CURRENT_DATE CURRENT_TIME CURRENT_TIMESTAMP CURRENT_USER DATE DAY
+    DEFAULT DESC DISTINCT DOW DOY ELSE END EPOCH ESCAPE EXCEPT EXCLUDE EXISTS
+    EXPLAIN EXTRACT FALSE FETCH FILTER FIRST FOLLOWING FOR FORMAT FROM FULL
+    GROUP GROUPING GROUPS HAVING HOUR ILIKE IN INNER INTERSECT INTERVAL INTO IS
+    ISNULL JOIN JSON LAST LATERAL LEADING LEFT LIKE LIMIT LOCALTIME
+    LOCALTIMESTAMP MINUTE MONTH NATURAL NEXT NOT NOTNULL NULL NULLS OF OFFSET ON
+    ONLY OR ORDER ORDINALITY OUTER OVER PARTITION PRECEDING QUALIFY QUARTER
+    RANGE RECURSIVE RIGHT ROLLUP ROW ROWS SECOND SELECT SESSION_USER SETS
+    SIMILAR SOME TABLESAMPLE THEN TIES TIME TIMESTAMP TO TRAILING TRUE UNBOUNDED
+    UNION UNKNOWN USING VALUES VERBOSE ANALYZE WEEK WHEN WHERE WINDOW WITH
+    WITHIN WITHOUT YEAR ZONE
+    """.split()
+)
+
+# One match per token: whitespace and comments are consumed as a prefix of the
+# token that follows them (a match with no group set is trailing filler).
+_PATTERN = re.compile(
+    r"""
+    (?:\s+|--[^\n]*|/\*.*?\*/)*
+    (?:
+      (?P<estring>[Ee]'(?:[^'\\]|\\.|'')*')
+    | (?P<word>[^\W\d][\w$]*)
+    | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[Ee][-+]?\d+)?)
+    | (?P<string>'(?:[^']|'')*'|\$(?P<tag>[^\W\d]\w*)?\$.*?\$(?P=tag)?\$)
+    | (?P<ident>"(?:[^"]|"")*"|`[^`]*`)
+    | (?P<error>['"`]|/\*|\$(?:[^\W\d]\w*)?\$)
+    | (?P<punct>[^\w\s])
+    )?
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+# An odd number of backslashes right before a quote: an escape in some dialects.
+_BACKSLASH_QUOTE = re.compile(r"(?<!\\)(?:\\\\)*\\['\"]")
+
+_new = tuple.__new__
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+    depth: int  # parentheses open around it; a bracket's own depth is the outer one
+
+    @property
+    def keyword(self) -> str:
+        """Upper-cased text for words, ``""`` for everything else."""
+        return self.text.upper() if self.kind == WORD else ""
+
+
+@lru_cache(maxsize=256)
+def tokenize(sql: str) -> tuple[Token, ...]:
+    """Tokens of ``sql`` in order, without whitespace or comments."""
+    tokens: list[Token] = []
+    append = tokens.append
+    depth = 0
+    for match in _PATTERN.finditer(sql):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        start, end = match.span(kind)
+        text = sql[start:end]
+        if kind == PUNCT:
+            if text == "(":
+                append(_new(Token, (kind, text, start, end, depth)))
+                depth += 1
+                continue
+            if text == ")":
+                depth -= 1
+        elif kind == "estring":
+            kind = STRING
+        elif (
+            kind in (STRING, IDENT)
+            and text[0] in "'\""
+            and "\\" in text
+            and _BACKSLASH_QUOTE.search(text)
+        ):
+            kind = ERROR
+        append(_new(Token, (kind, text, start, end, depth)))
+        if kind == ERROR:
+            break  # nothing after an unterminated quote is trustworthy
+    return tuple(tokens)
+
+
+def split_statements(tokens: tuple[Token, ...]) -> list[tuple[Token, ...]]:
+    """Non-empty runs of tokens between ``;`` separators."""
+    statements: list[tuple[Token, ...]] = []
+    start = 0
+    for i, token in enumerate(tokens):
+        if token.kind == PUNCT and token.text == ";":
+            if i > start:
+                statements.append(tokens[start:i])
+            start = i + 1
+    if start < len(tokens):
+        statements.append(tokens[start:])
+    return statements
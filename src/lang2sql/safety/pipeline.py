@@ -6,41 +6,149 @@ layer PASSes, the pipeline returns a PASS carrying the (possibly rewritten)
 SQL forward — so a layer that REWRITEs is itself a non-PASS short-circuit in
 V1, while accumulated rewrites only matter once we have multiple rewriting
 layers (V1.5+).
+
+Synchronous layers are pure functions of the SQL text, the context's
+``row_limit``/``timeout_seconds``/``scope`` (per-guild thresholds) and the
+explorer's dialect (which picks the row-limit syntax), so their outcome is
+kept in an LRU keyed by a hash of those: a repeated query skips lexing and
+every check. A hit replays the decision and the ``timeout_seconds`` the
+layers settled on. Layers with per-guild thresholds expose a
+``config_version`` that is part of the key, so changing them is never
+answered from the cache. Layers with an async ``acheck`` (the cost gate,
+which asks the database) are never cached here;
+:meth:`SafetyPipeline.aevaluate` caches the sync stretches around them.
+Contexts carrying ``extras`` bypass the cache, since layers may read them.
 """
 
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Sequence
 
+from ..core.ports.explorer import explorer_dialect
 from ..core.ports.safety import (
     SafetyContext,
     SafetyDecision,
     SafetyLayerPort,
     Verdict,
 )
-from .layers import RowLimitLayer, TimeoutLayer, WhitelistLayer
+from .layers import (
+    ComplexityLayer,
+    CostGateLayer,
+    RowLimitLayer,
+    SchemaCheckLayer,
+    TimeoutLayer,
+    WhitelistLayer,
+)
 
 
 def _default_layers() -> list[SafetyLayerPort]:
-    # Whitelist (reject) → RowLimit (rewrite) → Timeout (exec config).
-    return [WhitelistLayer(), RowLimitLayer(), TimeoutLayer()]
+    # Whitelist (reject) → SchemaCheck (catalog) → RowLimit (rewrite) →
+    # Complexity (query shape) → CostGate (EXPLAIN) → Timeout (exec config).
+    # Complexity scores the limited SQL, so the LIMIT that will run bounds a
+    # plain scan. The catalog and EXPLAIN checks only act on the async path.
+    return [
+        WhitelistLayer(),
+        SchemaCheckLayer(),
+        RowLimitLayer(),
+        ComplexityLayer(),
+        CostGateLayer(),
+        TimeoutLayer(),
+    ]
+
+
+DEFAULT_DECISION_CACHE_SIZE = 1024
+
+
+@dataclass
+class DecisionCacheStats:
+    hits: int = 0
+    misses: int = 0
 
 
 class SafetyPipeline:
     """Ordered safety layers. Implements ``SafetyPipelinePort``."""
 
-    def __init__(self, layers: Sequence[SafetyLayerPort] | None = None) -> None:
+    def __init__(
+        self,
+        layers: Sequence[SafetyLayerPort] | None = None,
+        *,
+        decision_cache_size: int = DEFAULT_DECISION_CACHE_SIZE,
+    ) -> None:
         self._layers: list[SafetyLayerPort] = (
             list(layers) if layers is not None else _default_layers()
         )
+        self._cache_size = max(0, decision_cache_size)
+        # key → (decision, timeout_seconds after the layers ran)
+        self._decisions: OrderedDict[bytes, tuple[SafetyDecision, int]] = OrderedDict()
+        self.cache_stats = DecisionCacheStats()
 
     @property
     def layers(self) -> Sequence[SafetyLayerPort]:
         return self._layers
 
     def evaluate(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        return self._run_sync(0, self._layers, sql, ctx)
+
+    async def aevaluate(self, sql: str, ctx: SafetyContext) -> SafetyDecision:
+        """Same line, but layers with an async ``acheck`` (DB-backed) are awaited."""
+        current = sql
+        start = 0
+        for i, layer in enumerate(self._layers):
+            acheck = getattr(layer, "acheck", None)
+            if acheck is None:
+                continue
+            # The sync stretch before this layer goes through the cache.
+            decision = self._run_sync(start, self._layers[start:i], current, ctx)
+            if decision.verdict is not Verdict.PASS:
+                return decision
+            decision = await acheck(decision.sql, ctx)
+            if decision.verdict is not Verdict.PASS:
+                return decision
+            current = decision.sql
+            start = i + 1
+        return self._run_sync(start, self._layers[start:], current, ctx)
+
+    def _run_sync(
+        self, offset: int, layers: Sequence[SafetyLayerPort], sql: str, ctx: SafetyContext
+    ) -> SafetyDecision:
+        if not layers:
+            return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer="pipeline")
+        key = self._key(offset, sql, ctx)
+        if key is not None:
+            hit = self._decisions.get(key)
+            if hit is not None:
+                self._decisions.move_to_end(key)
+                self.cache_stats.hits += 1
+                decision, ctx.timeout_seconds = hit
+                return dataclasses.replace(decision)
+            self.cache_stats.misses += 1
+        decision = self._check(layers, sql, ctx)
+        if key is not None:
+            self._decisions[key] = (dataclasses.replace(decision), ctx.timeout_seconds)
+            if len(self._decisions) > self._cache_size:
+                self._decisions.popitem(last=False)
+        return decision
+
+    def _key(self, offset: int, sql: str, ctx: SafetyContext) -> bytes | None:
+        if not self._cache_size or ctx.extras:
+            return None
+        digest = hashlib.blake2b(sql.encode("utf-8"), digest_size=16)
+        dialect = explorer_dialect(ctx.explorer)
+        config = ",".join(str(getattr(layer, "config_version", 0)) for layer in self._layers)
+        digest.update(
+            f"\0{offset}\0{ctx.row_limit}\0{ctx.timeout_seconds}\0{dialect}\0{ctx.scope}"
+            f"\0{config}".encode()
+        )
+        return digest.digest()
+
+    @staticmethod
+    def _check(layers: Sequence[SafetyLayerPort], sql: str, ctx: SafetyContext) -> SafetyDecision:
         current = sql
-        for layer in self._layers:
+        for layer in layers:
             decision = layer.check(current, ctx)
             if decision.verdict is not Verdict.PASS:
                 return decision
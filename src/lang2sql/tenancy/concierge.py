@@ -12,10 +12,12 @@ ctor so tests (and v1.5 swaps) need no network and no globals.
 
 from __future__ import annotations
 
+import asyncio
 import os
 
-from ..adapters.db.factory import build_explorer, explorer_from_env
-from ..adapters.db.postgres_explorer import PostgresExplorer
+from ..adapters.db.factory import explorer_from_env
+from ..adapters.db.stub_explorer import StubExplorer
+from ..adapters.llm.cache import CachingLLM
 from ..adapters.llm.fake import FakeLLM
 from ..adapters.llm.openai_ import OpenAILLM
 from ..adapters.storage.sqlite_store import SqliteStore
@@ -25,17 +27,20 @@ from ..core.ports.explorer import ExplorerPort
 from ..core.ports.llm import LLMPort
 from ..core.ports.safety import SafetyPipelinePort
 from ..core.ports.secrets import SecretsPort
+from ..core.singleflight import SingleFlight
 from ..harness.context import HarnessContext
-from ..harness.session import Session
+from ..harness.quota import QuotaManager
+from ..harness.result_cache import DEFAULT_RESULT_TTL_SECONDS, ResultCache
+from ..harness.session import Session, Tokenizer, estimate_tokens, history_budget_for
+from ..harness.summarizer import TranscriptSummarizer
+from ..harness.system_prompt import PromptCache
 from ..harness.tool_registry import ToolRegistry
 from ..ingestion import FileSource, IngestionPipeline, LLMExtractor
 from ..memory import InjectAllRecall, InMemoryStore, ManualExtractor, MemoryService
 from ..safety.pipeline import SafetyPipeline
 from ..tools import build_default_tools
 from .encrypted_secrets import EncryptedSecrets
-
-# DSN used for the V1 explorer stub when a scope has registered none yet.
-_DEFAULT_DSN = "postgresql://stub/v1"
+from .explorer_registry import DEFAULT_IDLE_TTL_SECONDS, DEFAULT_MAX_SCOPES, ExplorerRegistry
 
 
 class ContextConcierge:
@@ -52,27 +57,68 @@ class ContextConcierge:
         secrets: SecretsPort | None = None,
         audit: AuditPort | None = None,
         max_turns: int = 8,
+        max_tool_concurrency: int = 4,
+        history_budget_tokens: int | None = None,
+        tokenizer: Tokenizer = estimate_tokens,
+        cache_llm: bool = True,
+        result_cache: ResultCache | None = None,
+        quotas: QuotaManager | None = None,
+        max_scope_explorers: int = DEFAULT_MAX_SCOPES,
+        explorer_idle_ttl: float = DEFAULT_IDLE_TTL_SECONDS,
     ) -> None:
         self._store = store if store is not None else SqliteStore(path)
         self._llm = llm if llm is not None else _default_llm()
-        self._explorer = explorer or explorer_from_env() or PostgresExplorer(_DEFAULT_DSN)
+        self._explorer = explorer or explorer_from_env() or StubExplorer()
         self._safety = safety if safety is not None else SafetyPipeline()
         self._secrets = (
             secrets if secrets is not None else EncryptedSecrets(self._store)
         )
         self._audit = audit if audit is not None else self._store
+        # Repeatable batch prompts (enrich, org setup, doc extraction) go
+        # through a persistent completion cache; interactive turns do not.
+        self._cached_llm: LLMPort | None = (
+            CachingLLM(self._llm, self._store) if cache_llm else None
+        )
         self._max_turns = max_turns
+        self._max_tool_concurrency = max_tool_concurrency
+        self._history_budget = history_budget_tokens or history_budget_for(
+            getattr(self._llm, "model", "")
+        )
+        self._tokenizer = tokenizer
 
         # V1 memory (in-memory + inject-all + manual) and ingestion (file × LLM).
         self._memory = MemoryService(InMemoryStore(), InjectAllRecall(), ManualExtractor())
         self._ingestion = IngestionPipeline()
         self._source = FileSource()
-        self._extractor = LLMExtractor(self._llm)
+        self._extractor = LLMExtractor(self._cached_llm or self._llm)
+
+        # Per-scope explorers. /setup stores a DSN under the guild scope; the
+        # next build_context for that scope materialises an explorer from it
+        # on demand. Scopes on the same DSN share one explorer (and pool);
+        # bindings are LRU-bounded and expire when idle.
+        self._explorers = ExplorerRegistry(
+            max_scopes=max_scope_explorers, idle_ttl=explorer_idle_ttl
+        )
+
+        # System-prompt sections survive across requests; kv writes and schema
+        # catalog reloads invalidate them (see PromptCache).
+        self._prompt_cache = PromptCache()
+
+        # run_sql results shared by every request of a scope (see ResultCache).
+        self._result_cache = (
+            result_cache if result_cache is not None else _default_result_cache(self._store)
+        )
+        # Identical run_sql queries in flight at once share one execution.
+        self._flights: SingleFlight = SingleFlight()
+        # run_sql concurrency/rate/warehouse-time limits per scope and user.
+        self._quotas = quotas if quotas is not None else QuotaManager()
 
-        # Per-scope explorer cache. /setup stores a DSN under the guild scope;
-        # the next build_context for that scope materialises an explorer from
-        # it on demand and reuses it across turns (lazy + cached).
-        self._scope_explorers: dict[str, ExplorerPort] = {}
+        # Rolling transcript summaries are generated after the reply is sent;
+        # strong refs keep the fire-and-forget tasks from being collected.
+        self._summarizer = TranscriptSummarizer(
+            self._llm, budget_tokens=self._history_budget, tokenizer=tokenizer
+        )
+        self._background: set[asyncio.Task] = set()
 
     @property
     def store(self) -> SqliteStore:
@@ -83,19 +129,91 @@ class ContextConcierge:
         """Per-scope encrypted credential store (DSNs/API keys via ``/connect``)."""
         return self._secrets
 
+    @property
+    def result_cache(self) -> ResultCache:
+        """Query result cache; ``stats`` reports hit ratio and saved warehouse time."""
+        return self._result_cache
+
+    @property
+    def quotas(self) -> QuotaManager:
+        """run_sql quotas; ``usage(scope)`` is the admin view, ``set_limits`` tunes a guild."""
+        return self._quotas
+
+    @property
+    def explorers(self) -> ExplorerRegistry:
+        """Per-scope explorer registry; ``stats()`` reports the shared pools."""
+        return self._explorers
+
     def forget_explorer(self, scope: str) -> None:
         """Bust the cached explorer for ``scope`` (call after /setup updates a DSN)."""
-        self._scope_explorers.pop(scope, None)
+        self._explorers.forget(scope)
+
+    async def invalidate_schema(self, identity: Identity) -> None:
+        """Drop the cached schema catalog of ``identity``'s explorer, if it has one.
+
+        Called before schema-wide commands (``/enrich``) so they see DDL made
+        since the catalog was loaded rather than waiting for its TTL.
+        """
+        explorer = await self._explorer_for(identity)
+        invalidate = getattr(explorer, "invalidate", None)
+        if invalidate is not None:
+            invalidate()
+        self._result_cache.invalidate(identity.kv_scope)
+
+    def schedule_compaction(self, session: Session) -> None:
+        """Summarise ``session``'s oldest turns in the background if it overflows.
+
+        Cheap to call after every save: nothing is scheduled while the
+        transcript still fits the history budget.
+        """
+        if not self._summarizer.needs_compaction(session):
+            return
+        task = asyncio.create_task(self.compact_session(session.identity.session_key()))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def compact_session(self, key: str) -> bool:
+        """Fold the stored session ``key`` into its rolling summary.
+
+        The LLM call can take seconds, during which the next message may have
+        saved a newer transcript. The fold is only applied when the stored
+        session still starts with the summarised prefix; otherwise this pass
+        is dropped and the next save schedules a fresh one.
+        """
+        session = await self._store.load(key)
+        if session is None:
+            return False
+        count = self._summarizer.fold_count(session)
+        if count == 0:
+            return False
+        prefix = session.transcript[:count]
+        summary = await self._summarizer.summarize(session.summary, prefix)
+        current = await self._store.load(key)
+        if (
+            current is None
+            or current.summary != session.summary
+            or current.transcript[:count] != prefix
+        ):
+            return False
+        current.fold(count, summary)
+        await self._store.save(key, current)
+        return True
+
+    async def drain(self) -> None:
+        """Wait for pending background work (tests, graceful shutdown)."""
+        while self._background:
+            await asyncio.gather(*list(self._background), return_exceptions=True)
 
     async def _explorer_for(self, identity: Identity) -> ExplorerPort:
         """Pick the right explorer for this identity's guild scope.
 
         If the wizard has stored a DSN for the guild (under ``db_dsn`` in
-        secrets), build an explorer from it (cached). Otherwise fall back to
-        the concierge's default explorer (env-configured or stub).
+        secrets), bind the guild to the explorer for it (shared with other
+        guilds on the same DSN). Otherwise fall back to the concierge's
+        default explorer (env-configured or stub).
         """
         scope = identity.kv_scope
-        cached = self._scope_explorers.get(scope)
+        cached = await self._explorers.get(scope)
         if cached is not None:
             return cached
         dsn = await self._secrets.get(scope, "db_dsn")
@@ -105,9 +223,7 @@ class ContextConcierge:
         d1_token = await self._secrets.get(scope, "db_extras.d1_token")
         if d1_token:
             extras["d1_token"] = d1_token
-        explorer = build_explorer(dsn, extras=extras or None)
-        self._scope_explorers[scope] = explorer
-        return explorer
+        return await self._explorers.bind(scope, dsn, extras=extras or None)
 
     async def build_context(
         self, identity: Identity, user_text: str | None = None
@@ -134,10 +250,29 @@ class ContextConcierge:
             safety=self._safety,
             audit=self._audit,
             store=self._store,
+            cached_llm=self._cached_llm,
+            prompt_cache=self._prompt_cache,
+            result_cache=self._result_cache,
+            flights=self._flights,
+            quotas=self._quotas,
             max_turns=self._max_turns,
+            max_tool_concurrency=self._max_tool_concurrency,
+            history_budget_tokens=self._history_budget,
+            tokenizer=self._tokenizer,
         )
 
 
+def _default_result_cache(store: SqliteStore) -> ResultCache:
+    """Memory-only by default; ``LANG2SQL_RESULT_CACHE_DISK`` adds the sqlite tier."""
+    raw_ttl = os.environ.get("LANG2SQL_RESULT_CACHE_TTL", "").strip()
+    try:
+        ttl = float(raw_ttl) if raw_ttl else DEFAULT_RESULT_TTL_SECONDS
+    except ValueError:
+        ttl = DEFAULT_RESULT_TTL_SECONDS
+    disk = os.environ.get("LANG2SQL_RESULT_CACHE_DISK", "").strip().lower() in ("1", "true", "yes")
+    return ResultCache(ttl_seconds=ttl, store=store if disk else None)
+
+
 def _default_llm() -> LLMPort:
     """Local vLLM/Ollama when LANG2SQL_LLM_BASE_URL is set, OpenAI when keyed, else FakeLLM."""
     base_url = os.environ.get("LANG2SQL_LLM_BASE_URL")
@@ -0,0 +1,210 @@
+"""ExplorerRegistry — per-scope explorers over shared, bounded connection pools.
+
+Every guild that ran ``/setup`` gets an explorer built from its stored DSN, and
+each explorer owns an engine or pool. Kept in a plain dict, that grew one pool
+per guild forever — idle pools were the largest source of file-descriptor and
+memory growth on a bot serving hundreds of guilds — and guilds pointing at the
+same warehouse each opened their own.
+
+The registry fixes both:
+
+* **Shared by DSN** — explorers are keyed by a fingerprint of the connection
+  inputs (DSN, schema, adapter extras), so scopes with the same warehouse
+  share one explorer, one schema catalog and one pool. Each shared explorer
+  counts the scopes bound to it.
+* **Bounded LRU + idle TTL** — at most ``max_scopes`` scope bindings are kept,
+  and a binding unused for ``idle_ttl`` seconds is dropped. When the last
+  scope lets go of an explorer, it is retired.
+
+A retired explorer may still be running a query for a request that got it
+before the eviction, so its pool is disposed (``close()``) only once the
+explorer has gone ``idle_ttl`` without being handed out; binding its DSN again
+in the meantime revives it. Disposal is awaited on the next async call
+(``get``/``bind``/``sweep``), so :meth:`forget` stays synchronous for the
+``/setup`` path. :meth:`stats` reports each live or retired explorer's
+bindings, idle time and pool counters (``pool_stats()`` where the adapter
+provides it).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from ..adapters.db.factory import build_explorer
+from ..core.ports.explorer import ExplorerPort
+
+DEFAULT_MAX_SCOPES = 256
+DEFAULT_IDLE_TTL_SECONDS = 15 * 60.0
+
+
+def connection_fingerprint(dsn: str, schema: str | None = None, extras: dict | None = None) -> str:
+    """Stable hash of everything that decides which explorer a DSN builds."""
+    canonical = json.dumps(
+        {"dsn": dsn, "schema": schema, "extras": extras or {}}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class SharedExplorerStats:
+    fingerprint: str
+    adapter: str
+    scopes: int
+    idle_seconds: float
+    pool: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class _Shared:
+    explorer: ExplorerPort
+    scopes: set[str] = field(default_factory=set)
+    last_used: float = 0.0
+
+
+class ExplorerRegistry:
+    """Scope → explorer bindings (LRU, idle TTL) over explorers shared by DSN."""
+
+    def __init__(
+        self,
+        *,
+        max_scopes: int = DEFAULT_MAX_SCOPES,
+        idle_ttl: float = DEFAULT_IDLE_TTL_SECONDS,
+        build: Callable[..., ExplorerPort] = build_explorer,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_scopes = max(1, max_scopes)
+        self._idle_ttl = idle_ttl
+        self._build = build
+        self._clock = clock
+        # scope → (fingerprint, last used), least recently used first.
+        self._scopes: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._shared: dict[str, _Shared] = {}
+        # Unbound explorers whose pools stay open until idle (fingerprint → shared).
+        self._retired: dict[str, _Shared] = {}
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._scopes)
+
+    async def get(self, scope: str) -> ExplorerPort | None:
+        """The explorer bound to ``scope``, or ``None`` (expired or never bound)."""
+        await self.sweep()
+        bound = self._scopes.get(scope)
+        if bound is None:
+            return None
+        return self._touch(scope, bound[0])
+
+    async def bind(
+        self,
+        scope: str,
+        dsn: str,
+        *,
+        schema: str | None = None,
+        extras: dict | None = None,
+    ) -> ExplorerPort:
+        """Bind ``scope`` to the explorer for ``dsn``, building it only if no scope shares it."""
+        fingerprint = connection_fingerprint(dsn, schema, extras)
+        current = self._scopes.get(scope)
+        if current is not None and current[0] != fingerprint:
+            self._release(scope)
+        shared = self._shared.get(fingerprint) or self._retired.pop(fingerprint, None)
+        if shared is None:
+            shared = _Shared(self._build(dsn, schema=schema, extras=extras))
+        self._shared[fingerprint] = shared
+        shared.scopes.add(scope)
+        explorer = self._touch(scope, fingerprint)
+        while len(self._scopes) > self._max_scopes:
+            oldest = next(iter(self._scopes))
+            self._release(oldest)
+            self.evictions += 1
+        await self.sweep()
+        return explorer
+
+    def forget(self, scope: str) -> None:
+        """Unbind ``scope`` (after /setup changes its DSN); its pool closes once idle."""
+        if scope in self._scopes:
+            self._release(scope)
+
+    async def sweep(self) -> int:
+        """Drop bindings idle past the TTL and dispose of idle retired explorers."""
+        now = self._clock()
+        expired = 0
+        while self._scopes:
+            scope, (_, last_used) = next(iter(self._scopes.items()))
+            if now - last_used < self._idle_ttl:
+                break
+            self._release(scope)
+            expired += 1
+        self.evictions += expired
+        idle = [
+            fingerprint for fingerprint, shared in self._retired.items()
+            if now - shared.last_used >= self._idle_ttl
+        ]
+        for fingerprint in idle:
+            await _close(self._retired.pop(fingerprint).explorer)
+        return expired
+
+    async def close(self) -> None:
+        """Unbind every scope and dispose of every pool (shutdown)."""
+        for scope in list(self._scopes):
+            self._release(scope)
+        retired, self._retired = self._retired, {}
+        for shared in retired.values():
+            await _close(shared.explorer)
+
+    def stats(self) -> list[SharedExplorerStats]:
+        """One entry per live or retired explorer, most recently used first."""
+        now = self._clock()
+        out = []
+        for fingerprint, shared in sorted(
+            [*self._shared.items(), *self._retired.items()],
+            key=lambda kv: kv[1].last_used,
+            reverse=True,
+        ):
+            pool_stats = getattr(shared.explorer, "pool_stats", None)
+            out.append(
+                SharedExplorerStats(
+                    fingerprint=fingerprint,
+                    adapter=type(shared.explorer).__name__,
+                    scopes=len(shared.scopes),
+                    idle_seconds=now - shared.last_used,
+                    pool=pool_stats() if pool_stats is not None else {},
+                )
+            )
+        return out
+
+    def _touch(self, scope: str, fingerprint: str) -> ExplorerPort:
+        now = self._clock()
+        self._scopes[scope] = (fingerprint, now)
+        self._scopes.move_to_end(scope)
+        shared = self._shared[fingerprint]
+        shared.last_used = now
+        return shared.explorer
+
+    def _release(self, scope: str) -> None:
+        fingerprint, _ = self._scopes.pop(scope)
+        shared = self._shared.get(fingerprint)
+        if shared is None:
+            return
+        shared.scopes.discard(scope)
+        if not shared.scopes:
+            del self._shared[fingerprint]
+            self._retired[fingerprint] = shared
+
+
+async def _close(explorer: ExplorerPort) -> None:
+    close = getattr(explorer, "close", None)
+    if close is None:
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception:
+        pass  # a pool that fails to close is still unreachable from here
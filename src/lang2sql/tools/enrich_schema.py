@@ -13,7 +13,9 @@ import json
 import re
 from typing import TYPE_CHECKING, Any
 
+from ..core.ports.explorer import describe_all
 from ..core.types import Message, Role, ToolResult, ToolSpec
+from .sampling import sample_tables
 
 if TYPE_CHECKING:
     from ..harness.context import HarnessContext
@@ -60,6 +62,8 @@ def _extract_result(text: str) -> tuple[dict[str, str], list[str]]:
 
 
 class EnrichSchema:
+    concurrent_safe = False  # rewrites the enriched_desc:* kv namespace
+
     @property
     def spec(self) -> ToolSpec:
         return ToolSpec(
@@ -97,29 +101,23 @@ class EnrichSchema:
             return ToolResult(call_id="", content=f"🗑️ 보강 캐시 초기화 완료 ({count}개 삭제)")
 
         target = (args.get("table") or "").strip()
-        all_tables = await ctx.explorer.list_tables()
         if target:
-            tables = [t for t in all_tables if t.name == target or t.qualified == target]
-            if not tables:
+            all_tables = await ctx.explorer.list_tables()
+            matches = [t for t in all_tables if t.name == target or t.qualified == target]
+            if not matches:
                 return ToolResult(call_id="", content=f"테이블 '{target}'을 찾을 수 없습니다.", is_error=True)
+            tables = [await ctx.explorer.describe_table(t.name) for t in matches]
         else:
-            tables = all_tables
+            tables = await describe_all(ctx.explorer)  # one catalog query when supported
 
-        # Build schema block with sample values for each column.
+        # Build schema block with sample values (one bounded scan per table).
+        sampled = await sample_tables(ctx.explorer, tables, distinct=_SAMPLE_LIMIT)
         schema_lines: list[str] = []
         for tbl in tables:
-            described = await ctx.explorer.describe_table(tbl.name)
             schema_lines.append(f"테이블: {tbl.name}")
-            for col in described.columns:
-                try:
-                    sample_sql = (
-                        f"SELECT DISTINCT {col.name} FROM {tbl.qualified} "
-                        f"WHERE {col.name} IS NOT NULL LIMIT {_SAMPLE_LIMIT}"
-                    )
-                    rows = await ctx.explorer.execute(sample_sql, _SAMPLE_LIMIT)
-                    samples = [str(r.get(col.name, r.get(list(r.keys())[0], ""))) for r in rows]
-                except Exception:
-                    samples = []
+            values = sampled[tbl.qualified].values
+            for col in tbl.columns:
+                samples = values.get(col.name, [])
                 sample_str = f" 샘플: {samples}" if samples else ""
                 schema_lines.append(f"- {col.name} ({col.type}){sample_str}")
             schema_lines.append("")
@@ -128,12 +126,17 @@ class EnrichSchema:
         prompt = _build_prompt(schema_block)
 
         # Single LLM call for all tables at once.
-        completion = await ctx.llm.complete(
-            [Message(role=Role.USER, content=prompt)]
-        )
+        llm = ctx.cached_llm or ctx.llm
+        messages = [Message(role=Role.USER, content=prompt)]
+        forget = getattr(llm, "forget", None)  # a CachingLLM
+        if forget is not None and ctx.bypass_llm_cache:
+            forget(messages)
+        completion = await llm.complete(messages)
         columns, relationships = _extract_result(completion.content)
 
         if not columns and not relationships:
+            if forget is not None:
+                forget(messages)  # don't replay an answer we couldn't parse
             return ToolResult(
                 call_id="",
                 content="LLM이 JSON을 반환하지 않았습니다. 다시 시도해주세요.",
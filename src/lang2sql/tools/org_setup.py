@@ -20,8 +20,10 @@ import re
 import time
 from typing import TYPE_CHECKING, Any
 
+from ..core.ports.explorer import describe_all
 from ..core.ports.tool import ToolPort
 from ..core.types import Message, Role, ToolResult, ToolSpec
+from .sampling import sample_tables
 from .semantic_federation import FedEntry, _KV_PREFIX as _SEMFED_PREFIX, _kv_key as _semfed_kv_key, _parse_synonyms
 
 if TYPE_CHECKING:
@@ -68,6 +70,8 @@ def _extract_result(text: str) -> tuple[str, list[dict]]:
 
 
 class OrgSetupTool(ToolPort):
+    concurrent_safe = False  # writes org/team + cterm kv entries
+
     @property
     def spec(self) -> ToolSpec:
         return ToolSpec(
@@ -161,27 +165,19 @@ class OrgSetupTool(ToolPort):
         if ctx.explorer is None:
             return ToolResult(call_id="", content="❌ DB가 연결되지 않았습니다 (/setup 먼저).", is_error=True)
 
-        all_tables = await ctx.explorer.list_tables()
+        # A table whose describe failed comes back without columns; skip it.
+        all_tables = [t for t in await describe_all(ctx.explorer) if t.columns]
         if not all_tables:
             return ToolResult(call_id="", content="❌ 접근 가능한 테이블이 없습니다.", is_error=True)
 
+        # Distinct values per column, read from a single scan of each table.
+        sampled = await sample_tables(ctx.explorer, all_tables, distinct=_SAMPLE_LIMIT)
         schema_lines: list[str] = []
         for tbl in all_tables:
-            try:
-                described = await ctx.explorer.describe_table(tbl.name)
-            except Exception:
-                continue
             schema_lines.append(f"테이블: {tbl.name}")
-            for col in described.columns:
-                try:
-                    sample_sql = (
-                        f"SELECT DISTINCT {col.name} FROM {tbl.qualified} "
-                        f"WHERE {col.name} IS NOT NULL LIMIT {_SAMPLE_LIMIT}"
-                    )
-                    rows = await ctx.explorer.execute(sample_sql, _SAMPLE_LIMIT)
-                    samples = [str(r.get(col.name, r.get(list(r.keys())[0], ""))) for r in rows]
-                except Exception:
-                    samples = []
+            values = sampled[tbl.qualified].values
+            for col in tbl.columns:
+                samples = values.get(col.name, [])
                 sample_str = f" 샘플: {samples}" if samples else ""
                 schema_lines.append(f"- {col.name} ({col.type}){sample_str}")
             schema_lines.append("")
@@ -189,10 +185,17 @@ class OrgSetupTool(ToolPort):
         schema_block = "\n".join(schema_lines)
         prompt = _build_prompt(display_name, schema_block)
 
-        completion = await ctx.llm.complete([Message(role=Role.USER, content=prompt)])
+        llm = ctx.cached_llm or ctx.llm  # same schema → same prompt; replay it
+        messages = [Message(role=Role.USER, content=prompt)]
+        forget = getattr(llm, "forget", None)  # a CachingLLM
+        if forget is not None and ctx.bypass_llm_cache:
+            forget(messages)
+        completion = await llm.complete(messages)
         domain, terms = _extract_result(completion.content)
 
         if not terms:
+            if forget is not None:
+                forget(messages)  # a failed extraction shouldn't be replayed
             return ToolResult(
                 call_id="",
                 content="LLM이 용어를 추출하지 못했습니다. 다시 시도해주세요.",
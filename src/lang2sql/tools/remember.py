@@ -18,6 +18,8 @@ if TYPE_CHECKING:
 
 
 class Remember:
+    concurrent_safe = False  # memory + audit writes
+
     def __init__(self, memory: MemoryService) -> None:
         self._memory = memory
 
@@ -2,21 +2,64 @@
 
 The tool never touches the DB directly: it pushes the model's SQL through the
 :class:`SafetyPipelinePort` first. BLOCK/CONFIRM short-circuit with an
-explanation the model can act on; PASS/REWRITE proceed to
-``explorer.execute`` and the (possibly rewritten) SQL is what runs.
+explanation the model can act on; PASS/REWRITE proceed to the explorer and
+the (possibly rewritten) SQL is what runs, bounded by the ``timeout_seconds``
+the pipeline's :class:`TimeoutLayer` settled on. A query that overruns it is
+cancelled (on the server, where the explorer supports it) and reported back.
+
+Rows are consumed as a stream of batches. Only the first
+:data:`PREVIEW_ROWS` are kept for the model; every row is written to a CSV
+spool that stays in memory up to :data:`SPOOL_MEMORY_BYTES` and then moves to
+a temp file. When the result outgrows the preview, the CSV is handed to the
+frontend as a turn :class:`Attachment`, so peak memory does not grow with the
+row limit.
+
+When the context carries a :class:`~lang2sql.harness.result_cache.ResultCache`,
+gated SQL is looked up there before it reaches the explorer, and a result
+small enough to cache is kept alongside the spool. ``bypass_cache`` (or the
+turn's ``bypass_result_cache`` flag) skips the lookup and refreshes the entry.
+
+Identical queries that run at the same time — several people asking the same
+thing in one channel — share one execution through the context's
+:class:`~lang2sql.core.singleflight.SingleFlight`, keyed by the connection,
+the normalised SQL and the limit. Each caller gets its own copy of the CSV,
+taken from a spool none of them holds.
+
+Executions that reach the warehouse first take a lease from the context's
+:class:`~lang2sql.harness.quota.QuotaManager` (concurrency, rate and
+warehouse-time limits per kv scope and user) and charge it their elapsed
+time. The lease is taken inside the flight, so callers that join a running
+query don't count against any quota — though they do share the leader's
+rejection. Over-quota requests wait briefly, then come back as a ``QUOTA``
+error.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import io
+import shutil
+import tempfile
+import time
+import weakref
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any
 
 from ..core.ports.audit import AuditEvent
+from ..core.ports.explorer import ExplorerPort, QueryTimeout, execute_stream, explorer_fingerprint
 from ..core.ports.safety import SafetyContext, Verdict
-from ..core.types import ToolResult, ToolSpec
+from ..core.result import ResultSet
+from ..core.sql import sql_fingerprint
+from ..core.types import Attachment, ToolResult, ToolSpec
+from ..harness.quota import QuotaExceeded
 
 if TYPE_CHECKING:
     from ..harness.context import HarnessContext
 
+# Rows shown to the model (and inlined in chat); the rest go to the CSV only.
+PREVIEW_ROWS = 50
+SPOOL_MEMORY_BYTES = 1 << 20
+
 
 class RunSQL:
     @property
@@ -32,6 +75,10 @@ class RunSQL:
                 "properties": {
                     "sql": {"type": "string", "description": "a single SELECT or WITH query"},
                     "limit": {"type": "integer", "description": "max rows (default 1000)"},
+                    "bypass_cache": {
+                        "type": "boolean",
+                        "description": "true to skip cached results and query the database again",
+                    },
                 },
                 "required": ["sql"],
             },
@@ -48,30 +95,205 @@ class RunSQL:
             return ToolResult(call_id="", content="run_sql unavailable: no safety pipeline wired", is_error=True)
         if ctx.explorer is None:
             return ToolResult(call_id="", content="run_sql unavailable: no DB connected (use /connect)", is_error=True)
+        explorer = ctx.explorer  # narrowed for the execute() closure below
 
-        decision = ctx.safety.evaluate(sql, SafetyContext(row_limit=limit))
+        safety_ctx = SafetyContext(
+            row_limit=limit, explorer=explorer, scope=ctx.identity.kv_scope
+        )
+        aevaluate = getattr(ctx.safety, "aevaluate", None)
+        if aevaluate is not None:
+            decision = await aevaluate(sql, safety_ctx)
+        else:
+            decision = ctx.safety.evaluate(sql, safety_ctx)
         if decision.verdict == Verdict.BLOCK:
             return ToolResult(call_id="", content=f"BLOCKED by {decision.layer}: {decision.reason}", is_error=True)
         if decision.verdict == Verdict.CONFIRM:
             return ToolResult(call_id="", content=f"NEEDS CONFIRMATION: {decision.confirm_prompt}")
 
-        rows = await ctx.explorer.execute(decision.sql, limit)
+        cache = ctx.result_cache
+        scope = ctx.identity.kv_scope
+        key = cached = None
+        if cache is not None:
+            key = cache.key(decision.sql, scope=scope, explorer=explorer, limit=limit)
+            bypass = args.get("bypass_cache") in (True, "true") or ctx.bypass_result_cache
+            if not bypass:
+                cached = cache.get(key)
+
+        if cached is not None:
+            preview, total, spool = _replay(cached.result)
+        else:
+            keep = cache.max_entry_bytes if cache is not None else 0
+
+            async def execute() -> _Collected:
+                # Runs once per flight, so only the caller that leads it takes a
+                # lease; joiners share its result, or its QuotaExceeded.
+                async with AsyncExitStack() as stack:
+                    lease = None
+                    if ctx.quotas is not None:
+                        lease = await stack.enter_async_context(
+                            ctx.quotas.lease(scope, ctx.identity.user_id)
+                        )
+                    started = time.perf_counter()
+                    try:
+                        preview, total, spool, full = await _collect(
+                            explorer, decision.sql, limit, keep,
+                            timeout=safety_ctx.timeout_seconds,
+                        )
+                    finally:
+                        if lease is not None:
+                            lease.charge(time.perf_counter() - started)
+                    return _Collected(preview, total, spool, full, time.perf_counter() - started)
+
+            try:
+                if ctx.flights is not None:
+                    flight = (explorer_fingerprint(explorer), sql_fingerprint(decision.sql), limit)
+                    collected = await ctx.flights.do(flight, execute)
+                    preview, total, spool = collected.claim()
+                else:
+                    collected = await execute()
+                    preview, total, spool = collected.preview, collected.total, collected.spool
+            except QuotaExceeded as exc:
+                return ToolResult(call_id="", content=f"QUOTA: {exc}", is_error=True)
+            except QueryTimeout as exc:
+                return ToolResult(
+                    call_id="",
+                    content=f"TIMEOUT: {exc}. Narrow it (filters, aggregates, a smaller LIMIT) and retry.",
+                    is_error=True,
+                )
+            if cache is not None and key is not None and collected.full is not None:
+                cache.put(key, scope, collected.full, elapsed=collected.elapsed,
+                          size=collected.spool.size)
+        if total > PREVIEW_ROWS:
+            ctx.attachments.append(Attachment(name="result.csv", file=spool.finish(), rows=total))
+        else:
+            spool.close()
 
         if ctx.audit is not None:
             await ctx.audit.record(
                 AuditEvent(actor=ctx.identity.user_id, action="run_sql",
-                           scope=ctx.identity.session_key(), detail={"sql": decision.sql})
+                           scope=ctx.identity.session_key(),
+                           detail={"sql": decision.sql, "cached": cached is not None})
             )
 
-        return ToolResult(call_id="", content=_render_rows(decision.sql, rows))
+        content = _render_rows(decision.sql, preview, total)
+        if cached is not None:
+            age = max(0, int(time.time() - cached.stored_at))
+            content += f"\n(cached result from {age}s ago; pass bypass_cache=true for fresh data)"
+        return ToolResult(call_id="", content=content)
+
+
+async def _collect(
+    explorer: ExplorerPort,
+    sql: str,
+    limit: int,
+    keep_bytes: int = 0,
+    *,
+    timeout: float | None = None,
+) -> tuple[ResultSet, int, "_CsvSpool", ResultSet | None]:
+    """Stream the result: keep a preview, count every row, spool all to CSV.
+
+    While the spooled CSV stays within ``keep_bytes`` the rows are also kept
+    whole (for the result cache); past it they are dropped and the last
+    element of the tuple is ``None``.
+    """
+    preview: ResultSet | None = None
+    full: ResultSet | None = None
+    total = 0
+    spool = _CsvSpool()
+    try:
+        async for batch in execute_stream(explorer, sql, limit=limit, timeout=timeout):
+            if preview is None:
+                preview = batch.head(PREVIEW_ROWS)
+                spool.write(batch, header=True)
+                full = ResultSet(batch.columns) if keep_bytes > 0 else None
+            else:
+                room = PREVIEW_ROWS - len(preview)
+                if room > 0:
+                    preview.extend(batch.head(room))
+                spool.write(batch)
+            if full is not None and spool.size > keep_bytes:
+                full = None  # too big to cache; stop holding rows
+            if full is not None:
+                full.extend(batch)
+            total += len(batch)
+    except BaseException:
+        spool.close()
+        raise
+    if preview is None:
+        preview = ResultSet(())
+        full = ResultSet(()) if keep_bytes > 0 else None
+    return preview, total, spool, full
+
+
+@dataclass
+class _Collected:
+    """One execution's output, shared by every ``run_sql`` that joined its flight."""
+
+    preview: ResultSet
+    total: int
+    spool: "_CsvSpool"
+    full: ResultSet | None
+    elapsed: float
+    _release: weakref.finalize | None = field(default=None, init=False, repr=False)
+
+    def claim(self) -> tuple[ResultSet, int, "_CsvSpool"]:
+        """Preview, total and a spool this caller may hand out or close.
+
+        Every caller gets a copy (an empty one when the result fits the
+        preview, since no CSV is attached). The original is never handed
+        out, as the frontend closes an attachment once it is uploaded; it
+        is closed when the shared result itself goes away.
+        """
+        if self._release is None:
+            self._release = weakref.finalize(self, self.spool.close)
+        spool = self.spool.copy() if self.total > PREVIEW_ROWS else _CsvSpool()
+        return self.preview.head(PREVIEW_ROWS), self.total, spool
+
+
+def _replay(result: ResultSet) -> tuple[ResultSet, int, "_CsvSpool"]:
+    """Preview, total and spool for a cached result, as :func:`_collect` gives them."""
+    spool = _CsvSpool()
+    if len(result) > PREVIEW_ROWS:
+        spool.write(result, header=True)
+    return result.head(PREVIEW_ROWS), len(result), spool
+
+
+class _CsvSpool:
+    """CSV writer over a SpooledTemporaryFile (memory first, then disk)."""
+
+    def __init__(self) -> None:
+        self._file: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+        self.size = 0  # bytes written so far
+
+    def write(self, batch: ResultSet, *, header: bool = False) -> None:
+        buf = io.StringIO()
+        batch.write_csv(buf, header=header)
+        data = buf.getvalue().encode("utf-8")
+        self._file.write(data)
+        self.size += len(data)
+
+    def copy(self) -> "_CsvSpool":
+        """An independent spool with the same bytes (position left untouched)."""
+        clone = _CsvSpool()
+        position = self._file.tell()
+        self._file.seek(0)
+        shutil.copyfileobj(self._file, clone._file)
+        self._file.seek(position)
+        clone.size = self.size
+        return clone
+
+    def finish(self) -> IO[bytes]:
+        self._file.flush()
+        self._file.seek(0)
+        return self._file
+
+    def close(self) -> None:
+        self._file.close()
 
 
-def _render_rows(sql: str, rows: list[dict]) -> str:
+def _render_rows(sql: str, rows: ResultSet, total: int) -> str:
     if not rows:
         return f"(0 rows)\nSQL: {sql}"
-    headers = list(rows[0].keys())
-    lines = [" | ".join(headers), " | ".join("---" for _ in headers)]
-    for r in rows[:50]:
-        lines.append(" | ".join(str(r.get(h, "")) for h in headers))
-    suffix = f"\n… ({len(rows)} rows total)" if len(rows) > 50 else ""
-    return f"{len(rows)} row(s):\n" + "\n".join(lines) + suffix + f"\nSQL: {sql}"
+    table = rows.to_markdown(max_rows=PREVIEW_ROWS)
+    suffix = f"\n… ({total} rows total)" if total > PREVIEW_ROWS else ""
+    return f"{total} row(s):\n" + table + suffix + f"\nSQL: {sql}"
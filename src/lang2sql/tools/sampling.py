@@ -0,0 +1,150 @@
+"""Column sampling for schema enrichment — one bounded scan per table.
+
+``/enrich`` and ``/org_setup`` show the LLM a few distinct values per column.
+They used to run ``SELECT DISTINCT col … LIMIT 10`` per column, one after
+another: a 3,000-column warehouse meant 3,000 serial round-trips before the
+LLM was even called. :func:`sample_tables` instead reads up to ``scan_rows``
+rows per table with a single ``SELECT * … LIMIT n`` and deduplicates every
+column client-side, with tables fanned out under a concurrency bound.
+Explorers with ``execute_batch`` (the psycopg :class:`PostgresExplorer`) get
+the scans in groups of ``batch_size`` — one pipelined round-trip per group.
+
+A bounded scan sees fewer distinct values than a per-column ``DISTINCT`` over
+the whole table. For describing what a column holds, the first thousand rows
+are plenty.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..core.ports.explorer import ExplorerPort, Table
+from ..core.result import ResultSet, as_result_set
+
+logger = logging.getLogger(__name__)
+
+DISTINCT_PER_COLUMN = 10
+SCAN_ROWS = 1000
+SAMPLE_CONCURRENCY = 4
+SAMPLE_BATCH_SIZE = 25
+
+
+@dataclass
+class TableSample:
+    """Distinct non-null values per column for one table, plus how it went."""
+
+    table: str
+    values: dict[str, list[str]] = field(default_factory=dict)
+    rows_scanned: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+
+
+async def sample_tables(
+    explorer: ExplorerPort,
+    tables: list[Table],
+    *,
+    distinct: int = DISTINCT_PER_COLUMN,
+    scan_rows: int = SCAN_ROWS,
+    concurrency: int = SAMPLE_CONCURRENCY,
+    batch_size: int = SAMPLE_BATCH_SIZE,
+) -> dict[str, TableSample]:
+    """Sample every table (keyed by ``Table.qualified``); failures yield empty samples."""
+    sem = asyncio.Semaphore(max(1, concurrency))
+    batch = getattr(explorer, "execute_batch", None)
+
+    async def one(table: Table) -> TableSample:
+        async with sem:
+            return await _sample_table(explorer, table, distinct, scan_rows)
+
+    async def group(chunk: list[Table]) -> list[TableSample]:
+        async with sem:
+            return await _sample_batch(batch, chunk, distinct, scan_rows)
+
+    started = time.perf_counter()
+    if batch is not None and tables:
+        size = max(1, batch_size)
+        groups = await asyncio.gather(
+            *(group(tables[i : i + size]) for i in range(0, len(tables), size))
+        )
+        samples = [s for g in groups for s in g]
+    else:
+        samples = list(await asyncio.gather(*(one(t) for t in tables)))
+    logger.debug(
+        "sampled %d tables in %.2fs (slowest: %s)",
+        len(samples),
+        time.perf_counter() - started,
+        max(samples, key=lambda s: s.elapsed).table if samples else "-",
+    )
+    return {s.table: s for s in samples}
+
+
+def _scan_sql(table: Table, scan_rows: int) -> str:
+    return f"SELECT * FROM {table.qualified} LIMIT {int(scan_rows)}"
+
+
+async def _sample_table(
+    explorer: ExplorerPort, table: Table, distinct: int, scan_rows: int
+) -> TableSample:
+    sample = TableSample(table=table.qualified)
+    started = time.perf_counter()
+    try:
+        rows = as_result_set(await explorer.execute(_scan_sql(table, scan_rows), scan_rows))
+    except Exception as exc:
+        sample.error = str(exc) or type(exc).__name__
+        rows = ResultSet(())
+    sample.elapsed = time.perf_counter() - started
+    return _fold(sample, table, rows, distinct)
+
+
+async def _sample_batch(
+    execute_batch: Any, tables: list[Table], distinct: int, scan_rows: int
+) -> list[TableSample]:
+    started = time.perf_counter()
+    try:
+        results = await execute_batch([_scan_sql(t, scan_rows) for t in tables], scan_rows)
+    except Exception as exc:
+        results = [exc] * len(tables)
+    elapsed = time.perf_counter() - started
+    samples = []
+    for table, result in zip(tables, results):
+        # Tables in one pipeline share its round-trip, so they share its time too.
+        sample = TableSample(table=table.qualified, elapsed=elapsed)
+        if isinstance(result, Exception):
+            sample.error = str(result) or type(result).__name__
+            rows = ResultSet(())
+        else:
+            rows = as_result_set(result)
+        samples.append(_fold(sample, table, rows, distinct))
+    return samples
+
+
+def _fold(sample: TableSample, table: Table, rows: ResultSet, distinct: int) -> TableSample:
+    sample.rows_scanned = len(rows)
+    columns = [c.name for c in table.columns] or list(rows.columns)
+    position = {name: i for i, name in enumerate(rows.columns)}
+    seen: dict[str, dict[str, None]] = {c: {} for c in columns}
+    for col, bucket in seen.items():
+        idx = position.get(col)
+        if idx is None:
+            continue
+        for row in rows.rows:
+            if len(bucket) >= distinct:
+                break
+            value = row[idx]
+            if value is not None:
+                bucket.setdefault(str(value), None)
+    sample.values = {c: list(b) for c, b in seen.items()}
+
+    logger.debug(
+        "sampled %s: %d rows in %.3fs%s",
+        sample.table,
+        sample.rows_scanned,
+        sample.elapsed,
+        f" (failed: {sample.error})" if sample.error else "",
+    )
+    return sample
@@ -87,6 +87,8 @@ class FedEntry:
 
 
 class SemanticFederationTool(ToolPort):
+    concurrent_safe = False  # add-then-remove in one completion must stay ordered
+
     @property
     def spec(self) -> ToolSpec:
         return ToolSpec(
@@ -7,9 +7,12 @@ Async port methods are driven with ``asyncio.run``.
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 
-from lang2sql.adapters.db.postgres_explorer import PostgresExplorer
+import pytest
+
+from lang2sql.adapters.db.stub_explorer import StubExplorer
 from lang2sql.adapters.llm.openai_ import OpenAILLM
 from lang2sql.adapters.storage.sqlite_store import SqliteStore
 from lang2sql.core.identity import Identity
@@ -64,6 +67,16 @@ def test_session_save_then_load_reconstructs_transcript() -> None:
     assert loaded.transcript[2].name == "run_sql"
 
 
+def test_session_summary_survives_save_and_load() -> None:
+    store = SqliteStore()
+    identity = Identity(user_id="u1", channel_id="c")
+    session = Session(identity=identity, summary="Discussed orders by region.")
+    asyncio.run(store.save("k", session))
+    loaded = asyncio.run(store.load("k"))
+    assert loaded is not None
+    assert loaded.summary == "Discussed orders by region."
+
+
 def test_session_load_missing_returns_none() -> None:
     store = SqliteStore()
     assert asyncio.run(store.load("nope")) is None
@@ -80,8 +93,8 @@ def test_kv_set_get_delete() -> None:
     assert store.kv_get("scope", "k") is None
 
 
-def test_postgres_explorer_canned_data() -> None:
-    explorer = PostgresExplorer("postgresql://ignored")
+def test_stub_explorer_canned_data() -> None:
+    explorer = StubExplorer()
     tables = asyncio.run(explorer.list_tables())
     names = {t.qualified for t in tables}
     assert "public.orders" in names
@@ -95,13 +108,13 @@ def test_postgres_explorer_canned_data() -> None:
     assert "status" in rows[0]
 
 
-def test_postgres_explorer_satisfies_protocol() -> None:
-    explorer = PostgresExplorer("postgresql://ignored")
+def test_stub_explorer_satisfies_protocol() -> None:
+    explorer = StubExplorer()
     assert isinstance(explorer, ExplorerPort)
 
 
-def test_postgres_explorer_execute() -> None:
-    explorer = PostgresExplorer("postgresql://ignored")
+def test_stub_explorer_execute() -> None:
+    explorer = StubExplorer()
     order_rows = asyncio.run(explorer.execute("SELECT * FROM orders WHERE status='paid'"))
     assert order_rows and "amount" in order_rows[0]
 
@@ -132,3 +145,346 @@ def test_openai_complete_without_key_raises() -> None:
     finally:
         if saved is not None:
             os.environ["OPENAI_API_KEY"] = saved
+
+
+def _chunk(content=None, tool_calls=None, finish=None) -> dict:
+    delta: dict = {}
+    if content is not None:
+        delta["content"] = content
+    if tool_calls is not None:
+        delta["tool_calls"] = tool_calls
+    return {"choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+
+
+def test_openai_sse_line_parsing() -> None:
+    from lang2sql.adapters.llm.openai_ import _SSE_DONE, _parse_sse_line
+
+    assert _parse_sse_line(": keep-alive\n") is None
+    assert _parse_sse_line("\n") is None
+    assert _parse_sse_line('data: {"a": 1}\n') == {"a": 1}
+    assert _parse_sse_line("data: [DONE]\n") is _SSE_DONE
+
+
+def test_openai_stream_assembles_text_and_tool_call_fragments(monkeypatch) -> None:
+    events = [
+        _chunk(content="<thi"),
+        _chunk(content="nk>plan</think>Hel"),
+        _chunk(content="lo"),
+        _chunk(tool_calls=[{"index": 0, "id": "call_1", "function": {"name": "run_sql", "arguments": '{"sq'}}]),
+        _chunk(tool_calls=[{"index": 0, "function": {"arguments": 'l": "SELECT 1"}'}}]),
+        _chunk(tool_calls=[{"index": 1, "id": "call_2", "function": {"name": "explore_schema", "arguments": "{}"}}]),
+        _chunk(finish="tool_calls"),
+    ]
+    llm = OpenAILLM(api_key="k")
+
+    async def fake_post_stream(payload):
+        for event in events:
+            yield event
+
+    monkeypatch.setattr(llm, "_post_stream", fake_post_stream)
+
+    async def collect():
+        return [d async for d in llm.stream([Message(role=Role.USER, content="hi")])]
+
+    deltas = asyncio.run(collect())
+    assert "".join(d.content for d in deltas) == "Hello"  # think block never shown
+    final = deltas[-1].completion
+    assert final is not None and final.finish_reason == "tool_calls"
+    assert final.content == "Hello"
+    assert [(c.id, c.name, c.arguments) for c in final.tool_calls] == [
+        ("call_1", "run_sql", {"sql": "SELECT 1"}),
+        ("call_2", "explore_schema", {}),
+    ]
+
+
+# --- pooled HTTP client against a local aiohttp server ---------------------
+
+
+async def _with_server(handler, body):
+    """Serve ``handler`` on POST / for the duration of ``body(base_url)``."""
+    from aiohttp import web
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        return await body(f"http://127.0.0.1:{port}/")
+    finally:
+        await runner.cleanup()
+
+
+def test_http_client_reuses_keep_alive_connection() -> None:
+    from aiohttp import web
+
+    from lang2sql.adapters.http import HttpClient
+
+    peers: list = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"n": len(peers)})
+
+    async def body(url):
+        client = HttpClient(limit_per_host=1)
+        try:
+            return [(await client.request("POST", url, json_body={})).json() for _ in range(3)]
+        finally:
+            await client.close()
+
+    assert asyncio.run(_with_server(handler, body)) == [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert len(set(peers)) == 1  # one TCP connection served every request
+
+
+def test_openai_complete_and_stream_over_http_client() -> None:
+    from aiohttp import web
+
+    from lang2sql.adapters.http import HttpClient
+
+    async def handler(request):
+        payload = await request.json()
+        assert request.headers["Authorization"] == "Bearer k"
+        if not payload.get("stream"):
+            return web.json_response(
+                {"choices": [{"message": {"content": "hi"}, "finish_reason": "stop"}]}
+            )
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        for piece in ("Hel", "lo"):
+            await resp.write(f"data: {json.dumps(_chunk(content=piece))}\n\n".encode())
+        await resp.write(b"data: [DONE]\n\n")
+        return resp
+
+    async def body(url):
+        client = HttpClient()
+        llm = OpenAILLM(api_key="k", base_url=url, http=client)
+        try:
+            done = await llm.complete([Message(role=Role.USER, content="x")])
+            deltas = [d async for d in llm.stream([Message(role=Role.USER, content="x")])]
+            return done, deltas
+        finally:
+            await client.close()
+
+    done, deltas = asyncio.run(_with_server(handler, body))
+    assert done.content == "hi"
+    assert "".join(d.content for d in deltas) == "Hello"
+    assert deltas[-1].completion is not None and deltas[-1].completion.content == "Hello"
+
+
+# --- persistent completion cache -------------------------------------------
+
+
+class _CountingLLM:
+    model = "m1"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def complete(self, messages, tools=()):
+        from lang2sql.core.types import Completion
+
+        self.calls += 1
+        return Completion(
+            content=f"reply {self.calls}",
+            tool_calls=[ToolCall(id="c", name="run_sql", arguments={"sql": "SELECT 1"})],
+            finish_reason="stop",
+        )
+
+
+def test_caching_llm_replays_identical_requests() -> None:
+    from lang2sql.adapters.llm.cache import CachingLLM
+
+    inner, store = _CountingLLM(), SqliteStore()
+    llm = CachingLLM(inner, store)
+    prompt = [Message(role=Role.USER, content="describe orders")]
+
+    first = asyncio.run(llm.complete(prompt))
+    again = asyncio.run(CachingLLM(inner, store).complete(prompt))  # survives a new wrapper
+    assert inner.calls == 1
+    assert again == first
+
+    asyncio.run(llm.complete([Message(role=Role.USER, content="describe users")]))
+    assert inner.calls == 2
+    assert (llm.stats.hits, llm.stats.misses) == (0, 2)
+
+
+def test_caching_llm_forgets_a_request() -> None:
+    from lang2sql.adapters.llm.cache import CachingLLM
+
+    inner, store = _CountingLLM(), SqliteStore()
+    llm = CachingLLM(inner, store)
+    prompt = [Message(role=Role.USER, content="describe orders")]
+    asyncio.run(llm.complete(prompt))
+    llm.forget([Message(role=Role.USER, content="something else")])
+    asyncio.run(llm.complete(prompt))
+    assert inner.calls == 1
+
+    llm.forget(prompt)
+    assert asyncio.run(llm.complete(prompt)).content == "reply 2"
+
+
+def test_caching_llm_does_not_store_a_truncated_completion() -> None:
+    from lang2sql.adapters.llm.cache import CachingLLM
+    from lang2sql.core.types import Completion
+
+    class Truncating(_CountingLLM):
+        async def complete(self, messages, tools=()):
+            self.calls += 1
+            return Completion(content="[{\"kind\": ", finish_reason="length")
+
+    inner, store = Truncating(), SqliteStore()
+    llm = CachingLLM(inner, store)
+    prompt = [Message(role=Role.USER, content="describe orders")]
+    asyncio.run(llm.complete(prompt))
+    asyncio.run(llm.complete(prompt))
+    assert inner.calls == 2
+    assert store.llm_cache_usage()[0] == 0
+
+
+def test_caching_llm_expires_and_evicts_lru() -> None:
+    from lang2sql.adapters.llm.cache import CachingLLM
+
+    inner, store = _CountingLLM(), SqliteStore()
+    expired = CachingLLM(inner, store, ttl_seconds=0.0)
+    msg = [Message(role=Role.USER, content="a")]
+    asyncio.run(expired.complete(msg))
+    asyncio.run(expired.complete(msg))
+    assert inner.calls == 2
+
+    store.llm_cache_clear()
+    lru = CachingLLM(inner, store, max_entries=2)
+    for text in ("a", "b", "a", "c"):  # "b" is least recently used when "c" lands
+        asyncio.run(lru.complete([Message(role=Role.USER, content=text)]))
+    assert store.llm_cache_usage()[0] == 2
+    assert lru.stats.evictions == 1
+    calls = inner.calls
+    asyncio.run(lru.complete([Message(role=Role.USER, content="a")]))
+    assert inner.calls == calls  # still cached
+    asyncio.run(lru.complete([Message(role=Role.USER, content="b")]))
+    assert inner.calls == calls + 1  # evicted
+
+
+# --- OpenAI throttling and retry --------------------------------------------
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _ScriptedHttp:
+    """Returns canned HttpResponses in order, recording each request."""
+
+    def __init__(self, responses) -> None:
+        self._responses = list(responses)
+        self.requests = 0
+
+    async def request(self, method, url, *, json_body=None, headers=None, timeout=None):
+        self.requests += 1
+        return self._responses.pop(0)
+
+
+def _openai_ok(content: str = "ok"):
+    from lang2sql.adapters.http import HttpResponse
+
+    body = {"choices": [{"message": {"content": content}, "finish_reason": "stop"}]}
+    return HttpResponse(200, json.dumps(body).encode(), {})
+
+
+def test_openai_retries_429_honouring_retry_after() -> None:
+    from lang2sql.adapters.http import HttpResponse
+    from lang2sql.adapters.llm.ratelimit import RateLimiter
+
+    clock = _FakeClock()
+    http = _ScriptedHttp(
+        [
+            HttpResponse(429, b"slow down", {"Retry-After": "2"}),
+            HttpResponse(503, b"busy", {"retry-after-ms": "250"}),
+            _openai_ok("finally"),
+        ]
+    )
+    llm = OpenAILLM(api_key="k", http=http, limiter=RateLimiter(clock=clock, sleep=clock.sleep))
+
+    done = asyncio.run(llm.complete([Message(role=Role.USER, content="x")]))
+    assert done.content == "finally"
+    assert clock.sleeps == [2.0, 0.25]
+    stats = llm.throttle_stats
+    assert (stats.retries, stats.rate_limited, stats.throttled_seconds) == (2, 1, 2.25)
+
+
+def test_openai_does_not_retry_client_errors() -> None:
+    from lang2sql.adapters.http import HttpResponse
+
+    http = _ScriptedHttp([HttpResponse(400, b"bad request", {})])
+    llm = OpenAILLM(api_key="k", http=http)
+    with pytest.raises(RuntimeError, match="OpenAI HTTP 400"):
+        asyncio.run(llm.complete([Message(role=Role.USER, content="x")]))
+    assert http.requests == 1
+
+
+def test_openai_stream_syncs_the_limiter_from_response_headers() -> None:
+    from lang2sql.adapters.llm.ratelimit import RateLimiter
+
+    class _StreamingHttp:
+        async def stream_lines(self, method, url, *, json_body=None, headers=None,
+                               timeout=None, on_headers=None):
+            on_headers(
+                {
+                    "x-ratelimit-limit-requests": "100",
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-reset-requests": "4s",
+                }
+            )
+            chunk = {"choices": [{"delta": {"content": "hi"}, "finish_reason": "stop"}]}
+            yield "data: " + json.dumps(chunk)
+            yield "data: [DONE]"
+
+    clock = _FakeClock()
+    llm = OpenAILLM(
+        api_key="k", http=_StreamingHttp(), limiter=RateLimiter(clock=clock, sleep=clock.sleep)
+    )
+
+    async def drain():
+        return [d async for d in llm.stream([Message(role=Role.USER, content="x")])]
+
+    assert asyncio.run(drain())[-1].completion.content == "hi"
+    assert clock.sleeps == []
+    asyncio.run(drain())  # the stream's headers said the request budget is spent
+    assert clock.sleeps and clock.sleeps[0] >= 4.0
+
+
+def test_rate_limiter_buckets_learn_limits_from_headers() -> None:
+    from lang2sql.adapters.llm.ratelimit import RateLimiter, parse_duration
+
+    assert parse_duration("6m0s") == 360.0 and parse_duration("20ms") == 0.02
+
+    clock = _FakeClock()
+    limiter = RateLimiter(rpm=2, clock=clock, sleep=clock.sleep)
+    asyncio.run(limiter.acquire(10))
+    asyncio.run(limiter.acquire(10))
+    assert clock.sleeps == []
+    asyncio.run(limiter.acquire(10))  # third request in the same minute waits
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+    # The provider says the token budget is spent for 5s: honour it.
+    limiter.observe(
+        {
+            "x-ratelimit-limit-tokens": "1000",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "5s",
+        }
+    )
+    asyncio.run(limiter.acquire(1))
+    assert clock.sleeps[-1] >= 5.0
+    assert limiter.stats.waits == 2
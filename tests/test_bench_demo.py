@@ -58,3 +58,17 @@ def test_demo_federation_resolves_distinct_definitions():
     assert "paid sub" not in mkt_rendered
     assert "paid sub" in fin_rendered
     assert "30d login" not in fin_rendered
+
+
+def test_safety_gate_bench_generates_passing_queries():
+    spec = importlib.util.spec_from_file_location(
+        "safety_gate", _DEMO.parent / "safety_gate.py"
+    )
+    bench = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(bench)
+
+    sql = bench.generate_cte_query(20)
+    assert len(sql) > 4000  # multi-KB, with quoted ';' in every CTE
+    cold, warm = bench.measure(sql, repeat=2)
+    assert cold > 0 and warm > 0
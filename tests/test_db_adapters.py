@@ -3,17 +3,21 @@
 The SQLAlchemy explorer is exercised against a real on-disk SQLite DB (a
 SQLAlchemy dialect that ships with Python), proving introspection + execute end
 to end. The D1 explorer uses an injected transport so its request/response
-handling is tested with no network.
+handling is tested with no network, and the Postgres explorer runs over a fake
+pool since psycopg isn't a test dependency.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 
 import pytest
 
 from lang2sql.adapters.db import (
+    AsyncSqlAlchemyExplorer,
     D1Explorer,
+    PostgresExplorer,
     SqlAlchemyExplorer,
     build_explorer,
     explorer_from_env,
@@ -29,12 +33,34 @@ def test_factory_routes_d1():
 
 
 def test_factory_routes_sqlalchemy_without_connecting():
-    # No psycopg installed here; routing must not import a driver or connect.
-    exp = build_explorer("postgresql+psycopg://u:p@h/db")
+    # No pymysql installed here; routing must not import a driver or connect.
+    exp = build_explorer("mysql+pymysql://u:p@h/db")
     assert isinstance(exp, SqlAlchemyExplorer)
     assert exp._engine is None  # lazy: not built yet
 
 
+def test_factory_routes_postgres_to_psycopg_explorer_without_connecting():
+    # psycopg isn't installed here either; the pool is only opened on first use.
+    for url in ["postgresql://u:p@h/db", "postgres://u:p@h/db", "postgresql+psycopg://u:p@h/db"]:
+        exp = build_explorer(url, extras={"statement_timeout_ms": 5000, "pool_size": 3})
+        assert isinstance(exp, PostgresExplorer), url
+        assert exp.dsn.startswith(("postgresql://", "postgres://")) and exp._pool is None
+        assert (exp.statement_timeout_ms, exp.pool_size) == (5000, 3)
+    fallback = build_explorer("postgresql://u@h/db", prefer_async=False)
+    assert type(fallback) is SqlAlchemyExplorer
+    assert fallback.url == "postgresql+psycopg://u@h/db"
+
+
+def test_factory_routes_async_capable_drivers():
+    for url in ["postgresql+asyncpg://u:p@h/db", "sqlite+aiosqlite:///x.db", "mysql+asyncmy://u@h/db"]:
+        assert isinstance(build_explorer(url), AsyncSqlAlchemyExplorer), url
+    for url in ["sqlite:///x.db", "mysql+pymysql://u@h/db", "duckdb:///:memory:"]:
+        assert type(build_explorer(url)) is SqlAlchemyExplorer, url
+    assert type(build_explorer("mysql+asyncmy://u@h/db", prefer_async=False)) is SqlAlchemyExplorer
+    exp = build_explorer("sqlite+aiosqlite:///x.db", extras={"pool_size": 2, "max_overflow": 0})
+    assert (exp.pool_size, exp.max_overflow) == (2, 0)
+
+
 def test_factory_rejects_empty_and_schemeless():
     for bad in ["", "   ", "just-a-name"]:
         with pytest.raises(ValueError):
@@ -90,13 +116,558 @@ def test_sqlalchemy_explorer_introspect_and_execute(tmp_path):
     assert len(sample) == 1
 
 
+def test_sqlalchemy_execute_returns_result_set(tmp_path):
+    from lang2sql.core.result import ResultSet
+
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+    rows = asyncio.run(exp.execute("SELECT u.id, v.id, u.email FROM users u JOIN users v ON v.id = u.id"))
+    assert isinstance(rows, ResultSet)
+    assert rows.columns == ("id", "id", "email")  # duplicate names survive
+    assert rows.rows == [(1, 1, "a@x.com"), (2, 2, "b@x.com")]
+
+
+def test_result_set_shapes_and_renderers():
+    from decimal import Decimal
+
+    from lang2sql.core.result import ResultSet, as_result_set
+
+    rs = ResultSet(["id", "amount", "note"], [(1, Decimal("2.50"), None), (2, 3, "x,y")])
+    assert len(rs) == 2 and rs[0] == {"id": 1, "amount": Decimal("2.50"), "note": None}
+    assert rs == [{"id": 1, "amount": Decimal("2.50"), "note": None},
+                  {"id": 2, "amount": 3, "note": "x,y"}]
+    assert rs.head(1).rows == [(1, Decimal("2.50"), None)] and rs[1:].columns == rs.columns
+    assert rs.column("id") == [1, 2]
+    assert rs.to_markdown(max_rows=1) == "id | amount | note\n--- | --- | ---\n1 | 2.50 | NULL"
+    assert rs.to_csv().splitlines() == ["id,amount,note", "1,2.50,", '2,3,"x,y"']
+    assert as_result_set(rs) is rs
+    assert as_result_set([{"a": 1}, {"a": 2}]).rows == [(1,), (2,)]
+
+
+def test_result_set_numpy_columns():
+    np = pytest.importorskip("numpy")
+    from lang2sql.core.result import ResultSet
+
+    rs = ResultSet(["n", "f", "s"], [(1, 1.5, "a"), (2, None, "b")])
+    assert rs.array("n").dtype == np.int64
+    f = rs.array("f")
+    assert f.dtype == np.float64 and np.isnan(f[1])
+    assert rs.array("s") is None
+
+
+def test_sqlalchemy_execute_stream_batches_and_releases_connection(tmp_path):
+    from sqlalchemy import create_engine, text
+
+    db = tmp_path / "demo.db"
+    with create_engine(f"sqlite:///{db}").begin() as conn:
+        conn.execute(text("CREATE TABLE n (v INTEGER)"))
+        conn.execute(text("INSERT INTO n VALUES (:v)"), [{"v": v} for v in range(25)])
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+
+    async def scenario():
+        sizes = [len(b) async for b in exp.execute_stream("SELECT v FROM n", 22, batch_size=10)]
+        assert sizes == [10, 10, 2]
+        stream = exp.execute_stream("SELECT v FROM n", 1000, batch_size=4)
+        assert await stream.__anext__() == [{"v": 0}, {"v": 1}, {"v": 2}, {"v": 3}]
+        await stream.aclose()  # consumer stopped early
+
+    asyncio.run(scenario())
+    assert exp._get_engine().pool.checkedout() == 0
+
+
+_ENDLESS = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT count(*) FROM c"
+
+
+def test_sqlalchemy_timeout_interrupts_the_statement(tmp_path):
+    import time
+
+    from lang2sql.core.ports.explorer import QueryTimeout, execute_stream
+
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+
+    async def scenario():
+        started = time.monotonic()
+        with pytest.raises(QueryTimeout):
+            await exp.execute(_ENDLESS, timeout=0.2)
+        with pytest.raises(QueryTimeout):
+            async for _ in execute_stream(exp, _ENDLESS, timeout=0.2):
+                pass
+        # Interrupted, not abandoned: both returned well inside the grace period.
+        assert time.monotonic() - started < 3
+        assert await exp.execute("SELECT count(*) AS n FROM users", timeout=5) == [{"n": 2}]
+
+    asyncio.run(scenario())
+    assert exp._get_engine().pool.checkedout() == 0
+
+
+def test_statement_guard_sets_the_dialects_server_timeout():
+    from lang2sql.adapters.db.sqlalchemy_explorer import _StatementGuard
+
+    class FakeConn:
+        def __init__(self, name, mariadb=False):
+            self.dialect = type("D", (), {"name": name, "is_mariadb": mariadb})()
+            self.connection = type("C", (), {"driver_connection": object()})()
+            self.sql = []
+
+        def exec_driver_sql(self, sql):
+            self.sql.append(sql)
+
+    def run(name, mariadb=False):
+        conn = FakeConn(name, mariadb)
+        guard = _StatementGuard(2.5)
+        guard.begin(conn)
+        guard.end(conn)
+        return [s.split("=")[0].strip() for s in conn.sql]
+
+    assert run("postgresql") == ["SET LOCAL statement_timeout"]
+    assert run("mysql") == ["SET SESSION MAX_EXECUTION_TIME"] * 2
+    assert run("mysql", mariadb=True) == ["SET SESSION max_statement_time"] * 2
+    assert run("snowflake") == [
+        "ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS", "ALTER SESSION UNSET STATEMENT_TIMEOUT_IN_SECONDS"
+    ]
+    assert run("sqlite") == []  # interrupt only
+
+
+def test_execute_stream_bounds_explorers_without_timeout_support():
+    from lang2sql.core.ports.explorer import QueryTimeout, execute_stream
+
+    class SlowExplorer:
+        async def execute(self, sql, limit=1000):
+            await asyncio.sleep(10)
+
+    async def scenario():
+        with pytest.raises(QueryTimeout, match="0.05s"):
+            async for _ in execute_stream(SlowExplorer(), "SELECT 1", timeout=0.05):
+                pass
+
+    asyncio.run(scenario())
+
+
+def test_sqlalchemy_catalog_serves_warm_reads_from_memory(tmp_path, monkeypatch):
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+    asyncio.run(exp.list_tables())
+    asyncio.run(exp.describe_table("users"))
+
+    def boom(*a, **k):
+        raise AssertionError("warm read went back to the inspector")
+
+    monkeypatch.setattr("sqlalchemy.inspect", boom)
+    assert {t.name for t in asyncio.run(exp.list_tables())} == {"users"}
+    assert {c.name for c in asyncio.run(exp.describe_table("users")).columns} == {"id", "email"}
+
+
+def test_sqlalchemy_cold_catalog_reads_share_one_load(tmp_path, monkeypatch):
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+    calls = {"list": 0, "describe": 0}
+    list_sync, describe_sync = exp._list_tables_sync, exp._describe_table_sync
+
+    def counting_list(conn):
+        calls["list"] += 1
+        return list_sync(conn)
+
+    def counting_describe(conn, name):
+        calls["describe"] += 1
+        return describe_sync(conn, name)
+
+    monkeypatch.setattr(exp, "_list_tables_sync", counting_list)
+    monkeypatch.setattr(exp, "_describe_table_sync", counting_describe)
+
+    async def scenario():
+        listed = await asyncio.gather(*(exp.list_tables() for _ in range(5)))
+        described = await asyncio.gather(*(exp.describe_table("users") for _ in range(5)))
+        return listed, described
+
+    listed, described = asyncio.run(scenario())
+    assert calls == {"list": 1, "describe": 1}
+    assert all([t.name for t in tables] == ["users"] for tables in listed)
+    assert listed[0] is not listed[1]  # callers get their own list
+    assert all(t.name == "users" for t in described)
+
+
+def test_sqlalchemy_catalog_sees_ddl_and_explicit_invalidation(tmp_path):
+    from sqlalchemy import create_engine, text
+
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+    asyncio.run(exp.list_tables())
+    version = exp.catalog_version
+
+    # SQLite's schema_version probe notices DDL without waiting for the TTL.
+    with create_engine(f"sqlite:///{db}").begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER)"))
+    assert {t.name for t in asyncio.run(exp.list_tables())} == {"users", "orders"}
+    assert exp.catalog_version > version
+
+    version = exp.catalog_version
+    exp.invalidate()
+    assert exp.catalog_version > version
+
+
+def test_sqlalchemy_describe_all_reads_columns_and_foreign_keys_in_bulk(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine, text
+
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    with create_engine(f"sqlite:///{db}").begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER, user_id INTEGER REFERENCES users(id))"))
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+
+    tables = {t.name: t for t in asyncio.run(exp.describe_all())}
+    assert set(tables) == {"orders", "users"}
+    cols = {c.name: c for c in tables["orders"].columns}
+    assert cols["user_id"].foreign_key == "users.id"
+    assert {c.name: c.nullable for c in tables["users"].columns} == {"id": True, "email": False}
+
+    # The bulk load warmed the whole catalog.
+    def boom(*a, **k):
+        raise AssertionError("warm read went back to the inspector")
+
+    monkeypatch.setattr("sqlalchemy.inspect", boom)
+    assert [c.name for c in asyncio.run(exp.describe_table("orders")).columns] == ["id", "user_id"]
+    assert {t.name for t in asyncio.run(exp.list_tables())} == {"orders", "users"}
+
+
+def test_describe_all_binds_folded_schema_names_as_the_catalog_stores_them(monkeypatch):
+    import sqlalchemy
+
+    class FoldingDialect:  # Snowflake: case-insensitive names are stored upper-case
+        name = "snowflake"
+        requires_name_normalize = True
+
+        def normalize_name(self, name):
+            return name.lower() if name.isupper() else name
+
+        def denormalize_name(self, name):
+            return name.upper() if name.islower() else name
+
+    class Rows:
+        def __init__(self, rows):
+            self._rows = rows
+
+        def mappings(self):
+            return self
+
+        def all(self):
+            return self._rows
+
+    class Conn:
+        dialect = FoldingDialect()
+        params = None
+
+        def execute(self, statement, params=None):
+            Conn.params = params
+            if params != {"sch0": "PUBLIC"}:
+                return Rows([])
+            return Rows([{"table_schema": "PUBLIC", "table_name": "ORDERS", "column_name": "ID",
+                          "data_type": "NUMBER", "is_nullable": False}])
+
+    class Inspector:
+        default_schema_name = "public"  # what the dialect reports
+
+    monkeypatch.setattr(sqlalchemy, "inspect", lambda conn: Inspector())
+    tables = SqlAlchemyExplorer("snowflake://u@acct/db")._describe_all_sync(Conn(), (), ())
+    assert Conn.params == {"sch0": "PUBLIC"}
+    assert [(t.name, [c.name for c in t.columns]) for t in tables] == [("orders", ["id"])]
+
+
+def test_async_sqlalchemy_explorer_on_aiosqlite(tmp_path, monkeypatch):
+    from lang2sql.core.ports.explorer import QueryTimeout
+
+    pytest.importorskip("aiosqlite")
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    exp = build_explorer(f"sqlite+aiosqlite:///{db}", extras={"pool_size": 2})
+    assert isinstance(exp, AsyncSqlAlchemyExplorer)
+
+    def no_threads(*a, **k):
+        raise AssertionError("async explorer fell back to a worker thread")
+
+    monkeypatch.setattr(asyncio, "to_thread", no_threads)
+
+    async def scenario():
+        try:
+            assert {t.name for t in await exp.list_tables()} == {"users"}
+            cols = (await exp.describe_table("users")).columns
+            assert [c.name for c in cols] == ["id", "email"]
+            [users] = await exp.describe_all()
+            assert {c.name: c.nullable for c in users.columns} == {"id": True, "email": False}
+            # Concurrent queries share the pool instead of queueing on threads.
+            results = await asyncio.gather(
+                *(exp.execute("SELECT email FROM users ORDER BY id", limit=1) for _ in range(6))
+            )
+            assert results == [[{"email": "a@x.com"}]] * 6
+            assert len(await exp.sample_rows("users", limit=5)) == 2
+            batches = [b async for b in exp.execute_stream("SELECT id FROM users", 10, batch_size=1)]
+            assert batches == [[{"id": 1}], [{"id": 2}]]
+            assert exp._get_engine().pool.size() == 2
+            with pytest.raises(QueryTimeout):
+                await exp.execute(_ENDLESS, timeout=0.2)
+            assert await exp.execute("SELECT count(*) AS n FROM users", timeout=5) == [{"n": 2}]
+        finally:
+            await exp.close()
+
+    asyncio.run(scenario())
+    assert exp._engine is None
+
+
+def test_describe_all_schema_patterns(tmp_path):
+    from lang2sql.adapters.db.introspection import glob_to_like, schema_filter
+
+    assert glob_to_like("stg_*") == "stg!_%"
+    where, params = schema_filter("s", ["public"], ["an*"], ["an_tmp?"])
+    assert "LIKE :inc0" in where and "NOT LIKE :exc0" in where
+    assert params == {"inc0": "an%", "exc0": "an!_tmp_"}
+
+    db = tmp_path / "demo.db"
+    _seed_sqlite(str(db))
+    exp = SqlAlchemyExplorer(f"sqlite:///{db}")
+    assert asyncio.run(exp.describe_all(exclude=["ma*"])) == []
+    assert [t.name for t in asyncio.run(exp.describe_all(include=["main"]))] == ["users"]
+
+
+def test_postgres_explorer_catalog_query_is_psycopg_ready():
+    from lang2sql.adapters.db.postgres_explorer import libpq_dsn, pyformat, quote_ident
+    from lang2sql.adapters.db.introspection import bulk_query
+
+    assert libpq_dsn("postgresql+psycopg://u@h:5432/db") == "postgresql://u@h:5432/db"
+    assert libpq_dsn("postgresql://u@h/db") == "postgresql://u@h/db"
+    assert quote_ident('sales.or"ders') == '"sales"."or""ders"'
+
+    sql, params = bulk_query("postgresql", ["public"], exclude=["tmp_*"], tables=["orders"])
+    assert params == {"sch0": "public", "exc0": "tmp!_%", "tbl0": "orders"}
+    converted = pyformat(sql)
+    assert "%(sch0)s" in converted and "%(tbl0)s" in converted and "%(exc0)s" in converted
+    assert ":sch0" not in converted and "::" not in converted
+    # Statement text depends only on the shape, so psycopg can reuse one prepared plan.
+    other, _ = bulk_query("postgresql", ["public"], exclude=["x"], tables=["users"])
+    assert pyformat(other) == converted
+
+
+# --- Postgres explorer over a fake psycopg pool ------------------------------
+
+class _FakePgError(Exception):
+    """Stands in for psycopg.Error, which isn't installed here."""
+
+
+class _FakeCursor:
+    def __init__(self, conn, name=None):
+        self.conn, self.name = conn, name
+        self.description = None
+        self.closed = False
+        self._rows = []
+
+    async def execute(self, sql, params=None, prepare=None):
+        self.conn.log.append(sql)
+        return await self.run(sql)
+
+    async def run(self, sql):
+        outcome = self.conn.script(sql)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        delay, columns, rows = outcome
+        if delay:
+            await asyncio.sleep(delay)
+        self.description = [type("Col", (), {"name": c}) for c in columns] or None
+        self._rows = list(rows)
+        return self
+
+    async def fetchmany(self, n):
+        out, self._rows = self._rows[:n], self._rows[n:]
+        return out
+
+    async def fetchall(self):
+        return await self.fetchmany(len(self._rows))
+
+    async def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class _FakeConn:
+    """Answers ``SELECT n`` with n rows; ``FAIL``/``SLOW`` statements misbehave."""
+
+    def __init__(self):
+        self.log, self.cursors = [], []
+        self.broken = self.closed = self.cancelled = False
+
+    def script(self, sql):
+        if sql.startswith("SELECT set_config"):
+            return 0, (), ()
+        if "FAIL" in sql:
+            return _FakePgError(f"bad statement: {sql}")
+        if "DROP" in sql:
+            self.broken = True
+            return _FakePgError("server closed the connection")
+        n = int(sql.split()[1])
+        return (5 if "SLOW" in sql else 0), ("n",), [(i,) for i in range(n)]
+
+    def cursor(self, name=None):
+        cur = _FakeCursor(self, name)
+        self.cursors.append(cur)
+        return cur
+
+    async def execute(self, sql, params=None):
+        self.log.append((sql, params))
+        return await _FakeCursor(self).run(sql)
+
+    @contextlib.asynccontextmanager
+    async def pipeline(self):
+        self.log.append("pipeline")
+        yield
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        self.log.append("begin")
+        yield
+        self.log.append("commit")
+
+    async def cancel_safe(self):
+        self.cancelled = True
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+
+def _fake_postgres(monkeypatch=None):
+    from lang2sql.adapters.db import postgres_explorer
+
+    if monkeypatch is not None:
+        monkeypatch.setattr(postgres_explorer, "_driver_error", lambda: _FakePgError)
+    conn = _FakeConn()
+    exp = PostgresExplorer("postgresql://u@h/db", statement_timeout_ms=30_000)
+    exp._pool = _FakePool(conn)  # what _get_pool would have opened
+    return exp, conn
+
+
+def test_postgres_execute_and_stream_over_a_fake_pool():
+    exp, conn = _fake_postgres()
+
+    rs = asyncio.run(exp.execute("SELECT 5", limit=3))
+    assert rs.column("n") == [0, 1, 2]
+
+    asyncio.run(exp.execute("SELECT 2", timeout=2))
+    guards = [entry[1] for entry in conn.log if isinstance(entry, tuple)]
+    assert guards == [("2000ms", False), ("30000ms", False)]  # tightened, then restored
+
+    async def stream():
+        return [b.column("n") async for b in exp.execute_stream("SELECT 7", limit=5, batch_size=2)]
+
+    conn.log.clear()
+    assert asyncio.run(stream()) == [[0, 1], [2, 3], [4]]
+    assert conn.log[0] == "begin" and conn.log[-1] == "commit"
+    assert conn.cursors[-1].name == "lang2sql_stream" and conn.cursors[-1].closed
+
+
+def test_postgres_timeout_cancels_the_query_on_the_server():
+    from lang2sql.core.ports.explorer import QueryTimeout
+
+    exp, conn = _fake_postgres()
+    with pytest.raises(QueryTimeout):
+        asyncio.run(exp.execute("SELECT 1 SLOW", timeout=0.05))
+    assert conn.cancelled
+    assert conn.log[-1] == (
+        "SELECT set_config('statement_timeout', %s, %s)", ("30000ms", False)
+    )
+
+
+def test_postgres_execute_batch_pipelines_and_replays_statement_errors(monkeypatch):
+    exp, conn = _fake_postgres(monkeypatch)
+
+    results = asyncio.run(exp.execute_batch(["SELECT 1", "SELECT 2"]))
+    assert [r.column("n") for r in results] == [[0], [0, 1]]
+    assert conn.log.count("pipeline") == 1
+    assert conn.cursors and all(cur.closed for cur in conn.cursors)
+
+    conn.cursors.clear()
+    first, bad, last = asyncio.run(exp.execute_batch(["SELECT 1", "SELECT FAIL", "SELECT 3"]))
+    assert first.column("n") == [0] and last.column("n") == [0, 1, 2]
+    assert isinstance(bad, _FakePgError)
+    assert all(cur.closed for cur in conn.cursors)
+
+    # A dropped connection is not a per-statement result.
+    with pytest.raises(_FakePgError, match="closed the connection"):
+        asyncio.run(exp.execute_batch(["SELECT 1", "DROP"]))
+
+
+def test_postgres_execute_batch_propagates_pool_errors(monkeypatch):
+    exp, _ = _fake_postgres(monkeypatch)
+
+    class _ExhaustedPool:
+        @contextlib.asynccontextmanager
+        async def connection(self):
+            raise TimeoutError("couldn't get a connection after 30.00 sec")
+            yield
+
+    exp._pool = _ExhaustedPool()
+    with pytest.raises(TimeoutError):
+        asyncio.run(exp.execute_batch(["SELECT 1"]))
+
+
+def test_catalog_rows_keep_one_column_per_foreign_key_fanout():
+    from lang2sql.adapters.db.introspection import bulk_query, tables_from_rows
+
+    sql, _ = bulk_query("mysql", ["shop"])
+    # FK targets are aggregated per column, not joined in (a join repeats the column).
+    assert "LEFT JOIN information_schema.KEY_COLUMN_USAGE" not in sql
+    assert "MIN(CONCAT(k.REFERENCED_TABLE_NAME" in sql
+
+    row = {"table_schema": "shop", "table_name": "orders", "data_type": "int"}
+    rows = [
+        {**row, "column_name": "id"},
+        {**row, "column_name": "user_id", "foreign_key": "users.id"},
+        {**row, "column_name": "user_id", "foreign_key": "accounts.user_id"},
+    ]
+    (orders,) = tables_from_rows(rows)
+    assert [(c.name, c.foreign_key) for c in orders.columns] == [
+        ("id", ""),
+        ("user_id", "users.id"),
+    ]
+
+
+def test_schema_catalog_ttl_expiry():
+    from lang2sql.adapters.db.catalog import SchemaCatalog
+    from lang2sql.core.ports.explorer import Table
+
+    now = [0.0]
+    cat = SchemaCatalog(ttl_seconds=10, clock=lambda: now[0])
+    assert cat.tables() is None and cat.is_stale()
+    cat.store_tables([Table(name="t")])
+    cat.store_table(Table(name="t"))
+    assert [t.name for t in cat.tables()] == ["t"]
+    assert [t.name for t in cat.described()] == ["t"]
+    now[0] = 11.0
+    assert cat.tables() is None and cat.table("t") is None
+
+
 # --- D1 explorer with mocked HTTP transport --------------------------------
 
 def _d1_transport(sql, params):
     """Fake the D1 HTTP API: shape responses by the SQL it receives."""
     s = sql.lower()
-    if "sqlite_master" in s:
-        results = [{"name": "orders"}, {"name": "users"}]
+    if "pragma_table_info" in s:  # the one-request catalog query
+        results = [
+            {"table_name": t, "column_name": c, "data_type": "INTEGER", "is_nullable": n}
+            for t, c, n in (("orders", "id", 0), ("orders", "amount", 1), ("users", "id", 0))
+        ]
     elif "pragma table_info" in s:
         results = [
             {"cid": 0, "name": "id", "type": "INTEGER", "notnull": 1, "dflt_value": None, "pk": 1},
@@ -121,6 +692,113 @@ def test_d1_list_describe_execute():
     assert rows == [{"id": 1, "amount": 9.5}]
 
 
+def test_d1_catalog_serves_list_and_describe_from_one_request():
+    sent: list[str] = []
+
+    def transport(sql, params):
+        sent.append(sql)
+        return _d1_transport(sql, params)
+
+    exp = D1Explorer("acct", "db", token="t", transport=transport)
+
+    async def run():
+        return await asyncio.gather(exp.list_tables(), exp.describe_table("orders"))
+
+    tables, orders = asyncio.run(run())
+    assert [t.name for t in tables] == ["orders", "users"]
+    assert [c.name for c in orders.columns] == ["id", "amount"]
+    assert len(asyncio.run(exp.describe_all())) == 2
+    assert asyncio.run(exp.describe_table("users")).columns[0].name == "id"
+    assert len(sent) == 1  # every read above shared the catalog request
+
+    asyncio.run(exp.describe_table("recent_orders"))  # a view: falls back to PRAGMA
+    assert sent[-1] == 'PRAGMA table_info("recent_orders")'
+    version = exp.catalog_version
+    exp.invalidate()
+    assert exp.catalog_version != version
+    asyncio.run(exp.list_tables())
+    assert len(sent) == 3
+
+
+def test_d1_describe_all_is_one_round_trip():
+    from lang2sql.adapters.db.introspection import SQLITE_CATALOG_SQL
+
+    sent: list[str] = []
+
+    def transport(sql, params):
+        sent.append(sql)
+        rows = [
+            {"table_schema": "main", "table_name": "orders", "column_name": "id",
+             "data_type": "INTEGER", "is_nullable": 0, "foreign_key": None},
+            {"table_schema": "main", "table_name": "orders", "column_name": "user_id",
+             "data_type": "INTEGER", "is_nullable": 1, "foreign_key": "users.id"},
+        ]
+        return {"success": True, "result": [{"results": rows}]}
+
+    exp = D1Explorer("acct", "db", token="t", transport=transport)
+    (orders,) = asyncio.run(exp.describe_all())
+    assert sent == [SQLITE_CATALOG_SQL]
+    assert orders.schema == ""
+    assert [(c.name, c.nullable, c.foreign_key) for c in orders.columns] == [
+        ("id", False, ""),
+        ("user_id", True, "users.id"),
+    ]
+
+
+def test_d1_awaits_async_transport():
+    seen: list[str] = []
+
+    async def transport(sql, params):
+        seen.append(sql)
+        return _d1_transport(sql, params)
+
+    exp = D1Explorer("acct", "db", token="t", transport=transport)
+    assert asyncio.run(exp.execute("SELECT * FROM orders")) == [{"id": 1, "amount": 9.5}]
+    assert seen == ["SELECT * FROM (\nSELECT * FROM orders\n) LIMIT 1000"]
+
+
+def test_d1_pushes_limit_into_the_sql():
+    from lang2sql.adapters.db.d1_explorer import limit_sql
+
+    sent: list[str] = []
+
+    def transport(sql, params):
+        sent.append(sql)
+        return _d1_transport(sql, params)
+
+    exp = D1Explorer("acct", "db", token="t", transport=transport)
+    asyncio.run(exp.execute("SELECT * FROM orders -- recent;\n;", limit=5))
+    assert sent == ["SELECT * FROM (\nSELECT * FROM orders -- recent;\n) LIMIT 5"]
+    assert limit_sql("WITH t AS (SELECT 1) SELECT * FROM t", 3).endswith(") LIMIT 3")
+    assert limit_sql("PRAGMA table_info(\"x\");", 3) == 'PRAGMA table_info("x")'
+
+
+def test_d1_samples_every_table_in_one_request():
+    from lang2sql.core.ports.explorer import Table
+    from lang2sql.tools.sampling import sample_tables
+
+    requests: list[str] = []
+
+    def transport(sql, params):
+        requests.append(sql)
+        statements = sql.split(";\n")
+        if "broken" in sql:
+            return {"success": False, "errors": [{"message": "no such table: broken"}], "result": []}
+        return {"success": True, "result": [{"results": [{"v": i}]} for i in range(len(statements))]}
+
+    exp = D1Explorer("acct", "db", token="t", transport=transport)
+    tables = [Table(f"t{i}", schema="") for i in range(4)]
+    out = asyncio.run(sample_tables(exp, tables, scan_rows=7))
+    assert len(requests) == 1 and requests[0].count(") LIMIT 7") == 4
+    assert out["t3"].values == {"v": ["3"]}
+
+    # One bad statement fails the request; the batch falls back per statement.
+    requests.clear()
+    results = asyncio.run(exp.execute_batch(["SELECT 1", "SELECT * FROM broken"]))
+    assert len(requests) == 3
+    assert results[0] == [{"v": 0}] and isinstance(results[1], RuntimeError)
+
+
 def test_d1_raises_on_api_error():
     def failing(sql, params):
         return {"success": False, "errors": [{"message": "bad token"}], "result": []}
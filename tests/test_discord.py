@@ -95,6 +95,17 @@ def test_render_small_rows_inlined() -> None:
     assert "1,a" in msg.text
 
 
+def test_render_result_set_uses_its_columns() -> None:
+    from lang2sql.core.result import ResultSet
+
+    small = ResultSet(["id", "name"], [(1, "a"), (2, None)])
+    inline = render_answer("", small).text
+    assert inline.startswith("id,name") and "2," in inline
+    big = ResultSet(["n"], [(i,) for i in range(MAX_INLINE_ROWS + 1)])
+    msg = render_answer("", big)
+    assert msg.file_bytes is not None and msg.file_bytes.startswith(b"n\r\n0\r\n")
+
+
 def test_render_many_text_lines_attaches() -> None:
     text = "\n".join(f"line {i}" for i in range(MAX_INLINE_ROWS + 1))
     msg = render_answer(text)
@@ -102,6 +113,17 @@ def test_render_many_text_lines_attaches() -> None:
     assert "lines" in msg.text
 
 
+def test_render_passes_spooled_attachment_through() -> None:
+    import io
+
+    from lang2sql.core.types import Attachment
+
+    spooled = io.BytesIO(b"id\n1\n")
+    msg = render_answer("Here you go", attachment=Attachment("result.csv", spooled, rows=1200))
+    assert msg.file is spooled and msg.file_bytes is None
+    assert msg.text == "Here you go\n1200 rows — attached as result.csv."
+
+
 # -- CommandHandlers (real in-memory concierge) ---------------------------
 
 
@@ -163,6 +185,15 @@ def test_audit_me_empty() -> None:
     assert "No audited activity" in audit.text
 
 
+def test_quota_usage_is_admin_only() -> None:
+    handlers = CommandHandlers(ContextConcierge())
+    member = to_identity(InteractionContext(user_id="u4", guild_id="g1", channel_id="c1"))
+    admin = to_identity(InteractionContext(user_id="u5", guild_id="g1", channel_id="c1", is_admin=True))
+    assert "Only server admins" in asyncio.run(handlers.quota(member)).text
+    text = asyncio.run(handlers.quota(admin)).text
+    assert text.startswith("run_sql quota for g1:") and "in flight: 0/4" in text
+
+
 def test_query_returns_outbound_message() -> None:
     """With the default FakeLLM (no OPENAI key), a query still returns text."""
     handlers = CommandHandlers(ContextConcierge())
@@ -186,6 +217,53 @@ def test_query_persists_session() -> None:
     assert any(m.content == "first question" for m in saved.transcript)
 
 
+def test_query_reports_streaming_progress() -> None:
+    from lang2sql.core.types import Completion, CompletionDelta
+
+    class _Streamer:
+        async def complete(self, messages, tools=()):
+            return Completion(content="unused")
+
+        async def stream(self, messages, tools=()):
+            for piece in ("4", "2 users"):
+                yield CompletionDelta(content=piece)
+            yield CompletionDelta(completion=Completion(content="42 users", finish_reason="stop"))
+
+    handlers = CommandHandlers(ContextConcierge(llm=_Streamer()))
+    ident = to_identity(InteractionContext(user_id="u7", guild_id="g1", channel_id="c1"))
+    seen: list[str] = []
+
+    async def on_progress(text: str) -> None:
+        seen.append(text)
+
+    out = asyncio.run(handlers.query(ident, "how many?", on_progress=on_progress))
+    assert seen == ["4", "42 users"]
+    assert out.text == "42 users"
+
+
+def test_query_closes_spooled_csvs_when_the_turn_fails(monkeypatch) -> None:
+    import io
+
+    import pytest
+
+    from lang2sql.core.types import Attachment
+    from lang2sql.frontends.discord import commands
+
+    spooled = io.BytesIO(b"id\n1\n")
+
+    async def broken_events(ctx, text):
+        ctx.attachments.append(Attachment("result.csv", spooled, rows=1))
+        raise RuntimeError("llm went away")
+        yield  # pragma: no cover - makes this an async generator
+
+    monkeypatch.setattr(commands, "agent_events", broken_events)
+    handlers = CommandHandlers(ContextConcierge())
+    ident = to_identity(InteractionContext(user_id="u8", guild_id="g1", channel_id="c1"))
+    with pytest.raises(RuntimeError, match="llm went away"):
+        asyncio.run(handlers.query(ident, "how many?"))
+    assert spooled.closed
+
+
 def test_connect_stub_acknowledges() -> None:
     concierge = ContextConcierge()
     handlers = CommandHandlers(concierge)
@@ -11,9 +11,9 @@ import asyncio
 
 from lang2sql.adapters.llm.fake import FakeLLM
 from lang2sql.core.identity import Identity
-from lang2sql.core.types import Role
+from lang2sql.core.types import Completion, CompletionDelta, Message, Role, ToolCall, ToolResult, ToolSpec
 from lang2sql.harness.context import HarnessContext
-from lang2sql.harness.loop import agent_loop
+from lang2sql.harness.loop import agent_events, agent_loop
 from lang2sql.harness.session import Session
 from lang2sql.harness.tool_registry import ToolRegistry
 from lang2sql.tools.ping import Ping
@@ -54,3 +54,161 @@ def test_scope_chain_orders_narrow_to_wide():
     ident = Identity(user_id="u", guild_id="g", channel_id="c", thread_id="t")
     levels = [s.level.value for s in ident.scope_chain()]
     assert levels == ["thread", "channel", "guild", "builtin"]
+
+
+# --- concurrent tool dispatch ----------------------------------------------
+
+
+class _ScriptedLLM:
+    """Requests ``calls`` once, then answers."""
+
+    def __init__(self, calls: list[ToolCall]) -> None:
+        self._calls = calls
+
+    async def complete(self, messages, tools=()):
+        if messages[-1].role == Role.TOOL:
+            return Completion(content="done", finish_reason="stop")
+        return Completion(tool_calls=list(self._calls), finish_reason="tool_calls")
+
+
+class _SleepTool:
+    def __init__(self, name: str, log: list[str], *, concurrent_safe: bool = True) -> None:
+        self._name = name
+        self._log = log
+        self.concurrent_safe = concurrent_safe
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def spec(self) -> ToolSpec:
+        return ToolSpec(name=self._name, description="sleep")
+
+    async def run(self, args, ctx) -> ToolResult:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self._log.append(f"start:{args['tag']}")
+        await asyncio.sleep(args["delay"])
+        self._log.append(f"end:{args['tag']}")
+        self.active -= 1
+        return ToolResult(call_id="", content=args["tag"])
+
+
+def _loop_ctx(llm, tools, **kw) -> HarnessContext:
+    identity = Identity(user_id="tester")
+    return HarnessContext(
+        identity=identity, llm=llm, tools=ToolRegistry(tools),
+        session=Session(identity=identity), **kw,
+    )
+
+
+def test_independent_tool_calls_overlap_but_transcript_keeps_call_order():
+    log: list[str] = []
+    tool = _SleepTool("probe", log)
+    calls = [
+        ToolCall(id=f"c{i}", name="probe", arguments={"tag": f"t{i}", "delay": d})
+        for i, d in enumerate([0.05, 0.01, 0.03])
+    ]
+    ctx = _loop_ctx(_ScriptedLLM(calls), [tool], max_tool_concurrency=2)
+    asyncio.run(agent_loop(ctx, "go"))
+
+    assert tool.peak == 2  # ran concurrently, capped at 2
+    tool_msgs = [m for m in ctx.session.history() if m.role == Role.TOOL]
+    assert [m.tool_call_id for m in tool_msgs] == ["c0", "c1", "c2"]
+    assert [m.content for m in tool_msgs] == ["t0", "t1", "t2"]
+
+
+def test_opted_out_tool_runs_alone():
+    log: list[str] = []
+    safe = _SleepTool("probe", log)
+    serial = _SleepTool("write", log, concurrent_safe=False)
+    calls = [
+        ToolCall(id="a", name="probe", arguments={"tag": "a", "delay": 0.02}),
+        ToolCall(id="b", name="write", arguments={"tag": "b", "delay": 0.01}),
+        ToolCall(id="c", name="probe", arguments={"tag": "c", "delay": 0.01}),
+    ]
+    ctx = _loop_ctx(_ScriptedLLM(calls), [safe, serial])
+    asyncio.run(agent_loop(ctx, "go"))
+    # The side-effecting call neither overlaps its predecessor nor successor.
+    assert log == ["start:a", "end:a", "start:b", "end:b", "start:c", "end:c"]
+
+
+# --- streaming -------------------------------------------------------------
+
+
+class _StreamingLLM:
+    """Streams a tool call first, then the answer in two text deltas."""
+
+    async def complete(self, messages, tools=()):  # pragma: no cover - stream is preferred
+        raise AssertionError("loop should stream when the LLM supports it")
+
+    async def stream(self, messages, tools=()):
+        if messages[-1].role == Role.TOOL:
+            yield CompletionDelta(content="Found ")
+            yield CompletionDelta(content="it.")
+            yield CompletionDelta(completion=Completion(content="Found it.", finish_reason="stop"))
+        else:
+            call = ToolCall(id="c1", name="ping", arguments={"message": "x"})
+            yield CompletionDelta(completion=Completion(tool_calls=[call], finish_reason="tool_calls"))
+
+
+def test_agent_events_streams_deltas_then_answer():
+    identity = Identity(user_id="tester")
+    ctx = HarnessContext(
+        identity=identity, llm=_StreamingLLM(), tools=ToolRegistry([Ping()]),
+        session=Session(identity=identity),
+    )
+
+    async def collect():
+        return [(e.kind, e.text) async for e in agent_events(ctx, "hello")]
+
+    events = asyncio.run(collect())
+    assert events == [("tools", "ping"), ("delta", "Found "), ("delta", "it."), ("answer", "Found it.")]
+    assert ctx.session.history()[-1].content == "Found it."
+
+
+def test_agent_loop_falls_back_to_complete_for_non_streaming_llm():
+    ctx = _ctx()  # FakeLLM has no stream()
+    assert "pong" in asyncio.run(agent_loop(ctx, "hello"))
+
+
+def test_window_cuts_at_user_turns_and_prepends_summary():
+    session = Session(identity=Identity(user_id="u"))
+    session.add(Message(role=Role.USER, content="old " * 100))
+    session.add(
+        Message(
+            role=Role.ASSISTANT,
+            tool_calls=[ToolCall(id="c1", name="run_sql", arguments={"sql": "SELECT 1"})],
+        )
+    )
+    session.add(Message(role=Role.TOOL, content="r" * 400, tool_call_id="c1", name="run_sql"))
+    session.add(Message(role=Role.USER, content="latest question"))
+
+    assert session.window(10_000) == session.history()
+    tight = session.window(20)
+    assert [m.content for m in tight] == ["latest question"]  # never drops the newest turn
+
+    session.summary = "user asked about orders"
+    windowed = session.window(20)
+    assert windowed[0].role == Role.SYSTEM and "user asked about orders" in windowed[0].content
+    assert windowed[1:] == [session.transcript[-1]]
+
+
+def test_loop_sends_windowed_history():
+    seen: list[list[Message]] = []
+
+    class RecordingLLM(FakeLLM):
+        async def complete(self, messages, tools=()):
+            seen.append(list(messages))
+            return Completion(content="ok")
+
+    ctx = _ctx()
+    ctx.llm = RecordingLLM()
+    ctx.tools = ToolRegistry()
+    ctx.history_budget_tokens = 50
+    for i in range(5):
+        ctx.session.add(Message(role=Role.USER, content=f"turn {i} " + "z" * 200))
+    asyncio.run(agent_loop(ctx, "now"))
+
+    sent = seen[0][1:]  # after the system prompt
+    assert [m.content for m in sent] == ["now"]
+    assert len(ctx.session.transcript) == 7  # the session itself keeps everything
@@ -90,6 +90,27 @@ def test_llm_extractor_skips_rows_with_bad_kind_or_missing_fields() -> None:
     asyncio.run(run())
 
 
+def test_llm_extractor_forgets_a_cached_answer_that_yields_nothing() -> None:
+    from lang2sql.adapters.llm.cache import CachingLLM
+    from lang2sql.adapters.storage.sqlite_store import SqliteStore
+
+    class Counting(_ScriptedLLM):
+        model = "m1"
+        calls = 0
+
+        async def complete(self, messages, tools=()):
+            self.calls += 1
+            return await super().complete(messages, tools)
+
+    doc = Document(name="d", text="t")
+    for content, calls in (("not json at all", 2), (_JSON_ARRAY, 1)):
+        inner = Counting(content)
+        extractor = LLMExtractor(CachingLLM(inner, SqliteStore()))
+        asyncio.run(extractor.extract(doc))
+        asyncio.run(extractor.extract(doc))
+        assert inner.calls == calls
+
+
 def test_file_source_decodes_blob() -> None:
     source = FileSource()
 
@@ -48,6 +48,313 @@ def test_run_sql_tolerates_bad_limit():
     assert not res.is_error  # malformed limit must not crash the tool
 
 
+def test_run_sql_streams_preview_and_spools_full_csv(tmp_path):
+    from sqlalchemy import create_engine, text
+
+    from lang2sql.adapters.db import SqlAlchemyExplorer
+
+    db = tmp_path / "big.db"
+    with create_engine(f"sqlite:///{db}").begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER, label TEXT)"))
+        conn.execute(text("INSERT INTO t VALUES (:i, :l)"), [{"i": i, "l": f"r{i}"} for i in range(120)])
+
+    class StreamOnly(SqlAlchemyExplorer):
+        async def execute(self, sql, limit=1000):
+            raise AssertionError("run_sql materialized the whole result")
+
+    _, ctx = _ctx()
+    ctx.explorer = StreamOnly(f"sqlite:///{db}")
+    res = asyncio.run(RunSQL().run({"sql": "SELECT id, label FROM t ORDER BY id", "limit": 100}, ctx))
+    assert res.content.startswith("100 row(s):") and "(100 rows total)" in res.content
+    assert "49 | r49" in res.content and "50 | r50" not in res.content
+
+    [attachment] = ctx.attachments
+    lines = attachment.file.read().decode().splitlines()
+    assert attachment.rows == 100 and lines[0] == "id,label" and lines[-1] == "99,r99"
+
+    # A result that fits the preview needs no attachment.
+    asyncio.run(RunSQL().run({"sql": "SELECT id FROM t", "limit": 5}, ctx))
+    assert len(ctx.attachments) == 1
+
+
+def test_run_sql_enforces_the_pipeline_timeout():
+    from lang2sql.core.ports.safety import SafetyDecision
+    from lang2sql.safety.layers import WhitelistLayer
+    from lang2sql.safety.pipeline import SafetyPipeline
+
+    class TightTimeout:
+        name = "tight"
+
+        def check(self, sql, ctx):
+            ctx.timeout_seconds = 0.05
+            return SafetyDecision(verdict=Verdict.PASS, sql=sql, layer=self.name)
+
+    class SlowExplorer:
+        async def execute(self, sql, limit=1000):
+            await asyncio.sleep(10)
+
+    concierge = ContextConcierge(
+        explorer=SlowExplorer(), safety=SafetyPipeline([WhitelistLayer(), TightTimeout()])
+    )
+    ctx = asyncio.run(concierge.build_context(Identity(user_id="u1", guild_id="g1", channel_id="c")))
+    res = asyncio.run(RunSQL().run({"sql": "SELECT 1"}, ctx))
+    assert res.is_error and res.content.startswith("TIMEOUT: query exceeded 0.05s")
+
+
+def test_run_sql_serves_repeats_from_result_cache():
+    from lang2sql.harness.result_cache import ResultCache
+
+    class CountingExplorer:
+        url = "sqlite:///warehouse.db"
+
+        def __init__(self):
+            self.calls = 0
+
+        async def execute(self, sql, limit=1000):
+            self.calls += 1
+            return [{"n": self.calls}]
+
+    concierge = ContextConcierge(explorer=CountingExplorer(), result_cache=ResultCache())
+    ident = Identity(user_id="u1", guild_id="g1", channel_id="c")
+    ctx = asyncio.run(concierge.build_context(ident))
+    exp = ctx.explorer
+
+    first = asyncio.run(RunSQL().run({"sql": "SELECT n FROM t"}, ctx))
+    again = asyncio.run(RunSQL().run({"sql": "SELECT  n\nFROM t -- same\n;"}, ctx))
+    assert exp.calls == 1 and "cached result" in again.content and "cached" not in first.content
+    assert concierge.result_cache.stats.hits == 1 and concierge.result_cache.stats.hit_rate == 0.5
+
+    # The model's bypass flag and the user's --fresh turn both go to the DB.
+    asyncio.run(RunSQL().run({"sql": "SELECT n FROM t", "bypass_cache": True}, ctx))
+    ctx.bypass_result_cache = True
+    asyncio.run(RunSQL().run({"sql": "SELECT n FROM t"}, ctx))
+    assert exp.calls == 3
+
+    # Another guild never sees this guild's entry.
+    other = asyncio.run(concierge.build_context(Identity(user_id="u2", guild_id="g2", channel_id="c")))
+    asyncio.run(RunSQL().run({"sql": "SELECT n FROM t"}, other))
+    assert exp.calls == 4
+
+
+def test_run_sql_shares_identical_in_flight_queries():
+    class GatedExplorer:
+        url = "sqlite:///warehouse.db"
+
+        def __init__(self):
+            self.calls = 0
+            self.release = asyncio.Event()
+
+        async def execute(self, sql, limit=1000):
+            self.calls += 1
+            await self.release.wait()
+            return [{"id": i} for i in range(min(limit, 80))]
+
+    async def scenario():
+        concierge = ContextConcierge(explorer=GatedExplorer())
+        ctxs = [
+            await concierge.build_context(Identity(user_id=f"u{i}", guild_id="g1", channel_id="c"))
+            for i in range(3)
+        ]
+        runs = [asyncio.create_task(RunSQL().run({"sql": "SELECT id FROM t"}, c)) for c in ctxs]
+        runs.append(asyncio.create_task(RunSQL().run({"sql": "SELECT id FROM t", "limit": 5}, ctxs[0])))
+        await asyncio.sleep(0)
+        ctxs[0].explorer.release.set()
+        return ctxs, await asyncio.gather(*runs), concierge
+
+    ctxs, results, concierge = asyncio.run(scenario())
+    explorer = ctxs[0].explorer
+    # Three identical queries shared one call; a different limit is its own query.
+    assert explorer.calls == 2 and ctxs[0].flights.stats.shared == 2
+    assert all(r.content.startswith("80 row(s):") for r in results[:3])
+    files = [c.attachments[0].file.read() for c in ctxs]
+    assert files[0] == files[1] == files[2] and files[0].count(b"\n") == 81
+
+
+def test_run_sql_followers_copy_the_csv_even_after_the_first_upload_closed():
+    class GatedExplorer:
+        url = "sqlite:///warehouse.db"
+
+        def __init__(self):
+            self.release = asyncio.Event()
+
+        async def execute(self, sql, limit=1000):
+            await self.release.wait()
+            return [{"id": i} for i in range(80)]
+
+    async def upload(ctx):
+        # As the frontend does: read the attachment, then close it.
+        result = await RunSQL().run({"sql": "SELECT id FROM t"}, ctx)
+        file = ctx.attachments[0].file
+        data = file.read()
+        file.close()
+        return result, data
+
+    async def scenario():
+        concierge = ContextConcierge(explorer=GatedExplorer())
+        ctxs = [
+            await concierge.build_context(Identity(user_id=f"u{i}", guild_id="g1", channel_id="c"))
+            for i in range(3)
+        ]
+        runs = [asyncio.create_task(upload(c)) for c in ctxs]
+        await asyncio.sleep(0)
+        ctxs[0].explorer.release.set()
+        return await asyncio.gather(*runs)
+
+    uploads = asyncio.run(scenario())
+    assert not any(result.is_error for result, _ in uploads)
+    assert len({data for _, data in uploads}) == 1 and uploads[0][1].count(b"\n") == 81
+
+
+def test_single_flight_shares_errors_and_survives_a_cancelled_caller():
+    from lang2sql.core.singleflight import SingleFlight
+
+    async def scenario():
+        flights = SingleFlight()
+        gate = asyncio.Event()
+
+        async def fail():
+            await gate.wait()
+            raise RuntimeError("warehouse down")
+
+        first = asyncio.create_task(flights.do("k", fail))
+        second = asyncio.create_task(flights.do("k", fail))
+        await asyncio.sleep(0)
+        first.cancel()
+        gate.set()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        return flights, results
+
+    flights, (first, second) = asyncio.run(scenario())
+    assert isinstance(first, asyncio.CancelledError)
+    assert isinstance(second, RuntimeError) and flights.stats.calls == 1 and len(flights) == 0
+
+
+def test_result_cache_ttl_scope_and_lru_budget():
+    from lang2sql.core.result import ResultSet
+    from lang2sql.harness.result_cache import ResultCache
+
+    now = [0.0]
+    cache = ResultCache(ttl_seconds=60, max_bytes=100, clock=lambda: now[0])
+    rs = ResultSet(["a"], [(1,)])
+    cache.put("k1", "g1", rs, elapsed=2.0, size=40)
+    cache.put("k2", "g1", rs, elapsed=1.0, size=40)
+    assert cache.get("k1") is not None  # k1 is now most recent
+    cache.put("k3", "g1", rs, elapsed=1.0, size=40)
+    assert cache.get("k2") is None and cache.get("k3") is not None
+    assert cache.stats.evictions == 1 and cache.size_bytes == 80
+    assert cache.stats.saved_seconds == 3.0
+
+    assert not cache.put("big", "g1", rs, elapsed=1.0, size=101)
+    cache.set_ttl("g2", 0)
+    assert not cache.put("k4", "g2", rs, elapsed=1.0, size=1)
+
+    now[0] = 61.0
+    assert cache.get("k1") is None and cache.size_bytes == 40
+
+
+def test_run_sql_queues_then_rejects_over_concurrency_quota():
+    from lang2sql.harness.quota import QuotaLimits, QuotaManager
+
+    class SlowExplorer:
+        url = "sqlite:///warehouse.db"
+
+        def __init__(self):
+            self.release = asyncio.Event()
+
+        async def execute(self, sql, limit=1000):
+            await self.release.wait()
+            return [{"id": 1}]
+
+    async def scenario():
+        quotas = QuotaManager(QuotaLimits(max_concurrent_per_user=1, queue_timeout=0.1))
+        concierge = ContextConcierge(explorer=SlowExplorer(), quotas=quotas)
+        me = await concierge.build_context(Identity(user_id="u1", guild_id="g1", channel_id="c"))
+        other = await concierge.build_context(Identity(user_id="u2", guild_id="g1", channel_id="c"))
+        first = asyncio.create_task(RunSQL().run({"sql": "SELECT 1"}, me))
+        await asyncio.sleep(0)
+        rejected = await RunSQL().run({"sql": "SELECT 2"}, me)
+        peer = asyncio.create_task(RunSQL().run({"sql": "SELECT 3"}, other))
+        queued = asyncio.create_task(RunSQL().run({"sql": "SELECT 4"}, me))
+        await asyncio.sleep(0.01)
+        busy = quotas.usage("g1")
+        me.explorer.release.set()
+        return rejected, busy, await asyncio.gather(first, peer, queued), quotas.usage("g1")
+
+    rejected, busy, done, after = asyncio.run(scenario())
+    assert rejected.is_error and rejected.content.startswith("QUOTA: you already have 1 query running")
+    # The other user isn't held up; the queued request runs once a slot frees.
+    assert busy.running_by_user == {"u1": 1, "u2": 1} and busy.queued == 1
+    assert not any(r.is_error for r in done)
+    assert after.running == 0 and after.rejected == 1 and after.warehouse_seconds > 0
+
+
+def test_run_sql_followers_of_a_shared_query_take_no_quota():
+    from lang2sql.harness.quota import QuotaLimits, QuotaManager
+
+    class SlowExplorer:
+        url = "sqlite:///warehouse.db"
+
+        def __init__(self):
+            self.release = asyncio.Event()
+            self.calls = 0
+
+        async def execute(self, sql, limit=1000):
+            self.calls += 1
+            await self.release.wait()
+            return [{"id": 1}]
+
+    async def scenario():
+        quotas = QuotaManager(QuotaLimits(max_concurrent_per_user=1, queue_timeout=0.05))
+        concierge = ContextConcierge(explorer=SlowExplorer(), quotas=quotas)
+        me = await concierge.build_context(Identity(user_id="u1", guild_id="g1", channel_id="c"))
+        runs = [asyncio.create_task(RunSQL().run({"sql": "SELECT 1"}, me)) for _ in range(3)]
+        await asyncio.sleep(0.1)  # past queue_timeout: a queued lease would be rejected
+        busy = quotas.usage("g1")
+        me.explorer.release.set()
+        return busy, await asyncio.gather(*runs), me.explorer.calls
+
+    busy, results, calls = asyncio.run(scenario())
+    assert calls == 1 and busy.running == 1 and busy.queued == 0 and busy.rejected == 0
+    assert not any(r.is_error for r in results)
+
+
+def test_quota_rate_buckets_and_warehouse_budget():
+    from lang2sql.harness.quota import QuotaExceeded, QuotaLimits, QuotaManager
+
+    now = [0.0]
+    quotas = QuotaManager(
+        QuotaLimits(user_queries_per_minute=2, warehouse_seconds=5, budget_window=600,
+                    queue_timeout=0),
+        clock=lambda: now[0],
+    )
+
+    async def run(user):
+        try:
+            async with quotas.lease("g1", user) as lease:
+                lease.charge(1.0)
+            return "ok"
+        except QuotaExceeded as exc:
+            return str(exc)
+
+    async def scenario():
+        out = [await run("u1"), await run("u1"), await run("u1"), await run("u2")]
+        now[0] = 30.0  # one token back for u1
+        out.append(await run("u1"))
+        async with quotas.lease("g1", "u2") as lease:
+            lease.charge(10)
+        out.append(await run("u2"))
+        now[0] = 631.0  # the budget window rolled over
+        out.append(await run("u2"))
+        return out
+
+    out = asyncio.run(scenario())
+    assert out[:2] == ["ok", "ok"] and out[3] == "ok" and out[4] == "ok"
+    assert out[2] == "you have hit the query rate limit; retry in 30s"
+    assert out[5].startswith("this server has used its 5s of warehouse time")
+    assert out[6] == "ok" and quotas.usage("g1").warehouse_seconds == 1.0
+    assert quotas.usage("g1").rejected == 2
+
+
 def test_term_custom_is_scope_local():
     from lang2sql.tools.semantic_federation import _render_effective
     ident, ctx = _ctx()
@@ -75,3 +382,160 @@ def test_term_custom_emits_audit_event():
 def test_safety_pipeline_on_context():
     _, ctx = _ctx()
     assert ctx.safety.evaluate("SELECT 1", SafetyContext()).verdict == Verdict.PASS
+
+
+def test_enrich_samples_each_table_with_a_single_scan(tmp_path):
+    from sqlalchemy import create_engine, text
+
+    from lang2sql.adapters.db import SqlAlchemyExplorer
+    from lang2sql.core.types import Completion
+    from lang2sql.tools.enrich_schema import EnrichSchema
+
+    db = tmp_path / "shop.db"
+    with create_engine(f"sqlite:///{db}").begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER, status TEXT, note TEXT)"))
+        conn.execute(text(
+            "INSERT INTO orders VALUES (1, 'paid', NULL), (2, 'paid', NULL), (3, 'pending', 'x')"
+        ))
+        conn.execute(text("CREATE TABLE users (id INTEGER, email TEXT)"))
+
+    class CountingExplorer(SqlAlchemyExplorer):
+        executed: list[str] = []
+
+        async def execute(self, sql, limit=1000):
+            self.executed.append(sql)
+            return await super().execute(sql, limit)
+
+    prompts: list[str] = []
+
+    class JsonLLM:
+        async def complete(self, messages, tools=()):
+            prompts.append(messages[-1].content)
+            return Completion(content='{"columns": {"orders.status": "order state"}, "relationships": []}')
+
+    concierge = ContextConcierge(explorer=CountingExplorer(f"sqlite:///{db}"), llm=JsonLLM())
+    ident = Identity(user_id="u1", guild_id="g1", channel_id="c", is_admin=True)
+    ctx = asyncio.run(concierge.build_context(ident))
+    res = asyncio.run(EnrichSchema().run({}, ctx))
+
+    assert not res.is_error
+    assert len(CountingExplorer.executed) == 2  # one scan per table, not per column
+    assert "- status (TEXT) 샘플: ['paid', 'pending']" in prompts[0]
+    assert "- note (TEXT) 샘플: ['x']" in prompts[0]
+    assert "- email (TEXT)\n" in prompts[0]  # empty table: no samples
+
+
+def test_enrich_never_replays_an_unparsed_completion_and_fresh_reasks(tmp_path):
+    from sqlalchemy import create_engine, text
+
+    from lang2sql.adapters.db import SqlAlchemyExplorer
+    from lang2sql.core.types import Completion
+    from lang2sql.frontends.discord.commands import CommandHandlers
+
+    db = tmp_path / "shop.db"
+    with create_engine(f"sqlite:///{db}").begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER, status TEXT)"))
+
+    replies = [
+        "sorry, I can't help with that",
+        '{"columns": {"orders.status": "order state"}, "relationships": []}',
+        '{"columns": {"orders.status": "lifecycle state"}, "relationships": []}',
+    ]
+
+    class ScriptedLLM:
+        model = "m"
+        calls = 0
+
+        async def complete(self, messages, tools=()):
+            ScriptedLLM.calls += 1
+            return Completion(content=replies[ScriptedLLM.calls - 1])
+
+    concierge = ContextConcierge(explorer=SqlAlchemyExplorer(f"sqlite:///{db}"), llm=ScriptedLLM())
+    handlers = CommandHandlers(concierge)
+    ident = Identity(user_id="u1", guild_id="g1", channel_id="c", is_admin=True)
+
+    failed = asyncio.run(handlers.enrich(ident))
+    ok = asyncio.run(handlers.enrich(ident))  # the failure wasn't cached: asks again
+    replayed = asyncio.run(handlers.enrich(ident))
+    assert "JSON" in failed.text and "order state" in ok.text and "order state" in replayed.text
+    assert ScriptedLLM.calls == 2
+
+    fresh = asyncio.run(handlers.enrich(ident, fresh=True))
+    assert "lifecycle state" in fresh.text and ScriptedLLM.calls == 3
+    assert "lifecycle state" in asyncio.run(handlers.enrich(ident)).text  # refreshed entry
+
+
+def test_org_setup_skips_tables_that_fail_to_describe():
+    from lang2sql.adapters.db.stub_explorer import StubExplorer
+    from lang2sql.core.types import Completion
+    from lang2sql.tools.org_setup import OrgSetupTool
+
+    from lang2sql.core.ports.explorer import Table
+
+    class HalfBroken(StubExplorer):
+        describe_all = None  # list, then describe table by table
+
+        async def list_tables(self):
+            return [Table(name=t.name, schema=t.schema) for t in await super().list_tables()]
+
+        async def describe_table(self, name):
+            if name == "users":
+                raise RuntimeError("permission denied")
+            return await super().describe_table(name)
+
+    prompts: list[str] = []
+
+    class TermsLLM:
+        async def complete(self, messages, tools=()):
+            prompts.append(messages[-1].content)
+            return Completion(content='{"domain": "sales", "terms": []}')
+
+    concierge = ContextConcierge(explorer=HalfBroken(), llm=TermsLLM())
+    ident = Identity(user_id="u1", guild_id="g1", channel_id="c", is_admin=True)
+    ctx = asyncio.run(concierge.build_context(ident))
+    asyncio.run(OrgSetupTool().run({"org": "acme"}, ctx))
+
+    assert "테이블: orders" in prompts[0]
+    assert "테이블: users" not in prompts[0]
+
+
+def test_sample_tables_reports_failures_and_timing():
+    from lang2sql.core.ports.explorer import Column, Table
+    from lang2sql.tools.sampling import sample_tables
+
+    class FlakyExplorer:
+        async def execute(self, sql, limit=1000):
+            if "broken" in sql:
+                raise RuntimeError("no such table")
+            return [{"a": i % 3, "b": None} for i in range(50)]
+
+    tables = [Table("good", schema="", columns=[Column("a", "int"), Column("b", "int")]),
+              Table("broken", schema="")]
+    out = asyncio.run(sample_tables(FlakyExplorer(), tables, distinct=2))
+    assert out["good"].values == {"a": ["0", "1"], "b": []}
+    assert out["good"].rows_scanned == 50 and out["good"].elapsed >= 0
+    assert out["broken"].error == "no such table" and out["broken"].values == {}
+
+
+def test_sample_tables_batches_through_execute_batch():
+    from lang2sql.core.ports.explorer import Table
+    from lang2sql.tools.sampling import sample_tables
+
+    class PipelinedExplorer:
+        def __init__(self):
+            self.batches = []
+
+        async def execute(self, sql, limit=1000):
+            raise AssertionError("batch-capable explorer sampled one table at a time")
+
+        async def execute_batch(self, statements, limit=1000):
+            self.batches.append(list(statements))
+            return [RuntimeError("boom") if "t3" in s else [{"v": s.split()[3]}] for s in statements]
+
+    exp = PipelinedExplorer()
+    tables = [Table(f"t{i}", schema="") for i in range(5)]
+    out = asyncio.run(sample_tables(exp, tables, batch_size=2, scan_rows=7))
+    assert [len(b) for b in exp.batches] == [2, 2, 1]
+    assert all(s.endswith("LIMIT 7") for b in exp.batches for s in b)
+    assert out["t0"].values == {"v": ["t0"]}
+    assert out["t3"].error == "boom" and out["t4"].rows_scanned == 1
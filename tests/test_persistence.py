@@ -94,3 +94,20 @@ def test_encrypted_secrets_survive_new_instance_via_persisted_key(tmp_path) -> N
     finally:
         if saved is not None:
             os.environ["LANG2SQL_SECRET_KEY"] = saved
+
+
+def test_result_cache_disk_tier_survives_new_instance(tmp_path) -> None:
+    from lang2sql.core.result import ResultSet
+    from lang2sql.harness.result_cache import ResultCache
+
+    db = str(tmp_path / "cache.db")
+    rs = ResultSet(["id", "label"], [(1, "a"), (2, None)])
+    ResultCache(store=SqliteStore(db)).put("k", "g1", rs, elapsed=1.5, size=20)
+
+    reopened = ResultCache(store=SqliteStore(db))
+    hit = reopened.get("k")
+    assert hit is not None and hit.result == rs and hit.elapsed == 1.5
+    assert reopened.stats.saved_seconds == 1.5
+
+    reopened.invalidate("g1")
+    assert ResultCache(store=SqliteStore(db)).get("k") is None
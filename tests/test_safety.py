@@ -19,8 +19,15 @@ Only the statement-shape violations (#1-5, #12) BLOCK; #9/#10/#11 PASS.
 
 from __future__ import annotations
 
+import asyncio
+import json
+
+import pytest
+
 from lang2sql.core.ports.safety import SafetyContext, Verdict
+from lang2sql.core.result import ResultSet
 from lang2sql.safety import SafetyPipeline
+from lang2sql.safety.layers import CostGateLayer, CostThresholds
 
 
 def _verdict(sql: str) -> Verdict:
@@ -122,7 +129,9 @@ def test_default_timeout_set_on_pass():
 def test_pipeline_exposes_default_layers():
     pipeline = SafetyPipeline()
     names = [layer.name for layer in pipeline.layers]
-    assert names == ["whitelist", "row_limit", "timeout"]
+    assert names == [
+        "whitelist", "schema_check", "row_limit", "complexity", "cost_gate", "timeout",
+    ]
 
 
 # --- RowLimitLayer tests ------------------------------------------------------
@@ -178,3 +187,522 @@ def test_case_08_huge_table_gets_limit():
     decision = SafetyPipeline().evaluate("SELECT * FROM huge_table", ctx)
     assert decision.verdict is Verdict.PASS
     assert "LIMIT 1000" in decision.sql.upper()
+
+
+def _limited(sql, dialect="", row_limit=100):
+    class Dialect:
+        pass
+
+    explorer = Dialect()
+    explorer.dialect = dialect
+    ctx = SafetyContext(row_limit=row_limit, explorer=explorer)
+    return SafetyPipeline().evaluate(sql, ctx).sql
+
+
+def test_row_limit_tightens_explicit_limits_above_row_limit():
+    assert _limited("SELECT * FROM t LIMIT 50000 OFFSET 10") == "SELECT * FROM t LIMIT 100 OFFSET 10"
+    assert _limited("SELECT * FROM t LIMIT 5") == "SELECT * FROM t LIMIT 5"
+    assert _limited("SELECT * FROM t LIMIT 20, 5000") == "SELECT * FROM t LIMIT 20, 100"
+    assert _limited("SELECT TOP 5000 * FROM t", "mssql") == "SELECT TOP 100 * FROM t"
+    assert _limited("SELECT * FROM t FETCH FIRST 900 ROWS ONLY", "oracle").endswith(
+        "FETCH FIRST 100 ROWS ONLY"
+    )
+
+
+def test_row_limit_wraps_set_operations_outside_the_with_list():
+    sql = "WITH a AS (SELECT id FROM t) SELECT id FROM a UNION ALL SELECT id FROM u"
+    assert _limited(sql) == (
+        "WITH a AS (SELECT id FROM t) SELECT * FROM (\n"
+        "SELECT id FROM a UNION ALL SELECT id FROM u\n) limited\nLIMIT 100"
+    )
+    # An ORDER BY over the whole union already scopes a trailing LIMIT.
+    assert _limited("SELECT id FROM t UNION SELECT id FROM u ORDER BY id").endswith(
+        "ORDER BY id\nLIMIT 100"
+    )
+
+
+def test_row_limit_uses_the_dialect_syntax():
+    assert _limited("SELECT DISTINCT id FROM t", "mssql") == "SELECT DISTINCT TOP 100 id FROM t"
+    assert _limited("SELECT id FROM t ORDER BY id;", "mssql") == (
+        "SELECT id FROM t ORDER BY id\nOFFSET 0 ROWS FETCH NEXT 100 ROWS ONLY"
+    )
+    assert _limited("SELECT id FROM t UNION SELECT id FROM u", "mssql") == (
+        "SELECT TOP 100 * FROM (\nSELECT id FROM t UNION SELECT id FROM u\n) limited"
+    )
+    assert _limited("SELECT id FROM t", "oracle") == "SELECT id FROM t\nFETCH FIRST 100 ROWS ONLY"
+    assert _limited("SELECT id FROM t", "snowflake") == "SELECT id FROM t\nLIMIT 100"
+
+
+def test_row_limit_pushdown_runs_on_duckdb(tmp_path):
+    pytest.importorskip("duckdb_engine")
+    from lang2sql.adapters.db.sqlalchemy_explorer import SqlAlchemyExplorer
+
+    explorer = SqlAlchemyExplorer(f"duckdb:///{tmp_path / 'w.duckdb'}")
+    ctx = SafetyContext(row_limit=3, explorer=explorer)
+    sql = SafetyPipeline().evaluate(
+        "SELECT * FROM range(10) UNION ALL SELECT * FROM range(10) LIMIT 1000000", ctx
+    ).sql
+    assert sql.endswith("LIMIT 3")
+    wrapped = SafetyPipeline().evaluate(
+        "WITH r AS (SELECT * FROM range(10)) SELECT * FROM r UNION ALL SELECT * FROM r", ctx
+    ).sql
+    assert len(asyncio.run(explorer.execute(wrapped, 1000))) == 3
+
+
+# --- Lexer-backed layers & decision cache -----------------------------------
+
+
+def test_quoted_separators_and_keywords_are_not_statements():
+    assert _verdict("SELECT 'a;b' AS x") is Verdict.PASS
+    assert _verdict("SELECT 'DROP TABLE t' AS msg, \"delete\" FROM t") is Verdict.PASS
+    assert _verdict("SELECT $$x; DELETE FROM t$$") is Verdict.PASS
+    assert _verdict("SELECT 1; -- trailing note") is Verdict.PASS
+    assert _decision("SELECT 1; DELETE FROM t").reason == "multi_statement"
+
+
+def test_unterminated_quote_or_comment_is_a_parse_error():
+    assert _decision("SELECT 'abc").reason == "parse_error"
+    assert _decision("SELECT 1 /* DROP").reason == "parse_error"
+
+
+def test_backslash_escaped_quotes_fail_closed():
+    # On MySQL/BigQuery/Databricks ``\'`` doesn't close the literal, so this is
+    # three statements there; the lexer can't know the dialect and blocks it.
+    assert _decision("SELECT 'x\\'' AS a; DELETE FROM t; SELECT '").reason == "parse_error"
+    assert _decision("SELECT \"x\\\"\" FROM t; DELETE FROM t").reason == "parse_error"
+    assert _decision("SELECT 'a\\''").reason == "parse_error"
+    # An escaped backslash ends the literal the same way in every dialect.
+    assert _verdict("SELECT 'a\\\\' AS b") is Verdict.PASS
+    assert _verdict("SELECT E'a\\'b' AS c") is Verdict.PASS
+
+
+def test_explain_option_list_is_skipped_by_depth():
+    assert _verdict("EXPLAIN (FORMAT JSON, COSTS (true)) SELECT 1") is Verdict.PASS
+    assert _verdict("EXPLAIN (ANALYZE) DELETE FROM t") is Verdict.BLOCK
+
+
+def test_row_limit_ignores_quoted_limit_and_trailing_comment():
+    ctx = SafetyContext(row_limit=7)
+    decision = SafetyPipeline().evaluate("SELECT 'LIMIT 5' FROM t; -- done", ctx)
+    assert decision.sql == "SELECT 'LIMIT 5' FROM t\nLIMIT 7"
+
+
+def test_decision_cache_replays_decision_and_timeout():
+    from lang2sql.core.ports.safety import SafetyDecision
+
+    class Counting:
+        name = "counting"
+        calls = 0
+
+        def check(self, sql, ctx):
+            Counting.calls += 1
+            ctx.timeout_seconds = 12
+            return SafetyDecision(verdict=Verdict.PASS, sql=sql + " LIMIT 1", layer=self.name)
+
+    pipeline = SafetyPipeline([Counting()])
+    first, again = (pipeline.evaluate("SELECT 1", SafetyContext()) for _ in range(2))
+    ctx = SafetyContext()
+    third = pipeline.evaluate("SELECT 1", ctx)
+    assert Counting.calls == 1 and ctx.timeout_seconds == 12
+    assert first.sql == again.sql == third.sql == "SELECT 1 LIMIT 1" and third is not again
+    assert pipeline.cache_stats.hits == 2
+
+    # A different row limit, or a context with extras, is evaluated afresh.
+    pipeline.evaluate("SELECT 1", SafetyContext(row_limit=5))
+    pipeline.evaluate("SELECT 1", SafetyContext(extras={"guild": "g1"}))
+    assert Counting.calls == 3
+
+
+def test_aevaluate_caches_sync_layers_around_the_cost_gate():
+    from lang2sql.safety.layers import RowLimitLayer, TimeoutLayer, WhitelistLayer
+
+    explorer = _PlanningExplorer()
+    unlimited = CostThresholds(confirm_rows=None, block_rows=None)
+    pipeline = SafetyPipeline(
+        [WhitelistLayer(), RowLimitLayer(), CostGateLayer(unlimited), TimeoutLayer()]
+    )
+    for _ in range(3):
+        decision = _gate("SELECT * FROM small", explorer, pipeline=pipeline)
+        assert decision.verdict is Verdict.PASS and decision.sql.endswith("LIMIT 1000")
+    assert pipeline.cache_stats.hits == 4 and len(explorer.explains) == 1
+
+
+# --- CostGateLayer tests ------------------------------------------------------
+
+
+class _PlanningExplorer:
+    """Fake Postgres explorer answering EXPLAIN with a fixed exploding-join plan."""
+
+    dialect = "postgresql"
+    url = "postgresql://warehouse/db"
+
+    def __init__(self, join_rows: float = 1e16) -> None:
+        self.explains: list[str] = []
+        self.timeouts: list[float | None] = []
+        self._plan = [{"Plan": {
+            "Node Type": "Limit", "Plan Rows": 1000, "Total Cost": 5e13,
+            "Plans": [{"Node Type": "Nested Loop", "Plan Rows": join_rows, "Total Cost": 5e14,
+                       "Plans": [{"Node Type": "Seq Scan", "Plan Rows": 1e8},
+                                 {"Node Type": "Seq Scan", "Plan Rows": 1e8}]}],
+        }}]
+
+    async def execute(self, sql: str, limit: int = 1000, *, timeout=None) -> ResultSet:
+        assert sql.startswith("EXPLAIN (FORMAT JSON) ")
+        self.explains.append(sql)
+        self.timeouts.append(timeout)
+        return ResultSet(["QUERY PLAN"], [(json.dumps(self._plan),)])
+
+
+# Looks harmless in the text (keyed join); only the planner sees the skewed key.
+_BIG_JOIN = "SELECT * FROM big_a JOIN big_b ON big_a.k = big_b.k"
+
+
+def _gate(sql, explorer, scope="g1", pipeline=None):
+    ctx = SafetyContext(explorer=explorer, scope=scope)
+    return asyncio.run((pipeline or SafetyPipeline()).aevaluate(sql, ctx))
+
+
+def test_cost_gate_blocks_exploding_join_in_default_pipeline():
+    explorer = _PlanningExplorer()
+    decision = _gate(_BIG_JOIN, explorer)
+    assert decision.verdict is Verdict.BLOCK
+    assert decision.layer == "cost_gate"
+    assert "rows" in decision.reason
+    assert explorer.timeouts == [5.0]  # EXPLAIN carries the server-side timeout
+
+
+def test_cost_gate_confirms_between_thresholds():
+    decision = _gate(_BIG_JOIN, _PlanningExplorer(join_rows=5e8))
+    assert decision.verdict is Verdict.CONFIRM
+    assert "Run it anyway?" in decision.confirm_prompt
+
+
+def test_cost_gate_thresholds_are_per_guild():
+    layer = CostGateLayer()
+    layer.set_thresholds("analytics", CostThresholds(block_rows=None, confirm_rows=None))
+    pipeline = SafetyPipeline([layer])
+    assert _gate(_BIG_JOIN, _PlanningExplorer(), "analytics", pipeline).verdict is Verdict.PASS
+    assert _gate(_BIG_JOIN, _PlanningExplorer(), "other", pipeline).verdict is Verdict.BLOCK
+
+
+def test_cost_gate_caches_estimates_by_fingerprint():
+    explorer = _PlanningExplorer()
+    pipeline = SafetyPipeline([CostGateLayer()])
+    _gate(_BIG_JOIN, explorer, pipeline=pipeline)
+    _gate("SELECT *\n  FROM big_a JOIN big_b ON big_a.k = big_b.k; -- again", explorer, pipeline=pipeline)
+    assert len(explorer.explains) == 1
+
+
+def test_cost_gate_fails_open_and_skips_sync_path():
+    class Broken(_PlanningExplorer):
+        async def execute(self, sql, limit=1000, *, timeout=None):
+            raise RuntimeError("permission denied for EXPLAIN")
+
+    assert _gate(_BIG_JOIN, Broken()).verdict is Verdict.PASS
+    assert _gate(_BIG_JOIN, None).verdict is Verdict.PASS
+    assert SafetyPipeline().evaluate(_BIG_JOIN, SafetyContext()).verdict is Verdict.PASS
+
+
+def test_cost_gate_uses_bigquery_dry_run_bytes():
+    class BigQuery:
+        dialect = "bigquery"
+        url = "bigquery://project"
+
+    async def dry_run(sql):
+        return 5 * 1024**4
+
+    layer = CostGateLayer(bigquery_dry_run=dry_run)
+    decision = _gate(_BIG_JOIN, BigQuery(), pipeline=SafetyPipeline([layer]))
+    assert decision.verdict is Verdict.BLOCK
+    assert "bytes" in decision.reason
+
+
+def test_cost_gate_sizes_duckdb_cross_product(tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    pytest.importorskip("duckdb_engine")
+    from lang2sql.adapters.db.sqlalchemy_explorer import SqlAlchemyExplorer
+
+    path = tmp_path / "wh.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute("CREATE TABLE a AS SELECT range AS i FROM range(20000)")
+    con.close()
+    explorer = SqlAlchemyExplorer(f"duckdb:///{path}")
+    layer = CostGateLayer(CostThresholds(confirm_rows=1_000_000, block_rows=None))
+    pipeline = SafetyPipeline([layer])
+    estimate = asyncio.run(layer.estimate("SELECT * FROM a x, a y LIMIT 10", explorer))
+    assert estimate.rows == 20000 * 20000
+    assert _gate("SELECT * FROM a x, a y", explorer, pipeline=pipeline).verdict is Verdict.CONFIRM
+    assert _gate("SELECT * FROM a WHERE i < 5", explorer, pipeline=pipeline).verdict is Verdict.PASS
+
+
+# --- SchemaCheckLayer tests ---------------------------------------------------
+
+
+class _CatalogExplorer:
+    """Warm-catalog fake: orders/users with a few columns, counting lookups."""
+
+    def __init__(self):
+        from lang2sql.core.ports.explorer import Column, Table
+
+        def table(name, *cols):
+            return Table(name=name, schema="public", columns=[Column(c, "text") for c in cols])
+
+        self._tables = {
+            "orders": table("orders", "id", "user_id", "amount", "status", "created_at"),
+            "users": table("users", "id", "email", "country", "signup_date"),
+        }
+
+    async def list_tables(self):
+        from lang2sql.core.ports.explorer import Table
+
+        return [Table(name=t.name, schema=t.schema) for t in self._tables.values()]
+
+    async def describe_table(self, name):
+        return self._tables[name]
+
+
+def _schema(sql):
+    from lang2sql.safety.layers import SchemaCheckLayer
+
+    pipeline = SafetyPipeline([SchemaCheckLayer()])
+    return _gate(sql, _CatalogExplorer(), pipeline=pipeline)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM orders",
+        "SELECT o.amount, u.email FROM orders o JOIN users AS u ON u.id = o.user_id",
+        "SELECT status, COUNT(*) n, SUM(amount) AS total FROM orders GROUP BY status ORDER BY total DESC",
+        "SELECT DATE_TRUNC('month', created_at) m, EXTRACT(YEAR FROM created_at) FROM orders",
+        "SELECT CAST(amount AS DOUBLE PRECISION), amount::numeric(10, 2) FROM public.orders",
+        "SELECT id FROM orders WHERE status IS DISTINCT FROM 'paid' AND created_at > CURRENT_DATE - INTERVAL '7' DAY",
+        "SELECT ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at) FROM orders",
+        "SELECT email FROM users WHERE id IN (SELECT user_id FROM orders WHERE amount > 10)",
+        "WITH big AS (SELECT user_id, amount AS spend FROM orders) SELECT spend, whatever FROM big",
+        "SELECT x.total FROM (SELECT SUM(amount) total FROM orders) x",
+        "SELECT * FROM analytics.events e WHERE e.anything = 1",
+        "SELECT u.country, o.status FROM users u, orders o WHERE o.user_id = u.id",
+        'SELECT "amount" FROM "orders"',
+        "SELECT 1",
+        "SELECT CASE WHEN amount > 10 THEN 'big' ELSE 'small' END label FROM orders",
+        "SELECT id FROM orders WHERE created_at < SYSDATE",
+        "SELECT CONVERT(amount, CHAR) FROM orders",
+        "SELECT id FROM orders WHERE amount BETWEEN SYMMETRIC 1 AND 2",
+        "SELECT id FROM orders FOR UPDATE",
+        "SELECT emial FROM users",  # bare misses are left for the warehouse
+    ],
+)
+def test_schema_check_passes_known_and_unresolvable_references(sql):
+    decision = _schema(sql)
+    assert decision.verdict is Verdict.PASS, decision.reason
+
+
+def test_schema_check_blocks_unknown_table_with_suggestion():
+    decision = _schema("SELECT * FROM ordrs")
+    assert decision.verdict is Verdict.BLOCK and decision.layer == "schema_check"
+    assert decision.reason == "unknown table ordrs (did you mean orders?)"
+
+
+def test_schema_check_blocks_unknown_qualified_columns_with_suggestions():
+    decision = _schema("SELECT o.amout, u.emial FROM orders o JOIN users u ON u.id = o.user_id")
+    assert decision.verdict is Verdict.BLOCK
+    assert "unknown column o.amout (did you mean o.amount?)" in decision.reason
+    assert "unknown column u.emial (did you mean u.email?)" in decision.reason
+
+
+class _TwoSchemaExplorer(_CatalogExplorer):
+    """``orders`` in both ``public`` and ``archive``, with different columns."""
+
+    def __init__(self):
+        super().__init__()
+        from lang2sql.core.ports.explorer import Column, Table
+
+        self._tables["archive.orders"] = Table(
+            name="orders",
+            schema="archive",
+            columns=[Column("id", "text"), Column("legacy_total", "text")],
+            row_estimate=10,
+        )
+        self._tables["orders"].row_estimate = 5_000_000_000
+
+    async def list_tables(self):
+        from lang2sql.core.ports.explorer import Table
+
+        return [
+            Table(name=t.name, schema=t.schema, row_estimate=t.row_estimate)
+            for t in self._tables.values()
+        ]
+
+    async def describe_table(self, name):
+        return self._tables[name.removeprefix("public.")]  # shared names come qualified
+
+
+def test_schema_check_resolves_tables_by_schema():
+    from lang2sql.safety.layers import SchemaCheckLayer
+
+    def check(sql):
+        return _gate(sql, _TwoSchemaExplorer(), pipeline=SafetyPipeline([SchemaCheckLayer()]))
+
+    assert check("SELECT o.legacy_total FROM archive.orders o").verdict is Verdict.PASS
+    decision = check("SELECT o.legacy_total FROM public.orders o")
+    assert decision.verdict is Verdict.BLOCK and "unknown column o.legacy_total" in decision.reason
+    # A bare name two schemas share is left to the search path.
+    assert check("SELECT o.anything FROM orders o").verdict is Verdict.PASS
+    assert check("SELECT u.emial FROM users u").verdict is Verdict.BLOCK
+
+
+def test_schema_check_passes_without_catalog():
+    class Broken(_CatalogExplorer):
+        async def list_tables(self):
+            raise RuntimeError("catalog unavailable")
+
+    pipeline = SafetyPipeline()
+    assert _gate("SELECT nope FROM nowhere", Broken(), pipeline=pipeline).verdict is Verdict.PASS
+    assert _gate("SELECT nope FROM nowhere", None, pipeline=pipeline).verdict is Verdict.PASS
+
+
+# --- ComplexityLayer tests ----------------------------------------------------
+
+
+class _StatsExplorer(_CatalogExplorer):
+    """Catalog fake with a wide, large ``events`` table (row estimate from stats)."""
+
+    def __init__(self):
+        super().__init__()
+        from lang2sql.core.ports.explorer import Column, Table
+
+        self._tables["events"] = Table(
+            name="events",
+            schema="public",
+            columns=[Column(f"c{i}", "text") for i in range(60)],
+            row_estimate=3_000_000_000,
+        )
+
+    async def list_tables(self):
+        from lang2sql.core.ports.explorer import Table
+
+        return [
+            Table(name=t.name, schema=t.schema, row_estimate=t.row_estimate)
+            for t in self._tables.values()
+        ]
+
+
+def _complexity(sql, explorer=None, scope="g1", layer=None):
+    from lang2sql.safety.layers import ComplexityLayer
+
+    return _gate(sql, explorer or _StatsExplorer(), scope, SafetyPipeline([layer or ComplexityLayer()]))
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM orders, users",
+        "SELECT * FROM orders o CROSS JOIN users u WHERE o.amount > 10",
+        "SELECT * FROM orders JOIN users ON TRUE",
+        "SELECT id FROM users UNION ALL SELECT o.id FROM orders o, users u",
+    ],
+)
+def test_complexity_confirms_cartesian_products(sql):
+    decision = _complexity(sql)
+    assert decision.verdict is Verdict.CONFIRM and decision.layer == "complexity"
+    assert "cartesian product" in decision.reason
+    # Join shape needs no catalog, so the sync path catches it too.
+    assert SafetyPipeline().evaluate(sql, SafetyContext()).verdict is Verdict.CONFIRM
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM orders o, users u WHERE o.user_id = u.id",
+        "SELECT * FROM orders o JOIN users u ON u.id = o.user_id",
+        "SELECT * FROM orders JOIN users USING (id)",
+        "SELECT * FROM orders o, LATERAL (SELECT * FROM users u WHERE u.id = o.user_id) x",
+        "SELECT * FROM orders o CROSS JOIN UNNEST(o.tags) AS t(tag)",
+        "SELECT o.amount / s.total FROM orders o, (SELECT SUM(amount) total FROM orders) s",
+        "SELECT c1, c2 FROM events WHERE c3 = 'click'",
+        "SELECT c1, c2 FROM events LIMIT 20",
+        "SELECT c1 FROM events e JOIN users u ON u.id = e.c2 WHERE u.country = 'KR'",
+    ],
+)
+def test_complexity_passes_connected_and_bounded_queries(sql):
+    decision = _complexity(sql)
+    assert decision.verdict is Verdict.PASS, decision.reason
+
+
+def test_complexity_confirms_unbounded_scan_and_wide_star():
+    decision = _complexity("SELECT * FROM events")
+    assert decision.verdict is Verdict.CONFIRM
+    assert "SELECT * over events (60 columns)" in decision.reason
+    assert "no WHERE on large table events (~3,000,000,000 rows)" in decision.reason
+    assert "Run it anyway?" in decision.confirm_prompt
+
+    decision = _complexity("SELECT c1, COUNT(*) FROM events GROUP BY c1 LIMIT 10")
+    assert decision.reason == "no WHERE on large table events (~3,000,000,000 rows)"
+
+
+def test_complexity_counts_the_injected_row_limit_as_bounding():
+    explorer = _StatsExplorer()
+    decision = _gate("SELECT c1, c2 FROM events", explorer)
+    assert decision.verdict is not Verdict.CONFIRM and decision.sql.endswith("LIMIT 1000")
+
+    decision = _gate("SELECT * FROM events", explorer)
+    assert decision.layer == "complexity" and decision.reason == "SELECT * over events (60 columns)"
+    # A set operation is wrapped in ``SELECT * FROM (...)``; its stars still count.
+    decision = _gate("SELECT * FROM events WHERE c1 = 'a' UNION SELECT * FROM events WHERE c1 = 'b'",
+                     explorer)
+    assert decision.reason == "SELECT * over events (60 columns)"
+    # The limit caps the rows returned, not the scan behind an aggregate.
+    decision = _gate("SELECT c1, COUNT(*) FROM events GROUP BY c1", explorer)
+    assert decision.reason == "no WHERE on large table events (~3,000,000,000 rows)"
+
+
+def test_complexity_thresholds_are_per_guild():
+    from lang2sql.safety.layers import ComplexityLayer, ComplexityThresholds
+
+    layer = ComplexityLayer(ComplexityThresholds(max_joins=1))
+    layer.set_thresholds(
+        "ops", ComplexityThresholds(cartesian=False, large_tables=frozenset({"orders"}))
+    )
+    three_way = (
+        "SELECT * FROM orders o JOIN users u ON u.id = o.user_id JOIN users r ON r.id = o.user_id"
+        " WHERE o.status = 'paid'"
+    )
+    assert _complexity(three_way, layer=layer).reason == "2 joins (limit 1)"
+    assert _complexity(three_way, scope="ops", layer=layer).verdict is Verdict.PASS
+    assert _complexity("SELECT * FROM orders, users", scope="ops", layer=layer).reason == (
+        "no WHERE on large table orders"
+    )
+
+
+def test_decision_cache_sees_threshold_changes():
+    from lang2sql.safety.layers import ComplexityLayer, ComplexityThresholds
+
+    layer = ComplexityLayer()
+    pipeline = SafetyPipeline([layer])
+    sql = "SELECT * FROM orders, users"
+    assert pipeline.evaluate(sql, SafetyContext(scope="g1")).verdict is Verdict.CONFIRM
+    layer.set_thresholds("g1", ComplexityThresholds(cartesian=False))
+    assert pipeline.evaluate(sql, SafetyContext(scope="g1")).verdict is Verdict.PASS
+    layer.set_thresholds("g1", None)
+    assert pipeline.evaluate(sql, SafetyContext(scope="g1")).verdict is Verdict.CONFIRM
+    assert pipeline.cache_stats.hits == 0
+
+
+def test_complexity_looks_tables_up_by_schema():
+    from lang2sql.safety.layers import ComplexityLayer, ComplexityThresholds
+
+    layer = ComplexityLayer(ComplexityThresholds(large_rows=1_000_000))
+    explorer = _TwoSchemaExplorer()
+    assert _complexity("SELECT id FROM archive.orders", explorer, layer=layer).verdict is Verdict.PASS
+    decision = _complexity("SELECT id FROM public.orders", explorer, layer=layer)
+    assert decision.verdict is Verdict.CONFIRM and "orders (~5,000,000,000 rows)" in decision.reason
+
+
+def test_complexity_falls_back_to_text_without_catalog():
+    class Broken(_StatsExplorer):
+        async def list_tables(self):
+            raise RuntimeError("catalog unavailable")
+
+    assert _complexity("SELECT * FROM events", Broken()).verdict is Verdict.PASS
+    assert _complexity("SELECT * FROM events, users", Broken()).verdict is Verdict.CONFIRM
@@ -143,10 +143,27 @@ def test_concierge_per_scope_dsn_routes_correctly(tmp_path):
 
     assert isinstance(ctx_with.explorer, SqlAlchemyExplorer)
     # The guild without a stored DSN falls back to the concierge default
-    # (PostgresExplorer stub in this offline env).
+    # (StubExplorer in this offline env).
     assert ctx_with.explorer is not ctx_without.explorer
 
 
+def test_concierge_guilds_on_one_dsn_share_a_pool(tmp_path):
+    db = tmp_path / "shared.db"
+    _seed_sqlite(str(db))
+    concierge = ContextConcierge()
+    for guild in ("g-a", "g-b"):
+        asyncio.run(concierge.secrets.set(guild, "db_dsn", f"sqlite:///{db}"))
+
+    ctx_a = asyncio.run(concierge.build_context(Identity(user_id="u", guild_id="g-a", channel_id="c")))
+    ctx_b = asyncio.run(concierge.build_context(Identity(user_id="u", guild_id="g-b", channel_id="c")))
+    assert ctx_a.explorer is ctx_b.explorer
+    asyncio.run(ctx_a.explorer.list_tables())
+
+    [shared] = concierge.explorers.stats()
+    assert shared.scopes == 2 and shared.adapter == "SqlAlchemyExplorer"
+    assert shared.pool.get("checkedout") == 0
+
+
 def test_concierge_d1_extras_threaded_through_secrets():
     concierge = ContextConcierge()
     asyncio.run(concierge.secrets.set("g-d1", "db_dsn", "d1://acct/db"))
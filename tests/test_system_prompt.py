@@ -0,0 +1,117 @@
+"""System prompt assembly — section memoisation and kv-driven invalidation.
+
+A counting explorer stands in for the warehouse so the tests can assert that a
+warm prompt does no per-table ``describe_table`` round-trips, and that writes
+through ``SqliteStore.kv_set`` (enrichment, relationships, terms) are what make
+a section rebuild.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from lang2sql.adapters.llm.fake import FakeLLM
+from lang2sql.adapters.storage.sqlite_store import SqliteStore
+from lang2sql.core.identity import Identity
+from lang2sql.core.ports.explorer import Column, Table
+from lang2sql.harness.context import HarnessContext
+from lang2sql.harness.session import Session
+from lang2sql.harness.system_prompt import PromptCache, build_system_prompt
+from lang2sql.harness.tool_registry import ToolRegistry
+from lang2sql.tools.semantic_federation import FedEntry, _kv_key
+
+
+class _CountingExplorer:
+    def __init__(self) -> None:
+        self.catalog_version = 1
+        self.describes = 0
+
+    async def list_tables(self) -> list[Table]:
+        return [Table(name="orders", schema=""), Table(name="users", schema="")]
+
+    async def describe_table(self, name: str) -> Table:
+        self.describes += 1
+        return Table(name=name, schema="", columns=[Column("id", "integer")])
+
+
+def _ctx(store: SqliteStore, explorer, cache: PromptCache, user: str = "u1") -> HarnessContext:
+    identity = Identity(user_id=user, guild_id="g", channel_id="c")
+    return HarnessContext(
+        identity=identity,
+        llm=FakeLLM(),
+        tools=ToolRegistry(),
+        session=Session(identity=identity),
+        explorer=explorer,
+        store=store,
+        prompt_cache=cache,
+    )
+
+
+def test_warm_prompt_skips_describe_round_trips():
+    store, explorer, cache = SqliteStore(), _CountingExplorer(), PromptCache()
+    store.kv_set("g", "schema_relationships", json.dumps(["orders.user_id = users.id"]))
+
+    first = asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+    assert explorer.describes == 2
+    second = asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+    assert second == first
+    assert explorer.describes == 2  # served from the cache
+
+    store.kv_set("g", "enriched_desc:orders:id", "order key")
+    third = asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+    assert "order key" in third
+    assert explorer.describes == 4  # enrichment write invalidated the schema block
+
+    explorer.catalog_version += 1  # catalog reload
+    asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+    assert explorer.describes == 6
+
+
+def test_term_write_rebuilds_only_for_new_inputs():
+    store, explorer, cache = SqliteStore(), _CountingExplorer(), PromptCache()
+    before = asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+    assert "active_user" not in before
+
+    entry = FedEntry(term="active_user", layer="guild", entity="", definition="30d login")
+    store.kv_set("g", _kv_key("active_user", "guild", ""), entry.to_json())
+    after = asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+    assert "30d login" in after
+
+    store.kv_delete("g", _kv_key("active_user", "guild", ""))
+    assert "30d login" not in asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+
+
+def test_kv_generation_tracks_namespaces():
+    store = SqliteStore()
+    assert store.kv_generation("g", "cterm") == 0
+    store.kv_set("g", "cterm:x:guild", "{}")
+    store.kv_set("g", "enriched_desc:t:c", "d")
+    assert store.kv_generation("g", "cterm") == 1
+    store.kv_delete_prefix("g", "enriched_desc:")
+    assert store.kv_generation("g", "enriched_desc") == 2
+    assert store.kv_generation("other", "cterm") == 0
+
+
+def test_rebuilt_explorer_for_the_same_dsn_never_reuses_a_stale_schema(tmp_path):
+    import gc
+
+    from sqlalchemy import create_engine, text
+
+    from lang2sql.adapters.db import SqlAlchemyExplorer
+
+    url = f"sqlite:///{tmp_path / 'shop.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER)"))
+    store, cache = SqliteStore(), PromptCache()
+
+    explorer = SqlAlchemyExplorer(url)
+    assert "refunds" not in asyncio.run(build_system_prompt(_ctx(store, explorer, cache)))
+    del explorer
+    gc.collect()  # its id() may now be handed to the next explorer
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE refunds (id INTEGER)"))
+    rebuilt = SqlAlchemyExplorer(url)  # e.g. after the registry disposed of the first
+    assert "refunds" in asyncio.run(build_system_prompt(_ctx(store, rebuilt, cache)))
@@ -77,3 +77,136 @@ def test_injected_overrides_are_used() -> None:
     ctx = asyncio.run(concierge.build_context(Identity(user_id="u1")))
     assert ctx.llm is fake
     assert ctx.audit is store
+
+
+def _long_session(identity: Identity, turns: int) -> Session:
+    session = Session(identity=identity)
+    for i in range(turns):
+        session.add(Message(role=Role.USER, content=f"question {i} " + "x" * 200))
+        session.add(Message(role=Role.ASSISTANT, content=f"answer {i} " + "y" * 200))
+    return session
+
+
+def test_compact_session_folds_old_turns_into_summary() -> None:
+    store = SqliteStore()
+    identity = Identity(user_id="u1", channel_id="c")
+    key = identity.session_key()
+    asyncio.run(store.save(key, _long_session(identity, 10)))
+
+    concierge = ContextConcierge(store=store, llm=FakeLLM(), history_budget_tokens=300)
+    assert asyncio.run(concierge.compact_session(key)) is True
+
+    folded = asyncio.run(store.load(key))
+    assert folded is not None
+    assert folded.summary  # FakeLLM's reply stands in for the summary
+    assert folded.transcript[0].role == Role.USER
+    assert folded.overflow(300) == 0
+    assert asyncio.run(concierge.compact_session(key)) is False  # already fits
+
+
+def test_compact_session_drops_fold_when_session_changed_meanwhile() -> None:
+    store = SqliteStore()
+    identity = Identity(user_id="u1", channel_id="c")
+    key = identity.session_key()
+    asyncio.run(store.save(key, _long_session(identity, 10)))
+
+    class ResettingLLM(FakeLLM):
+        async def complete(self, messages, tools=()):
+            await store.save(key, Session(identity=identity))  # e.g. /reset mid-summary
+            return await super().complete(messages, tools)
+
+    concierge = ContextConcierge(store=store, llm=ResettingLLM(), history_budget_tokens=300)
+    assert asyncio.run(concierge.compact_session(key)) is False
+    loaded = asyncio.run(store.load(key))
+    assert loaded is not None and loaded.transcript == [] and loaded.summary == ""
+
+
+def test_explorer_registry_shares_by_dsn_and_evicts_lru_and_idle() -> None:
+    from lang2sql.tenancy.explorer_registry import ExplorerRegistry
+
+    closed: list[str] = []
+
+    class FakeExplorer:
+        def __init__(self, dsn):
+            self.dsn = dsn
+
+        async def close(self):
+            closed.append(self.dsn)
+
+        def pool_stats(self):
+            return {"size": 1}
+
+    now = [0.0]
+    reg = ExplorerRegistry(
+        max_scopes=2, idle_ttl=60, clock=lambda: now[0],
+        build=lambda dsn, schema=None, extras=None: FakeExplorer(dsn),
+    )
+
+    async def scenario():
+        a = await reg.bind("g1", "sqlite:///a.db")
+        assert await reg.bind("g2", "sqlite:///a.db") is a  # one pool for both guilds
+        [stats] = reg.stats()
+        assert stats.scopes == 2 and stats.pool == {"size": 1}
+
+        # A third scope evicts g1 (LRU), but a.db stays open for g2.
+        await reg.bind("g3", "sqlite:///b.db")
+        assert await reg.get("g1") is None and closed == []
+
+        # g2 idles out: its last binding goes, so a.db's pool is disposed.
+        now[0] = 30.0
+        assert await reg.get("g3") is not None
+        now[0] = 61.0
+        assert await reg.get("g2") is None
+        assert closed == ["sqlite:///a.db"] and reg.evictions == 2
+
+        reg.forget("g3")
+        await reg.sweep()
+        assert closed == ["sqlite:///a.db"] and len(reg) == 0  # b.db was used 31s ago
+        now[0] = 91.0
+        await reg.sweep()
+        assert closed == ["sqlite:///a.db", "sqlite:///b.db"] and reg.stats() == []
+
+    asyncio.run(scenario())
+
+
+def test_explorer_registry_keeps_an_evicted_pool_until_it_idles() -> None:
+    from lang2sql.tenancy.explorer_registry import ExplorerRegistry
+
+    built: list[str] = []
+    closed: list[str] = []
+
+    class FakeExplorer:
+        def __init__(self, dsn):
+            self.dsn = dsn
+            built.append(dsn)
+
+        async def close(self):
+            closed.append(self.dsn)
+
+    now = [0.0]
+    reg = ExplorerRegistry(
+        max_scopes=1, idle_ttl=60, clock=lambda: now[0],
+        build=lambda dsn, schema=None, extras=None: FakeExplorer(dsn),
+    )
+
+    async def scenario():
+        # g1's request is mid-query on a.db when g2's bind evicts it.
+        in_flight = await reg.bind("g1", "sqlite:///a.db")
+        now[0] = 10.0
+        await reg.bind("g2", "sqlite:///b.db")
+        assert closed == [] and await reg.get("g1") is None
+        assert [s.scopes for s in reg.stats()] == [1, 0]  # b.db live, a.db retired
+
+        # Binding a.db again revives the retired explorer instead of opening a pool.
+        assert await reg.bind("g1", "sqlite:///a.db") is in_flight
+        assert built == ["sqlite:///a.db", "sqlite:///b.db"]
+
+        now[0] = 50.0
+        assert await reg.get("g1") is in_flight
+        now[0] = 75.0  # b.db, evicted just above, was last handed out at 10s
+        await reg.sweep()
+        assert closed == ["sqlite:///b.db"]
+        await reg.close()
+        assert closed == ["sqlite:///b.db", "sqlite:///a.db"]
+
+    asyncio.run(scenario())